@@ -4,10 +4,22 @@
 
 """Custom Alembic operations for our own nuances."""
 
-from typing import Any, Optional
+from typing import Any, Dict, Optional
+from datetime import date
 
 from alembic.operations import Operations, MigrateOperation
 
+from modist.tallying import (
+    build_reconcile_tally_sql,
+    build_drop_tally_triggers_sql,
+    build_create_tally_triggers_sql,
+)
+from modist.partitioning import (
+    get_months,
+    build_drop_partition_sql,
+    build_create_partition_sql,
+)
+
 
 @Operations.register_operation("create_refresh_updated_at_trigger")
 class CreateRefreshUpdatedAtTriggerOperation(MigrateOperation):
@@ -254,3 +266,505 @@ def drop_refresh_depth_and_lineage_trigger(
         f"{operation.table_name!s}_refresh_depth_and_lineage_trigger "
         f"ON {operation.schema_name!s}.{operation.table_name!s}"
     )
+
+
+@Operations.register_operation("create_refresh_search_vector_trigger")
+class CreateRefreshSearchVectorTriggerOperation(MigrateOperation):
+    """The Alembic operation to create a ``refresh_search_vector`` trigger."""
+
+    def __init__(
+        self,
+        table_name: str,
+        weights: Dict[str, str],
+        config: str = "english",
+        schema_name: str = "public",
+    ):
+        """Alembic operation for creating a ``refresh_search_vector`` trigger.
+
+        :param str table_name: The name of the table to create the trigger in
+        :param Dict[str, str] weights: The text columns to build the search vector
+            from, mapped to their weight (``A`` being the highest, ``D`` the lowest)
+        :param str config: The text search configuration to build the search vector
+            with, optional, defaults to "english"
+        :param str schema_name: The name of the schema which the given table lives in,
+            optional, defaults to "public"
+        """
+
+        self.table_name = table_name
+        self.weights = weights
+        self.config = config
+        self.schema_name = schema_name
+
+    @classmethod
+    def create_refresh_search_vector_trigger(
+        cls, operations, table_name: str, weights: Dict[str, str], **kwargs
+    ) -> Any:
+        """Invoke the create ``refresh_search_vector`` trigger operation.
+
+        :param operations: The Alembic operations context to invoke the current
+            operation within
+        :param str table_name: The name of the table to invoke the create
+            trigger operation with
+        :param Dict[str, str] weights: The text columns to build the search vector
+            from, mapped to their weight
+        :return: The response of the invoked operation
+        :rtype: Any
+        """
+
+        return operations.invoke(cls(table_name, weights, **kwargs))
+
+    def reverse(self) -> Any:
+        """Trigger the reverse of the create search vector trigger operation.
+
+        :return: The result of the reverse operation
+        :rtype: Any
+        """
+
+        return DropRefreshSearchVectorTriggerOperation(
+            self.table_name,
+            self.weights,
+            config=self.config,
+            schema_name=self.schema_name,
+        )
+
+
+@Operations.register_operation("drop_refresh_search_vector_trigger")
+class DropRefreshSearchVectorTriggerOperation(MigrateOperation):
+    """The Alembic operation to drop a ``refresh_search_vector`` trigger."""
+
+    def __init__(
+        self,
+        table_name: str,
+        weights: Optional[Dict[str, str]] = None,
+        config: str = "english",
+        schema_name: str = "public",
+    ):
+        """Alembic operation for dropping a ``refresh_search_vector`` trigger.
+
+        :param str table_name: The name of the table to drop the trigger from
+        :param Optional[Dict[str, str]] weights: The text columns the search vector
+            was built from, only required to reverse the operation, optional, defaults
+            to None
+        :param str config: The text search configuration the search vector was built
+            with, optional, defaults to "english"
+        :param str schema_name: The name of the schema which the given table lives in,
+            optional, defaults to "public"
+        """
+
+        self.table_name = table_name
+        self.weights = weights
+        self.config = config
+        self.schema_name = schema_name
+
+    @classmethod
+    def drop_refresh_search_vector_trigger(
+        cls, operations, table_name: str, **kwargs
+    ) -> Any:
+        """Invoke the drop ``refresh_search_vector`` trigger operation.
+
+        :param operations: The Alembic operations context to invoke the current
+            operation within
+        :param str table_name: The name of the table to invoke the drop trigger
+            operation with
+        :return: The response of the invoked operation
+        :rtype: Any
+        """
+
+        return operations.invoke(cls(table_name, **kwargs))
+
+    def reverse(self) -> Any:
+        """Trigger the reverse of the drop search vector trigger operation.
+
+        :raises ValueError: If the operation was not given the search vector weights
+        :return: The result of the reverse operation
+        :rtype: Any
+        """
+
+        if self.weights is None:
+            raise ValueError(
+                "Cannot reverse dropping a search vector trigger without weights"
+            )
+
+        return CreateRefreshSearchVectorTriggerOperation(
+            self.table_name,
+            self.weights,
+            config=self.config,
+            schema_name=self.schema_name,
+        )
+
+
+@Operations.implementation_for(CreateRefreshSearchVectorTriggerOperation)
+def create_refresh_search_vector_trigger(
+    operations, operation: CreateRefreshSearchVectorTriggerOperation
+) -> Any:
+    """Create a trigger to automatically call ``refresh_search_vector``.
+
+    .. note:: The trigger only fires for updates of the weighted columns so unrelated
+        updates never pay for rebuilding the search vector. Existing rows are
+        backfilled with user triggers disabled so their ``updated_at`` is untouched.
+
+    :param operations: The Alembic operation context to execute the operation within
+    :param CreateRefreshSearchVectorTriggerOperation operation: The operation context
+    :return: The result of the execution of the creation of the trigger
+    :rtype: Any
+    """
+
+    column_names = ", ".join(operation.weights.keys())
+    trigger_arguments = ", ".join(
+        f"'{argument!s}'"
+        for column_name, weight in operation.weights.items()
+        for argument in (column_name, weight)
+    )
+    operations.execute(
+        f"CREATE TRIGGER {operation.table_name!s}_refresh_search_vector_trigger "
+        f"BEFORE INSERT OR UPDATE OF {column_names!s} "
+        f"ON {operation.schema_name!s}.{operation.table_name!s} "
+        "FOR EACH ROW EXECUTE PROCEDURE "
+        f"refresh_search_vector('{operation.config!s}', {trigger_arguments!s})"
+    )
+
+    search_vector = " || ".join(
+        f"setweight(to_tsvector('{operation.config!s}', "
+        f"coalesce({column_name!s}, '')), '{weight!s}')"
+        for column_name, weight in operation.weights.items()
+    )
+    table_name = f"{operation.schema_name!s}.{operation.table_name!s}"
+    operations.execute(f"ALTER TABLE {table_name!s} DISABLE TRIGGER USER")
+    operations.execute(f"UPDATE {table_name!s} SET search_vector = {search_vector!s}")
+    return operations.execute(f"ALTER TABLE {table_name!s} ENABLE TRIGGER USER")
+
+
+@Operations.implementation_for(DropRefreshSearchVectorTriggerOperation)
+def drop_refresh_search_vector_trigger(
+    operations, operation: DropRefreshSearchVectorTriggerOperation
+) -> Any:
+    """Drop an existing trigger on a given table that calls ``refresh_search_vector``.
+
+    :param operations: The Alembic operation context to execute the operation within
+    :param DropRefreshSearchVectorTriggerOperation operation: The operation context
+    :return: The result of the execution of the dropping of the trigger
+    :rtype: Any
+    """
+
+    operations.execute(
+        "DROP TRIGGER IF EXISTS "
+        f"{operation.table_name!s}_refresh_search_vector_trigger "
+        f"ON {operation.schema_name!s}.{operation.table_name!s}"
+    )
+
+
+@Operations.register_operation("create_monthly_partitions")
+class CreateMonthlyPartitionsOperation(MigrateOperation):
+    """The Alembic operation to create monthly partitions of a partitioned table."""
+
+    def __init__(
+        self, table_name: str, start: date, months: int, schema_name: str = "public"
+    ):
+        """Alembic operation for creating monthly partitions of a partitioned table.
+
+        :param str table_name: The name of the table partitioned by month
+        :param date start: A date within the first month to create a partition for
+        :param int months: The number of consecutive months to create partitions for
+        :param str schema_name: The name of the schema which the given table lives in,
+            optional, defaults to "public"
+        """
+
+        self.table_name = table_name
+        self.start = start
+        self.months = months
+        self.schema_name = schema_name
+
+    @classmethod
+    def create_monthly_partitions(
+        cls, operations, table_name: str, start: date, months: int, **kwargs
+    ) -> Any:
+        """Invoke the create monthly partitions operation.
+
+        :param operations: The Alembic operations context to invoke the current
+            operation within
+        :param str table_name: The name of the table to create partitions of
+        :param date start: A date within the first month to create a partition for
+        :param int months: The number of consecutive months to create partitions for
+        :return: The response of the invoked operation
+        :rtype: Any
+        """
+
+        return operations.invoke(cls(table_name, start, months, **kwargs))
+
+    def reverse(self) -> Any:
+        """Trigger the reverse of the create monthly partitions operation.
+
+        :return: The result of the reverse operation
+        :rtype: Any
+        """
+
+        return DropMonthlyPartitionsOperation(
+            self.table_name, self.start, self.months, schema_name=self.schema_name
+        )
+
+
+@Operations.register_operation("drop_monthly_partitions")
+class DropMonthlyPartitionsOperation(MigrateOperation):
+    """The Alembic operation to drop monthly partitions of a partitioned table."""
+
+    def __init__(
+        self, table_name: str, start: date, months: int, schema_name: str = "public"
+    ):
+        """Alembic operation for dropping monthly partitions of a partitioned table.
+
+        :param str table_name: The name of the table partitioned by month
+        :param date start: A date within the first month to drop the partition of
+        :param int months: The number of consecutive months to drop partitions of
+        :param str schema_name: The name of the schema which the given table lives in,
+            optional, defaults to "public"
+        """
+
+        self.table_name = table_name
+        self.start = start
+        self.months = months
+        self.schema_name = schema_name
+
+    @classmethod
+    def drop_monthly_partitions(
+        cls, operations, table_name: str, start: date, months: int, **kwargs
+    ) -> Any:
+        """Invoke the drop monthly partitions operation.
+
+        :param operations: The Alembic operations context to invoke the current
+            operation within
+        :param str table_name: The name of the table to drop partitions of
+        :param date start: A date within the first month to drop the partition of
+        :param int months: The number of consecutive months to drop partitions of
+        :return: The response of the invoked operation
+        :rtype: Any
+        """
+
+        return operations.invoke(cls(table_name, start, months, **kwargs))
+
+    def reverse(self) -> Any:
+        """Trigger the reverse of the drop monthly partitions operation.
+
+        :return: The result of the reverse operation
+        :rtype: Any
+        """
+
+        return CreateMonthlyPartitionsOperation(
+            self.table_name, self.start, self.months, schema_name=self.schema_name
+        )
+
+
+@Operations.implementation_for(CreateMonthlyPartitionsOperation)
+def create_monthly_partitions(
+    operations, operation: CreateMonthlyPartitionsOperation
+) -> Any:
+    """Create the monthly partitions of a table which don't exist yet.
+
+    :param operations: The Alembic operation context to execute the operation within
+    :param CreateMonthlyPartitionsOperation operation: The operation context
+    """
+
+    for month in get_months(operation.start, operation.months):
+        operations.execute(
+            build_create_partition_sql(
+                operation.table_name, month, schema_name=operation.schema_name
+            )
+        )
+
+
+@Operations.implementation_for(DropMonthlyPartitionsOperation)
+def drop_monthly_partitions(
+    operations, operation: DropMonthlyPartitionsOperation
+) -> Any:
+    """Drop the monthly partitions of a table which exist, along with their rows.
+
+    :param operations: The Alembic operation context to execute the operation within
+    :param DropMonthlyPartitionsOperation operation: The operation context
+    """
+
+    for month in get_months(operation.start, operation.months):
+        operations.execute(
+            build_drop_partition_sql(
+                operation.table_name, month, schema_name=operation.schema_name
+            )
+        )
+
+
+@Operations.register_operation("create_ranking_tally_triggers")
+class CreateRankingTallyTriggersOperation(MigrateOperation):
+    """The Alembic operation to create the tally triggers of a ranked entity."""
+
+    def __init__(
+        self,
+        association_table: str,
+        entity_column: str,
+        tally_table: str,
+        schema_name: str = "public",
+    ):
+        """Alembic operation for creating the tally triggers of a ranked entity.
+
+        :param str association_table: The name of the ranking association table
+        :param str entity_column: The name of the association's column referencing
+            the ranked entity, also the primary key of the tally table
+        :param str tally_table: The name of the tally table to maintain
+        :param str schema_name: The name of the schema which the given tables live in,
+            optional, defaults to "public"
+        """
+
+        self.association_table = association_table
+        self.entity_column = entity_column
+        self.tally_table = tally_table
+        self.schema_name = schema_name
+
+    @classmethod
+    def create_ranking_tally_triggers(
+        cls,
+        operations,
+        association_table: str,
+        entity_column: str,
+        tally_table: str,
+        **kwargs,
+    ) -> Any:
+        """Invoke the create ranking tally triggers operation.
+
+        :param operations: The Alembic operations context to invoke the current
+            operation within
+        :param str association_table: The name of the ranking association table
+        :param str entity_column: The name of the association's column referencing
+            the ranked entity
+        :param str tally_table: The name of the tally table to maintain
+        :return: The response of the invoked operation
+        :rtype: Any
+        """
+
+        return operations.invoke(
+            cls(association_table, entity_column, tally_table, **kwargs)
+        )
+
+    def reverse(self) -> Any:
+        """Trigger the reverse of the create ranking tally triggers operation.
+
+        :return: The result of the reverse operation
+        :rtype: Any
+        """
+
+        return DropRankingTallyTriggersOperation(
+            self.association_table,
+            entity_column=self.entity_column,
+            tally_table=self.tally_table,
+            schema_name=self.schema_name,
+        )
+
+
+@Operations.register_operation("drop_ranking_tally_triggers")
+class DropRankingTallyTriggersOperation(MigrateOperation):
+    """The Alembic operation to drop the tally triggers of a ranked entity."""
+
+    def __init__(
+        self,
+        association_table: str,
+        entity_column: Optional[str] = None,
+        tally_table: Optional[str] = None,
+        schema_name: str = "public",
+    ):
+        """Alembic operation for dropping the tally triggers of a ranked entity.
+
+        :param str association_table: The name of the ranking association table
+        :param Optional[str] entity_column: The name of the association's column
+            referencing the ranked entity, only required to reverse the operation,
+            optional, defaults to None
+        :param Optional[str] tally_table: The name of the maintained tally table, only
+            required to reverse the operation, optional, defaults to None
+        :param str schema_name: The name of the schema which the given tables live in,
+            optional, defaults to "public"
+        """
+
+        self.association_table = association_table
+        self.entity_column = entity_column
+        self.tally_table = tally_table
+        self.schema_name = schema_name
+
+    @classmethod
+    def drop_ranking_tally_triggers(
+        cls, operations, association_table: str, **kwargs
+    ) -> Any:
+        """Invoke the drop ranking tally triggers operation.
+
+        :param operations: The Alembic operations context to invoke the current
+            operation within
+        :param str association_table: The name of the ranking association table
+        :return: The response of the invoked operation
+        :rtype: Any
+        """
+
+        return operations.invoke(cls(association_table, **kwargs))
+
+    def reverse(self) -> Any:
+        """Trigger the reverse of the drop ranking tally triggers operation.
+
+        :raises ValueError: If the operation was not given the entity column and tally
+            table
+        :return: The result of the reverse operation
+        :rtype: Any
+        """
+
+        if self.entity_column is None or self.tally_table is None:
+            raise ValueError(
+                "Cannot reverse dropping ranking tally triggers without the entity "
+                "column and tally table"
+            )
+
+        return CreateRankingTallyTriggersOperation(
+            self.association_table,
+            self.entity_column,
+            self.tally_table,
+            schema_name=self.schema_name,
+        )
+
+
+@Operations.implementation_for(CreateRankingTallyTriggersOperation)
+def create_ranking_tally_triggers(
+    operations, operation: CreateRankingTallyTriggersOperation
+) -> Any:
+    """Create the triggers calling ``refresh_ranking_tally(ies)`` for a ranked entity.
+
+    .. note:: The tally table is backfilled from the existing rankings once the
+        triggers are in place.
+
+    :param operations: The Alembic operation context to execute the operation within
+    :param CreateRankingTallyTriggersOperation operation: The operation context
+    :return: The result of the execution of the backfill of the tally table
+    :rtype: Any
+    """
+
+    for statement in build_create_tally_triggers_sql(
+        operation.association_table,
+        operation.entity_column,
+        operation.tally_table,
+        schema_name=operation.schema_name,
+    ):
+        operations.execute(statement)
+
+    return operations.execute(
+        build_reconcile_tally_sql(
+            operation.association_table,
+            operation.entity_column,
+            operation.tally_table,
+            schema_name=operation.schema_name,
+        )
+    )
+
+
+@Operations.implementation_for(DropRankingTallyTriggersOperation)
+def drop_ranking_tally_triggers(
+    operations, operation: DropRankingTallyTriggersOperation
+) -> Any:
+    """Drop the existing triggers maintaining the tally table of a ranked entity.
+
+    :param operations: The Alembic operation context to execute the operation within
+    :param DropRankingTallyTriggersOperation operation: The operation context
+    """
+
+    for statement in build_drop_tally_triggers_sql(
+        operation.association_table, schema_name=operation.schema_name
+    ):
+        operations.execute(statement)
@@ -0,0 +1,61 @@
+"""Create host release version key.
+
+Revision ID: 09cf512afa80
+Revises: f1bee5c5f3ef
+Create Date: 2026-10-19 18:02:41.306518
+
+"""
+import sqlalchemy as sa
+from semver import VersionInfo
+
+from alembic import op
+from modist.versioning import get_version_key
+
+# revision identifiers, used by Alembic.
+revision = "09cf512afa80"
+down_revision = "f1bee5c5f3ef"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    connection = op.get_bind()
+
+    op.add_column(
+        "host_release", sa.Column("version_key", sa.Text(collation="C"), nullable=True)
+    )
+    # NOTE: user triggers are disabled so the backfill doesn't touch ``updated_at``
+    op.execute("ALTER TABLE host_release DISABLE TRIGGER USER")
+    releases = [
+        {
+            "release_id": release_id,
+            "version_key": get_version_key(VersionInfo.parse(version)),
+        }
+        for release_id, version in connection.execute(
+            sa.text("SELECT id, version FROM host_release")
+        )
+    ]
+    if len(releases) > 0:
+        connection.execute(
+            sa.text(
+                "UPDATE host_release SET version_key = :version_key "
+                "WHERE id = :release_id"
+            ),
+            releases,
+        )
+    op.execute("ALTER TABLE host_release ENABLE TRIGGER USER")
+    op.alter_column("host_release", "version_key", nullable=False)
+    op.create_index(
+        "ix_host_release_host_id_version_key",
+        "host_release",
+        ["host_id", "version_key"],
+    )
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    op.drop_index("ix_host_release_host_id_version_key", table_name="host_release")
+    op.drop_column("host_release", "version_key")
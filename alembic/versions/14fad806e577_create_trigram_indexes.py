@@ -0,0 +1,43 @@
+"""Create trigram indexes.
+
+Revision ID: 14fad806e577
+Revises: c98cf84088a0
+Create Date: 2026-10-19 15:53:02.117485
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "14fad806e577"
+down_revision = "c98cf84088a0"
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = (
+    ("ix_mod_slug_trgm", "mod", "slug"),
+    ("ix_mod_name_trgm", "mod", "name"),
+    ("ix_host_name_trgm", "host", "name"),
+    ("ix_tag_name_trgm", "tag", "name"),
+)
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    for index_name, table_name, column_name in TRIGRAM_INDEXES:
+        op.create_index(
+            index_name,
+            table_name,
+            [column_name],
+            postgresql_using="gin",
+            postgresql_ops={column_name: "gin_trgm_ops"},
+        )
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    for index_name, table_name, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,172 @@
+"""Partition mod_release_download by month.
+
+Revision ID: 25c47a5935fa
+Revises: 8908f9224ed9
+Create Date: 2026-10-19 20:41:08.318204
+
+"""
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+from modist.env import instance as env
+from modist.partitioning import add_months, build_create_default_partition_sql
+
+# revision identifiers, used by Alembic.
+revision = "25c47a5935fa"
+down_revision = "8908f9224ed9"
+branch_labels = None
+depends_on = None
+
+COLUMNS = (
+    "id, created_at, updated_at, downloaded_at, ip, headers, "
+    "mod_release_id, mod_id, user_id"
+)
+
+
+def _create_download_table(table_name: str, *args, **kwargs):
+    """Create a table with the columns of ``mod_release_download``.
+
+    .. note:: Foreign key names are only unique per table, so both tables keep the
+        foreign key names of ``mod_release_download``.
+
+    :param str table_name: The name of the table to create
+    :param args: Additional columns and constraints of the table
+    :param kwargs: Additional options of the table
+    """
+
+    op.create_table(
+        table_name,
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=True),
+            server_default=sa.text("uuid_generate_v4()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "downloaded_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("ip", postgresql.INET(), nullable=False),
+        sa.Column(
+            "headers",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+        sa.Column("mod_release_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("mod_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["mod_id"],
+            ["mod.id"],
+            name="mod_release_download_mod_id_fkey",
+            ondelete="cascade",
+        ),
+        sa.ForeignKeyConstraint(
+            ["mod_release_id"],
+            ["mod_release.id"],
+            name="mod_release_download_mod_release_id_fkey",
+            ondelete="set null",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+            name="mod_release_download_user_id_fkey",
+            ondelete="set null",
+        ),
+        *args,
+        **kwargs,
+    )
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    # NOTE: index names are unique per schema, so the indexes of the existing table
+    # must be renamed as well before the partitioned table can reuse their names
+    op.rename_table("mod_release_download", "mod_release_download_unpartitioned")
+    op.execute(
+        "ALTER INDEX mod_release_download_pkey "
+        "RENAME TO mod_release_download_unpartitioned_pkey"
+    )
+    op.execute(
+        "ALTER INDEX ix_mod_release_download_created_at "
+        "RENAME TO ix_mod_release_download_unpartitioned_created_at"
+    )
+
+    _create_download_table(
+        "mod_release_download",
+        sa.PrimaryKeyConstraint("id", "downloaded_at"),
+        postgresql_partition_by="RANGE (downloaded_at)",
+    )
+    op.create_index(
+        "ix_mod_release_download_created_at", "mod_release_download", ["created_at"],
+    )
+    op.create_refresh_updated_at_trigger("mod_release_download")
+
+    earliest = (
+        op.get_bind()
+        .execute(
+            "SELECT min(downloaded_at AT TIME ZONE 'UTC') "
+            "FROM mod_release_download_unpartitioned"
+        )
+        .scalar()
+    )
+    current = datetime.now(timezone.utc).date()
+    start = (earliest.date() if earliest is not None else current).replace(day=1)
+    # NOTE: partitions are made as far ahead as the partition maintenance job makes
+    # them, so the job keeps creating partitions ahead of time from here on
+    end = add_months(current, env.app.downloads.partition_premake_months)
+    months = (end.year - start.year) * 12 + (end.month - start.month) + 1
+    op.create_monthly_partitions("mod_release_download", start, months)
+    op.execute(build_create_default_partition_sql("mod_release_download"))
+
+    op.execute(
+        f"INSERT INTO mod_release_download ({COLUMNS!s}) "
+        f"SELECT {COLUMNS!s} FROM mod_release_download_unpartitioned"
+    )
+    op.drop_table("mod_release_download_unpartitioned")
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    _create_download_table(
+        "mod_release_download_unpartitioned",
+        sa.PrimaryKeyConstraint("id", name="mod_release_download_unpartitioned_pkey"),
+    )
+    op.execute(
+        f"INSERT INTO mod_release_download_unpartitioned ({COLUMNS!s}) "
+        f"SELECT {COLUMNS!s} FROM mod_release_download"
+    )
+
+    # NOTE: dropping the partitioned table drops all of its partitions as well
+    op.drop_refresh_updated_at_trigger("mod_release_download")
+    op.drop_table("mod_release_download")
+
+    op.rename_table("mod_release_download_unpartitioned", "mod_release_download")
+    op.execute(
+        "ALTER INDEX mod_release_download_unpartitioned_pkey "
+        "RENAME TO mod_release_download_pkey"
+    )
+    op.create_index(
+        "ix_mod_release_download_created_at", "mod_release_download", ["created_at"],
+    )
+    op.create_refresh_updated_at_trigger("mod_release_download")
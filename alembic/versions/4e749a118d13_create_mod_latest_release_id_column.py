@@ -0,0 +1,117 @@
+"""Create mod latest_release_id column.
+
+Revision ID: 4e749a118d13
+Revises: 09cf512afa80
+Create Date: 2026-10-19 18:46:13.072934
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4e749a118d13"
+down_revision = "09cf512afa80"
+branch_labels = None
+depends_on = None
+
+
+# NOTE: the affected mods are locked before their latest release is looked up, so
+# concurrent transactions releasing the same mod are serialized and the lookup (which
+# takes a new snapshot) always sees the releases committed by the other transaction
+CREATE_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION refresh_latest_release_id()
+RETURNS TRIGGER AS
+$$
+DECLARE
+  affected_mod_ids uuid[];
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    affected_mod_ids := ARRAY[NEW.mod_id];
+  ELSIF TG_OP = 'DELETE' THEN
+    affected_mod_ids := ARRAY[OLD.mod_id];
+  ELSE
+    affected_mod_ids := ARRAY[OLD.mod_id, NEW.mod_id];
+  END IF;
+
+  PERFORM 1 FROM mod WHERE id = ANY(affected_mod_ids) ORDER BY id FOR UPDATE;
+
+  UPDATE mod
+  SET latest_release_id = latest.id
+  FROM (
+    SELECT affected.mod_id, (
+      SELECT mod_release.id
+      FROM mod_release
+      WHERE mod_release.mod_id = affected.mod_id AND mod_release.is_active
+      ORDER BY mod_release.version_key DESC
+      LIMIT 1
+    ) AS id
+    FROM (SELECT DISTINCT unnest(affected_mod_ids) AS mod_id) AS affected
+  ) AS latest
+  WHERE mod.id = latest.mod_id
+    AND mod.latest_release_id IS DISTINCT FROM latest.id;
+
+  RETURN NULL;
+END
+$$
+LANGUAGE plpgsql;
+"""
+DROP_FUNCTION_SQL = "DROP FUNCTION IF EXISTS refresh_latest_release_id"
+
+CREATE_TRIGGER_SQL = """
+CREATE TRIGGER mod_release_refresh_latest_release_id_trigger
+AFTER INSERT OR DELETE OR UPDATE OF mod_id, version_key, is_active
+ON public.mod_release
+FOR EACH ROW EXECUTE PROCEDURE refresh_latest_release_id()
+"""
+DROP_TRIGGER_SQL = (
+    "DROP TRIGGER IF EXISTS mod_release_refresh_latest_release_id_trigger "
+    "ON public.mod_release"
+)
+
+BACKFILL_SQL = """
+UPDATE mod
+SET latest_release_id = latest.id
+FROM (
+  SELECT DISTINCT ON (mod_id) mod_id, id
+  FROM mod_release
+  WHERE is_active
+  ORDER BY mod_id, version_key DESC
+) AS latest
+WHERE mod.id = latest.mod_id
+"""
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    op.add_column(
+        "mod",
+        sa.Column("latest_release_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.create_foreign_key(
+        "mod_latest_release_id_fkey",
+        "mod",
+        "mod_release",
+        ["latest_release_id"],
+        ["id"],
+        ondelete="set null",
+    )
+
+    # NOTE: user triggers are disabled so the backfill doesn't touch ``updated_at``
+    op.execute("ALTER TABLE mod DISABLE TRIGGER USER")
+    op.execute(BACKFILL_SQL)
+    op.execute("ALTER TABLE mod ENABLE TRIGGER USER")
+
+    op.execute(CREATE_FUNCTION_SQL)
+    op.execute(CREATE_TRIGGER_SQL)
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    op.execute(DROP_TRIGGER_SQL)
+    op.execute(DROP_FUNCTION_SQL)
+    op.drop_constraint("mod_latest_release_id_fkey", "mod", type_="foreignkey")
+    op.drop_column("mod", "latest_release_id")
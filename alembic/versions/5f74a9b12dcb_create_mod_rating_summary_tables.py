@@ -0,0 +1,220 @@
+"""Create mod rating summary tables.
+
+Revision ID: 5f74a9b12dcb
+Revises: 661f84f71ce5
+Create Date: 2026-10-19 23:12:45.602317
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5f74a9b12dcb"
+down_revision = "661f84f71ce5"
+branch_labels = None
+depends_on = None
+
+# NOTE: ratings are ``numeric(3, 2)``, so their integer part is always one of 10
+# histogram buckets
+HISTOGRAM_SIZE = 10
+BUCKET_SQL = (
+    f"least(greatest(floor(rating.rating)::integer, 0), {HISTOGRAM_SIZE - 1}) + 1"
+)
+
+# NOTE: decrements never insert a summary, as the summary already exists for any rating
+# being removed (and inserting one while the mod itself is being deleted would fail)
+CREATE_APPLY_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION apply_mod_rating(
+  target_mod_id uuid, target_version text, rating numeric, direction integer
+)
+RETURNS void AS
+$$
+DECLARE
+  bucket integer :=
+    least(greatest(floor(rating)::integer, 0), {HISTOGRAM_SIZE - 1}) + 1;
+BEGIN
+  IF direction > 0 THEN
+    INSERT INTO mod_rating_summary (mod_id, histogram)
+    VALUES (target_mod_id, array_fill(0::bigint, ARRAY[{HISTOGRAM_SIZE}]))
+    ON CONFLICT (mod_id) DO NOTHING;
+    INSERT INTO mod_rating_version_summary (mod_id, version, histogram)
+    VALUES (
+      target_mod_id, target_version, array_fill(0::bigint, ARRAY[{HISTOGRAM_SIZE}])
+    )
+    ON CONFLICT (mod_id, version) DO NOTHING;
+  END IF;
+
+  UPDATE mod_rating_summary
+  SET
+    count = count + direction,
+    sum = sum + direction * rating,
+    sum_squares = sum_squares + direction * rating * rating,
+    histogram[bucket] = histogram[bucket] + direction
+  WHERE mod_id = target_mod_id;
+  UPDATE mod_rating_version_summary
+  SET
+    count = count + direction,
+    sum = sum + direction * rating,
+    sum_squares = sum_squares + direction * rating * rating,
+    histogram[bucket] = histogram[bucket] + direction
+  WHERE mod_id = target_mod_id AND version = target_version;
+END
+$$
+LANGUAGE plpgsql;
+"""
+
+# NOTE: when a rating is deleted its mod ratings are removed by the cascade after the
+# rating is gone, so the rating's own trigger removes it from the summaries instead
+CREATE_MOD_RATING_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION refresh_mod_rating_summary()
+RETURNS TRIGGER AS
+$$
+DECLARE
+  value numeric;
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    SELECT rating.rating INTO value
+    FROM rating
+    WHERE rating.id = OLD.rating_id AND rating.is_active;
+    IF FOUND THEN
+      PERFORM apply_mod_rating(OLD.mod_id, OLD.version, value, -1);
+    END IF;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    SELECT rating.rating INTO value
+    FROM rating
+    WHERE rating.id = NEW.rating_id AND rating.is_active;
+    IF FOUND THEN
+      PERFORM apply_mod_rating(NEW.mod_id, NEW.version, value, 1);
+    END IF;
+  END IF;
+
+  RETURN NULL;
+END
+$$
+LANGUAGE plpgsql;
+"""
+CREATE_RATING_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION refresh_rating_mod_rating_summary()
+RETURNS TRIGGER AS
+$$
+BEGIN
+  IF OLD.is_active THEN
+    PERFORM apply_mod_rating(mod_rating.mod_id, mod_rating.version, OLD.rating, -1)
+    FROM mod_rating
+    WHERE mod_rating.rating_id = OLD.id;
+  END IF;
+
+  IF TG_OP = 'UPDATE' AND NEW.is_active THEN
+    PERFORM apply_mod_rating(mod_rating.mod_id, mod_rating.version, NEW.rating, 1)
+    FROM mod_rating
+    WHERE mod_rating.rating_id = NEW.id;
+  END IF;
+
+  IF TG_OP = 'DELETE' THEN
+    RETURN OLD;
+  END IF;
+  RETURN NEW;
+END
+$$
+LANGUAGE plpgsql;
+"""
+DROP_FUNCTIONS_SQL = (
+    "DROP FUNCTION IF EXISTS refresh_rating_mod_rating_summary",
+    "DROP FUNCTION IF EXISTS refresh_mod_rating_summary",
+    "DROP FUNCTION IF EXISTS apply_mod_rating",
+)
+
+CREATE_TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER mod_rating_refresh_mod_rating_summary_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF mod_id, rating_id, version
+    ON public.mod_rating
+    FOR EACH ROW EXECUTE PROCEDURE refresh_mod_rating_summary()
+    """,
+    """
+    CREATE TRIGGER rating_refresh_mod_rating_summary_trigger
+    BEFORE DELETE OR UPDATE OF rating, is_active
+    ON public.rating
+    FOR EACH ROW EXECUTE PROCEDURE refresh_rating_mod_rating_summary()
+    """,
+)
+DROP_TRIGGERS_SQL = (
+    "DROP TRIGGER IF EXISTS rating_refresh_mod_rating_summary_trigger "
+    "ON public.rating",
+    "DROP TRIGGER IF EXISTS mod_rating_refresh_mod_rating_summary_trigger "
+    "ON public.mod_rating",
+)
+
+HISTOGRAM_SQL = ", ".join(
+    f"count(*) FILTER (WHERE {BUCKET_SQL} = {bucket})"
+    for bucket in range(1, HISTOGRAM_SIZE + 1)
+)
+BACKFILL_SQL = """
+INSERT INTO {table} ({columns}, count, sum, sum_squares, histogram)
+SELECT
+  {grouping}, count(*), sum(rating.rating), sum(rating.rating * rating.rating),
+  ARRAY[{histogram}]::bigint[]
+FROM mod_rating
+JOIN rating ON rating.id = mod_rating.rating_id
+WHERE rating.is_active
+GROUP BY {grouping}
+"""
+
+
+def _create_summary_table(name: str, *columns: sa.Column, primary_key=("mod_id",)):
+    """Create a rating summary table with the given key columns."""
+
+    op.create_table(
+        name,
+        sa.Column("mod_id", postgresql.UUID(as_uuid=True), nullable=False),
+        *columns,
+        sa.Column("count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("sum", sa.Numeric(), server_default="0", nullable=False),
+        sa.Column("sum_squares", sa.Numeric(), server_default="0", nullable=False),
+        sa.Column("histogram", postgresql.ARRAY(sa.BigInteger()), nullable=False),
+        sa.ForeignKeyConstraint(["mod_id"], ["mod.id"], ondelete="cascade"),
+        sa.PrimaryKeyConstraint(*primary_key),
+    )
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    _create_summary_table("mod_rating_summary")
+    _create_summary_table(
+        "mod_rating_version_summary",
+        sa.Column("version", sa.UnicodeText(), nullable=False),
+        primary_key=("mod_id", "version"),
+    )
+
+    for table, grouping in (
+        ("mod_rating_summary", ("mod_id",)),
+        ("mod_rating_version_summary", ("mod_id", "version")),
+    ):
+        op.execute(
+            BACKFILL_SQL.format(
+                table=table,
+                columns=", ".join(grouping),
+                grouping=", ".join(f"mod_rating.{column}" for column in grouping),
+                histogram=HISTOGRAM_SQL,
+            )
+        )
+
+    op.execute(CREATE_APPLY_FUNCTION_SQL)
+    op.execute(CREATE_MOD_RATING_FUNCTION_SQL)
+    op.execute(CREATE_RATING_FUNCTION_SQL)
+    for statement in CREATE_TRIGGERS_SQL:
+        op.execute(statement)
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    for statement in DROP_TRIGGERS_SQL + DROP_FUNCTIONS_SQL:
+        op.execute(statement)
+    op.drop_table("mod_rating_version_summary")
+    op.drop_table("mod_rating_summary")
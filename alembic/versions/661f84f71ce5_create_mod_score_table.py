@@ -0,0 +1,41 @@
+"""Create mod_score table.
+
+Revision ID: 661f84f71ce5
+Revises: b8db6c850619
+Create Date: 2026-10-19 22:41:07.318254
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "661f84f71ce5"
+down_revision = "b8db6c850619"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    op.create_table(
+        "mod_score",
+        sa.Column("mod_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("hot", sa.Float(), nullable=False),
+        sa.Column("trending", sa.Float(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["mod_id"], ["mod.id"], ondelete="cascade"),
+        sa.PrimaryKeyConstraint("mod_id"),
+    )
+    op.create_index("ix_mod_score_hot", "mod_score", ["hot"], unique=False)
+    op.create_index("ix_mod_score_trending", "mod_score", ["trending"], unique=False)
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    op.drop_index("ix_mod_score_trending", table_name="mod_score")
+    op.drop_index("ix_mod_score_hot", table_name="mod_score")
+    op.drop_table("mod_score")
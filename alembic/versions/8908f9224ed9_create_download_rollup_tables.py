@@ -0,0 +1,82 @@
+"""Create download rollup tables.
+
+Revision ID: 8908f9224ed9
+Revises: 4e749a118d13
+Create Date: 2026-10-19 19:32:57.640215
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8908f9224ed9"
+down_revision = "4e749a118d13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    op.create_table(
+        "rollup_watermark",
+        sa.Column("name", sa.Text(), nullable=False),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_table(
+        "mod_download_daily",
+        sa.Column("mod_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["mod_id"], ["mod.id"], ondelete="cascade"),
+        sa.PrimaryKeyConstraint("mod_id", "day"),
+    )
+    op.create_table(
+        "mod_download_total",
+        sa.Column("mod_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["mod_id"], ["mod.id"], ondelete="cascade"),
+        sa.PrimaryKeyConstraint("mod_id"),
+    )
+    op.create_index(
+        op.f("ix_mod_download_total_count"), "mod_download_total", ["count"],
+    )
+    op.create_table(
+        "mod_release_download_daily",
+        sa.Column("mod_release_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(
+            ["mod_release_id"], ["mod_release.id"], ondelete="cascade"
+        ),
+        sa.PrimaryKeyConstraint("mod_release_id", "day"),
+    )
+    op.create_table(
+        "mod_release_download_total",
+        sa.Column("mod_release_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(
+            ["mod_release_id"], ["mod_release.id"], ondelete="cascade"
+        ),
+        sa.PrimaryKeyConstraint("mod_release_id"),
+    )
+    op.create_index(
+        "ix_mod_release_download_created_at", "mod_release_download", ["created_at"],
+    )
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    op.drop_index(
+        "ix_mod_release_download_created_at", table_name="mod_release_download"
+    )
+    op.drop_table("mod_release_download_total")
+    op.drop_table("mod_release_download_daily")
+    op.drop_index(op.f("ix_mod_download_total_count"), table_name="mod_download_total")
+    op.drop_table("mod_download_total")
+    op.drop_table("mod_download_daily")
+    op.drop_table("rollup_watermark")
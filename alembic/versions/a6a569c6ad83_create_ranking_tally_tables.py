@@ -0,0 +1,182 @@
+"""Create ranking tally tables.
+
+Revision ID: a6a569c6ad83
+Revises: 5f74a9b12dcb
+Create Date: 2026-10-19 23:38:12.253631
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a6a569c6ad83"
+down_revision = "5f74a9b12dcb"
+branch_labels = None
+depends_on = None
+
+# NOTE: each ranked entity is its association table, the association's column
+# referencing the entity, the entity's table, and the entity's tally table
+RANKED_ENTITIES = (
+    ("mod_ranking", "mod_id", "mod", "mod_ranking_tally"),
+    ("comment_ranking", "comment_id", "comment", "comment_ranking_tally"),
+    ("image_ranking", "image_id", "image", "image_ranking_tally"),
+)
+
+# NOTE: decrements never insert a tally, as the tally already exists for any ranking
+# being removed (and inserting one while the entity itself is being deleted would fail)
+CREATE_APPLY_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION apply_ranking_tally(
+  tally_table text, entity_column text, entity_id uuid, rank integer, direction integer
+)
+RETURNS void AS
+$$
+BEGIN
+  IF direction > 0 THEN
+    EXECUTE format(
+      'INSERT INTO %I (%I) VALUES ($1) ON CONFLICT (%I) DO NOTHING',
+      tally_table, entity_column, entity_column
+    ) USING entity_id;
+  END IF;
+
+  EXECUTE format(
+    'UPDATE %I SET '
+    'up = up + $2 * ($3 > 0)::integer, '
+    'down = down + $2 * ($3 < 0)::integer, '
+    'net = net + $2 * (($3 > 0)::integer - ($3 < 0)::integer) '
+    'WHERE %I = $1',
+    tally_table, entity_column
+  ) USING entity_id, direction, rank;
+END
+$$
+LANGUAGE plpgsql;
+"""
+
+# NOTE: trigger arguments are the association's entity column and the tally table,
+# for example ``('mod_id', 'mod_ranking_tally')``; when a ranking is deleted its
+# associations are removed by the cascade after the ranking is gone, so the ranking's
+# own trigger removes it from the tallies instead
+CREATE_ASSOCIATION_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION refresh_ranking_tally()
+RETURNS TRIGGER AS
+$$
+DECLARE
+  entity_column text := TG_ARGV[0];
+  tally_table text := TG_ARGV[1];
+  value integer;
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    SELECT ranking.rank INTO value
+    FROM ranking
+    WHERE ranking.id = OLD.ranking_id AND ranking.is_active;
+    IF FOUND THEN
+      PERFORM apply_ranking_tally(
+        tally_table, entity_column, (to_jsonb(OLD) ->> entity_column)::uuid, value, -1
+      );
+    END IF;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    SELECT ranking.rank INTO value
+    FROM ranking
+    WHERE ranking.id = NEW.ranking_id AND ranking.is_active;
+    IF FOUND THEN
+      PERFORM apply_ranking_tally(
+        tally_table, entity_column, (to_jsonb(NEW) ->> entity_column)::uuid, value, 1
+      );
+    END IF;
+  END IF;
+
+  RETURN NULL;
+END
+$$
+LANGUAGE plpgsql;
+"""
+
+# NOTE: trigger arguments are the association table, the association's entity column
+# and the tally table, for example ``('mod_ranking', 'mod_id', 'mod_ranking_tally')``
+CREATE_RANKING_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION refresh_ranking_tallies()
+RETURNS TRIGGER AS
+$$
+DECLARE
+  association_table text := TG_ARGV[0];
+  entity_column text := TG_ARGV[1];
+  tally_table text := TG_ARGV[2];
+  entity_id uuid;
+BEGIN
+  IF OLD.is_active OR (TG_OP = 'UPDATE' AND NEW.is_active) THEN
+    FOR entity_id IN EXECUTE format(
+      'SELECT %I FROM %I WHERE ranking_id = $1', entity_column, association_table
+    ) USING OLD.id
+    LOOP
+      IF OLD.is_active THEN
+        PERFORM apply_ranking_tally(
+          tally_table, entity_column, entity_id, OLD.rank, -1
+        );
+      END IF;
+      IF TG_OP = 'UPDATE' AND NEW.is_active THEN
+        PERFORM apply_ranking_tally(
+          tally_table, entity_column, entity_id, NEW.rank, 1
+        );
+      END IF;
+    END LOOP;
+  END IF;
+
+  IF TG_OP = 'DELETE' THEN
+    RETURN OLD;
+  END IF;
+  RETURN NEW;
+END
+$$
+LANGUAGE plpgsql;
+"""
+DROP_FUNCTIONS_SQL = (
+    "DROP FUNCTION IF EXISTS refresh_ranking_tallies",
+    "DROP FUNCTION IF EXISTS refresh_ranking_tally",
+    "DROP FUNCTION IF EXISTS apply_ranking_tally",
+)
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    for association_table, entity_column, entity_table, tally_table in RANKED_ENTITIES:
+        op.create_table(
+            tally_table,
+            sa.Column(entity_column, postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("up", sa.BigInteger(), server_default="0", nullable=False),
+            sa.Column("down", sa.BigInteger(), server_default="0", nullable=False),
+            sa.Column("net", sa.BigInteger(), server_default="0", nullable=False),
+            sa.ForeignKeyConstraint(
+                [entity_column], [f"{entity_table!s}.id"], ondelete="cascade"
+            ),
+            sa.PrimaryKeyConstraint(entity_column),
+        )
+        op.create_index(
+            f"ix_{association_table!s}_ranking_id",
+            association_table,
+            ["ranking_id"],
+            unique=False,
+        )
+
+    op.execute(CREATE_APPLY_FUNCTION_SQL)
+    op.execute(CREATE_ASSOCIATION_FUNCTION_SQL)
+    op.execute(CREATE_RANKING_FUNCTION_SQL)
+    for association_table, entity_column, _, tally_table in RANKED_ENTITIES:
+        op.create_ranking_tally_triggers(association_table, entity_column, tally_table)
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    for association_table, _, _, _ in RANKED_ENTITIES:
+        op.drop_ranking_tally_triggers(association_table)
+    for statement in DROP_FUNCTIONS_SQL:
+        op.execute(statement)
+    for association_table, _, _, tally_table in reversed(RANKED_ENTITIES):
+        op.drop_index(
+            f"ix_{association_table!s}_ranking_id", table_name=association_table
+        )
+        op.drop_table(tally_table)
@@ -0,0 +1,95 @@
+"""Create user_agent table.
+
+Revision ID: b8db6c850619
+Revises: f77aa2a918d6
+Create Date: 2026-10-19 21:52:19.402713
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b8db6c850619"
+down_revision = "f77aa2a918d6"
+branch_labels = None
+depends_on = None
+
+# NOTE: the default ``APP_DOWNLOADS_HEADER_ALLOWLIST`` at the time of this migration,
+# existing downloads keep only these headers
+HEADER_ALLOWLIST = ("accept-language",)
+
+INTERN_USER_AGENTS_SQL = """
+INSERT INTO user_agent (value)
+SELECT DISTINCT left(headers->>'user-agent', 512)
+FROM mod_release_download
+WHERE headers ? 'user-agent'
+ORDER BY 1
+"""
+
+BACKFILL_SQL = """
+UPDATE mod_release_download
+SET
+    user_agent_id = (
+        SELECT user_agent.id
+        FROM user_agent
+        WHERE user_agent.value = left(mod_release_download.headers->>'user-agent', 512)
+    ),
+    headers = (
+        SELECT coalesce(jsonb_object_agg(header.key, header.value), '{}'::jsonb)
+        FROM jsonb_each(mod_release_download.headers) AS header
+        WHERE header.key = ANY(:allowlist)
+    )
+"""
+
+RESTORE_SQL = """
+UPDATE mod_release_download
+SET headers = headers || jsonb_build_object('user-agent', user_agent.value)
+FROM user_agent
+WHERE user_agent.id = mod_release_download.user_agent_id
+"""
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    op.create_table(
+        "user_agent",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("value", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("value"),
+    )
+    op.add_column(
+        "mod_release_download", sa.Column("user_agent_id", sa.Integer(), nullable=True),
+    )
+    op.create_foreign_key(
+        "mod_release_download_user_agent_id_fkey",
+        "mod_release_download",
+        "user_agent",
+        ["user_agent_id"],
+        ["id"],
+    )
+
+    # NOTE: user triggers are disabled so the backfill doesn't touch ``updated_at``
+    op.execute("ALTER TABLE mod_release_download DISABLE TRIGGER USER")
+    op.execute(INTERN_USER_AGENTS_SQL)
+    op.get_bind().execute(sa.text(BACKFILL_SQL), allowlist=list(HEADER_ALLOWLIST))
+    op.execute("ALTER TABLE mod_release_download ENABLE TRIGGER USER")
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    # NOTE: headers dropped by the upgrade's allowlist can't be restored
+    op.execute("ALTER TABLE mod_release_download DISABLE TRIGGER USER")
+    op.execute(RESTORE_SQL)
+    op.execute("ALTER TABLE mod_release_download ENABLE TRIGGER USER")
+
+    op.drop_constraint(
+        "mod_release_download_user_agent_id_fkey",
+        "mod_release_download",
+        type_="foreignkey",
+    )
+    op.drop_column("mod_release_download", "user_agent_id")
+    op.drop_table("user_agent")
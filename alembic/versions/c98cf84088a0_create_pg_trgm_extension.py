@@ -0,0 +1,35 @@
+"""Create pg_trgm extension.
+
+Revision ID: c98cf84088a0
+Revises: e29915f89d57
+Create Date: 2026-10-19 15:52:18.664021
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c98cf84088a0"
+down_revision = "e29915f89d57"
+branch_labels = None
+depends_on = None
+
+CREATE_EXTENSION_SQL = """
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+"""
+DROP_EXTENSION_SQL = """
+DROP EXTENSION IF EXISTS "pg_trgm";
+"""
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    op.execute(CREATE_EXTENSION_SQL)
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    op.execute(DROP_EXTENSION_SQL)
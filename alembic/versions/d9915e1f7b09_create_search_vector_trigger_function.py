@@ -0,0 +1,57 @@
+"""Create search vector trigger function.
+
+Revision ID: d9915e1f7b09
+Revises: 954d25e175b1
+Create Date: 2026-10-19 15:30:05.421974
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d9915e1f7b09"
+down_revision = "954d25e175b1"
+branch_labels = None
+depends_on = None
+
+
+# NOTE: trigger arguments are the text search configuration followed by pairs of
+# column names and weights, for example ``('english', 'name', 'A', 'description', 'B')``
+CREATE_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION refresh_search_vector()
+RETURNS TRIGGER AS
+$$
+DECLARE
+  record jsonb := to_jsonb(NEW);
+  vector tsvector := ''::tsvector;
+  argument_index integer := 1;
+BEGIN
+  WHILE argument_index < TG_NARGS LOOP
+    vector := vector || setweight(
+      to_tsvector(
+        TG_ARGV[0]::regconfig, coalesce(record ->> TG_ARGV[argument_index], '')
+      ),
+      TG_ARGV[argument_index + 1]::"char"
+    );
+    argument_index := argument_index + 2;
+  END LOOP;
+  NEW.search_vector = vector;
+  RETURN NEW;
+END
+$$
+LANGUAGE plpgsql;
+"""
+DROP_FUNCTION_SQL = "DROP FUNCTION IF EXISTS refresh_search_vector"
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    op.execute(CREATE_FUNCTION_SQL)
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    op.execute(DROP_FUNCTION_SQL)
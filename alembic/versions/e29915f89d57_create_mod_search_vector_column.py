@@ -0,0 +1,45 @@
+"""Create mod search_vector column.
+
+Revision ID: e29915f89d57
+Revises: d9915e1f7b09
+Create Date: 2026-10-19 15:31:42.180339
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e29915f89d57"
+down_revision = "d9915e1f7b09"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    op.add_column(
+        "mod",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            server_default=sa.text("''::tsvector"),
+            nullable=False,
+        ),
+    )
+    op.create_refresh_search_vector_trigger(
+        "mod", {"name": "A", "description": "B"}, config="english"
+    )
+    op.create_index(
+        "ix_mod_search_vector", "mod", ["search_vector"], postgresql_using="gin"
+    )
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    op.drop_index("ix_mod_search_vector", table_name="mod")
+    op.drop_refresh_search_vector_trigger("mod")
+    op.drop_column("mod", "search_vector")
@@ -0,0 +1,50 @@
+"""Create summary and tally updated_at columns.
+
+Revision ID: e6321dd77abb
+Revises: a6a569c6ad83
+Create Date: 2026-10-20 00:12:41.506218
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e6321dd77abb"
+down_revision = "a6a569c6ad83"
+branch_labels = None
+depends_on = None
+
+# NOTE: these tables are maintained by triggers rather than the ORM, so their
+# ``updated_at`` is refreshed by the ``refresh_updated_at`` trigger whenever the
+# maintaining triggers update them
+TABLE_NAMES = (
+    "mod_rating_summary",
+    "mod_ranking_tally",
+    "comment_ranking_tally",
+    "image_ranking_tally",
+)
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    for table_name in TABLE_NAMES:
+        op.add_column(
+            table_name,
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+        )
+        op.create_refresh_updated_at_trigger(table_name)
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    for table_name in reversed(TABLE_NAMES):
+        op.drop_refresh_updated_at_trigger(table_name)
+        op.drop_column(table_name, "updated_at")
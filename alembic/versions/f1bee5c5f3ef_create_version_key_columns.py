@@ -0,0 +1,147 @@
+"""Create version key columns.
+
+Revision ID: f1bee5c5f3ef
+Revises: 14fad806e577
+Create Date: 2026-10-19 16:24:08.512047
+
+"""
+import sqlalchemy as sa
+from semver import VersionInfo
+
+from alembic import op
+from modist.versioning import get_version_key, parse_version_expression
+
+# revision identifiers, used by Alembic.
+revision = "f1bee5c5f3ef"
+down_revision = "14fad806e577"
+branch_labels = None
+depends_on = None
+
+VERSION_RANGE_TABLES = ("mod_release_dependency", "mod_release_conflict")
+
+# NOTE: existing rows with an invalid version expression are given an empty range (an
+# exclusive lower and upper bound on the lowest possible key), so they match nothing
+INVALID_BOUNDS = {
+    "lower_version_key": "",
+    "lower_inclusive": False,
+    "upper_version_key": "",
+    "upper_inclusive": False,
+}
+
+
+def _get_bounds(version_expression: str) -> dict:
+    """Get the column values for the bounds of a given version expression.
+
+    :param str version_expression: The version expression to get the bounds of
+    :return: The bound column values of the version expression
+    :rtype: dict
+    """
+
+    try:
+        version_range = parse_version_expression(version_expression)
+    except ValueError:
+        return INVALID_BOUNDS
+
+    bounds = {}
+    for name, bound in (("lower", version_range.lower), ("upper", version_range.upper)):
+        bounds[f"{name!s}_version_key"] = bound.key if bound else None
+        bounds[f"{name!s}_inclusive"] = bound.inclusive if bound else True
+
+    return bounds
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    connection = op.get_bind()
+
+    op.add_column(
+        "mod_release", sa.Column("version_key", sa.Text(collation="C"), nullable=True)
+    )
+    # NOTE: user triggers are disabled so the backfill doesn't touch ``updated_at``
+    op.execute("ALTER TABLE mod_release DISABLE TRIGGER USER")
+    releases = [
+        {
+            "release_id": release_id,
+            "version_key": get_version_key(VersionInfo.parse(version)),
+        }
+        for release_id, version in connection.execute(
+            sa.text("SELECT id, version FROM mod_release")
+        )
+    ]
+    if len(releases) > 0:
+        connection.execute(
+            sa.text(
+                "UPDATE mod_release SET version_key = :version_key "
+                "WHERE id = :release_id"
+            ),
+            releases,
+        )
+    op.execute("ALTER TABLE mod_release ENABLE TRIGGER USER")
+    op.alter_column("mod_release", "version_key", nullable=False)
+    op.create_index(
+        "ix_mod_release_mod_id_version_key", "mod_release", ["mod_id", "version_key"],
+    )
+
+    for table_name in VERSION_RANGE_TABLES:
+        op.add_column(
+            table_name,
+            sa.Column("lower_version_key", sa.Text(collation="C"), nullable=True),
+        )
+        op.add_column(
+            table_name,
+            sa.Column(
+                "lower_inclusive", sa.Boolean(), server_default="true", nullable=False,
+            ),
+        )
+        op.add_column(
+            table_name,
+            sa.Column("upper_version_key", sa.Text(collation="C"), nullable=True),
+        )
+        op.add_column(
+            table_name,
+            sa.Column(
+                "upper_inclusive", sa.Boolean(), server_default="true", nullable=False,
+            ),
+        )
+
+        op.execute(f"ALTER TABLE {table_name!s} DISABLE TRIGGER USER")
+        edges = [
+            {
+                "mod_release_id": mod_release_id,
+                "mod_id": mod_id,
+                **_get_bounds(version_expression),
+            }
+            for mod_release_id, mod_id, version_expression in connection.execute(
+                sa.text(
+                    "SELECT mod_release_id, mod_id, version_expression "
+                    f"FROM {table_name!s}"
+                )
+            )
+        ]
+        if len(edges) > 0:
+            connection.execute(
+                sa.text(
+                    f"UPDATE {table_name!s} SET "
+                    "lower_version_key = :lower_version_key, "
+                    "lower_inclusive = :lower_inclusive, "
+                    "upper_version_key = :upper_version_key, "
+                    "upper_inclusive = :upper_inclusive "
+                    "WHERE mod_release_id = :mod_release_id AND mod_id = :mod_id"
+                ),
+                edges,
+            )
+        op.execute(f"ALTER TABLE {table_name!s} ENABLE TRIGGER USER")
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    for table_name in reversed(VERSION_RANGE_TABLES):
+        op.drop_column(table_name, "upper_inclusive")
+        op.drop_column(table_name, "upper_version_key")
+        op.drop_column(table_name, "lower_inclusive")
+        op.drop_column(table_name, "lower_version_key")
+
+    op.drop_index("ix_mod_release_mod_id_version_key", table_name="mod_release")
+    op.drop_column("mod_release", "version_key")
@@ -0,0 +1,47 @@
+"""Create download sketch tables.
+
+Revision ID: f77aa2a918d6
+Revises: 25c47a5935fa
+Create Date: 2026-10-19 21:17:42.905136
+
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f77aa2a918d6"
+down_revision = "25c47a5935fa"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Pushes changes into the database."""
+
+    op.create_table(
+        "mod_download_sketch",
+        sa.Column("mod_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("sketch", postgresql.BYTEA(), nullable=False),
+        sa.ForeignKeyConstraint(["mod_id"], ["mod.id"], ondelete="cascade"),
+        sa.PrimaryKeyConstraint("mod_id", "day"),
+    )
+    op.create_table(
+        "mod_release_download_sketch",
+        sa.Column("mod_release_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("sketch", postgresql.BYTEA(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["mod_release_id"], ["mod_release.id"], ondelete="cascade"
+        ),
+        sa.PrimaryKeyConstraint("mod_release_id", "day"),
+    )
+
+
+def downgrade():
+    """Reverts changes performed by upgrade()."""
+
+    op.drop_table("mod_release_download_sketch")
+    op.drop_table("mod_download_sketch")
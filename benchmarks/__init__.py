@@ -0,0 +1,9 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains standalone performance benchmarks.
+
+Benchmarks are runnable scripts, either directly (``python -m benchmarks.<name>``) or
+through the ``profile`` invoke task (``invoke profile benchmarks/<name>.py``).
+"""
@@ -0,0 +1,133 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Benchmark the dependency resolver against synthetic dependency graphs.
+
+Each synthetic mod has several major versions and each release depends on a few mods
+later in the graph (so the graph is acyclic). Every mod is assigned a planted major
+version which all edges are built to accept, so every graph has a resolution. Some
+dependencies pin the planted major version (``^2.0.0``) and some releases conflict with
+newer major versions of another mod, both of which force the resolver to backtrack
+away from the newest releases to find it.
+"""
+
+import random
+import timeit
+import argparse
+from uuid import UUID, uuid4
+from typing import Dict, List
+
+from semver import VersionInfo
+
+from modist.versioning import get_version_key, parse_version_expression
+from modist.app.services.resolver import Candidate, DependencyResolver
+
+
+def build_candidates(
+    mods: int,
+    versions: int,
+    dependencies: int,
+    pin_ratio: float,
+    conflict_ratio: float,
+    seed: int,
+) -> Dict[UUID, List[Candidate]]:
+    """Build the candidates of a synthetic dependency graph.
+
+    :param int mods: The number of mods in the graph
+    :param int versions: The number of major versions of each mod
+    :param int dependencies: The maximum number of dependencies of each release
+    :param float pin_ratio: The ratio of dependencies that pin a major version
+    :param float conflict_ratio: The ratio of releases that declare a conflict
+    :param int seed: The seed of the random graph
+    :return: The candidate releases keyed by their mod's unique identifier
+    :rtype: Dict[UUID, List[Candidate]]
+    """
+
+    generator = random.Random(seed)
+    mod_ids = [uuid4() for _ in range(mods)]
+    planted = {mod_id: generator.randint(1, versions) for mod_id in mod_ids}
+    candidates: Dict[UUID, List[Candidate]] = {}
+    for index, mod_id in enumerate(mod_ids):
+        later_mod_ids = mod_ids[index + 1 : index + 1 + dependencies * 4]
+        candidates[mod_id] = []
+        for major in range(1, versions + 1):
+            dependency_edges = []
+            for dependency_id in generator.sample(
+                later_mod_ids, min(len(later_mod_ids), dependencies)
+            ):
+                if generator.random() < pin_ratio:
+                    expression = f"^{planted[dependency_id]!s}.0.0"
+                else:
+                    expression = (
+                        f">={generator.randint(1, planted[dependency_id])!s}.0.0"
+                    )
+                dependency_edges.append(
+                    (dependency_id, parse_version_expression(expression))
+                )
+
+            conflict_edges = []
+            if len(later_mod_ids) > 0 and generator.random() < conflict_ratio:
+                conflict_id = generator.choice(later_mod_ids)
+                if planted[conflict_id] < versions:
+                    expression = f">{planted[conflict_id]!s}.0.0"
+                else:
+                    expression = f"<{planted[conflict_id]!s}.0.0"
+                conflict_edges.append(
+                    (conflict_id, parse_version_expression(expression))
+                )
+
+            candidates[mod_id].append(
+                Candidate(
+                    id=uuid4(),
+                    mod_id=mod_id,
+                    key=get_version_key(VersionInfo(major, 0, 0)),
+                    dependencies=tuple(dependency_edges),
+                    conflicts=tuple(conflict_edges),
+                )
+            )
+
+    return candidates
+
+
+def main():
+    """Run the benchmark."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mods", type=int, default=5000)
+    parser.add_argument("--versions", type=int, default=3)
+    parser.add_argument("--dependencies", type=int, default=3)
+    parser.add_argument("--pin-ratio", type=float, default=0.1)
+    parser.add_argument("--conflict-ratio", type=float, default=0.05)
+    parser.add_argument("--requested", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    candidates = build_candidates(
+        args.mods,
+        args.versions,
+        args.dependencies,
+        args.pin_ratio,
+        args.conflict_ratio,
+        args.seed,
+    )
+    requested = list(candidates.keys())[: args.requested]
+
+    resolved = DependencyResolver(candidates).resolve(requested)
+    seconds = min(
+        timeit.repeat(
+            lambda: DependencyResolver(candidates).resolve(requested),
+            number=1,
+            repeat=args.repeat,
+        )
+    )
+    print(f"mods      {args.mods:>12,d}")
+    print(f"releases  {sum(len(value) for value in candidates.values()):>12,d}")
+    print(f"resolved  {len(resolved):>12,d}")
+    print(f"seconds   {seconds:>12.4f}")
+    print(f"parsing   {parse_version_expression.cache_info()!s}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Benchmark the single statement mod detail against walking the mod's relationships.
+
+The relationship walking path loads the mod and lazily loads its owner, host, category,
+tags, releases, the artifacts of each recent release, and its ratings, as a detail view
+built on the ORM relationships of :class:`~modist.models.mod.Mod` would. The single
+statement path is :func:`~modist.app.services.mod.get_mod_detail`.
+
+.. note:: This benchmark runs against the database configured by ``DATABASE_URL`` and
+    uses the active mods with the most releases within it, so the database should be
+    populated first.
+"""
+
+import timeit
+import argparse
+from uuid import UUID
+from typing import List, Callable
+
+from sqlalchemy import func, event
+
+from modist.app.utils import get_db
+from modist.models.mod import Mod, ModRelease
+from modist.app.schemas.mod import (
+    ModSchema,
+    ModDetailSchema,
+    ModReleaseSchema,
+    ModRatingSummarySchema,
+    ModReleaseDetailSchema,
+    ModReleaseArtifactSchema,
+)
+from modist.app.schemas.host import HostSchema
+from modist.app.schemas.user import UserPublicSchema
+from modist.app.services.mod import MOD_DETAIL_RELEASE_LIMIT, get_mod_detail
+from modist.app.schemas.common import TagSchema, CategorySchema
+
+
+def get_mod_detail_by_relationships(mod_id: UUID) -> ModDetailSchema:
+    """Get the detail of a mod by walking its ORM relationships.
+
+    :param UUID mod_id: The mod's unique primary identifier
+    :return: The mod detail
+    :rtype: ModDetailSchema
+    """
+
+    with get_db().session() as session:
+        mod = session.query(Mod).get(mod_id)
+        releases = sorted(
+            (release for release in mod.mod_releases if release.is_active),
+            key=lambda release: release.version_key,
+            reverse=True,
+        )[:MOD_DETAIL_RELEASE_LIMIT]
+        ratings = [
+            mod_rating.rating.rating
+            for mod_rating in mod.mod_ratings
+            if mod_rating.rating.is_active
+        ]
+
+        return ModDetailSchema(
+            **ModSchema.from_model(mod).dict(),
+            user=UserPublicSchema.from_model(mod.user),
+            host=HostSchema.from_model(mod.host),
+            category=(
+                CategorySchema.from_model(mod.category)
+                if mod.category is not None
+                else None
+            ),
+            tags=[TagSchema.from_model(tag) for tag in mod.tags],
+            releases=[
+                ModReleaseDetailSchema(
+                    **ModReleaseSchema.from_model(release).dict(),
+                    artifacts=[
+                        ModReleaseArtifactSchema(
+                            id=artifact.id,
+                            name=artifact.name,
+                            path=artifact.path,
+                            size=artifact.size,
+                            mimetype=artifact.mimetype,
+                            checksum=artifact.checksum,
+                        )
+                        for artifact in release.artifacts
+                        if artifact.is_active
+                    ],
+                )
+                for release in releases
+            ],
+            rating=ModRatingSummarySchema(
+                count=len(ratings),
+                average=sum(ratings) / len(ratings) if len(ratings) > 0 else None,
+            ),
+        )
+
+
+def get_mod_ids(limit: int) -> List[UUID]:
+    """Get the identifiers of the active mods with the most releases.
+
+    :param int limit: The maximum number of mods to return
+    :return: The identifiers of the active mods with the most releases
+    :rtype: List[UUID]
+    """
+
+    with get_db().session() as session:
+        return [
+            mod_id
+            for mod_id, in session.query(ModRelease.mod_id)
+            .join(Mod, Mod.id == ModRelease.mod_id)
+            .filter(Mod.is_active.is_(True))
+            .group_by(ModRelease.mod_id)
+            .order_by(func.count().desc())
+            .limit(limit)
+        ]
+
+
+def count_statements(detail: Callable[[UUID], ModDetailSchema], mod_id: UUID) -> int:
+    """Count the statements executed to get the detail of a mod.
+
+    :param Callable[[UUID], ModDetailSchema] detail: The mod detail callable
+    :param UUID mod_id: The mod's unique primary identifier
+    :return: The number of executed statements
+    :rtype: int
+    """
+
+    statements: List[str] = []
+
+    def _collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_db().engine
+    event.listen(engine, "before_cursor_execute", _collect)
+    try:
+        detail(mod_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", _collect)
+
+    return len(statements)
+
+
+def main():
+    """Run the benchmark."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mods", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    mod_ids = get_mod_ids(args.mods)
+    if len(mod_ids) <= 0:
+        parser.error("The database contains no active mods with releases")
+
+    for name, detail in (
+        ("orm", get_mod_detail_by_relationships),
+        ("json_agg", get_mod_detail),
+    ):
+        statements = sum(count_statements(detail, mod_id) for mod_id in mod_ids)
+        seconds = min(
+            timeit.repeat(
+                lambda: [detail(mod_id) for mod_id in mod_ids],
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        print(
+            f"{name:<8} {len(mod_ids):>6,d} mods "
+            f"{statements / len(mod_ids):>8.1f} statements/mod "
+            f"{seconds * 1000 / len(mod_ids):>10.2f} ms/mod"
+        )
+
+
+if __name__ == "__main__":
+    main()
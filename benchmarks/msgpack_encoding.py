@@ -0,0 +1,122 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Benchmark MessagePack against JSON response encoding for release-like payloads.
+
+The JSON path mirrors what FastAPI does for every JSON response (``jsonable_encoder``
+followed by rendering through ``JSONResponse``), while the MessagePack path mirrors
+:class:`~modist.app.content.MessagePackResponse`.
+"""
+
+import timeit
+import argparse
+from uuid import UUID, uuid4
+from typing import List
+from datetime import datetime, timezone
+
+from pydantic import BaseModel
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from modist.app.content import encode_msgpack
+
+
+class ArtifactSchema(BaseModel):
+    """Describes a release artifact payload."""
+
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+    name: str
+    path: str
+    size: int
+    mimetype: str
+    checksum: str
+
+
+class ReleaseSchema(BaseModel):
+    """Describes a release payload."""
+
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+    version: str
+    description: str
+    size: int
+    checksum: str
+    mod_id: UUID
+    host_release_id: UUID
+    dependencies: List[UUID]
+    artifacts: List[ArtifactSchema]
+
+
+def build_releases(count: int) -> List[ReleaseSchema]:
+    """Build a list of synthetic releases.
+
+    :param int count: The number of releases to build
+    :return: A list of synthetic releases
+    :rtype: List[ReleaseSchema]
+    """
+
+    now = datetime.now(timezone.utc)
+    return [
+        ReleaseSchema(
+            id=uuid4(),
+            created_at=now,
+            updated_at=now,
+            version=f"1.{index!s}.0",
+            description="A synthetic release used for benchmarking.",
+            size=index * 1024,
+            checksum="0" * 64,
+            mod_id=uuid4(),
+            host_release_id=uuid4(),
+            dependencies=[uuid4() for _ in range(3)],
+            artifacts=[
+                ArtifactSchema(
+                    id=uuid4(),
+                    created_at=now,
+                    updated_at=now,
+                    name=f"artifact-{artifact_index!s}.zip",
+                    path=f"/artifacts/{index!s}/{artifact_index!s}.zip",
+                    size=artifact_index * 512,
+                    mimetype="application/zip",
+                    checksum="0" * 64,
+                )
+                for artifact_index in range(2)
+            ],
+        )
+        for index in range(count)
+    ]
+
+
+def encode_json(releases: List[ReleaseSchema]) -> bytes:
+    """Encode the given releases the same way FastAPI encodes JSON responses.
+
+    :param List[ReleaseSchema] releases: The releases to encode
+    :return: The encoded releases
+    :rtype: bytes
+    """
+
+    return JSONResponse(jsonable_encoder(releases)).body
+
+
+def main():
+    """Run the benchmark."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--releases", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    releases = build_releases(args.releases)
+    for name, encode in (("json", encode_json), ("msgpack", encode_msgpack)):
+        size = len(encode(releases))
+        seconds = min(
+            timeit.repeat(lambda: encode(releases), number=1, repeat=args.repeat)
+        )
+        print(f"{name:<8} {size:>12,d} bytes {seconds * 1000:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Benchmark estimating unique downloaders from daily HyperLogLog sketches.
+
+Synthetic downloads of a single mod are spread over a year of days, with downloaders
+drawn from a fixed population so most of them download on several days. The exact path
+merges the set of downloaders of each day as ``COUNT(DISTINCT ip)`` would, while the
+sketch path merges the serialized daily sketches as the download statistics do.
+"""
+
+import sys
+import random
+import timeit
+import argparse
+from typing import Set, List
+
+from modist.hyperloglog import HyperLogLog
+
+
+def build_days(days: int, downloads: int, population: int, seed: int) -> List[Set[str]]:
+    """Build the downloaders of each day of synthetic downloads.
+
+    :param int days: The number of days of downloads
+    :param int downloads: The number of downloads per day
+    :param int population: The number of distinct downloaders
+    :param int seed: The seed of the random downloads
+    :return: The set of downloaders of each day
+    :rtype: List[Set[str]]
+    """
+
+    generator = random.Random(seed)
+    return [
+        {f"ip:10.{generator.randrange(population)!s}" for _ in range(downloads)}
+        for _ in range(days)
+    ]
+
+
+def main():
+    """Run the benchmark."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--downloads", type=int, default=2_000)
+    parser.add_argument("--population", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    days = build_days(args.days, args.downloads, args.population, args.seed)
+    sketches = [HyperLogLog.from_values(day).to_bytes() for day in days]
+
+    def count_exact() -> int:
+        return len(set().union(*days))
+
+    def count_sketched() -> int:
+        merged = HyperLogLog()
+        for sketch in sketches:
+            merged.merge(HyperLogLog(sketch))
+        return merged.estimate()
+
+    exact = count_exact()
+    for name, count, size in (
+        ("exact", count_exact, sum(sys.getsizeof(day) for day in days)),
+        ("sketch", count_sketched, sum(len(sketch) for sketch in sketches)),
+    ):
+        seconds = min(timeit.repeat(count, number=1, repeat=args.repeat))
+        estimate = count()
+        print(
+            f"{name:<8} {estimate:>10,d} unique "
+            f"{(estimate - exact) * 100 / exact:>+7.2f}% error "
+            f"{size / 1024 / args.days:>8.1f} KiB/day "
+            f"{seconds * 1000:>10.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
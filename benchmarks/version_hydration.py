@@ -0,0 +1,71 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Benchmark hydrating the versions of release rows through ``SemverType``.
+
+Rows are drawn from a few hundred distinct versions, as a listing of releases across
+many mods shares the same handful of version strings. The uncached path parses every
+row's version as ``SemverType`` used to, while the cached path runs the column's
+actual result processor (starting from an empty parse cache on every repeat).
+"""
+
+import random
+import timeit
+import argparse
+from typing import List
+
+from semver import VersionInfo
+from sqlalchemy.dialects import postgresql
+
+from modist.models._types import SemverType, _parse_version
+
+
+def build_rows(rows: int, distinct: int, seed: int) -> List[str]:
+    """Build the version strings of synthetic release rows.
+
+    :param int rows: The number of rows to build
+    :param int distinct: The number of distinct versions shared by the rows
+    :param int seed: The seed of the random rows
+    :return: The version string of each row
+    :rtype: List[str]
+    """
+
+    generator = random.Random(seed)
+    versions = [
+        f"{index // 100!s}.{index // 10 % 10!s}.{index % 10!s}"
+        for index in range(distinct)
+    ]
+    return [generator.choice(versions) for _ in range(rows)]
+
+
+def main():
+    """Run the benchmark."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--distinct", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows, args.distinct, args.seed)
+    process = SemverType().result_processor(postgresql.dialect(), None)
+
+    def hydrate_cached() -> List[VersionInfo]:
+        _parse_version.cache_clear()
+        return [process(value) for value in rows]
+
+    def hydrate_uncached() -> List[VersionInfo]:
+        return [VersionInfo.parse(value) for value in rows]
+
+    assert hydrate_cached() == hydrate_uncached()
+    for name, hydrate in (("uncached", hydrate_uncached), ("cached", hydrate_cached)):
+        seconds = min(timeit.repeat(hydrate, number=1, repeat=args.repeat))
+        print(f"{name:<8} {args.rows:>12,d} rows {seconds * 1000:>10.2f} ms")
+
+    print(f"parsing  {_parse_version.cache_info()!s}")
+
+
+if __name__ == "__main__":
+    main()
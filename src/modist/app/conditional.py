@@ -0,0 +1,289 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains data-types and dependency-injections for conditional requests.
+
+Validators are derived from the ``updated_at`` column every model carries through the
+``TimestampMixin`` (trigger maintained rows such as ranking tallies and rating
+summaries carry an ``updated_at`` refreshed by the ``refresh_updated_at`` trigger as
+well). A response embeds rows of several tables, so its validators are built from the
+latest ``updated_at`` and the number of every row it is serialized from. The number
+of rows changes when a row is removed, which the latest ``updated_at`` alone doesn't
+reflect. Since these only require a cheap aggregate query, they are compared against
+the request's conditional headers before the content is loaded or serialized:
+
+>>> validators = get_mod_detail_validators(mod_id, get_representation(request))
+>>> return respond_conditionally(
+...     validators, response, conditions, get_mod_detail, mod_id
+... )
+
+Strong ETags identify a single representation, so every ETag also hashes the
+representation of the request: the negotiated media type and the query parameters
+(including the pagination, sorting and cursor of collections). Compressed
+representations have their ETags weakened by the
+:class:`~.middleware.CompressionMiddleware`.
+
+.. note:: Validators are computed before the content is loaded. So content changed in
+    between is sent with the validators of its previous state, which only costs the
+    client an unnecessary ``200 OK`` on its next request rather than a stale
+    ``304 Not Modified``.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Tuple, Union, TypeVar, Callable, Optional
+from datetime import datetime, timezone
+from dataclasses import dataclass
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Header, Request
+from pydantic import BaseModel
+from sqlalchemy import func, union_all
+from sqlalchemy.orm import Query, Session
+from starlette.status import HTTP_304_NOT_MODIFIED
+from starlette.responses import Response
+
+from .content import negotiate_response_media_type
+
+ETAG_WILDCARD = "*"
+ETAG_WEAK_PREFIX = "W/"
+
+T_Content = TypeVar("T_Content", bound=BaseModel)
+
+
+@dataclass
+class Validators(object):
+    """Describes the cache validators for a resource or collection."""
+
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Build the response headers for the validators.
+
+        :return: A dictionary of response headers
+        :rtype: Dict[str, str]
+        """
+
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                _as_utc(self.last_modified), usegmt=True
+            )
+
+        return headers
+
+
+@dataclass
+class ConditionalHeaders(object):
+    """Describes the conditional headers provided by a request."""
+
+    if_none_match: List[str]
+    if_modified_since: Optional[datetime] = None
+
+    def is_not_modified(self, validators: Optional[Validators]) -> bool:
+        """Check if the requesting client's representation is still valid.
+
+        .. note:: As described in RFC 7232, ``If-Modified-Since`` is ignored whenever
+            ``If-None-Match`` is given.
+
+        :param Optional[Validators] validators: The current validators of the resource
+        :return: True if the resource has not been modified, otherwise False
+        :rtype: bool
+        """
+
+        if validators is None:
+            return False
+
+        if len(self.if_none_match) > 0:
+            return ETAG_WILDCARD in self.if_none_match or any(
+                _strip_weak_prefix(etag) == validators.etag
+                for etag in self.if_none_match
+            )
+
+        if self.if_modified_since is not None and validators.last_modified is not None:
+            # NOTE: HTTP dates only have a precision of seconds
+            return _as_utc(validators.last_modified).replace(microsecond=0) <= _as_utc(
+                self.if_modified_since
+            )
+
+        return False
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Convert a given datetime to UTC, assuming naive datetimes are already UTC.
+
+    :param datetime value: The datetime to convert
+    :return: The timezone aware UTC datetime
+    :rtype: datetime
+    """
+
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+
+    return value.astimezone(timezone.utc)
+
+
+def _strip_weak_prefix(etag: str) -> str:
+    """Strip the weak indicator prefix from a given ETag.
+
+    :param str etag: The ETag to strip
+    :return: The ETag without the weak indicator prefix
+    :rtype: str
+    """
+
+    if etag.startswith(ETAG_WEAK_PREFIX):
+        return etag[len(ETAG_WEAK_PREFIX) :]
+
+    return etag
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse a given HTTP date header value.
+
+    :param Optional[str] value: The HTTP date header value
+    :return: The parsed timezone aware datetime if the value is valid
+    :rtype: Optional[datetime]
+    """
+
+    if not value:
+        return None
+
+    try:
+        return _as_utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def build_etag(*parts: Any) -> str:
+    """Build a strong ETag from the given parts.
+
+    :return: The quoted ETag
+    :rtype: str
+    """
+
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode("utf-8"), digest_size=16
+    ).hexdigest()
+    return f'"{digest!s}"'
+
+
+def get_representation(request: Request) -> Tuple[str, ...]:
+    """Get the parts identifying the representation requested by a given request.
+
+    :param Request request: The request to get the representation of
+    :return: The negotiated media type and the query parameters of the request
+    :rtype: Tuple[str, ...]
+    """
+
+    return (negotiate_response_media_type(request), str(request.query_params))
+
+
+def build_validators(
+    *parts: Any,
+    representation: Tuple[str, ...] = (),
+    last_modified: Optional[datetime] = None,
+) -> Validators:
+    """Build the validators for the given parts of a response's state.
+
+    :param Any parts: The parts identifying the state of the response's content
+    :param Tuple[str, ...] representation: The representation of the response,
+        optional, defaults to an empty tuple
+    :param Optional[datetime] last_modified: The modification time of the response,
+        optional, defaults to None (only sending the ETag)
+    :return: The validators of the response
+    :rtype: Validators
+    """
+
+    return Validators(
+        etag=build_etag(*parts, *representation), last_modified=last_modified
+    )
+
+
+def get_last_modified(
+    session: Session, queries: List[Query]
+) -> Tuple[Optional[datetime], int]:
+    """Get the latest ``updated_at`` and the number of the rows selected by queries.
+
+    .. note:: Each query must select a single ``updated_at`` column. The queries are
+        combined by ``UNION ALL``, so they are answered by a single statement.
+
+    :param Session session: The session to query within
+    :param List[Query] queries: The queries selecting the ``updated_at`` of the rows
+    :return: The latest ``updated_at`` (None if there are no rows) and the number of
+        rows
+    :rtype: Tuple[Optional[datetime], int]
+    """
+
+    rows = union_all(*[query.statement for query in queries]).alias("rows")
+    (updated_at,) = rows.c
+    return tuple(session.query(func.max(updated_at), func.count()).one())
+
+
+def build_not_modified_response(validators: Validators) -> Response:
+    """Build the ``304 Not Modified`` response for the given validators.
+
+    :param Validators validators: The validators of the unmodified resource
+    :return: The ``304 Not Modified`` response
+    :rtype: Response
+    """
+
+    return Response(status_code=HTTP_304_NOT_MODIFIED, headers=validators.headers)
+
+
+def conditional_headers(
+    if_none_match: Optional[str] = Header(
+        None,
+        title="If-None-Match",
+        description="The ETags of the client's cached representations",
+    ),
+    if_modified_since: Optional[str] = Header(
+        None,
+        title="If-Modified-Since",
+        description="The last modification time of the client's representation",
+    ),
+) -> ConditionalHeaders:
+    """Handle the aggregation of provided conditional request headers.
+
+    :param Optional[str] if_none_match: The ``If-None-Match`` header value
+    :param Optional[str] if_modified_since: The ``If-Modified-Since`` header value
+    :returns: An instance of :class:`~.ConditionalHeaders` for the given headers
+    :rtype: ConditionalHeaders
+    """
+
+    return ConditionalHeaders(
+        if_none_match=[
+            etag.strip() for etag in (if_none_match or "").split(",") if etag.strip()
+        ],
+        if_modified_since=_parse_http_date(if_modified_since),
+    )
+
+
+def respond_conditionally(
+    validators: Optional[Validators],
+    response: Response,
+    conditions: ConditionalHeaders,
+    load: Callable[..., T_Content],
+    *args: Any,
+) -> Union[T_Content, Response]:
+    """Load and respond with content unless the client's representation is current.
+
+    :param Optional[Validators] validators: The current validators of the content,
+        None if the content doesn't exist (so loading it raises the error response)
+    :param Response response: The route's injected response to set the validators on
+    :param ConditionalHeaders conditions: The conditional headers of the request
+    :param Callable[..., T_Content] load: The callable loading the content
+    :param args: The arguments to load the content with
+    :return: The ``304 Not Modified`` response if the client's representation is
+        still valid, otherwise the loaded content
+    :rtype: Union[T_Content, Response]
+    """
+
+    if validators is not None and conditions.is_not_modified(validators):
+        return build_not_modified_response(validators)
+
+    content = load(*args)
+    if validators is not None:
+        response.headers.update(validators.headers)
+    return content
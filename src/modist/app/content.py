@@ -0,0 +1,309 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains content negotiation for MessagePack request and response bodies.
+
+Routers that should support MessagePack only need to use the :class:`~.MessagePackRoute`
+route class. Clients can then send ``Content-Type: application/msgpack`` request bodies
+and request ``Accept: application/msgpack`` responses, while all other clients continue
+to use JSON:
+
+>>> router = APIRouter(route_class=MessagePackRoute)
+
+UUIDs are encoded as the MessagePack extension type ``UUID_EXT_TYPE`` containing the
+16 raw bytes of the UUID and datetimes are encoded as the MessagePack timestamp
+extension type.
+"""
+
+import asyncio
+from copy import copy
+from enum import Enum
+from uuid import UUID
+from typing import Any, Dict, List, Callable, Optional
+from datetime import date, datetime, timezone
+
+import msgpack
+from fastapi import Request
+from pydantic import BaseModel
+from pydantic.json import pydantic_encoder
+from fastapi.routing import APIRoute, get_request_handler
+from starlette.responses import Response
+from pydantic.error_wrappers import ErrorWrapper, ValidationError
+from fastapi.dependencies.models import Dependant
+
+from .utils import parse_quality_values
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPE_ALIASES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+RESPONSE_MEDIA_TYPES = [JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE]
+UUID_EXT_TYPE = 1
+
+
+def _encode_default(value: Any) -> Any:
+    """Encode values that MessagePack does not natively know how to pack.
+
+    :param Any value: The value to encode
+    :return: The MessagePack packable value
+    :rtype: Any
+    """
+
+    if isinstance(value, BaseModel):
+        return value.dict()
+    elif isinstance(value, UUID):
+        return msgpack.ExtType(UUID_EXT_TYPE, value.bytes)
+    elif isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return msgpack.Timestamp.from_datetime(value)
+    elif isinstance(value, date):
+        return value.isoformat()
+    elif isinstance(value, Enum):
+        return value.value
+    elif isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+
+    return pydantic_encoder(value)
+
+
+def _decode_ext(code: int, data: bytes) -> Any:
+    """Decode the MessagePack extension types we encode.
+
+    :param int code: The extension type code
+    :param bytes data: The extension type data
+    :return: The decoded value
+    :rtype: Any
+    """
+
+    if code == UUID_EXT_TYPE:
+        return UUID(bytes=data)
+
+    return msgpack.ExtType(code, data)
+
+
+def encode_msgpack(content: Any) -> bytes:
+    """Encode the given content as MessagePack.
+
+    :param Any content: The content to encode
+    :return: The encoded content
+    :rtype: bytes
+    """
+
+    return msgpack.packb(content, default=_encode_default, use_bin_type=True)
+
+
+def decode_msgpack(content: bytes) -> Any:
+    """Decode the given MessagePack content.
+
+    :param bytes content: The MessagePack content to decode
+    :return: The decoded content
+    :rtype: Any
+    """
+
+    return msgpack.unpackb(content, raw=False, timestamp=3, ext_hook=_decode_ext)
+
+
+def negotiate_media_type(accept: str, supported: List[str]) -> Optional[str]:
+    """Negotiate the media type to use for a given ``Accept`` header.
+
+    :param str accept: The value of the request's ``Accept`` header
+    :param List[str] supported: The supported media types in order of server
+        preference
+    :return: The negotiated media type if any supported media type is acceptable
+    :rtype: Optional[str]
+    """
+
+    if len(accept.strip()) <= 0:
+        return supported[0]
+
+    weights = parse_quality_values(accept)
+
+    def _get_weight(media_type: str) -> float:
+        if media_type in weights:
+            return weights[media_type]
+
+        aliases = MSGPACK_MEDIA_TYPE_ALIASES if media_type == MSGPACK_MEDIA_TYPE else ()
+        for alias in aliases:
+            if alias in weights:
+                return weights[alias]
+
+        major_type = media_type.split("/")[0]
+        return weights.get(f"{major_type!s}/*", weights.get("*/*", 0.0))
+
+    weight, _, media_type = max(
+        (_get_weight(media_type), -index, media_type)
+        for index, media_type in enumerate(supported)
+    )
+    if weight <= 0.0:
+        return None
+
+    return media_type
+
+
+def negotiate_response_media_type(request: Request) -> str:
+    """Negotiate the media type a :class:`~.MessagePackRoute` responds to a request in.
+
+    :param Request request: The request to negotiate the response media type of
+    :return: The negotiated media type, JSON if no supported media type is acceptable
+    :rtype: str
+    """
+
+    media_type = negotiate_media_type(
+        request.headers.get("Accept", ""), RESPONSE_MEDIA_TYPES
+    )
+    if media_type is None:
+        return JSON_MEDIA_TYPE
+
+    return media_type
+
+
+class MessagePackResponse(Response):
+    """Describes a MessagePack encoded response."""
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content: Any) -> bytes:
+        """Render the given content as MessagePack.
+
+        :param Any content: The content to render
+        :return: The rendered content
+        :rtype: bytes
+        """
+
+        return encode_msgpack(content)
+
+
+class MessagePackRequest(Request):
+    """Describes a request whose body may be encoded as MessagePack.
+
+    FastAPI always reads request bodies through ``Request.json()``, so decoding
+    MessagePack bodies there keeps route signatures and body validation unchanged.
+    """
+
+    async def json(self) -> Any:
+        """Decode the request body as either MessagePack or JSON.
+
+        :return: The decoded request body
+        :rtype: Any
+        """
+
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip()
+        if content_type.lower() not in MSGPACK_MEDIA_TYPE_ALIASES:
+            return await super().json()
+
+        if not hasattr(self, "_json"):
+            self._json = decode_msgpack(await self.body())
+
+        return self._json
+
+
+class MessagePackRoute(APIRoute):
+    """Describes a route that negotiates between JSON and MessagePack content.
+
+    .. note:: FastAPI encodes response content with the ``jsonable_encoder`` before
+        the response class renders it, which would turn UUIDs and datetimes into
+        strings. So MessagePack responses are built from the endpoint's validated
+        return value instead.
+
+    """
+
+    def get_route_handler(self) -> Callable:
+        """Build the negotiating request handler for the route.
+
+        :return: The request handler for the route
+        :rtype: Callable
+        """
+
+        json_handler = super().get_route_handler()
+        msgpack_handler = get_request_handler(
+            dependant=self._build_msgpack_dependant(),
+            body_field=self.body_field,
+            status_code=self.status_code,
+            response_class=MessagePackResponse,
+            dependency_overrides_provider=self.dependency_overrides_provider,
+        )
+
+        async def negotiated_handler(request: Request) -> Response:
+            request = MessagePackRequest(request.scope, request.receive)
+            if negotiate_response_media_type(request) == MSGPACK_MEDIA_TYPE:
+                response = await msgpack_handler(request)
+            else:
+                response = await json_handler(request)
+
+            # NOTE: every response of the route (including unmodified responses)
+            # depends on the negotiated media type, so caches must key them by the
+            # ``Accept`` header too
+            response.headers.add_vary_header("Accept")
+            return response
+
+        return negotiated_handler
+
+    def _build_msgpack_dependant(self) -> Dependant:
+        """Build a copy of the route's dependant whose endpoint returns MessagePack.
+
+        :return: The MessagePack dependant of the route
+        :rtype: Dependant
+        """
+
+        dependant = copy(self.dependant)
+        endpoint = self.dependant.call
+
+        if asyncio.iscoroutinefunction(endpoint):
+
+            async def msgpack_endpoint(**values):
+                return self._build_msgpack_response(await endpoint(**values), values)
+
+        else:
+
+            def msgpack_endpoint(**values):
+                return self._build_msgpack_response(endpoint(**values), values)
+
+        dependant.call = msgpack_endpoint
+        return dependant
+
+    def _build_msgpack_response(self, content: Any, values: Dict[str, Any]) -> Response:
+        """Build the MessagePack response for an endpoint's returned content.
+
+        :param Any content: The content returned by the endpoint
+        :param Dict[str, Any] values: The resolved values the endpoint was called with
+        :raises ValidationError: If the content does not match the response model
+        :return: The MessagePack response
+        :rtype: Response
+        """
+
+        if isinstance(content, Response):
+            return content
+
+        if self.secure_cloned_response_field:
+            content, errors = self.secure_cloned_response_field.validate(
+                content, {}, loc=("response",)
+            )
+            if isinstance(errors, ErrorWrapper):
+                errors = [errors]
+            if errors:
+                raise ValidationError(errors, self.secure_cloned_response_field.type_)
+
+        if isinstance(content, BaseModel):
+            content = content.dict(
+                include=self.response_model_include,
+                exclude=self.response_model_exclude,
+                by_alias=self.response_model_by_alias,
+                exclude_unset=self.response_model_exclude_unset,
+            )
+
+        response = MessagePackResponse(content, status_code=self.status_code)
+
+        # NOTE: endpoints may set headers or status codes on an injected response
+        # instance, FastAPI merges those into JSON responses so we do the same here
+        sub_response: Optional[Response] = (
+            values.get(self.dependant.response_param_name)
+            if self.dependant.response_param_name
+            else None
+        )
+        if sub_response is not None:
+            response.headers.raw.extend(sub_response.headers.raw)
+            if sub_response.status_code:
+                response.status_code = sub_response.status_code
+
+        return response
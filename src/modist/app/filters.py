@@ -5,15 +5,33 @@
 """Contains data-types and dependency-injetions for common query parameters."""
 
 from enum import Enum
-from typing import List
+from uuid import UUID
+from typing import Any, Set, List, Optional
+from datetime import date, datetime, timezone, timedelta
 from dataclasses import dataclass
 
-from fastapi import Query, Depends
+from fastapi import Query, Depends, HTTPException, status
+
+from ..env import instance as env
+from .utils import decode_cursor
 
 SORT_DESCENDING_FLAG = "-"
 SORT_ASCENDING_FLAG = "+"
+IDS_SEPARATOR = ","
 PAGINATION_DEFAULT_SIZE = 10
 PAGINATION_DEFAULT_LIMIT = 100
+DATE_RANGE_DEFAULT_DAYS = 30
+DATE_RANGE_MAXIMUM_DAYS = 366
+ANALYTICS_DEFAULT_POINTS = 120
+ANALYTICS_MAXIMUM_POINTS = DATE_RANGE_MAXIMUM_DAYS
+
+
+class CountStrategy(Enum):
+    """Enumeration of allowable collection total counting strategies."""
+
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
 
 
 class SortDirection(Enum):
@@ -23,6 +41,21 @@ class SortDirection(Enum):
     DESCENDING = "desc"
 
 
+class Granularity(Enum):
+    """Enumeration of allowable time series bucket sizes."""
+
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class DownloadGrouping(Enum):
+    """Enumeration of allowable download analytics breakdowns."""
+
+    RELEASE = "release"
+    HOST_RELEASE = "host_release"
+
+
 @dataclass
 class Sort(object):
     """Describes a specific query sorting for a field name."""
@@ -39,12 +72,44 @@ class Pagination(object):
     page: int = 0
 
 
+@dataclass
+class KeysetPagination(object):
+    """Describes the keyset pagination that should be used for queries.
+
+    Rather than skipping a number of rows, keyset pagination continues after the sort
+    values of the last row of the previous page. So fetching deep pages costs the same
+    as fetching the first page.
+    """
+
+    size: int = PAGINATION_DEFAULT_SIZE
+    after: Optional[List[Any]] = None
+
+
+@dataclass
+class DateRange(object):
+    """Describes an inclusive range of days that should be used for queries."""
+
+    start: date
+    end: date
+
+
+@dataclass
+class AnalyticsFilter(object):
+    """Describes the time series that should be built for download analytics."""
+
+    date_range: DateRange
+    granularity: Granularity = Granularity.DAY
+    group_by: DownloadGrouping = DownloadGrouping.RELEASE
+    points: int = ANALYTICS_DEFAULT_POINTS
+
+
 @dataclass
 class CollectionFilter(object):
     """The common filters utilized for collection resources."""
 
     pagination: Pagination
     sorts: List[Sort]
+    count: CountStrategy = CountStrategy.ESTIMATE
 
 
 def sort_filters(
@@ -114,9 +179,62 @@ def pagination_filters(
     return Pagination(size=size, page=page)
 
 
+def keyset_pagination_filters(
+    size: int = Query(
+        default=PAGINATION_DEFAULT_SIZE,
+        title="Pagination size",
+        description="The number of paginated documents to return per request",
+        gt=0,
+        le=PAGINATION_DEFAULT_LIMIT,
+    ),
+    after: Optional[str] = Query(
+        default=None,
+        title="Pagination cursor",
+        description="The cursor of the previous page to continue after",
+    ),
+) -> KeysetPagination:
+    """Handle the aggregation of provided keyset pagination query parameters.
+
+    :param int size: The number of results to return per page
+    :param Optional[str] after: The cursor of the previous page, if any
+    :raises HTTPException: If the given cursor is malformed
+    :returns: An instance of :class:`~.KeysetPagination` for the given parameters
+    :rtype: KeysetPagination
+    """
+
+    if after is None:
+        return KeysetPagination(size=size)
+
+    try:
+        return KeysetPagination(size=size, after=decode_cursor(after))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid pagination cursor {after!r}",
+        )
+
+
+def count_filters(
+    count: CountStrategy = Query(
+        default=CountStrategy.ESTIMATE,
+        title="Count strategy",
+        description="The strategy used to count the total number of documents",
+    )
+) -> CountStrategy:
+    """Handle the aggregation of the provided count query parameter.
+
+    :param CountStrategy count: The requested total counting strategy
+    :returns: The requested :class:`~.CountStrategy`
+    :rtype: CountStrategy
+    """
+
+    return count
+
+
 def collection_filters(
     pagination: Pagination = Depends(pagination_filters),
     sorts: List[Sort] = Depends(sort_filters),
+    count: CountStrategy = Depends(count_filters),
 ) -> CollectionFilter:
     """Handle the aggregation of common collection filters.
 
@@ -125,4 +243,132 @@ def collection_filters(
     :rtype: CollectionFilter
     """
 
-    return CollectionFilter(pagination=pagination, sorts=sorts)
+    return CollectionFilter(pagination=pagination, sorts=sorts, count=count)
+
+
+def ids_filters(
+    ids: List[str] = Query(
+        ...,
+        title="Identifiers",
+        description=(
+            "The unique identifiers of the documents to fetch, either repeated or "
+            "comma separated"
+        ),
+    )
+) -> List[UUID]:
+    """Handle the aggregation of provided identifier query parameters.
+
+    :param List[str] ids: A list of query identifier entries
+    :raises HTTPException: If any identifier is invalid or too many are requested
+    :returns: A list of unique identifiers in their requested order
+    :rtype: List[UUID]
+    """
+
+    identifiers: List[UUID] = []
+    seen: Set[UUID] = set()
+    for entry in ids:
+        for value in entry.split(IDS_SEPARATOR):
+            value = value.strip()
+            if len(value) <= 0:
+                continue
+
+            try:
+                identifier = UUID(value)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid identifier {value!r}",
+                )
+
+            if identifier not in seen:
+                seen.add(identifier)
+                identifiers.append(identifier)
+
+    if len(identifiers) > env.app.collection.batch_maximum_size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                "Cannot request more than "
+                f"{env.app.collection.batch_maximum_size!s} identifiers"
+            ),
+        )
+
+    return identifiers
+
+
+def date_range_filters(
+    start: Optional[date] = Query(
+        default=None,
+        title="Range start",
+        description="The first day of the range, defaults to 30 days before the end",
+    ),
+    end: Optional[date] = Query(
+        default=None,
+        title="Range end",
+        description="The last day of the range, defaults to today (in UTC)",
+    ),
+) -> DateRange:
+    """Handle the aggregation of provided date range query parameters.
+
+    :param Optional[date] start: The first day of the range, if any
+    :param Optional[date] end: The last day of the range, if any
+    :raises HTTPException: If the range is reversed or spans too many days
+    :returns: An instance of :class:`~.DateRange` for the given parameters
+    :rtype: DateRange
+    """
+
+    if end is None:
+        end = datetime.now(timezone.utc).date()
+    if start is None:
+        start = end - timedelta(days=DATE_RANGE_DEFAULT_DAYS - 1)
+
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range start {start!s} is after range end {end!s}",
+        )
+
+    if (end - start).days >= DATE_RANGE_MAXIMUM_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot request more than {DATE_RANGE_MAXIMUM_DAYS!s} days",
+        )
+
+    return DateRange(start=start, end=end)
+
+
+def analytics_filters(
+    date_range: DateRange = Depends(date_range_filters),
+    granularity: Granularity = Query(
+        default=Granularity.DAY,
+        title="Granularity",
+        description="The size of each bucket of the time series",
+    ),
+    group_by: DownloadGrouping = Query(
+        default=DownloadGrouping.RELEASE,
+        title="Group by",
+        description="The resource to break the downloads down by",
+    ),
+    points: int = Query(
+        default=ANALYTICS_DEFAULT_POINTS,
+        title="Maximum points",
+        description=(
+            "The maximum number of points per series, buckets are merged to fit"
+        ),
+        gt=0,
+        le=ANALYTICS_MAXIMUM_POINTS,
+    ),
+) -> AnalyticsFilter:
+    """Handle the aggregation of provided download analytics query parameters.
+
+    :param DateRange date_range: The range of days the analytics should cover
+    :param Granularity granularity: The size of each bucket of the time series
+    :param DownloadGrouping group_by: The resource to break the downloads down by
+    :param int points: The maximum number of points per series
+    :returns: An instance of :class:`~.AnalyticsFilter` for the given parameters
+    :rtype: AnalyticsFilter
+    """
+
+    return AnalyticsFilter(
+        date_range=date_range, granularity=granularity, group_by=group_by, points=points
+    )
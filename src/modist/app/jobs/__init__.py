@@ -0,0 +1,10 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains periodic jobs which run outside of the request cycle.
+
+Every job module is runnable (``python -m modist.app.jobs.<name>``) so jobs can be
+scheduled by cron or any other scheduler. Jobs do all of their work within a single
+transaction, so a failed or interrupted run can simply be retried.
+"""
@@ -0,0 +1,155 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains the job which rolls up mod release downloads into download counts.
+
+``mod_release_download`` is an append-only event table, so counting the downloads of a
+mod or release from it means counting millions of rows. Instead this job adds the
+downloads created since its last run to per day and total counts of each mod and mod
+release, which the download services read with a single index lookup.
+"""
+
+from typing import Any, Dict, Type, Tuple, Counter
+from datetime import timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects import postgresql
+
+from ...env import instance as env
+from ..utils import get_db
+from ...models.mod import (
+    ModDownloadDaily,
+    ModDownloadTotal,
+    ModReleaseDownload,
+    ModReleaseDownloadDaily,
+    ModReleaseDownloadTotal,
+)
+from ...models.common import RollupWatermark
+
+DOWNLOAD_ROLLUP_NAME = "downloads"
+
+
+def _lock_watermark(session: Session, name: str) -> RollupWatermark:
+    """Get and lock the watermark of a given rollup, creating it if necessary.
+
+    .. note:: The watermark is locked until the end of the session's transaction, so
+        concurrent runs of the same rollup are serialized rather than rolling up the
+        same rows twice.
+
+    :param Session session: The session to lock the watermark within
+    :param str name: The name of the rollup
+    :return: The locked watermark of the rollup
+    :rtype: RollupWatermark
+    """
+
+    session.execute(
+        postgresql.insert(RollupWatermark.__table__)
+        .values(name=name)
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    return (
+        session.query(RollupWatermark)
+        .filter(RollupWatermark.name == name)
+        .with_for_update()
+        .one()
+    )
+
+
+def _upsert_counts(
+    session: Session,
+    model: Type[Any],
+    key_names: Tuple[str, ...],
+    counts: Dict[Tuple[Any, ...], int],
+):
+    """Add the given counts to the existing counts of a rollup model.
+
+    :param Session session: The session to upsert the counts within
+    :param Type[Any] model: The rollup model with a ``count`` column
+    :param Tuple[str, ...] key_names: The names of the primary key columns of the model
+    :param Dict[Tuple[Any, ...], int] counts: The counts to add keyed by the primary
+        key values they should be added to
+    """
+
+    if len(counts) <= 0:
+        return
+
+    table = model.__table__
+    statement = postgresql.insert(table)
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=list(key_names),
+            set_={"count": table.c.count + statement.excluded.count},
+        ),
+        [
+            {**dict(zip(key_names, key)), "count": count}
+            for key, count in counts.items()
+        ],
+    )
+
+
+def rollup_downloads(session: Session, settle_interval: int) -> int:
+    """Roll up the downloads created since the last rollup into download counts.
+
+    .. note:: Downloads are rolled up by when they were created rather than when they
+        were downloaded, so late arriving downloads are still counted (on the day they
+        were downloaded). As ``created_at`` is the start of the inserting transaction,
+        downloads created within the last ``settle_interval`` seconds are left for the
+        next run in case their transaction has yet to commit.
+
+    :param Session session: The session to roll up the downloads within
+    :param int settle_interval: The number of seconds downloads are given to commit
+        before they are rolled up
+    :return: The number of downloads rolled up
+    :rtype: int
+    """
+
+    watermark = _lock_watermark(session, DOWNLOAD_ROLLUP_NAME)
+    upper_bound = session.execute(
+        select([func.now() - timedelta(seconds=settle_interval)])
+    ).scalar()
+    if watermark.watermark is not None and upper_bound <= watermark.watermark:
+        return 0
+
+    day = func.date(func.timezone("UTC", ModReleaseDownload.downloaded_at))
+    query = session.query(
+        ModReleaseDownload.mod_id, ModReleaseDownload.mod_release_id, day, func.count(),
+    ).filter(ModReleaseDownload.created_at < upper_bound)
+    if watermark.watermark is not None:
+        query = query.filter(ModReleaseDownload.created_at >= watermark.watermark)
+
+    mod_daily: Counter[Tuple[Any, ...]] = Counter()
+    mod_total: Counter[Tuple[Any, ...]] = Counter()
+    release_daily: Counter[Tuple[Any, ...]] = Counter()
+    release_total: Counter[Tuple[Any, ...]] = Counter()
+    for mod_id, mod_release_id, downloaded_on, count in query.group_by(
+        ModReleaseDownload.mod_id, ModReleaseDownload.mod_release_id, day
+    ):
+        mod_daily[(mod_id, downloaded_on)] += count
+        mod_total[(mod_id,)] += count
+        # NOTE: downloads of deleted releases only count towards their mod
+        if mod_release_id is not None:
+            release_daily[(mod_release_id, downloaded_on)] += count
+            release_total[(mod_release_id,)] += count
+
+    _upsert_counts(session, ModDownloadDaily, ("mod_id", "day"), mod_daily)
+    _upsert_counts(session, ModDownloadTotal, ("mod_id",), mod_total)
+    _upsert_counts(
+        session, ModReleaseDownloadDaily, ("mod_release_id", "day"), release_daily
+    )
+    _upsert_counts(session, ModReleaseDownloadTotal, ("mod_release_id",), release_total)
+
+    watermark.watermark = upper_bound
+    return sum(mod_total.values())
+
+
+def main():
+    """Run the download rollup job."""
+
+    with get_db().session() as session:
+        rollup_downloads(session, env.app.downloads.rollup_settle_interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains the job which manages the monthly partitions of mod release downloads.
+
+``mod_release_download`` is range partitioned by month of ``downloaded_at``. This job
+creates the partitions of upcoming months ahead of time, so downloads never land in the
+default partition, and removes the partitions of months older than the retention
+period by detaching or dropping them whole rather than deleting their rows.
+"""
+
+from typing import List, Optional
+from datetime import date, datetime
+
+from sqlalchemy import func, text, select
+from sqlalchemy.orm import Session
+
+from ...env import instance as env
+from ..utils import get_db
+from .downloads import DOWNLOAD_ROLLUP_NAME
+from ...models.mod import ModReleaseDownload
+from ...partitioning import (
+    get_month,
+    add_months,
+    get_months,
+    get_partition_name,
+    get_partition_month,
+    build_drop_partition_sql,
+    build_create_partition_sql,
+    build_detach_partition_sql,
+    build_attach_default_partition_sql,
+    build_detach_default_partition_sql,
+    build_default_partition_has_rows_sql,
+    build_move_default_partition_rows_sql,
+)
+from ...models.common import RollupWatermark
+
+DOWNLOAD_TABLE_NAME = ModReleaseDownload.__tablename__
+DOWNLOAD_PARTITION_COLUMN_NAME = ModReleaseDownload.downloaded_at.key
+
+
+def _get_partition_months(session: Session, table_name: str) -> List[date]:
+    """Get the months of the attached monthly partitions of a given table.
+
+    :param Session session: The session to query within
+    :param str table_name: The name of the partitioned table
+    :return: The first day of the month of each monthly partition in order
+    :rtype: List[date]
+    """
+
+    partition_names = session.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = CAST(:table_name AS regclass)"
+        ),
+        {"table_name": table_name},
+    ).fetchall()
+
+    return sorted(
+        month
+        for month in (
+            get_partition_month(table_name, partition_name)
+            for partition_name, in partition_names
+        )
+        if month is not None
+    )
+
+
+def _create_download_partition(session: Session, month: date):
+    """Create the download partition of a given month.
+
+    Creating a partition fails while the default partition holds rows of its month, so
+    any downloads of the month which landed in the default partition are moved into the
+    new partition while the default partition is detached.
+
+    :param Session session: The session to create the partition within
+    :param date month: The month of the download partition
+    """
+
+    if not session.execute(
+        build_default_partition_has_rows_sql(
+            DOWNLOAD_TABLE_NAME, DOWNLOAD_PARTITION_COLUMN_NAME, month
+        )
+    ).scalar():
+        session.execute(build_create_partition_sql(DOWNLOAD_TABLE_NAME, month))
+        return
+
+    session.execute(build_detach_default_partition_sql(DOWNLOAD_TABLE_NAME))
+    session.execute(build_create_partition_sql(DOWNLOAD_TABLE_NAME, month))
+    session.execute(
+        build_move_default_partition_rows_sql(
+            DOWNLOAD_TABLE_NAME, DOWNLOAD_PARTITION_COLUMN_NAME, month
+        )
+    )
+    session.execute(build_attach_default_partition_sql(DOWNLOAD_TABLE_NAME))
+
+
+def _has_pending_downloads(
+    session: Session, month: date, watermark: Optional[datetime]
+) -> bool:
+    """Check if the download partition of a given month has downloads to roll up.
+
+    :param Session session: The session to query within
+    :param date month: The month of the download partition
+    :param Optional[datetime] watermark: The watermark of the download rollup
+    :return: True if the partition has downloads which are not yet rolled up
+    :rtype: bool
+    """
+
+    if watermark is None:
+        return True
+
+    return session.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM "
+            f"{get_partition_name(DOWNLOAD_TABLE_NAME, month)!s} "
+            "WHERE created_at >= :watermark)"
+        ),
+        {"watermark": watermark},
+    ).scalar()
+
+
+def maintain_download_partitions(
+    session: Session, premake_months: int, retention_months: int, detach_only: bool
+) -> List[date]:
+    """Create upcoming download partitions and remove the expired download partitions.
+
+    .. note:: Partitions containing downloads which the download rollup has not yet
+        counted are never removed, so removing old downloads never changes the download
+        statistics. Those partitions are left for the next run instead. Downloads which
+        landed in the default partition are moved into their month's partition when it
+        is created.
+
+    :param Session session: The session to manage the partitions within
+    :param int premake_months: The number of months after the current month to create
+        partitions for
+    :param int retention_months: The number of months before the current month to keep
+        the partitions of
+    :param bool detach_only: If True, expired partitions are detached into standalone
+        tables (to be archived) rather than dropped
+    :return: The first day of the month of each removed partition
+    :rtype: List[date]
+    """
+
+    current = get_month(
+        session.execute(select([func.date(func.timezone("UTC", func.now()))])).scalar()
+    )
+    existing = set(_get_partition_months(session, DOWNLOAD_TABLE_NAME))
+    for month in get_months(current, premake_months + 1):
+        if month not in existing:
+            _create_download_partition(session, month)
+
+    cutoff = add_months(current, -retention_months)
+    watermark = (
+        session.query(RollupWatermark.watermark)
+        .filter(RollupWatermark.name == DOWNLOAD_ROLLUP_NAME)
+        .scalar()
+    )
+
+    removed: List[date] = []
+    for month in _get_partition_months(session, DOWNLOAD_TABLE_NAME):
+        if month >= cutoff or _has_pending_downloads(session, month, watermark):
+            continue
+
+        session.execute(
+            build_detach_partition_sql(DOWNLOAD_TABLE_NAME, month)
+            if detach_only
+            else build_drop_partition_sql(DOWNLOAD_TABLE_NAME, month)
+        )
+        removed.append(month)
+
+    return removed
+
+
+def main():
+    """Run the download partition maintenance job."""
+
+    with get_db().session() as session:
+        maintain_download_partitions(
+            session,
+            env.app.downloads.partition_premake_months,
+            env.app.downloads.retention_months,
+            env.app.downloads.retention_detach_only,
+        )
+
+
+if __name__ == "__main__":
+    main()
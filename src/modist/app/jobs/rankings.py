@@ -0,0 +1,76 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains the job which reconciles the vote tallies of ranked entities.
+
+Tallies are maintained by triggers whenever a ranking or ranking association changes
+(see :mod:`~modist.tallying`), but anything bypassing the triggers (such as restoring
+a table or disabling user triggers for a bulk update) leaves the tallies drifted from
+the rankings. This job recounts the tallies of every ranked entity and repairs only the
+tallies which differ from their recount.
+"""
+
+from typing import Any, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..utils import get_db
+from ...tallying import build_reconcile_tally_sql
+from ...models.mod import ModRanking, ModRankingTally
+from ...models.user import (
+    ImageRanking,
+    CommentRanking,
+    ImageRankingTally,
+    CommentRankingTally,
+)
+
+RANKED_ENTITIES: Tuple[Tuple[Any, str, Any], ...] = (
+    (ModRanking, "mod_id", ModRankingTally),
+    (CommentRanking, "comment_id", CommentRankingTally),
+    (ImageRanking, "image_id", ImageRankingTally),
+)
+
+
+def reconcile_ranking_tallies(session: Session) -> int:
+    """Repair the vote tallies of every ranked entity which drifted from the rankings.
+
+    .. note:: Each tally table is locked against concurrent writes (but not reads)
+        while it is recounted, so a ranking changed during the recount can't be lost
+        between the recount and the repair. As the job runs in a single transaction,
+        the lock is held until the session's transaction ends rather than released
+        after each tally table. So any ranking write (or ranking association write) of
+        a locked entity type blocks in its tally trigger for the rest of the
+        reconciliation, which should therefore run when rankings are least active.
+
+    :param Session session: The session to reconcile the tallies within
+    :return: The number of tallies repaired
+    :rtype: int
+    """
+
+    repaired = 0
+    for association, entity_column, tally in RANKED_ENTITIES:
+        session.execute(
+            text(f"LOCK TABLE {tally.__tablename__!s} IN SHARE ROW EXCLUSIVE MODE")
+        )
+        repaired += session.execute(
+            text(
+                build_reconcile_tally_sql(
+                    association.__tablename__, entity_column, tally.__tablename__
+                )
+            )
+        ).rowcount
+
+    return repaired
+
+
+def main():
+    """Run the ranking tally reconciliation job."""
+
+    with get_db().session() as session:
+        reconcile_ranking_tallies(session)
+
+
+if __name__ == "__main__":
+    main()
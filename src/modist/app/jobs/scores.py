@@ -0,0 +1,268 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains the job which computes the popularity scores of every mod.
+
+Ordering mods by popularity needs time-decayed scores combining each mod's recent
+downloads, rankings and ratings, which are far too expensive to compute per request.
+Instead this job loads the recent activity of every mod into NumPy arrays, computes the
+scores of all mods in a single vectorized pass and bulk writes them into ``mod_score``,
+so ordering mods by a score is a scan of the score's index.
+
+The ``hot`` score is the logarithm of each mod's weighted activity within the window,
+where every download, ranking and rating loses half of its weight every
+``APP_SCORES_HALF_LIFE_DAYS`` days. The ``trending`` score is the logarithmic growth of
+each mod's daily downloads over the last ``APP_SCORES_TRENDING_DAYS`` days compared to
+the rest of the window.
+"""
+
+import io
+import csv
+from uuid import UUID
+from typing import Any, Dict, List, Tuple
+from datetime import timedelta
+
+import numpy
+from sqlalchemy import Float, cast, func, extract, literal
+from sqlalchemy.orm import Query, Session
+
+from ...env import instance as env
+from ..utils import get_db
+from ...models.mod import Mod, ModScore, ModRating, ModRanking, ModDownloadDaily
+from ...models.user import Rating, Ranking
+
+DOWNLOAD_WEIGHT = 1.0
+RANKING_WEIGHT = 25.0
+RATING_WEIGHT = 5.0
+SECONDS_PER_DAY = 86400
+
+SCORE_COLUMNS = ("mod_id", "hot", "trending")
+STAGING_TABLE_NAME = "mod_score_staging"
+
+CREATE_STAGING_SQL = (
+    f"CREATE TEMPORARY TABLE {STAGING_TABLE_NAME!s} ("
+    "mod_id uuid NOT NULL, hot double precision NOT NULL, "
+    "trending double precision NOT NULL"
+    ") ON COMMIT DROP"
+)
+COPY_STAGING_SQL = (
+    f"COPY {STAGING_TABLE_NAME!s} ({', '.join(SCORE_COLUMNS)!s}) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+UPSERT_SCORES_SQL = (
+    f"INSERT INTO {ModScore.__tablename__!s} "
+    f"({', '.join(SCORE_COLUMNS)!s}, computed_at) "
+    f"SELECT {', '.join(SCORE_COLUMNS)!s}, now() FROM {STAGING_TABLE_NAME!s} "
+    "ON CONFLICT (mod_id) DO UPDATE SET hot = excluded.hot, "
+    "trending = excluded.trending, computed_at = excluded.computed_at"
+)
+
+Activity = Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+
+
+def _load_activity(query: Query, index: Dict[UUID, int]) -> Activity:
+    """Load the rows of an activity query into arrays.
+
+    .. note:: Activity of mods missing from the index (mods created after the index was
+        loaded) is skipped, those mods are scored by the next run.
+
+    :param Query query: The query of ``(mod_id, age, value)`` rows, where ``age`` is the
+        number of days since the activity
+    :param Dict[UUID, int] index: The position of each mod in the score arrays
+    :return: The position of the mod, age and value of each activity as arrays
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+    """
+
+    rows: List[Tuple[UUID, float, float]] = [
+        row for row in query.all() if row[0] in index
+    ]
+    return (
+        numpy.fromiter(
+            (index[mod_id] for mod_id, _, _ in rows), dtype=numpy.intp, count=len(rows)
+        ),
+        numpy.fromiter(
+            (age for _, age, _ in rows), dtype=numpy.float64, count=len(rows)
+        ),
+        numpy.fromiter(
+            (value for _, _, value in rows), dtype=numpy.float64, count=len(rows)
+        ),
+    )
+
+
+def compute_hot_scores(
+    mod_count: int, activities: List[Activity], half_life_days: float
+) -> numpy.ndarray:
+    """Compute the time-decayed hot score of every mod.
+
+    :param int mod_count: The number of mods to compute the scores of
+    :param List[Activity] activities: The position of the mod, age and weighted value
+        of each activity
+    :param float half_life_days: The number of days after which an activity has lost
+        half of its weight
+    :return: The hot score of each mod by position
+    :rtype: numpy.ndarray
+    """
+
+    indices, ages, values = (
+        numpy.concatenate([activity[field] for activity in activities])
+        for field in range(3)
+    )
+    return numpy.log1p(
+        numpy.bincount(
+            indices,
+            weights=values * numpy.exp2(-ages / half_life_days),
+            minlength=mod_count,
+        )
+    )
+
+
+def compute_trending_scores(
+    mod_count: int, downloads: Activity, window_days: int, trending_days: int
+) -> numpy.ndarray:
+    """Compute the download growth trending score of every mod.
+
+    :param int mod_count: The number of mods to compute the scores of
+    :param Activity downloads: The position of the mod, age and count of each day of
+        downloads within the window
+    :param int window_days: The number of days of downloads loaded
+    :param int trending_days: The number of most recent days to compare against the
+        rest of the window
+    :return: The trending score of each mod by position
+    :rtype: numpy.ndarray
+    """
+
+    indices, ages, counts = downloads
+    recent = ages < trending_days
+    recent_rate = (
+        numpy.bincount(indices[recent], weights=counts[recent], minlength=mod_count)
+        / trending_days
+    )
+    baseline_rate = numpy.bincount(
+        indices[~recent], weights=counts[~recent], minlength=mod_count
+    ) / (window_days - trending_days)
+
+    return numpy.log1p(recent_rate) - numpy.log1p(baseline_rate)
+
+
+def _write_scores(
+    session: Session, mod_ids: List[UUID], hot: numpy.ndarray, trending: numpy.ndarray,
+):
+    """Bulk write the scores of the given mods into ``mod_score``.
+
+    .. note:: Scores are copied into a temporary staging table and upserted from there
+        in a single statement, rather than sending a statement per mod.
+
+    :param Session session: The session to write the scores within
+    :param List[UUID] mod_ids: The mods' unique primary identifiers by position
+    :param numpy.ndarray hot: The hot score of each mod by position
+    :param numpy.ndarray trending: The trending score of each mod by position
+    """
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        zip((str(mod_id) for mod_id in mod_ids), hot.tolist(), trending.tolist())
+    )
+    buffer.seek(0)
+
+    with session.connection().connection.cursor() as cursor:
+        cursor.execute(CREATE_STAGING_SQL)
+        cursor.copy_expert(COPY_STAGING_SQL, buffer)
+        cursor.execute(UPSERT_SCORES_SQL)
+
+
+def compute_mod_scores(
+    session: Session, window_days: int, trending_days: int, half_life_days: float
+) -> int:
+    """Compute and write the popularity scores of every mod.
+
+    .. note:: Only activity within the last ``window_days`` days is loaded, as older
+        activity has decayed to a negligible weight.
+
+    :param Session session: The session to compute the scores within
+    :param int window_days: The number of days of activity to load
+    :param int trending_days: The number of most recent days of downloads to compare
+        against the rest of the window for the trending score
+    :param float half_life_days: The number of days after which an activity has lost
+        half of its weight for the hot score
+    :raises ValueError: If the trending days don't leave part of the window to compare
+        against
+    :return: The number of mods scored
+    :rtype: int
+    """
+
+    if not 0 < trending_days < window_days:
+        raise ValueError(
+            f"Trending days must be within the window of {window_days!s} days, "
+            f"received {trending_days!s}"
+        )
+
+    mod_ids: List[UUID] = [mod_id for mod_id, in session.query(Mod.id)]
+    if len(mod_ids) <= 0:
+        return 0
+
+    index = {mod_id: position for position, mod_id in enumerate(mod_ids)}
+    today = func.date(func.timezone("UTC", func.now()))
+    downloads = _load_activity(
+        session.query(
+            ModDownloadDaily.mod_id,
+            cast(today - ModDownloadDaily.day, Float),
+            cast(ModDownloadDaily.count, Float),
+        ).filter(ModDownloadDaily.day > today - window_days),
+        index,
+    )
+
+    activities: List[Activity] = [
+        (downloads[0], downloads[1], downloads[2] * DOWNLOAD_WEIGHT)
+    ]
+    model: Any
+    content: Any
+    for model, content, content_id, value, weight in (
+        (ModRanking, Ranking, ModRanking.ranking_id, literal(1.0), RANKING_WEIGHT),
+        (
+            ModRating,
+            Rating,
+            ModRating.rating_id,
+            cast(Rating.rating, Float),
+            RATING_WEIGHT,
+        ),
+    ):
+        indices, ages, values = _load_activity(
+            session.query(
+                model.mod_id,
+                cast(extract("epoch", func.now() - model.created_at), Float)
+                / SECONDS_PER_DAY,
+                value,
+            )
+            .join(content, content.id == content_id)
+            .filter(
+                content.is_active.is_(True),
+                model.created_at > func.now() - timedelta(days=window_days),
+            ),
+            index,
+        )
+        activities.append((indices, ages, values * weight))
+
+    _write_scores(
+        session,
+        mod_ids,
+        compute_hot_scores(len(mod_ids), activities, half_life_days),
+        compute_trending_scores(len(mod_ids), downloads, window_days, trending_days),
+    )
+    return len(mod_ids)
+
+
+def main():
+    """Run the mod score job."""
+
+    with get_db().session() as session:
+        compute_mod_scores(
+            session,
+            env.app.scores.window_days,
+            env.app.scores.trending_days,
+            env.app.scores.half_life_days,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains the job which backfills the daily download sketches from downloads.
+
+The download recorder merges the downloaders of every batch it flushes into the daily
+:class:`~modist.hyperloglog.HyperLogLog` sketches, so downloads recorded before the
+sketches existed (or inserted by anything other than the recorder) are missing from
+the unique downloader estimates. This job merges the recorded downloads of every day
+back into the sketches. Adding a downloader to a sketch which already counts them
+leaves the sketch unchanged, so days which are already sketched are never counted
+twice and the job can be rerun at any time.
+"""
+
+from typing import Optional
+from datetime import date, time, datetime, timezone, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..utils import get_db
+from ..recorder import update_download_sketches
+from ...models.mod import ModReleaseDownload
+
+
+def backfill_download_sketches(
+    session: Session, start: Optional[date] = None, end: Optional[date] = None
+) -> int:
+    """Merge the recorded downloads of a range of days into the daily sketches.
+
+    .. note:: Downloads are loaded and merged one day at a time, so only the sketches
+        of a single day are ever held in memory. The current day is left to the
+        download recorder by default, as the sketches merged by the job stay locked
+        until the session's transaction ends.
+
+    :param Session session: The session to backfill the sketches within
+    :param Optional[date] start: The first day to backfill, optional, defaults to None
+        (the day of the first recorded download)
+    :param Optional[date] end: The day to backfill up to (exclusive), optional,
+        defaults to None (the current day)
+    :return: The number of downloads merged into the sketches
+    :rtype: int
+    """
+
+    if start is None:
+        first_downloaded_at: Optional[datetime] = session.query(
+            func.min(ModReleaseDownload.downloaded_at)
+        ).scalar()
+        if first_downloaded_at is None:
+            return 0
+        start = first_downloaded_at.astimezone(timezone.utc).date()
+    if end is None:
+        end = datetime.now(timezone.utc).date()
+
+    merged = 0
+    day = start
+    while day < end:
+        lower_bound = datetime.combine(day, time(), tzinfo=timezone.utc)
+        downloads = (
+            session.query(
+                ModReleaseDownload.mod_id,
+                ModReleaseDownload.mod_release_id,
+                ModReleaseDownload.downloaded_at,
+                ModReleaseDownload.ip,
+                ModReleaseDownload.user_id,
+            )
+            .filter(
+                ModReleaseDownload.downloaded_at >= lower_bound,
+                ModReleaseDownload.downloaded_at < lower_bound + timedelta(days=1),
+            )
+            .all()
+        )
+        update_download_sketches(session.connection(), downloads)
+        merged += len(downloads)
+        day += timedelta(days=1)
+
+    return merged
+
+
+def main():
+    """Run the download sketch backfill job."""
+
+    with get_db().session() as session:
+        backfill_download_sketches(session)
+
+
+if __name__ == "__main__":
+    main()
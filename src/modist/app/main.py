@@ -8,7 +8,13 @@ from fastapi import FastAPI
 
 from .. import __version__
 from ..env import instance as env
-from .routers import user, security
+from .routers import mod, user, search, release, security
+from .recorder import get_download_recorder
+from .middleware import CompressionMiddleware
+from .services.autocomplete import (
+    stop_autocomplete_refresher,
+    start_autocomplete_refresher,
+)
 
 app = FastAPI(
     debug=env.app.debug,
@@ -16,5 +22,44 @@ app = FastAPI(
     description=__version__.__description__,
     version=__version__.__version__,
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=env.app.compression.minimum_size,
+    gzip_level=env.app.compression.gzip_level,
+    brotli_quality=env.app.compression.brotli_quality,
+    cache_size=env.app.compression.cache_size,
+    cache_maximum_size=env.app.compression.cache_maximum_size,
+)
 app.include_router(security.router, prefix="/oauth2", tags=["Security"])
 app.include_router(user.router, prefix="/users", tags=["Users"])
+app.include_router(mod.router, prefix="/mods", tags=["Mods"])
+app.include_router(release.router, prefix="/releases", tags=["Releases"])
+app.include_router(search.router, prefix="/search", tags=["Search"])
+
+
+@app.on_event("startup")
+def start_download_recorder():
+    """Start flushing recorded downloads in the background."""
+
+    get_download_recorder().start()
+
+
+@app.on_event("shutdown")
+def stop_download_recorder():
+    """Flush any buffered downloads before the application exits."""
+
+    get_download_recorder().stop()
+
+
+@app.on_event("startup")
+def start_autocomplete():
+    """Start building and refreshing the autocompletion indexes in the background."""
+
+    start_autocomplete_refresher()
+
+
+@app.on_event("shutdown")
+def stop_autocomplete():
+    """Stop refreshing the autocompletion indexes."""
+
+    stop_autocomplete_refresher()
@@ -0,0 +1,338 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains ASGI middleware utilized by the application."""
+
+import zlib
+from typing import List, Tuple, Callable, Optional
+from threading import RLock
+
+import brotli
+from cachetools import LRUCache
+from starlette.types import Send, Scope, ASGIApp, Message, Receive
+from starlette.status import HTTP_304_NOT_MODIFIED
+from starlette.datastructures import Headers, MutableHeaders
+
+from .utils import parse_quality_values
+
+GZIP_ENCODING = "gzip"
+BROTLI_ENCODING = "br"
+GZIP_MAXIMUM_LEVEL = 9
+BROTLI_MAXIMUM_QUALITY = 11
+SUPPORTED_ENCODINGS = [BROTLI_ENCODING, GZIP_ENCODING]
+ETAG_WEAK_PREFIX = "W/"
+
+# NOTE: already compressed media types (images, archives, ...) only cost CPU to
+# compress again, so only textual and structured media types are compressed
+COMPRESSIBLE_MEDIA_TYPES = (
+    "application/json",
+    "application/msgpack",
+    "application/x-msgpack",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+COMPRESSIBLE_MEDIA_TYPE_PREFIXES = ("text/",)
+COMPRESSIBLE_MEDIA_TYPE_SUFFIXES = ("+json", "+xml")
+
+
+class _Compressor(object):
+    """Describes a streaming compressor for a specific content encoding."""
+
+    def __init__(self, process: Callable[[bytes], bytes], finish: Callable[[], bytes]):
+        """Initialize the streaming compressor.
+
+        :param Callable[[bytes], bytes] process: Callable that compresses a chunk
+        :param Callable[[], bytes] finish: Callable that flushes the compressed stream
+        """
+
+        self.process = process
+        self.finish = finish
+
+
+def build_compressor(encoding: str, level: int) -> _Compressor:
+    """Build a new streaming compressor for a given content encoding.
+
+    :param str encoding: The content encoding to build a compressor for
+    :param int level: The compression level (or quality) of the compressor
+    :raises ValueError: If the given encoding is not supported
+    :return: A new streaming compressor
+    :rtype: _Compressor
+    """
+
+    if encoding == GZIP_ENCODING:
+        gzip_compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return _Compressor(gzip_compressor.compress, gzip_compressor.flush)
+    elif encoding == BROTLI_ENCODING:
+        brotli_compressor = brotli.Compressor(quality=level)
+        return _Compressor(brotli_compressor.process, brotli_compressor.finish)
+
+    raise ValueError(f"unsupported content encoding {encoding!r}")
+
+
+def is_compressible(content_type: str) -> bool:
+    """Check if a response of a given content type is worth compressing.
+
+    :param str content_type: The value of the response's ``Content-Type`` header
+    :return: True if the content type is compressible, otherwise False
+    :rtype: bool
+    """
+
+    media_type = content_type.split(";")[0].strip().lower()
+    return (
+        media_type in COMPRESSIBLE_MEDIA_TYPES
+        or media_type.startswith(COMPRESSIBLE_MEDIA_TYPE_PREFIXES)
+        or media_type.endswith(COMPRESSIBLE_MEDIA_TYPE_SUFFIXES)
+    )
+
+
+def weaken_etag(etag: str) -> str:
+    """Weaken a given ETag so it no longer claims byte-for-byte equality.
+
+    :param str etag: The ETag to weaken
+    :return: The weak ETag
+    :rtype: str
+    """
+
+    if etag.startswith(ETAG_WEAK_PREFIX):
+        return etag
+
+    return f"{ETAG_WEAK_PREFIX!s}{etag!s}"
+
+
+def negotiate_encoding(accept_encoding: str, supported: List[str]) -> Optional[str]:
+    """Negotiate the content encoding to use for a given ``Accept-Encoding`` header.
+
+    :param str accept_encoding: The value of the request's ``Accept-Encoding`` header
+    :param List[str] supported: The supported encodings in order of server preference
+    :return: The negotiated content encoding if any supported encoding is acceptable
+    :rtype: Optional[str]
+    """
+
+    weights = parse_quality_values(accept_encoding)
+    wildcard_weight = weights.get("*", 0.0)
+    acceptable: List[Tuple[float, int, str]] = [
+        (weights.get(encoding, wildcard_weight), -index, encoding)
+        for index, encoding in enumerate(supported)
+    ]
+    weight, _, encoding = max(acceptable, default=(0.0, 0, None))
+    if weight <= 0.0:
+        return None
+
+    return encoding
+
+
+class CompressionMiddleware(object):
+    """ASGI middleware that negotiates and applies response compression.
+
+    Only responses of compressible content types are compressed and responses smaller
+    than ``minimum_size`` are sent uncompressed as the compression overhead outweighs
+    the savings. Complete (non-streaming) response bodies no larger than
+    ``cache_maximum_size`` which carry a strong ETag have their compressed
+    representation cached by their ETag. So static or rarely changing payloads are
+    only ever compressed once per encoding regardless of how many times they are
+    requested, while dynamic payloads never churn the cache.
+
+    .. note:: A strong ETag promises byte-for-byte equality, which a compressed
+        representation of the identified body no longer has. So the ETags of responses
+        that are (or, depending on their size, could be) compressed are weakened, and
+        compressible responses always vary by ``Accept-Encoding``.
+
+    >>> app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        cache_size: int = 256,
+        cache_maximum_size: int = 1048576,
+    ):
+        """Initialize the compression middleware.
+
+        :param ASGIApp app: The ASGI application to wrap
+        :param int minimum_size: The minimum response body size in bytes to compress,
+            optional, defaults to 500
+        :param int gzip_level: The gzip compression level, bounded to the range 1-9,
+            optional, defaults to 6
+        :param int brotli_quality: The brotli compression quality, bounded to the range
+            0-11, optional, defaults to 4
+        :param int cache_size: The maximum number of compressed bodies to cache,
+            optional, defaults to 256
+        :param int cache_maximum_size: The maximum response body size in bytes to cache
+            compressed bodies for, optional, defaults to 1048576
+        """
+
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {
+            GZIP_ENCODING: max(1, min(gzip_level, GZIP_MAXIMUM_LEVEL)),
+            BROTLI_ENCODING: max(0, min(brotli_quality, BROTLI_MAXIMUM_QUALITY)),
+        }
+        self.supported_encodings = SUPPORTED_ENCODINGS
+        self.cache_maximum_size = cache_maximum_size
+        self.cache: LRUCache = LRUCache(maxsize=cache_size)
+        self.cache_lock = RLock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI request.
+
+        :param Scope scope: The ASGI connection scope
+        :param Receive receive: The ASGI receive channel
+        :param Send send: The ASGI send channel
+        """
+
+        if scope["type"] == "http":
+            # NOTE: responses are intercepted even if no encoding is acceptable, as
+            # compressible responses must vary by ``Accept-Encoding`` either way
+            encoding = negotiate_encoding(
+                Headers(scope=scope).get("Accept-Encoding", ""),
+                self.supported_encodings,
+            )
+            responder = _CompressionResponder(self, encoding, send)
+            await self.app(scope, receive, responder.send)
+            return
+
+        await self.app(scope, receive, send)
+
+    def compress(self, body: bytes, encoding: str, etag: Optional[str] = None) -> bytes:
+        """Compress a complete response body, reusing cached compressed bodies.
+
+        .. note:: Only bodies identified by a strong ETag are cached, as the body of a
+            strong ETag never changes while the bodies of any other (dynamic) responses
+            would only evict the cached bodies that are actually reused.
+
+        :param bytes body: The response body to compress
+        :param str encoding: The content encoding to compress the body with
+        :param Optional[str] etag: The ETag of the response, optional, defaults to None
+        :return: The compressed response body
+        :rtype: bytes
+        """
+
+        if (
+            etag is None
+            or etag.startswith(ETAG_WEAK_PREFIX)
+            or len(body) > self.cache_maximum_size
+        ):
+            return self._compress(body, encoding)
+
+        cache_key = (encoding, etag)
+        with self.cache_lock:
+            compressed = self.cache.get(cache_key)
+        if compressed is None:
+            compressed = self._compress(body, encoding)
+            with self.cache_lock:
+                self.cache[cache_key] = compressed
+
+        return compressed
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        """Compress a complete response body.
+
+        :param bytes body: The response body to compress
+        :param str encoding: The content encoding to compress the body with
+        :return: The compressed response body
+        :rtype: bytes
+        """
+
+        compressor = build_compressor(encoding, self.levels[encoding])
+        return compressor.process(body) + compressor.finish()
+
+
+class _CompressionResponder(object):
+    """Applies a negotiated content encoding to the messages of a single response."""
+
+    def __init__(
+        self, middleware: CompressionMiddleware, encoding: Optional[str], send: Send
+    ):
+        """Initialize the compression responder.
+
+        :param CompressionMiddleware middleware: The owning compression middleware
+        :param Optional[str] encoding: The negotiated content encoding, None if no
+            supported content encoding is acceptable
+        :param Send send: The ASGI send channel to forward messages to
+        """
+
+        self.middleware = middleware
+        self.encoding = encoding
+        self.forward = send
+        self.initial_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.started = False
+
+    async def send(self, message: Message) -> None:
+        """Intercept and compress outgoing ASGI messages.
+
+        :param Message message: The outgoing ASGI message
+        """
+
+        if message["type"] == "http.response.start":
+            # NOTE: we can't send the initial message until we know if the body should
+            # be compressed, as that decides the headers that need to be sent
+            self.initial_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self.forward(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            compressible = "content-encoding" not in headers and is_compressible(
+                headers.get("content-type", "")
+            )
+            if compressible:
+                headers.add_vary_header("Accept-Encoding")
+
+            etag = headers.get("etag")
+            # NOTE: unmodified responses must carry the ETag of the (compressed)
+            # response the client has cached
+            if (
+                etag is not None
+                and self.encoding is not None
+                and (
+                    compressible
+                    or self.initial_message["status"] == HTTP_304_NOT_MODIFIED
+                )
+            ):
+                headers["ETag"] = weaken_etag(etag)
+
+            if (
+                self.encoding is None
+                or not compressible
+                or (len(body) < self.middleware.minimum_size and not more_body)
+            ):
+                await self.forward(self.initial_message)
+                await self.forward(message)
+                return
+
+            headers["Content-Encoding"] = self.encoding
+            if not more_body:
+                message["body"] = self.middleware.compress(body, self.encoding, etag)
+                headers["Content-Length"] = str(len(message["body"]))
+                await self.forward(self.initial_message)
+                await self.forward(message)
+                return
+
+            del headers["Content-Length"]
+            self.compressor = build_compressor(
+                self.encoding, self.middleware.levels[self.encoding]
+            )
+            await self.forward(self.initial_message)
+
+        if self.compressor is None:
+            await self.forward(message)
+            return
+
+        message["body"] = self.compressor.process(body)
+        if not more_body:
+            message["body"] += self.compressor.finish()
+        await self.forward(message)
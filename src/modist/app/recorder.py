@@ -0,0 +1,669 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains the buffered recorder of mod release download events.
+
+Inserting every download into ``mod_release_download`` as it happens puts a database
+round trip on the download's critical path. Instead download events are enqueued into a
+bounded in-process buffer, which a background thread flushes into the database with a
+single ``COPY`` per batch once the batch is full or the flush interval has passed.
+
+Batches which can't be flushed because the database is unavailable are appended to a
+spill file, which is copied in along with the next batch that does flush. The spill
+file is shared by every process recording downloads, so it is only ever read, written
+or removed while holding an exclusive lock on its lock file. Events enqueued while the
+buffer is full are dropped rather than blocking the request.
+Repeated downloads of the same release from the same IP address within the
+deduplication window (as download managers and retry loops do) are collapsed into the
+first download before they are ever buffered.
+
+Along with the downloads themselves, each flush merges the downloaders of the batch
+into the daily :class:`~modist.hyperloglog.HyperLogLog` sketches of the downloaded mods
+and releases, which the download statistics estimate unique downloaders from.
+
+User agents are interned into the ``user_agent`` table rather than stored with every
+download. The recorder caches the identifiers of the user agents it has interned, so
+only user agents it hasn't seen before are copied in (and resolved) as text.
+"""
+
+import io
+import csv
+import json
+import fcntl
+import queue
+import logging
+from time import monotonic
+from uuid import UUID, uuid4
+from typing import (
+    Any,
+    Dict,
+    List,
+    Type,
+    Tuple,
+    TextIO,
+    Mapping,
+    Callable,
+    Hashable,
+    Iterator,
+    Optional,
+    NamedTuple,
+)
+from pathlib import Path
+from datetime import date, datetime, timezone
+from threading import Lock, Event, Thread
+from contextlib import contextmanager
+from dataclasses import field, dataclass
+
+import psycopg2
+from cachetools import LRUCache, TTLCache, cached
+from sqlalchemy import DateTime, text, select, tuple_, bindparam
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.engine import Connection
+from sqlalchemy.dialects import postgresql
+
+from ..db import Database
+from ..env import instance as env
+from .utils import get_db
+from ..models.mod import ModDownloadSketch, ModReleaseDownloadSketch
+from ..hyperloglog import HyperLogLog
+
+DOWNLOAD_COLUMNS = (
+    "downloaded_at",
+    "ip",
+    "headers",
+    "mod_release_id",
+    "mod_id",
+    "user_id",
+    "user_agent_id",
+)
+STAGING_COLUMNS = DOWNLOAD_COLUMNS + ("user_agent",)
+STAGING_TABLE_NAME = "mod_release_download_staging"
+REJECTED_SPILL_SUFFIX = ".rejected"
+SPILL_LOCK_SUFFIX = ".lock"
+USER_AGENT_CACHE_SIZE = 4096
+DEDUPLICATION_WINDOW = 60.0
+DEDUPLICATION_SIZE = 100000
+
+# NOTE: events are copied into a temporary staging table first, so downloads of
+# releases which don't exist (or don't belong to the given mod) are filtered out by the
+# join below rather than failing the entire batch on a foreign key violation
+CREATE_STAGING_SQL = (
+    f"CREATE TEMPORARY TABLE IF NOT EXISTS {STAGING_TABLE_NAME!s} ("
+    "downloaded_at timestamptz NOT NULL, ip inet NOT NULL, headers jsonb NOT NULL, "
+    "mod_release_id uuid NOT NULL, mod_id uuid NOT NULL, user_id uuid, "
+    "user_agent_id integer, user_agent text"
+    ") ON COMMIT DELETE ROWS"
+)
+COPY_STAGING_SQL = (
+    f"COPY {STAGING_TABLE_NAME!s} ({', '.join(STAGING_COLUMNS)!s}) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+INTERN_USER_AGENTS_SQL = (
+    "INSERT INTO user_agent (value) "
+    f"SELECT DISTINCT user_agent FROM {STAGING_TABLE_NAME!s} "
+    "WHERE user_agent_id IS NULL AND user_agent IS NOT NULL "
+    "ORDER BY user_agent ON CONFLICT (value) DO NOTHING"
+)
+RESOLVE_USER_AGENTS_STATEMENT = text(
+    f"UPDATE {STAGING_TABLE_NAME!s} AS staging SET user_agent_id = user_agent.id "
+    "FROM user_agent WHERE staging.user_agent_id IS NULL "
+    "AND staging.user_agent = user_agent.value "
+    "RETURNING user_agent.value, user_agent.id"
+)
+INSERT_DOWNLOADS_STATEMENT = text(
+    f"INSERT INTO mod_release_download ({', '.join(DOWNLOAD_COLUMNS)!s}) "
+    f"SELECT {', '.join('staging.' + column for column in DOWNLOAD_COLUMNS)!s} "
+    f"FROM {STAGING_TABLE_NAME!s} AS staging JOIN mod_release "
+    "ON mod_release.id = staging.mod_release_id "
+    "AND mod_release.mod_id = staging.mod_id "
+    "RETURNING mod_id, mod_release_id, downloaded_at, ip, user_id"
+).columns(
+    mod_id=postgresql.UUID(as_uuid=True),
+    mod_release_id=postgresql.UUID(as_uuid=True),
+    downloaded_at=DateTime(timezone=True),
+    ip=postgresql.INET,
+    user_id=postgresql.UUID(as_uuid=True),
+)
+
+CONNECTION_ERRORS = (
+    InterfaceError,
+    OperationalError,
+    psycopg2.InterfaceError,
+    psycopg2.OperationalError,
+)
+
+download_recorder_cache = LRUCache(maxsize=1)
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class DownloadEvent(object):
+    """Describes a single download of a mod release."""
+
+    mod_id: UUID
+    mod_release_id: UUID
+    ip: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    user_agent: Optional[str] = None
+    user_id: Optional[UUID] = None
+    downloaded_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class DeduplicationInfo(NamedTuple):
+    """Describes the hits and misses of a deduplication window."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class DeduplicationWindow(object):
+    """Collapses the repeats of keys seen within a time window.
+
+    Keys are remembered for ``window`` seconds from when they were first seen, in an
+    LRU bounded to ``maxsize`` keys. So memory stays bounded and, once full, the least
+    recently seen keys are forgotten early rather than blocking anything.
+    """
+
+    def __init__(
+        self, maxsize: int, window: float, timer: Callable[[], float] = monotonic
+    ):
+        """Initialize the deduplication window.
+
+        :param int maxsize: The maximum number of remembered keys
+        :param float window: The number of seconds a key is remembered for
+        :param Callable[[], float] timer: The timer of the window, optional, defaults
+            to :func:`time.monotonic`
+        """
+
+        self.hits = 0
+        self.misses = 0
+
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=window, timer=timer)
+        self._lock = Lock()
+
+    def seen(self, key: Hashable) -> bool:
+        """Check if a key was already seen within the window, remembering it if not.
+
+        :param Hashable key: The key to check
+        :return: True if the key is a repeat within the window, otherwise False
+        :rtype: bool
+        """
+
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                return True
+
+            self._cache[key] = True
+            self.misses += 1
+            return False
+
+    def info(self) -> DeduplicationInfo:
+        """Get the hits and misses of the deduplication window.
+
+        :return: The hits, misses, maximum and current size of the window
+        :rtype: DeduplicationInfo
+        """
+
+        with self._lock:
+            return DeduplicationInfo(
+                self.hits, self.misses, self._cache.maxsize, self._cache.currsize
+            )
+
+
+def write_download_events(
+    stream: TextIO, events: List[DownloadEvent], user_agents: Mapping[str, int]
+):
+    """Write the given download events as ``COPY`` compatible CSV rows.
+
+    :param TextIO stream: The text stream to write the rows to
+    :param List[DownloadEvent] events: The download events to write
+    :param Mapping[str, int] user_agents: The identifiers of already interned user
+        agents, which are written instead of the user agent itself
+    """
+
+    writer = csv.writer(stream)
+    for event in events:
+        user_agent_id = user_agents.get(event.user_agent)
+        writer.writerow(
+            (
+                event.downloaded_at.isoformat(),
+                event.ip,
+                json.dumps(event.headers, separators=(",", ":")),
+                str(event.mod_release_id),
+                str(event.mod_id),
+                str(event.user_id) if event.user_id is not None else None,
+                user_agent_id,
+                event.user_agent if user_agent_id is None else None,
+            )
+        )
+
+
+def get_downloader_key(ip: str, user_id: Optional[UUID]) -> str:
+    """Get the value identifying a downloader within the download sketches.
+
+    :param str ip: The IP address of the download
+    :param Optional[UUID] user_id: The user who downloaded, if known
+    :return: The user if known, otherwise the IP address of the download
+    :rtype: str
+    """
+
+    if user_id is not None:
+        return f"user:{user_id!s}"
+
+    return f"ip:{ip!s}"
+
+
+def merge_download_sketches(
+    connection: Connection,
+    model: Type[Any],
+    key_name: str,
+    sketches: Dict[Tuple[UUID, date], HyperLogLog],
+):
+    """Merge the given sketches into the existing daily sketches of a sketch model.
+
+    .. note:: Sketches which don't exist yet are inserted as is and the others are
+        locked in key order before being merged, so concurrent flushes from multiple
+        processes never lose each other's downloaders.
+
+    :param Connection connection: The connection to merge the sketches within
+    :param Type[Any] model: The sketch model with ``day`` and ``sketch`` columns
+    :param str key_name: The name of the column identifying the sketched resource
+    :param Dict[Tuple[UUID, date], HyperLogLog] sketches: The sketches to merge keyed by
+        the resource identifier and day they should be merged into
+    """
+
+    if len(sketches) <= 0:
+        return
+
+    table = model.__table__
+    key_column = table.c[key_name]
+    inserted = {
+        (row[key_name], row.day)
+        for row in connection.execute(
+            postgresql.insert(table)
+            .values(
+                [
+                    {
+                        key_name: key,
+                        "day": day,
+                        "sketch": sketches[(key, day)].to_bytes(),
+                    }
+                    for key, day in sorted(sketches)
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[key_name, "day"])
+            .returning(key_column, table.c.day)
+        )
+    }
+    existing = sorted(set(sketches) - inserted)
+    if len(existing) <= 0:
+        return
+
+    updates = []
+    for row in connection.execute(
+        select([key_column, table.c.day, table.c.sketch])
+        .where(tuple_(key_column, table.c.day).in_(existing))
+        .order_by(key_column, table.c.day)
+        .with_for_update()
+    ):
+        sketch = HyperLogLog(row.sketch)
+        sketch.merge(sketches[(row[key_name], row.day)])
+        updates.append(
+            {"_key": row[key_name], "_day": row.day, "_sketch": sketch.to_bytes()}
+        )
+
+    connection.execute(
+        table.update()
+        .where(key_column == bindparam("_key"))
+        .where(table.c.day == bindparam("_day"))
+        .values(sketch=bindparam("_sketch")),
+        updates,
+    )
+
+
+def update_download_sketches(connection: Connection, downloads: List[Any]):
+    """Merge the downloaders of the given downloads into the daily download sketches.
+
+    :param Connection connection: The connection to update the sketches within
+    :param List[Any] downloads: The downloads with ``mod_id``, ``mod_release_id``,
+        ``downloaded_at``, ``ip`` and ``user_id`` columns
+    """
+
+    mod_sketches: Dict[Tuple[UUID, date], HyperLogLog] = {}
+    release_sketches: Dict[Tuple[UUID, date], HyperLogLog] = {}
+    for download in downloads:
+        day = download.downloaded_at.astimezone(timezone.utc).date()
+        downloader = get_downloader_key(download.ip, download.user_id)
+        for sketches, key in (
+            (mod_sketches, (download.mod_id, day)),
+            (release_sketches, (download.mod_release_id, day)),
+        ):
+            # NOTE: downloads of deleted releases only count towards their mod
+            if key[0] is None:
+                continue
+            if key not in sketches:
+                sketches[key] = HyperLogLog()
+            sketches[key].add(downloader)
+
+    merge_download_sketches(connection, ModDownloadSketch, "mod_id", mod_sketches)
+    merge_download_sketches(
+        connection, ModReleaseDownloadSketch, "mod_release_id", release_sketches
+    )
+
+
+class DownloadRecorder(object):
+    """Buffers download events and flushes them into the database in batches.
+
+    >>> recorder = DownloadRecorder(get_db(), 10000, 1000, 1.0, Path("spill.csv"))
+    >>> recorder.start()
+    >>> recorder.record(DownloadEvent(mod_id, mod_release_id, "127.0.0.1"))
+    True
+    >>> recorder.stop()
+
+    """
+
+    def __init__(
+        self,
+        database: Database,
+        buffer_size: int,
+        flush_size: int,
+        flush_interval: float,
+        spill_path: Path,
+        user_agent_cache_size: int = USER_AGENT_CACHE_SIZE,
+        deduplication_window: float = DEDUPLICATION_WINDOW,
+        deduplication_size: int = DEDUPLICATION_SIZE,
+    ):
+        """Initialize the download recorder.
+
+        :param Database database: The database to flush download events into
+        :param int buffer_size: The maximum number of buffered download events
+        :param int flush_size: The maximum number of download events per flush
+        :param float flush_interval: The maximum number of seconds a download event is
+            buffered before it is flushed
+        :param Path spill_path: The path of the file to spill download events to while
+            the database is unavailable
+        :param int user_agent_cache_size: The maximum number of cached user agent
+            identifiers, optional, defaults to ``USER_AGENT_CACHE_SIZE``
+        :param float deduplication_window: The number of seconds repeated downloads of
+            a release from an IP address are collapsed for, disabled if not positive,
+            optional, defaults to ``DEDUPLICATION_WINDOW``
+        :param int deduplication_size: The maximum number of IP address and release
+            pairs remembered by the deduplication window, optional, defaults to
+            ``DEDUPLICATION_SIZE``
+        """
+
+        self.database = database
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self.user_agents: LRUCache = LRUCache(maxsize=user_agent_cache_size)
+        self.deduplication: Optional[DeduplicationWindow] = (
+            DeduplicationWindow(deduplication_size, deduplication_window)
+            if deduplication_window > 0
+            else None
+        )
+
+        self.flushed = 0
+        self.spilled = 0
+        self.dropped = 0
+
+        self._queue: queue.Queue = queue.Queue(maxsize=buffer_size)
+        self._counter_lock = Lock()
+        self._stopping = Event()
+        self._thread: Optional[Thread] = None
+
+    def record(self, event: DownloadEvent) -> bool:
+        """Enqueue a download event to be flushed, never blocking.
+
+        :param DownloadEvent event: The download event to record
+        :return: True if the event was enqueued, False if it was dropped or collapsed
+            into a previous download
+        :rtype: bool
+        """
+
+        if self.deduplication is not None and self.deduplication.seen(
+            (event.ip, event.mod_release_id)
+        ):
+            return False
+
+        if not self._stopping.is_set():
+            try:
+                self._queue.put_nowait(event)
+                return True
+            except queue.Full:
+                pass
+
+        with self._counter_lock:
+            self.dropped += 1
+        return False
+
+    def start(self):
+        """Start the background thread flushing the buffered download events."""
+
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopping.clear()
+        self._thread = Thread(
+            target=self._run, name=self.__class__.__qualname__, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the background thread after flushing all buffered download events.
+
+        :param Optional[float] timeout: The maximum number of seconds to wait for the
+            buffered download events to be flushed, optional, defaults to None
+        """
+
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def flush(self, events: List[DownloadEvent]) -> bool:
+        """Flush the given and any spilled download events into the database.
+
+        .. note:: If the spill file exists, the spill file's lock is held for the
+            whole flush, so concurrent flushes from other processes never copy in
+            (or remove) the same spilled download events twice.
+
+        :param List[DownloadEvent] events: The download events to flush
+        :return: True if the events were flushed, False if they were spilled or dropped
+        :rtype: bool
+        """
+
+        if not self.spill_path.exists():
+            if len(events) <= 0:
+                return True
+
+            return self._flush(events, False)
+
+        with self._lock_spill():
+            return self._flush(events, True)
+
+    def _flush(self, events: List[DownloadEvent], locked: bool) -> bool:
+        """Flush the given and, if the spill file's lock is held, the spilled events.
+
+        :param List[DownloadEvent] events: The download events to flush
+        :param bool locked: Whether the spill file's lock is held
+        :return: True if the events were flushed, False if they were spilled or dropped
+        :rtype: bool
+        """
+
+        include_spill = locked and self.spill_path.exists()
+        try:
+            try:
+                interned = self._copy(events, include_spill)
+            except (DBAPIError, psycopg2.Error) as exc:
+                if not include_spill or isinstance(exc, CONNECTION_ERRORS):
+                    raise
+
+                # NOTE: the batch is retried without the spill file, so the spill file
+                # is only set aside for inspection if it (rather than a row of the
+                # batch) was rejected, for example after a partial write
+                interned = self._copy(events, False)
+                self._reject_spill()
+                include_spill = False
+        except CONNECTION_ERRORS:
+            self._write_spill(events, locked)
+            return False
+        except (DBAPIError, psycopg2.Error):
+            log.exception("Dropped %d rejected download events", len(events))
+            with self._counter_lock:
+                self.dropped += len(events)
+            return False
+
+        # NOTE: user agents are only cached once their transaction has committed, so
+        # cached identifiers are always safe to write to the spill file
+        self.user_agents.update(interned)
+        if include_spill:
+            self.spill_path.unlink()
+        with self._counter_lock:
+            self.flushed += len(events)
+        return True
+
+    def _copy(self, events: List[DownloadEvent], include_spill: bool) -> Dict[str, int]:
+        """Copy the given and optionally the spilled download events in a transaction.
+
+        :param List[DownloadEvent] events: The download events to copy in
+        :param bool include_spill: Whether the spill file should be copied in
+        :return: The identifiers of the user agents interned by the transaction
+        :rtype: Dict[str, int]
+        """
+
+        buffer = io.StringIO()
+        write_download_events(buffer, events, self.user_agents)
+        buffer.seek(0)
+
+        with self.database.engine.begin() as connection:
+            with connection.connection.cursor() as cursor:
+                cursor.execute(CREATE_STAGING_SQL)
+                if include_spill:
+                    with self.spill_path.open("r", newline="") as spill:
+                        cursor.copy_expert(COPY_STAGING_SQL, spill)
+                cursor.copy_expert(COPY_STAGING_SQL, buffer)
+                cursor.execute(INTERN_USER_AGENTS_SQL)
+            interned = dict(
+                connection.execute(RESOLVE_USER_AGENTS_STATEMENT).fetchall()
+            )
+            update_download_sketches(
+                connection, connection.execute(INSERT_DOWNLOADS_STATEMENT).fetchall(),
+            )
+
+        return interned
+
+    @contextmanager
+    def _lock_spill(self) -> Iterator[None]:
+        """Hold an exclusive lock on the spill file across every process.
+
+        :return: A context manager holding the lock until it exits
+        :rtype: Iterator[None]
+        """
+
+        lock_path = self.spill_path.with_name(self.spill_path.name + SPILL_LOCK_SUFFIX)
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with lock_path.open("a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _reject_spill(self):
+        """Set the spill file aside under a unique name for inspection.
+
+        .. note:: The spill file's lock must be held.
+        """
+
+        rejected_path = self.spill_path.with_name(
+            f"{self.spill_path.name!s}.{uuid4().hex!s}{REJECTED_SPILL_SUFFIX!s}"
+        )
+        self.spill_path.replace(rejected_path)
+        log.error("Set aside rejected download spill file as %s", rejected_path)
+
+    def _write_spill(self, events: List[DownloadEvent], locked: bool = False):
+        """Append the given download events to the spill file.
+
+        :param List[DownloadEvent] events: The download events to spill
+        :param bool locked: Whether the spill file's lock is already held, optional,
+            defaults to False
+        """
+
+        if len(events) <= 0:
+            return
+
+        if not locked:
+            with self._lock_spill():
+                self._write_spill(events, True)
+            return
+
+        with self.spill_path.open("a", newline="") as spill:
+            write_download_events(spill, events, self.user_agents)
+        with self._counter_lock:
+            self.spilled += len(events)
+
+    def _take_batch(self) -> List[DownloadEvent]:
+        """Take the next batch of download events from the buffer.
+
+        :return: Up to ``flush_size`` download events, waiting at most
+            ``flush_interval`` seconds for the batch to fill unless stopping
+        :rtype: List[DownloadEvent]
+        """
+
+        events: List[DownloadEvent] = []
+        deadline = monotonic() + self.flush_interval
+        while len(events) < self.flush_size:
+            try:
+                if self._stopping.is_set():
+                    events.append(self._queue.get_nowait())
+                else:
+                    events.append(
+                        self._queue.get(timeout=max(deadline - monotonic(), 0))
+                    )
+            except queue.Empty:
+                break
+
+        return events
+
+    def _run(self):
+        """Flush batches of buffered download events until stopped and drained."""
+
+        while True:
+            events = self._take_batch()
+            try:
+                self.flush(events)
+            except Exception:
+                # NOTE: an unexpected failure (for example the spill file being
+                # unwritable) drops the batch rather than ending the thread, which
+                # would otherwise leave every later download to be dropped
+                log.exception("Failed to flush %d download events", len(events))
+                with self._counter_lock:
+                    self.dropped += len(events)
+
+            if self._stopping.is_set() and self._queue.empty():
+                break
+
+
+@cached(cache=download_recorder_cache)
+def get_download_recorder() -> DownloadRecorder:
+    """Fetch the global application's download recorder instance.
+
+    :return: The initialized download recorder instance
+    :rtype: DownloadRecorder
+    """
+
+    return DownloadRecorder(
+        get_db(),
+        env.app.downloads.buffer_size,
+        env.app.downloads.flush_size,
+        env.app.downloads.flush_interval,
+        Path(env.app.downloads.spill_path),
+        user_agent_cache_size=env.app.downloads.user_agent_cache_size,
+        deduplication_window=env.app.downloads.deduplication_window,
+        deduplication_size=env.app.downloads.deduplication_size,
+    )
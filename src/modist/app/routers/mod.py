@@ -0,0 +1,191 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains the application's mod router and views."""
+
+from uuid import UUID
+from typing import List, Union, Optional
+
+from fastapi import Query, Depends, Request, APIRouter, status
+from starlette.responses import Response
+
+from ..content import MessagePackRoute
+from ..filters import (
+    DateRange,
+    AnalyticsFilter,
+    CollectionFilter,
+    KeysetPagination,
+    ids_filters,
+    analytics_filters,
+    collection_filters,
+    date_range_filters,
+    keyset_pagination_filters,
+)
+from ..conditional import (
+    ConditionalHeaders,
+    get_representation,
+    conditional_headers,
+    respond_conditionally,
+)
+from ..schemas.mod import (
+    ModSchema,
+    ModDetailSchema,
+    ModListingSchema,
+    ModReleaseSchema,
+    ModRatingVersionSummarySchema,
+)
+from ..schemas.user import UserSchema
+from ..services.mod import (
+    get_mods,
+    search_mods,
+    get_mod_detail,
+    get_mods_by_ids,
+    get_mods_validators,
+    get_latest_mod_release,
+    search_mods_validators,
+    get_mod_rating_versions,
+    get_mod_detail_validators,
+)
+from ..services.user import get_current_active_user
+from ..schemas.download import DownloadAnalyticsSchema, DownloadStatisticsSchema
+from ..services.download import (
+    get_mod_download_analytics,
+    get_mod_download_statistics,
+    record_mod_release_download,
+)
+from ..schemas.collection import BatchSchema, CollectionSchema, KeysetCollectionSchema
+
+router = APIRouter(route_class=MessagePackRoute)
+
+# NOTE: credentials sent with a download are never recorded with the download
+CREDENTIAL_HEADERS = frozenset(("authorization", "cookie", "proxy-authorization"))
+
+
+@router.get("/", response_model=CollectionSchema[ModListingSchema])
+def get_mods_collection(
+    request: Request,
+    response: Response,
+    filters: CollectionFilter = Depends(collection_filters),
+    conditions: ConditionalHeaders = Depends(conditional_headers),
+) -> Union[CollectionSchema[ModListingSchema], Response]:
+    """Fetch a page of the mod catalog."""
+
+    return respond_conditionally(
+        get_mods_validators(filters, get_representation(request)),
+        response,
+        conditions,
+        get_mods,
+        filters,
+    )
+
+
+@router.get("/search", response_model=KeysetCollectionSchema[ModListingSchema])
+def get_mods_search(
+    request: Request,
+    response: Response,
+    q: str = Query(
+        ...,
+        title="Search query",
+        description="The words to search mod names and descriptions for",
+        min_length=1,
+        max_length=256,
+    ),
+    pagination: KeysetPagination = Depends(keyset_pagination_filters),
+    conditions: ConditionalHeaders = Depends(conditional_headers),
+) -> Union[KeysetCollectionSchema[ModListingSchema], Response]:
+    """Search the mod catalog by the words in mod names and descriptions."""
+
+    return respond_conditionally(
+        search_mods_validators(q, pagination, get_representation(request)),
+        response,
+        conditions,
+        search_mods,
+        q,
+        pagination,
+    )
+
+
+@router.get("/batch", response_model=BatchSchema[ModSchema])
+def get_mods_batch(ids: List[UUID] = Depends(ids_filters)) -> BatchSchema[ModSchema]:
+    """Fetch a batch of mods by their identifiers."""
+
+    return get_mods_by_ids(ids)
+
+
+@router.get("/{mod_id}/releases/latest", response_model=ModReleaseSchema)
+def get_mod_latest_release(
+    mod_id: UUID,
+    host_release_id: Optional[UUID] = Query(
+        None,
+        title="Host release",
+        description="The host release the latest release should be for",
+    ),
+) -> ModReleaseSchema:
+    """Fetch the release of a mod with the highest version."""
+
+    return get_latest_mod_release(mod_id, host_release_id=host_release_id)
+
+
+@router.post(
+    "/{mod_id}/releases/{mod_release_id}/downloads",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def post_mod_release_download(mod_id: UUID, mod_release_id: UUID, request: Request):
+    """Record a download of a mod release to be counted in its download statistics."""
+
+    record_mod_release_download(
+        mod_id,
+        mod_release_id,
+        request.client.host,
+        {
+            name: value
+            for name, value in request.headers.items()
+            if name not in CREDENTIAL_HEADERS
+        },
+    )
+
+
+@router.get("/{mod_id}", response_model=ModDetailSchema)
+def get_mod(
+    mod_id: UUID,
+    request: Request,
+    response: Response,
+    conditions: ConditionalHeaders = Depends(conditional_headers),
+) -> Union[ModDetailSchema, Response]:
+    """Fetch a mod along with the resources shown on its detail page."""
+
+    return respond_conditionally(
+        get_mod_detail_validators(mod_id, get_representation(request)),
+        response,
+        conditions,
+        get_mod_detail,
+        mod_id,
+    )
+
+
+@router.get("/{mod_id}/ratings", response_model=List[ModRatingVersionSummarySchema])
+def get_mod_ratings(mod_id: UUID) -> List[ModRatingVersionSummarySchema]:
+    """Fetch the summary of the ratings of each rated version of a mod."""
+
+    return get_mod_rating_versions(mod_id)
+
+
+@router.get("/{mod_id}/downloads", response_model=DownloadStatisticsSchema)
+def get_mod_downloads(
+    mod_id: UUID, date_range: DateRange = Depends(date_range_filters)
+) -> DownloadStatisticsSchema:
+    """Fetch the total downloads of a mod and its downloads per day."""
+
+    return get_mod_download_statistics(mod_id, date_range)
+
+
+@router.get("/{mod_id}/analytics", response_model=DownloadAnalyticsSchema)
+def get_mod_analytics(
+    mod_id: UUID,
+    analytics: AnalyticsFilter = Depends(analytics_filters),
+    user: UserSchema = Depends(get_current_active_user),
+) -> DownloadAnalyticsSchema:
+    """Fetch the downloads of a mod over time for its author."""
+
+    return get_mod_download_analytics(mod_id, user, analytics)
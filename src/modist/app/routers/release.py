@@ -0,0 +1,47 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains the application's mod release router and views."""
+
+from uuid import UUID
+from typing import List
+
+from fastapi import Depends, APIRouter
+
+from ..content import MessagePackRoute
+from ..filters import DateRange, ids_filters, date_range_filters
+from ..schemas.mod import ModReleaseSchema
+from ..services.mod import get_mod_releases_by_ids
+from ..schemas.download import DownloadStatisticsSchema
+from ..schemas.resolver import ResolutionSchema, ResolutionRequestSchema
+from ..services.download import get_mod_release_download_statistics
+from ..services.resolver import resolve_mod_releases
+from ..schemas.collection import BatchSchema
+
+router = APIRouter(route_class=MessagePackRoute)
+
+
+@router.get("/batch", response_model=BatchSchema[ModReleaseSchema])
+def get_releases_batch(
+    ids: List[UUID] = Depends(ids_filters),
+) -> BatchSchema[ModReleaseSchema]:
+    """Fetch a batch of mod releases by their identifiers."""
+
+    return get_mod_releases_by_ids(ids)
+
+
+@router.post("/resolve", response_model=ResolutionSchema)
+def post_releases_resolve(resolution: ResolutionRequestSchema) -> ResolutionSchema:
+    """Resolve a consistent set of releases of the requested mods for a host release."""
+
+    return resolve_mod_releases(resolution)
+
+
+@router.get("/{mod_release_id}/downloads", response_model=DownloadStatisticsSchema)
+def get_release_downloads(
+    mod_release_id: UUID, date_range: DateRange = Depends(date_range_filters)
+) -> DownloadStatisticsSchema:
+    """Fetch the total downloads of a mod release and its downloads per day."""
+
+    return get_mod_release_download_statistics(mod_release_id, date_range)
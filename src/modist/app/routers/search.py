@@ -0,0 +1,46 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains the application's search router and views."""
+
+from typing import List
+
+from fastapi import Query, APIRouter
+
+from ..content import MessagePackRoute
+from ..schemas.search import CompletionSchema, SuggestionSchema
+from ..services.search import get_suggestions
+from ..services.autocomplete import get_completions
+
+router = APIRouter(route_class=MessagePackRoute)
+
+
+@router.get("/suggestions", response_model=List[SuggestionSchema])
+def get_search_suggestions(
+    q: str = Query(
+        ...,
+        title="Search query",
+        description="The possibly misspelled search to suggest resources for",
+        min_length=1,
+        max_length=256,
+    )
+) -> List[SuggestionSchema]:
+    """Fetch "did you mean" suggestions for a possibly misspelled search."""
+
+    return get_suggestions(q)
+
+
+@router.get("/autocomplete", response_model=List[CompletionSchema])
+def get_search_autocomplete(
+    q: str = Query(
+        ...,
+        title="Search prefix",
+        description="The partially typed search to complete",
+        min_length=1,
+        max_length=64,
+    )
+) -> List[CompletionSchema]:
+    """Fetch the tags and popular mods that complete a partially typed search."""
+
+    return get_completions(q)
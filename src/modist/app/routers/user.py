@@ -4,14 +4,18 @@
 
 """Contains the application's user router and views."""
 
-from typing import Optional
+from uuid import UUID
+from typing import List, Optional
 
 from fastapi import Depends, APIRouter
 
-from ..schemas.user import UserSchema, UserMutationSchema
-from ..services.user import create_user, get_current_active_user
+from ..content import MessagePackRoute
+from ..filters import ids_filters
+from ..schemas.user import UserSchema, UserPublicSchema, UserMutationSchema
+from ..services.user import create_user, get_users_by_ids, get_current_active_user
+from ..schemas.collection import BatchSchema
 
-router = APIRouter()
+router = APIRouter(route_class=MessagePackRoute)
 
 
 @router.get("/me", response_model=UserSchema)
@@ -21,6 +25,15 @@ def get_me(current_user: UserSchema = Depends(get_current_active_user)) -> UserS
     return current_user
 
 
+@router.get("/batch", response_model=BatchSchema[UserPublicSchema])
+def get_users_batch(
+    ids: List[UUID] = Depends(ids_filters),
+) -> BatchSchema[UserPublicSchema]:
+    """Fetch a batch of users by their identifiers."""
+
+    return get_users_by_ids(ids)
+
+
 @router.post("/", response_model=UserSchema)
 def post_user(user_data: UserMutationSchema) -> Optional[UserSchema]:
     """Create a new user."""
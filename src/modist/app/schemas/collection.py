@@ -0,0 +1,39 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains schemas related to collection resources."""
+
+from uuid import UUID
+from typing import List, Generic, TypeVar, Optional
+
+from pydantic.generics import GenericModel
+
+from ..filters import CountStrategy
+
+Schema_T = TypeVar("Schema_T")
+
+
+class CollectionSchema(GenericModel, Generic[Schema_T]):
+    """Describes a paginated collection of documents."""
+
+    page: int
+    size: int
+    count: CountStrategy
+    total: Optional[int]
+    results: List[Schema_T]
+
+
+class BatchSchema(GenericModel, Generic[Schema_T]):
+    """Describes a batch of documents fetched by their identifiers."""
+
+    results: List[Schema_T]
+    missing: List[UUID]
+
+
+class KeysetCollectionSchema(GenericModel, Generic[Schema_T]):
+    """Describes a keyset paginated collection of documents."""
+
+    size: int
+    next: Optional[str]
+    results: List[Schema_T]
@@ -0,0 +1,72 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains schemas related to common leaf resources."""
+
+from uuid import UUID
+from typing import Optional
+
+from pydantic import BaseModel
+
+from ...models.common import Tag, Category
+from ...models._mixins import RankingTallyMixin
+
+
+class TagSchema(BaseModel):
+    """Describes a content tag."""
+
+    id: UUID
+    name: str
+    description: Optional[str]
+
+    @classmethod
+    def from_model(cls, model: Tag) -> "TagSchema":
+        """Create an instance of the schema from the related tag model.
+
+        :param Tag model: The tag model representation of the tag
+        """
+
+        return cls(id=model.id, name=model.name, description=model.description)
+
+
+class CategorySchema(BaseModel):
+    """Describes a category."""
+
+    id: UUID
+    parent_id: Optional[UUID]
+    name: str
+    description: Optional[str]
+    depth: int
+
+    @classmethod
+    def from_model(cls, model: Category) -> "CategorySchema":
+        """Create an instance of the schema from the related category model.
+
+        :param Category model: The category model representation of the category
+        """
+
+        return cls(
+            id=model.id,
+            parent_id=model.parent_id,
+            name=model.name,
+            description=model.description,
+            depth=model.depth,
+        )
+
+
+class RankingTallySchema(BaseModel):
+    """Describes the vote tallies of a ranked resource."""
+
+    up: int = 0
+    down: int = 0
+    net: int = 0
+
+    @classmethod
+    def from_model(cls, model: RankingTallyMixin) -> "RankingTallySchema":
+        """Create an instance of the schema from any ranking tally model.
+
+        :param RankingTallyMixin model: The tally model representation of the tallies
+        """
+
+        return cls(up=model.up, down=model.down, net=model.net)
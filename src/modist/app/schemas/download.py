@@ -0,0 +1,63 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains schemas related to download statistics."""
+
+from uuid import UUID
+from typing import List
+from datetime import date
+
+from pydantic import BaseModel
+
+from ..filters import Granularity, DownloadGrouping
+
+
+class DownloadCountSchema(BaseModel):
+    """Describes the number of downloads on a single day."""
+
+    day: date
+    count: int
+
+
+class DownloadStatisticsSchema(BaseModel):
+    """Describes the total downloads of a resource and its downloads per day.
+
+    .. note:: Only days with at least one download are included in the ``series``.
+        ``unique`` is an estimate (within about 2%) of the number of distinct users or
+        IP addresses which downloaded the resource between ``start`` and ``end``.
+    """
+
+    total: int
+    unique: int
+    start: date
+    end: date
+    series: List[DownloadCountSchema]
+
+
+class DownloadSeriesSchema(BaseModel):
+    """Describes the downloads of a single resource over time.
+
+    .. note:: Each point's ``day`` is the first day of its bucket, and every bucket of
+        the range is included (with a count of 0 if it had no downloads).
+    """
+
+    id: UUID
+    name: str
+    total: int
+    points: List[DownloadCountSchema]
+
+
+class DownloadAnalyticsSchema(BaseModel):
+    """Describes the downloads of a mod over time broken down by a related resource.
+
+    .. note:: ``resolution`` is the number of ``granularity`` buckets merged into each
+        point so that no series has more points than requested.
+    """
+
+    start: date
+    end: date
+    granularity: Granularity
+    group_by: DownloadGrouping
+    resolution: int
+    series: List[DownloadSeriesSchema]
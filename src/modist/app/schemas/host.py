@@ -0,0 +1,41 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains schemas related to host routes and services."""
+
+from uuid import UUID
+from typing import Optional
+
+from pydantic import BaseModel
+
+from ...models.host import Host
+
+
+class HostSchema(BaseModel):
+    """Describes a host."""
+
+    id: UUID
+    slug: str
+    name: str
+    description: Optional[str]
+    banner_image: Optional[str]
+    avatar_image: Optional[str]
+    host_publisher_id: UUID
+
+    @classmethod
+    def from_model(cls, model: Host) -> "HostSchema":
+        """Create an instance of the schema from the related host model.
+
+        :param Host model: The host model representation of the host
+        """
+
+        return cls(
+            id=model.id,
+            slug=model.slug,
+            name=model.name,
+            description=model.description,
+            banner_image=model.banner_image,
+            avatar_image=model.avatar_image,
+            host_publisher_id=model.host_publisher_id,
+        )
@@ -0,0 +1,189 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains schemas related to mod routes and services."""
+
+from uuid import UUID
+from typing import List, Optional
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from .host import HostSchema
+from .user import UserPublicSchema
+from .common import TagSchema, CategorySchema, RankingTallySchema
+from ...models.mod import Mod, ModRelease
+
+
+class ModReleaseSchema(BaseModel):
+    """Describes a mod release."""
+
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+    version: str
+    description: Optional[str]
+    size: int
+    checksum: str
+    mod_id: UUID
+    host_release_id: UUID
+
+    @classmethod
+    def from_model(cls, model: ModRelease) -> "ModReleaseSchema":
+        """Create an instance of the schema from the related mod release model.
+
+        :param ModRelease model: The mod release model representation of the release
+        """
+
+        return cls(
+            id=model.id,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+            version=str(model.version),
+            description=model.description,
+            size=model.size,
+            checksum=model.checksum,
+            mod_id=model.mod_id,
+            host_release_id=model.host_release_id,
+        )
+
+
+class ModSchema(BaseModel):
+    """Describes a mod."""
+
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+    slug: str
+    name: str
+    description: Optional[str]
+    banner_image: Optional[str]
+    avatar_image: Optional[str]
+    user_id: UUID
+    host_id: UUID
+    category_id: Optional[UUID]
+    age_restriction_id: Optional[UUID]
+
+    @classmethod
+    def from_model(cls, model: Mod) -> "ModSchema":
+        """Create an instance of the schema from the related mod model.
+
+        :param Mod model: The mod model representation of the mod
+        """
+
+        return cls(
+            id=model.id,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+            slug=model.slug,
+            name=model.name,
+            description=model.description,
+            banner_image=model.banner_image,
+            avatar_image=model.avatar_image,
+            user_id=model.user_id,
+            host_id=model.host_id,
+            category_id=model.category_id,
+            age_restriction_id=model.age_restriction_id,
+        )
+
+
+class ModListingSchema(ModSchema):
+    """Describes a mod along with the related resources shown in mod listings."""
+
+    user: UserPublicSchema
+    host: HostSchema
+    category: Optional[CategorySchema]
+    tags: List[TagSchema]
+    latest_release: Optional[ModReleaseSchema]
+    ranking_tally: RankingTallySchema
+
+    @classmethod
+    def from_model(cls, model: Mod) -> "ModListingSchema":
+        """Create an instance of the schema from the related mod model.
+
+        .. note:: This accesses the ``user``, ``host``, ``category``, ``tags``,
+            ``latest_release``, and ``ranking_tally`` relationships of the mod. So the
+            mod should be loaded with those relationships eagerly loaded to avoid a
+            lazy load per relationship. Mods which were never ranked have no tally and
+            are described with zeroed tallies.
+
+        :param Mod model: The mod model representation of the mod
+        """
+
+        return cls(
+            **ModSchema.from_model(model).dict(),
+            user=UserPublicSchema.from_model(model.user),
+            host=HostSchema.from_model(model.host),
+            category=(
+                CategorySchema.from_model(model.category)
+                if model.category is not None
+                else None
+            ),
+            tags=[TagSchema.from_model(tag) for tag in model.tags],
+            latest_release=(
+                ModReleaseSchema.from_model(model.latest_release)
+                if model.latest_release is not None
+                else None
+            ),
+            ranking_tally=(
+                RankingTallySchema.from_model(model.ranking_tally)
+                if model.ranking_tally is not None
+                else RankingTallySchema()
+            ),
+        )
+
+
+class ModReleaseArtifactSchema(BaseModel):
+    """Describes a downloadable artifact of a mod release."""
+
+    id: UUID
+    name: str
+    path: str
+    size: int
+    mimetype: str
+    checksum: str
+
+
+class ModReleaseDetailSchema(ModReleaseSchema):
+    """Describes a mod release along with its artifacts."""
+
+    artifacts: List[ModReleaseArtifactSchema]
+
+
+class ModRatingSummarySchema(BaseModel):
+    """Describes a summary of the ratings of a mod.
+
+    .. note:: ``bayesian_average`` is the average pulled towards the mean of all mod
+        ratings by ``APP_RATINGS_PRIOR_COUNT`` virtual ratings, so mods with few ratings
+        don't outrank mods with many. ``histogram[n]`` counts the ratings from ``n`` up
+        to (but excluding) ``n + 1``.
+    """
+
+    count: int
+    average: Optional[float]
+    deviation: Optional[float]
+    bayesian_average: float
+    histogram: List[int]
+
+
+class ModRatingVersionSummarySchema(ModRatingSummarySchema):
+    """Describes a summary of the ratings of a single version of a mod."""
+
+    version: str
+
+
+class ModDetailSchema(ModSchema):
+    """Describes a mod along with the related resources shown on its detail page.
+
+    .. note:: Unlike the other mod schemas this is not built from a mod model. The
+        detail payload is shaped by the database in a single query, so instances are
+        parsed from that payload instead.
+    """
+
+    user: UserPublicSchema
+    host: HostSchema
+    category: Optional[CategorySchema]
+    tags: List[TagSchema]
+    releases: List[ModReleaseDetailSchema]
+    rating: ModRatingSummarySchema
@@ -0,0 +1,48 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains schemas related to dependency resolution routes and services."""
+
+from uuid import UUID
+from typing import List
+
+from pydantic import BaseModel, validator
+
+from .mod import ModReleaseSchema
+from ...env import instance as env
+
+
+class ResolutionRequestSchema(BaseModel):
+    """Describes a request to resolve the releases of mods for a host release."""
+
+    mod_ids: List[UUID]
+    host_release_id: UUID
+
+    @validator("mod_ids")
+    def _validate_mod_ids(cls, mod_ids: List[UUID]) -> List[UUID]:  # noqa
+        """Validate that a reasonable number of mods is requested.
+
+        :param List[UUID] mod_ids: The requested mods' unique identifiers
+        :raises ValueError: If no or too many mods are requested
+        :return: The unique requested mods' identifiers in their requested order
+        :rtype: List[UUID]
+        """
+
+        mod_ids = list(dict.fromkeys(mod_ids))
+        if len(mod_ids) <= 0:
+            raise ValueError("at least one mod must be requested")
+        if len(mod_ids) > env.app.collection.batch_maximum_size:
+            raise ValueError(
+                "cannot request more than "
+                f"{env.app.collection.batch_maximum_size!s} mods"
+            )
+
+        return mod_ids
+
+
+class ResolutionSchema(BaseModel):
+    """Describes a consistent set of mod releases for a host release."""
+
+    host_release_id: UUID
+    releases: List[ModReleaseSchema]
@@ -0,0 +1,35 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains schemas related to search routes and services."""
+
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SuggestionType(Enum):
+    """Enumeration of the resource types that can be suggested."""
+
+    MOD = "mod"
+    HOST = "host"
+    TAG = "tag"
+
+
+class SuggestionSchema(BaseModel):
+    """Describes a suggested resource for a possibly misspelled search."""
+
+    id: UUID
+    type: SuggestionType
+    text: str
+    similarity: float
+
+
+class CompletionSchema(BaseModel):
+    """Describes a resource completing a partially typed search."""
+
+    id: UUID
+    type: SuggestionType
+    text: str
@@ -87,3 +87,30 @@ class UserSchema(BaseModel):
             bio=model.bio,
             preferences=model.preferences,
         )
+
+
+class UserPublicSchema(BaseModel):
+    """Describes the publicly visible details of a user."""
+
+    id: UUID
+    display_name: str
+    bio: Optional[str]
+    avatar_image: Optional[str]
+    status_emoji: Optional[str]
+    status: Optional[str]
+
+    @classmethod
+    def from_model(cls, model: User) -> "UserPublicSchema":
+        """Create an instance of the schema from the related user model.
+
+        :param User user: The user model representation of the user
+        """
+
+        return cls(
+            id=model.id,
+            display_name=model.display_name,
+            bio=model.bio,
+            avatar_image=model.avatar_image,
+            status_emoji=model.status_emoji,
+            status=model.status,
+        )
@@ -0,0 +1,411 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains service methods for autocompleting partially typed searches.
+
+Autocompletion requests are made on every keystroke, so they are served entirely from
+in-process prefix indexes rather than the database. The indexes contain every active
+tag and the names of the ``APP_AUTOCOMPLETE_MOD_LIMIT`` most downloaded active mods.
+Every ``APP_AUTOCOMPLETE_REFRESH_INTERVAL`` seconds a background thread updates the
+indexes with only the rows whose ``updated_at`` changed since the last refresh. Every
+``APP_AUTOCOMPLETE_REBUILD_INTERVAL`` seconds the indexes are fully rebuilt instead,
+which also recalculates the most downloaded mods and drops deleted rows. Rebuilt
+indexes are built aside and swapped in, so requests are never served an empty or
+partially built index and never wait on the database.
+"""
+
+import time
+import bisect
+import logging
+from uuid import UUID
+from typing import Any, Set, Dict, List, Type, Tuple, Optional
+from datetime import datetime
+from threading import Lock, Event, RLock, Thread
+
+from sqlalchemy.orm import Query, Session
+
+from ...env import instance as env
+from ..utils import get_db
+from .collection import filter_by_ids
+from ...models.mod import Mod, ModDownloadTotal
+from ...models.common import Tag
+from ..schemas.search import SuggestionType, CompletionSchema
+
+
+def _normalize(text: str) -> str:
+    """Normalize the given text for case insensitive prefix comparisons.
+
+    :param str text: The text to normalize
+    :return: The normalized text
+    :rtype: str
+    """
+
+    return " ".join(text.casefold().split())
+
+
+class PrefixIndex(object):
+    """Describes a bounded in-memory index of texts searchable by prefix.
+
+    Texts are stored as a sorted array of normalized keys which is searched with
+    :mod:`bisect`. Each text is indexed by every one of its words, so ``"weath"``
+    completes ``"Realistic Weather"``.
+
+    >>> index = PrefixIndex()
+    >>> index.upsert(mod_id, "Realistic Weather")
+    >>> index.search("weath", 10)
+    [(UUID(...), 'Realistic Weather')]
+
+    """
+
+    def __init__(self):
+        """Initialize an empty prefix index."""
+
+        self._keys: List[Tuple[str, UUID]] = []
+        self._texts: Dict[UUID, str] = {}
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        """Get the number of texts in the index.
+
+        :return: The number of texts in the index
+        :rtype: int
+        """
+
+        return len(self._texts)
+
+    def __contains__(self, record_id: UUID) -> bool:
+        """Check if a given record is within the index.
+
+        :param UUID record_id: The unique identifier of the record
+        :return: True if the record is indexed, otherwise False
+        :rtype: bool
+        """
+
+        return record_id in self._texts
+
+    @staticmethod
+    def _build_keys(text: str) -> List[str]:
+        """Build the keys a given text should be indexed by.
+
+        :param str text: The text to build keys for
+        :return: The normalized text starting at each of its words
+        :rtype: List[str]
+        """
+
+        words = _normalize(text).split(" ")
+        return list({" ".join(words[index:]) for index in range(len(words))})
+
+    def upsert(self, record_id: UUID, text: str):
+        """Insert or update the text of a given record.
+
+        :param UUID record_id: The unique identifier of the record
+        :param str text: The text of the record
+        """
+
+        with self._lock:
+            self.remove(record_id)
+            self._texts[record_id] = text
+            for key in self._build_keys(text):
+                bisect.insort(self._keys, (key, record_id))
+
+    def load(self, records: List[Tuple[UUID, str]]):
+        """Replace the contents of the index with the given records.
+
+        .. note:: This sorts the keys of every record once rather than inserting each
+            key into its sorted position, so (re)building a large index is
+            ``O(n log n)`` rather than ``O(n^2)``.
+
+        :param List[Tuple[UUID, str]] records: The record identifiers and texts to
+            index
+        """
+
+        texts = dict(records)
+        keys = sorted(
+            (key, record_id)
+            for record_id, text in texts.items()
+            for key in self._build_keys(text)
+        )
+        with self._lock:
+            self._keys = keys
+            self._texts = texts
+
+    def remove(self, record_id: UUID):
+        """Remove a given record from the index if it is indexed.
+
+        :param UUID record_id: The unique identifier of the record
+        """
+
+        with self._lock:
+            text = self._texts.pop(record_id, None)
+            if text is None:
+                return
+
+            for key in self._build_keys(text):
+                index = bisect.bisect_left(self._keys, (key, record_id))
+                if index < len(self._keys) and self._keys[index] == (key, record_id):
+                    del self._keys[index]
+
+    def clear(self):
+        """Remove every record from the index."""
+
+        with self._lock:
+            self._keys = []
+            self._texts = {}
+
+    def search(self, prefix: str, limit: int) -> List[Tuple[UUID, str]]:
+        """Search the index for records with a word starting with the given prefix.
+
+        :param str prefix: The prefix to search for
+        :param int limit: The maximum number of records to return
+        :return: A list of the matching record identifiers and texts
+        :rtype: List[Tuple[UUID, str]]
+        """
+
+        prefix = _normalize(prefix)
+        results: Dict[UUID, str] = {}
+        with self._lock:
+            index = bisect.bisect_left(self._keys, (prefix,))
+            while index < len(self._keys) and len(results) < limit:
+                key, record_id = self._keys[index]
+                if not key.startswith(prefix):
+                    break
+
+                results.setdefault(record_id, self._texts[record_id])
+                index += 1
+
+        return list(results.items())
+
+
+class _IndexSource(object):
+    """Describes the source rows of a prefix index and when they were last read."""
+
+    def __init__(self, model: Type[Any], suggestion_type: SuggestionType):
+        """Initialize the source of a prefix index.
+
+        :param Type[Any] model: The model whose ``name`` column is indexed
+        :param SuggestionType suggestion_type: The type of the indexed records
+        """
+
+        self.model = model
+        self.suggestion_type = suggestion_type
+        self.index = PrefixIndex()
+        self.watermark: Optional[datetime] = None
+        self.record_ids: Optional[Set[UUID]] = None
+
+    def build_query(
+        self,
+        session: Session,
+        record_ids: Optional[Set[UUID]] = None,
+        watermark: Optional[datetime] = None,
+    ) -> Query:
+        """Build the query for the source rows changed since a given watermark.
+
+        :param Session session: The session to build the query within
+        :param Optional[Set[UUID]] record_ids: The only records to query, optional,
+            defaults to None (every record)
+        :param Optional[datetime] watermark: The latest ``updated_at`` already read,
+            optional, defaults to None (every row)
+        :return: The query for the changed source rows
+        :rtype: Query
+        """
+
+        query = session.query(
+            self.model.id, self.model.name, self.model.is_active, self.model.updated_at,
+        )
+        if record_ids is not None:
+            query = filter_by_ids(query, self.model.id, list(record_ids))
+        if watermark is not None:
+            # NOTE: rows sharing the watermark's timestamp may have been committed
+            # after the last refresh, upserting them again is harmless
+            query = query.filter(self.model.updated_at >= watermark)
+
+        return query
+
+    def refresh(self, session: Session):
+        """Apply the source rows changed since the last refresh to the index.
+
+        :param Session session: The session to read the changed rows within
+        """
+
+        rows = self.build_query(session, self.record_ids, self.watermark).all()
+        if self.watermark is None:
+            self.index.load(
+                [
+                    (record_id, name)
+                    for record_id, name, is_active, _ in rows
+                    if is_active
+                ]
+            )
+        else:
+            for record_id, name, is_active, _ in rows:
+                if is_active:
+                    self.index.upsert(record_id, name)
+                else:
+                    self.index.remove(record_id)
+
+        for *_, updated_at in rows:
+            if self.watermark is None or updated_at > self.watermark:
+                self.watermark = updated_at
+
+    def rebuild(self, session: Session, record_ids: Optional[Set[UUID]] = None):
+        """Rebuild the index from scratch and swap it in for the current index.
+
+        .. note:: The current index keeps serving searches while the new index is
+            queried and built, the new index then replaces it in a single assignment.
+
+        :param Session session: The session to read the source rows within
+        :param Optional[Set[UUID]] record_ids: The only records that should be
+            indexed, optional, defaults to None (every record)
+        """
+
+        rows = self.build_query(session, record_ids).all()
+        index = PrefixIndex()
+        index.load(
+            [(record_id, name) for record_id, name, is_active, _ in rows if is_active]
+        )
+
+        self.record_ids = record_ids
+        self.watermark = max((updated_at for *_, updated_at in rows), default=None)
+        self.index = index
+
+
+tag_source = _IndexSource(Tag, SuggestionType.TAG)
+mod_source = _IndexSource(Mod, SuggestionType.MOD)
+refresh_lock = Lock()
+refresh_state = {"refreshed_at": None, "rebuilt_at": None}
+refresher_stopping = Event()
+refresher_state: Dict[str, Optional[Thread]] = {"thread": None}
+
+log = logging.getLogger(__name__)
+
+
+def _get_popular_mod_ids(session: Session, limit: int) -> Set[UUID]:
+    """Get the identifiers of the most downloaded mods.
+
+    :param Session session: The session to query within
+    :param int limit: The maximum number of mods to return
+    :return: The identifiers of the most downloaded mods
+    :rtype: Set[UUID]
+    """
+
+    return {
+        mod_id
+        for mod_id, in session.query(ModDownloadTotal.mod_id)
+        .order_by(ModDownloadTotal.count.desc())
+        .limit(limit)
+    }
+
+
+def refresh_autocomplete(force: bool = False):
+    """Refresh the autocompletion indexes if they are due to be refreshed.
+
+    .. note:: If another thread is already refreshing the indexes, this returns
+        immediately (unless forced) and the current indexes continue to be served.
+
+    :param bool force: Whether to rebuild the indexes regardless of when they were
+        last refreshed, optional, defaults to False
+    """
+
+    now = time.monotonic()
+    refreshed_at, rebuilt_at = (
+        refresh_state["refreshed_at"],
+        refresh_state["rebuilt_at"],
+    )
+    should_rebuild = (
+        force
+        or rebuilt_at is None
+        or now - rebuilt_at >= env.app.autocomplete.rebuild_interval
+    )
+    should_refresh = (
+        should_rebuild or now - refreshed_at >= env.app.autocomplete.refresh_interval
+    )
+    if not should_refresh:
+        return
+
+    if not refresh_lock.acquire(blocking=force):
+        return
+
+    try:
+        with get_db().session() as session:
+            if should_rebuild:
+                tag_source.rebuild(session)
+                mod_source.rebuild(
+                    session,
+                    _get_popular_mod_ids(session, env.app.autocomplete.mod_limit),
+                )
+                refresh_state["rebuilt_at"] = now
+            else:
+                tag_source.refresh(session)
+                mod_source.refresh(session)
+            refresh_state["refreshed_at"] = now
+    finally:
+        refresh_lock.release()
+
+
+def _run_refresher():
+    """Refresh the autocompletion indexes every refresh interval until stopped."""
+
+    while not refresher_stopping.is_set():
+        try:
+            refresh_autocomplete()
+        except Exception:
+            # NOTE: a failed refresh (for example while the database is unavailable)
+            # keeps serving the current indexes and is retried on the next interval
+            log.exception("Failed to refresh the autocompletion indexes")
+
+        refresher_stopping.wait(env.app.autocomplete.refresh_interval)
+
+
+def start_autocomplete_refresher():
+    """Start the background thread refreshing the autocompletion indexes."""
+
+    thread = refresher_state["thread"]
+    if thread is not None and thread.is_alive():
+        return
+
+    refresher_stopping.clear()
+    thread = Thread(target=_run_refresher, name="AutocompleteRefresher", daemon=True)
+    refresher_state["thread"] = thread
+    thread.start()
+
+
+def stop_autocomplete_refresher(timeout: Optional[float] = None):
+    """Stop the background thread refreshing the autocompletion indexes.
+
+    :param Optional[float] timeout: The maximum number of seconds to wait for an
+        ongoing refresh to finish, optional, defaults to None
+    """
+
+    refresher_stopping.set()
+    thread = refresher_state["thread"]
+    if thread is not None:
+        thread.join(timeout)
+        refresher_state["thread"] = None
+
+
+def get_completions(prefix: str, limit: Optional[int] = None) -> List[CompletionSchema]:
+    """Get the tags and popular mods that complete a partially typed search.
+
+    .. note:: Completions are served from the current indexes as is, which are
+        refreshed by the background refresher (see
+        :func:`start_autocomplete_refresher`) rather than by requests.
+
+    :param str prefix: The partially typed search
+    :param Optional[int] limit: The maximum number of completions, optional, defaults
+        to ``APP_AUTOCOMPLETE_RESULT_LIMIT``
+    :return: The tag completions followed by the mod completions
+    :rtype: List[CompletionSchema]
+    """
+
+    if limit is None:
+        limit = env.app.autocomplete.result_limit
+
+    completions: List[CompletionSchema] = []
+    for source in (tag_source, mod_source):
+        completions.extend(
+            CompletionSchema(id=record_id, type=source.suggestion_type, text=text)
+            for record_id, text in source.index.search(prefix, limit - len(completions))
+        )
+
+    return completions
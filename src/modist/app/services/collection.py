@@ -0,0 +1,256 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains service methods for dealing with collection resources."""
+
+from uuid import UUID
+from typing import Any, Dict, List, Tuple, Hashable, Optional
+from threading import RLock
+
+from cachetools import TTLCache
+from sqlalchemy import Table, Column, any_, cast, text, literal
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement
+
+from ...env import instance as env
+from ..filters import Sort, Pagination, CountStrategy, SortDirection
+
+RELTUPLES_SQL = (
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"
+)
+
+exact_count_cache = TTLCache(
+    maxsize=env.app.collection.count_cache_size, ttl=env.app.collection.count_cache_ttl,
+)
+exact_count_cache_lock = RLock()
+
+
+class Explain(Executable, ClauseElement):
+    """Describes an ``EXPLAIN`` statement for a given selectable statement.
+
+    .. note:: This construct always requests the ``JSON`` format from Postgres as we
+        only ever care about reading the planner's estimates programmatically.
+
+    """
+
+    def __init__(self, statement: ClauseElement):
+        """Initialize the ``EXPLAIN`` statement for a given selectable statement.
+
+        :param ClauseElement statement: The statement to explain
+        """
+
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kwargs) -> str:
+    """Compile the given ``EXPLAIN`` statement for Postgres.
+
+    :param Explain element: The ``EXPLAIN`` statement to compile
+    :param compiler: The SQL compiler for the current dialect
+    :return: The compiled ``EXPLAIN`` statement
+    :rtype: str
+    """
+
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kwargs)
+
+
+def strip_query(query: Query) -> Query:
+    """Strip the ordering and pagination of a given query.
+
+    :param Query query: The query to strip
+    :return: The query without any ``ORDER BY``, ``LIMIT``, or ``OFFSET`` clauses
+    :rtype: Query
+    """
+
+    return query.limit(None).offset(None).order_by(None)
+
+
+def _build_exact_count_key(session: Session, query: Query) -> Hashable:
+    """Build the exact count cache key for a given query.
+
+    :param Session session: The session the query will be executed within
+    :param Query query: The query to build the cache key for
+    :return: The cache key for the given query
+    :rtype: Hashable
+    """
+
+    compiled = query.statement.compile(dialect=session.bind.dialect)
+    params: Tuple[Tuple[str, Any], ...] = tuple(sorted(compiled.params.items()))
+    return (str(compiled), repr(params))
+
+
+def get_estimated_count(
+    session: Session, query: Query, table: Optional[Table] = None
+) -> int:
+    """Get the estimated number of rows a given query would produce.
+
+    Queries over every row of a single table are estimated from the table statistics
+    in ``pg_class.reltuples``. Any other query is estimated from the query planner's
+    row estimate for the query. Neither of these require scanning the table.
+
+    .. note:: Only the service building the query knows whether it selects every row
+        of a table (without any filtering, joins, grouping or distinct rows). So the
+        table statistics are only used when the service passes that ``table``.
+
+    :param Session session: The session to execute the estimate within
+    :param Query query: The query to estimate the number of rows for
+    :param Optional[Table] table: The table the query selects every row of,
+        optional, defaults to None (estimating the query's rows from its plan)
+    :return: The estimated number of rows
+    :rtype: int
+    """
+
+    query = strip_query(query)
+    if table is not None:
+        reltuples: Optional[int] = session.execute(
+            text(RELTUPLES_SQL), {"table": table.fullname}
+        ).scalar()
+
+        # NOTE: tables that have never been vacuumed or analyzed report a negative or
+        # empty ``reltuples``, in those cases the planner's estimate is the best we have
+        if reltuples is not None and reltuples > 0:
+            return reltuples
+
+    plan = session.execute(Explain(query.statement)).scalar()
+    return max(0, int(plan[0]["Plan"]["Plan Rows"]))
+
+
+def get_exact_count(session: Session, query: Query) -> int:
+    """Get the exact number of rows a given query produces.
+
+    .. note:: Exact counts are cached for ``APP_COLLECTION_COUNT_CACHE_TTL`` seconds
+        keyed by the compiled query and its parameters. So frequently requested
+        filters only pay for a full count once per cache period.
+
+    :param Session session: The session to execute the count within
+    :param Query query: The query to count the number of rows for
+    :return: The exact number of rows
+    :rtype: int
+    """
+
+    query = strip_query(query)
+    cache_key = _build_exact_count_key(session, query)
+    with exact_count_cache_lock:
+        if cache_key in exact_count_cache:
+            return exact_count_cache[cache_key]
+
+    count: int = query.count()
+    with exact_count_cache_lock:
+        exact_count_cache[cache_key] = count
+
+    return count
+
+
+def get_collection_total(
+    session: Session,
+    query: Query,
+    strategy: CountStrategy,
+    table: Optional[Table] = None,
+) -> Optional[int]:
+    """Get the total number of rows for a collection query using a given strategy.
+
+    :param Session session: The session to execute the count within
+    :param Query query: The collection query to count
+    :param CountStrategy strategy: The counting strategy to use
+    :param Optional[Table] table: The table the collection query selects every row
+        of, optional, defaults to None (see :func:`~.get_estimated_count`)
+    :return: The total number of rows, or None if counting is not requested
+    :rtype: Optional[int]
+    """
+
+    if strategy == CountStrategy.EXACT:
+        return get_exact_count(session, query)
+    elif strategy == CountStrategy.ESTIMATE:
+        return get_estimated_count(session, query, table=table)
+
+    return None
+
+
+def paginate_query(query: Query, pagination: Pagination) -> Query:
+    """Apply the given pagination to a collection query.
+
+    :param Query query: The collection query to paginate
+    :param Pagination pagination: The pagination to apply
+    :return: The paginated query
+    :rtype: Query
+    """
+
+    return query.limit(pagination.size).offset(pagination.size * pagination.page)
+
+
+def filter_by_ids(query: Query, column: Column, ids: List[UUID]) -> Query:
+    """Filter a given query to only the given identifiers.
+
+    .. note:: The identifiers are sent as a single ``uuid[]`` parameter compared with
+        ``= ANY(...)`` rather than as an ``IN (...)`` list of parameters. So the
+        statement (and its plan) is the same regardless of the number of identifiers.
+
+    :param Query query: The query to filter
+    :param Column column: The identifier column to filter on
+    :param List[UUID] ids: The identifiers to filter to
+    :return: The filtered query
+    :rtype: Query
+    """
+
+    ids_type = postgresql.ARRAY(postgresql.UUID(as_uuid=True))
+    return query.filter(column == any_(cast(literal(ids, ids_type), ids_type)))
+
+
+def get_by_ids(
+    query: Query, column: Column, ids: List[UUID]
+) -> Tuple[List[Any], List[UUID]]:
+    """Get the records for the given identifiers with a single query.
+
+    :param Query query: The base query to fetch records with
+    :param Column column: The identifier column to filter on
+    :param List[UUID] ids: The identifiers to fetch records for
+    :return: A tuple of the discovered records in the order of the given identifiers
+        and the identifiers that have no discovered record
+    :rtype: Tuple[List[Any], List[UUID]]
+    """
+
+    if len(ids) <= 0:
+        return ([], [])
+
+    records = {
+        getattr(record, column.key): record
+        for record in filter_by_ids(query, column, ids).all()
+    }
+    return (
+        [records[record_id] for record_id in ids if record_id in records],
+        [record_id for record_id in ids if record_id not in records],
+    )
+
+
+def sort_query(
+    query: Query, sorts: List[Sort], columns: Dict[str, Column], tiebreaker: Column
+) -> Query:
+    """Apply the given sorts to a collection query.
+
+    .. note:: Sorts for fields that are not present in ``columns`` are ignored. The
+        ``tiebreaker`` column is always appended to the ordering so that pagination
+        over rows with equal sort values remains deterministic.
+
+    :param Query query: The collection query to sort
+    :param List[Sort] sorts: The requested sorts
+    :param Dict[str, Column] columns: The sortable columns keyed by field name
+    :param Column tiebreaker: The unique column used to break ties between rows
+    :return: The sorted query
+    :rtype: Query
+    """
+
+    ordering = [
+        (
+            columns[sort.field].asc()
+            if sort.direction == SortDirection.ASCENDING
+            else columns[sort.field].desc()
+        )
+        for sort in sorts
+        if sort.field in columns
+    ]
+    return query.order_by(*ordering, tiebreaker.asc())
@@ -0,0 +1,391 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains service methods for recording downloads and reading download statistics.
+
+Downloads are recorded through the buffered download recorder (see
+:mod:`~modist.app.recorder`), so recording a download never waits on the database.
+Only the request headers named by ``APP_DOWNLOADS_HEADER_ALLOWLIST`` are kept with a
+download, while its user agent is interned into the ``user_agent`` table.
+
+Download statistics are read from the rollups maintained by the ``rollup_downloads``
+job (see :mod:`~modist.app.jobs.downloads`) rather than counting the raw download
+events. So statistics lag behind the latest downloads by up to the job's schedule plus
+``APP_DOWNLOADS_ROLLUP_SETTLE_INTERVAL`` seconds. Unique downloaders are estimated by
+merging the daily download sketches maintained by the download recorder. Downloads
+recorded before the sketches existed are only estimated once the
+``backfill_download_sketches`` job (see :mod:`~modist.app.jobs.sketches`) has run.
+
+Download analytics are built from the same rollups and cached until the rollup next
+advances its watermark, as they can't change in between.
+"""
+
+import math
+from uuid import UUID
+from typing import Any, Dict, List, Type, Tuple
+from datetime import date, timedelta
+from threading import RLock
+
+from fastapi import HTTPException, status
+from cachetools import LRUCache
+from sqlalchemy import Date, Column, cast, func
+from sqlalchemy.orm import Session
+
+from ...env import instance as env
+from ..utils import get_db
+from ..filters import DateRange, Granularity, AnalyticsFilter, DownloadGrouping
+from ..recorder import DownloadEvent, get_download_recorder
+from ...models.mod import (
+    Mod,
+    ModRelease,
+    ModDownloadDaily,
+    ModDownloadTotal,
+    ModDownloadSketch,
+    ModReleaseDownloadDaily,
+    ModReleaseDownloadTotal,
+    ModReleaseDownloadSketch,
+)
+from ...hyperloglog import HyperLogLog
+from ...models.host import Host, HostRelease
+from ..schemas.user import UserSchema
+from ...partitioning import get_month, add_months
+from ...models.common import RollupWatermark
+from ..jobs.downloads import DOWNLOAD_ROLLUP_NAME
+from ..schemas.download import (
+    DownloadCountSchema,
+    DownloadSeriesSchema,
+    DownloadAnalyticsSchema,
+    DownloadStatisticsSchema,
+)
+
+USER_AGENT_HEADER = "user-agent"
+USER_AGENT_MAXIMUM_LENGTH = 512
+
+analytics_cache = LRUCache(maxsize=env.app.downloads.analytics_cache_size)
+analytics_cache_lock = RLock()
+
+
+def _get_captured_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """Get the request headers of a download which should be kept with the download.
+
+    :param Dict[str, str] headers: The lowercased request headers of the download
+    :return: The request headers named by ``APP_DOWNLOADS_HEADER_ALLOWLIST``
+    :rtype: Dict[str, str]
+    """
+
+    allowlist = {
+        name.strip().lower() for name in env.app.downloads.header_allowlist.split(",")
+    }
+    return {
+        name: value
+        for name, value in headers.items()
+        if name in allowlist and name != USER_AGENT_HEADER
+    }
+
+
+def _get_download_statistics(
+    session: Session,
+    total_model: Type[Any],
+    daily_model: Type[Any],
+    sketch_model: Type[Any],
+    key_column: str,
+    key: UUID,
+    date_range: DateRange,
+) -> DownloadStatisticsSchema:
+    """Get the download statistics of a resource from its download rollups.
+
+    :param Session session: The session to query within
+    :param Type[Any] total_model: The rollup model of the resource's total downloads
+    :param Type[Any] daily_model: The rollup model of the resource's daily downloads
+    :param Type[Any] sketch_model: The sketch model of the resource's daily downloaders
+    :param str key_column: The name of the column identifying the resource in the
+        rollup and sketch models
+    :param UUID key: The resource's unique identifier
+    :param DateRange date_range: The range of days to get the daily downloads of
+    :return: The download statistics of the resource
+    :rtype: DownloadStatisticsSchema
+    """
+
+    total_key: Column = getattr(total_model, key_column)
+    daily_key: Column = getattr(daily_model, key_column)
+    sketch_key: Column = getattr(sketch_model, key_column)
+    total = session.query(total_model.count).filter(total_key == key).scalar() or 0
+    series = (
+        session.query(daily_model.day, daily_model.count)
+        .filter(
+            daily_key == key,
+            daily_model.day >= date_range.start,
+            daily_model.day <= date_range.end,
+        )
+        .order_by(daily_model.day)
+    )
+
+    unique = HyperLogLog()
+    for (sketch,) in session.query(sketch_model.sketch).filter(
+        sketch_key == key,
+        sketch_model.day >= date_range.start,
+        sketch_model.day <= date_range.end,
+    ):
+        unique.merge(HyperLogLog(sketch))
+
+    return DownloadStatisticsSchema(
+        total=total,
+        unique=unique.estimate(),
+        start=date_range.start,
+        end=date_range.end,
+        series=[DownloadCountSchema(day=day, count=count) for day, count in series],
+    )
+
+
+def get_mod_download_statistics(
+    mod_id: UUID, date_range: DateRange
+) -> DownloadStatisticsSchema:
+    """Get the total downloads of a mod and its downloads per day.
+
+    :param UUID mod_id: The mod's unique primary identifier
+    :param DateRange date_range: The range of days to get the daily downloads of
+    :return: The download statistics of the mod
+    :rtype: DownloadStatisticsSchema
+    """
+
+    with get_db().session() as session:
+        return _get_download_statistics(
+            session,
+            ModDownloadTotal,
+            ModDownloadDaily,
+            ModDownloadSketch,
+            "mod_id",
+            mod_id,
+            date_range,
+        )
+
+
+def get_mod_release_download_statistics(
+    mod_release_id: UUID, date_range: DateRange
+) -> DownloadStatisticsSchema:
+    """Get the total downloads of a mod release and its downloads per day.
+
+    :param UUID mod_release_id: The mod release's unique primary identifier
+    :param DateRange date_range: The range of days to get the daily downloads of
+    :return: The download statistics of the mod release
+    :rtype: DownloadStatisticsSchema
+    """
+
+    with get_db().session() as session:
+        return _get_download_statistics(
+            session,
+            ModReleaseDownloadTotal,
+            ModReleaseDownloadDaily,
+            ModReleaseDownloadSketch,
+            "mod_release_id",
+            mod_release_id,
+            date_range,
+        )
+
+
+def record_mod_release_download(
+    mod_id: UUID, mod_release_id: UUID, ip: str, headers: Dict[str, str]
+) -> bool:
+    """Record a download of a mod release.
+
+    .. note:: Downloads of releases which don't exist or don't belong to the given mod
+        are discarded when the recorded downloads are flushed.
+
+    :param UUID mod_id: The mod's unique primary identifier
+    :param UUID mod_release_id: The mod release's unique primary identifier
+    :param str ip: The IP address of the downloading client
+    :param Dict[str, str] headers: The request headers of the download
+    :return: True if the download was recorded, False if it was dropped or was a
+        repeat of a download recorded within ``APP_DOWNLOADS_DEDUPLICATION_WINDOW``
+    :rtype: bool
+    """
+
+    user_agent = headers.get(USER_AGENT_HEADER)
+    return get_download_recorder().record(
+        DownloadEvent(
+            mod_id=mod_id,
+            mod_release_id=mod_release_id,
+            ip=ip,
+            headers=_get_captured_headers(headers),
+            user_agent=(
+                user_agent[:USER_AGENT_MAXIMUM_LENGTH]
+                if user_agent is not None
+                else None
+            ),
+        )
+    )
+
+
+def _get_buckets(date_range: DateRange, granularity: Granularity) -> List[date]:
+    """Get the first day of every bucket of a given granularity within a date range.
+
+    :param DateRange date_range: The range of days to get the buckets of
+    :param Granularity granularity: The size of each bucket
+    :return: The first day of each bucket overlapping the range in order
+    :rtype: List[date]
+    """
+
+    if granularity == Granularity.MONTH:
+        bucket = get_month(date_range.start)
+    elif granularity == Granularity.WEEK:
+        bucket = date_range.start - timedelta(days=date_range.start.weekday())
+    else:
+        bucket = date_range.start
+
+    buckets: List[date] = []
+    while bucket <= date_range.end:
+        buckets.append(bucket)
+        bucket = (
+            add_months(bucket, 1)
+            if granularity == Granularity.MONTH
+            else bucket + timedelta(days=7 if granularity == Granularity.WEEK else 1)
+        )
+
+    return buckets
+
+
+def _downsample(
+    buckets: List[date], counts: Dict[date, int], resolution: int
+) -> List[DownloadCountSchema]:
+    """Merge every ``resolution`` consecutive buckets of a series into a single point.
+
+    :param List[date] buckets: The first day of each bucket in order
+    :param Dict[date, int] counts: The number of downloads keyed by bucket
+    :param int resolution: The number of consecutive buckets to merge per point
+    :return: The points of the series, dated by the first of their merged buckets
+    :rtype: List[DownloadCountSchema]
+    """
+
+    return [
+        DownloadCountSchema(
+            day=buckets[index],
+            count=sum(
+                counts.get(bucket, 0) for bucket in buckets[index : index + resolution]
+            ),
+        )
+        for index in range(0, len(buckets), resolution)
+    ]
+
+
+def _get_download_series(
+    session: Session, mod_id: UUID, analytics: AnalyticsFilter
+) -> Tuple[int, List[DownloadSeriesSchema]]:
+    """Get the downloads of a mod over time broken down by a related resource.
+
+    :param Session session: The session to query within
+    :param UUID mod_id: The mod's unique primary identifier
+    :param AnalyticsFilter analytics: The time series to build
+    :return: The resolution of the series and the series of each resource, ordered by
+        their total downloads
+    :rtype: Tuple[int, List[DownloadSeriesSchema]]
+    """
+
+    day = ModReleaseDownloadDaily.day
+    bucket = cast(func.date_trunc(analytics.granularity.value, day), Date)
+    query = session.query(ModReleaseDownloadDaily).join(
+        ModRelease, ModRelease.id == ModReleaseDownloadDaily.mod_release_id
+    )
+    if analytics.group_by == DownloadGrouping.HOST_RELEASE:
+        labels = (HostRelease.id, Host.name, HostRelease.version)
+        query = query.join(HostRelease, HostRelease.id == ModRelease.host_release_id)
+        query = query.join(Host, Host.id == HostRelease.host_id)
+    else:
+        labels = (ModRelease.id, ModRelease.version)
+
+    rows = (
+        query.filter(
+            ModRelease.mod_id == mod_id,
+            day >= analytics.date_range.start,
+            day <= analytics.date_range.end,
+        )
+        .with_entities(*labels, bucket, func.sum(ModReleaseDownloadDaily.count))
+        .group_by(*labels, bucket)
+    )
+
+    names: Dict[UUID, str] = {}
+    counts: Dict[UUID, Dict[date, int]] = {}
+    for *label, bucket_day, count in rows:
+        resource_id, *name = label
+        names[resource_id] = " ".join(str(part) for part in name)
+        counts.setdefault(resource_id, {})[bucket_day] = int(count)
+
+    buckets = _get_buckets(analytics.date_range, analytics.granularity)
+    resolution = max(math.ceil(len(buckets) / analytics.points), 1)
+    series = [
+        DownloadSeriesSchema(
+            id=resource_id,
+            name=names[resource_id],
+            total=sum(resource_counts.values()),
+            points=_downsample(buckets, resource_counts, resolution),
+        )
+        for resource_id, resource_counts in counts.items()
+    ]
+
+    return (
+        resolution,
+        sorted(series, key=lambda resource: (-resource.total, resource.name)),
+    )
+
+
+def get_mod_download_analytics(
+    mod_id: UUID, user: UserSchema, analytics: AnalyticsFilter
+) -> DownloadAnalyticsSchema:
+    """Get the downloads of a mod over time broken down by release or host release.
+
+    .. note:: Analytics are cached by mod and filters along with the download rollup's
+        watermark, and are only rebuilt once the rollup has advanced its watermark.
+
+    :param UUID mod_id: The mod's unique primary identifier
+    :param UserSchema user: The user requesting the analytics
+    :param AnalyticsFilter analytics: The time series to build
+    :raises HTTPException: If the mod doesn't exist or the user is not its author
+    :return: The download analytics of the mod
+    :rtype: DownloadAnalyticsSchema
+    """
+
+    with get_db().session() as session:
+        author = session.query(Mod.user_id).filter(Mod.id == mod_id).one_or_none()
+        if author is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Mod {mod_id!s} not found",
+            )
+        if author.user_id != user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Mod {mod_id!s} analytics are only available to its author",
+            )
+
+        watermark = (
+            session.query(RollupWatermark.watermark)
+            .filter(RollupWatermark.name == DOWNLOAD_ROLLUP_NAME)
+            .scalar()
+        )
+        cache_key = (
+            mod_id,
+            analytics.date_range.start,
+            analytics.date_range.end,
+            analytics.granularity,
+            analytics.group_by,
+            analytics.points,
+        )
+        with analytics_cache_lock:
+            cached = analytics_cache.get(cache_key)
+        if cached is not None and cached[0] == watermark:
+            return cached[1]
+
+        resolution, series = _get_download_series(session, mod_id, analytics)
+        result = DownloadAnalyticsSchema(
+            start=analytics.date_range.start,
+            end=analytics.date_range.end,
+            granularity=analytics.granularity,
+            group_by=analytics.group_by,
+            resolution=resolution,
+            series=series,
+        )
+
+    with analytics_cache_lock:
+        analytics_cache[cache_key] = (watermark, result)
+
+    return result
@@ -0,0 +1,877 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains service methods related to managing mods."""
+
+from uuid import UUID
+from typing import Any, Dict, List, Type, Tuple, Union, Optional
+from datetime import datetime
+from itertools import chain
+from threading import RLock
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from cachetools import TTLCache
+from sqlalchemy import (
+    REAL,
+    Float,
+    Column,
+    BigInteger,
+    or_,
+    and_,
+    case,
+    cast,
+    func,
+    null,
+    true,
+    select,
+    literal_column,
+)
+from sqlalchemy.orm import Query, Session, joinedload, selectinload
+from sqlalchemy.sql import Select, FromClause, ColumnElement
+from sqlalchemy.dialects.postgresql import array, aggregate_order_by
+
+from ...env import instance as env
+from ..utils import get_db, encode_cursor
+from ..filters import CollectionFilter, KeysetPagination
+from .collection import (
+    get_by_ids,
+    sort_query,
+    filter_by_ids,
+    paginate_query,
+    get_collection_total,
+)
+from ...models.mod import (
+    Mod,
+    ModTag,
+    ModScore,
+    ModRelease,
+    ModRankingTally,
+    ModRatingSummary,
+    ModReleaseArtifact,
+    ModRatingVersionSummary,
+)
+from ..conditional import Validators, build_validators, get_last_modified
+from ..schemas.mod import (
+    ModSchema,
+    ModDetailSchema,
+    ModListingSchema,
+    ModReleaseSchema,
+    ModRatingSummarySchema,
+    ModReleaseArtifactSchema,
+    ModRatingVersionSummarySchema,
+)
+from ...models.host import Host
+from ...models.user import User
+from ..schemas.host import HostSchema
+from ..schemas.user import UserPublicSchema
+from ...models.common import Tag, Category
+from ..schemas.common import TagSchema, CategorySchema
+from ..schemas.collection import BatchSchema, CollectionSchema, KeysetCollectionSchema
+
+MOD_SEARCH_CONFIG = "english"
+MOD_DETAIL_RELEASE_LIMIT = 5
+EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+MOD_SORTABLE_COLUMNS: Dict[str, Column] = {
+    "name": Mod.name,
+    "slug": Mod.slug,
+    "created_at": Mod.created_at,
+    "updated_at": Mod.updated_at,
+    "hot": ModScore.hot,
+    "trending": ModScore.trending,
+}
+MOD_SCORE_SORTS = {"hot", "trending"}
+MOD_RATING_SORT = "rating"
+RATING_HISTOGRAM_SIZE = 10
+RATING_PRIOR_CACHE_KEY = "mean"
+
+rating_prior_cache = TTLCache(maxsize=1, ttl=env.app.ratings.prior_cache_ttl)
+rating_prior_cache_lock = RLock()
+
+
+def _build_rating_prior_mean_statement() -> Select:
+    """Build the statement that selects the mean of all active mod ratings.
+
+    .. note:: The mean is computed from the rating summaries (a row per rated mod
+        rather than per rating), and is 0 if there are no ratings.
+
+    :return: The statement selecting the mean of all active mod ratings as ``mean``
+    :rtype: Select
+    """
+
+    return select(
+        [
+            func.coalesce(
+                cast(
+                    func.sum(ModRatingSummary.sum)
+                    / func.nullif(func.sum(ModRatingSummary.count), 0),
+                    Float,
+                ),
+                0,
+            ).label("mean")
+        ]
+    )
+
+
+def _get_cached_rating_prior_mean() -> Optional[float]:
+    """Get the cached mean of all active mod ratings.
+
+    :return: The mean of all active mod ratings, or None if it is not cached
+    :rtype: Optional[float]
+    """
+
+    with rating_prior_cache_lock:
+        return rating_prior_cache.get(RATING_PRIOR_CACHE_KEY)
+
+
+def _cache_rating_prior_mean(mean: float):
+    """Cache the mean of all active mod ratings for ``APP_RATINGS_PRIOR_CACHE_TTL``.
+
+    :param float mean: The mean of all active mod ratings
+    """
+
+    with rating_prior_cache_lock:
+        rating_prior_cache[RATING_PRIOR_CACHE_KEY] = mean
+
+
+def _get_rating_prior_mean(session: Session) -> float:
+    """Get the mean of all active mod ratings to use as the prior of Bayesian averages.
+
+    :param Session session: The session to query within if the mean is not cached
+    :return: The mean of all active mod ratings
+    :rtype: float
+    """
+
+    mean = _get_cached_rating_prior_mean()
+    if mean is None:
+        mean = session.execute(_build_rating_prior_mean_statement()).scalar()
+        _cache_rating_prior_mean(mean)
+
+    return mean
+
+
+def _get_bayesian_average(
+    summary: Any, prior_mean: Union[float, ColumnElement]
+) -> ColumnElement:
+    """Get the Bayesian average of a rating summary.
+
+    :param Any summary: The rating summary model to get the average of
+    :param Union[float, ColumnElement] prior_mean: The mean of all mod ratings used as
+        the prior
+    :return: The average of the summary's ratings along with ``APP_RATINGS_PRIOR_COUNT``
+        virtual ratings of the prior mean
+    :rtype: ColumnElement
+    """
+
+    prior_count = env.app.ratings.prior_count
+    return cast(
+        (prior_count * prior_mean + func.coalesce(summary.sum, 0))
+        / (prior_count + func.coalesce(summary.count, 0)),
+        Float,
+    )
+
+
+def _get_rating_summary_columns(
+    summary: Any, prior_mean: Union[float, ColumnElement]
+) -> Dict[str, ColumnElement]:
+    """Get the columns of a rating summary that populate a rating summary schema.
+
+    .. note:: The summary may be outer joined, so a missing summary is treated as a
+        summary of no ratings.
+
+    :param Any summary: The rating summary model to get the columns of
+    :param Union[float, ColumnElement] prior_mean: The mean of all mod ratings used as
+        the prior
+    :return: The columns keyed by the fields of :class:`~.ModRatingSummarySchema`
+    :rtype: Dict[str, ColumnElement]
+    """
+
+    count = func.coalesce(summary.count, 0)
+    average = cast(summary.sum / func.nullif(summary.count, 0), Float)
+    return {
+        "count": count,
+        "average": average,
+        "deviation": func.sqrt(
+            func.greatest(
+                cast(summary.sum_squares / func.nullif(summary.count, 0), Float)
+                - average * average,
+                0,
+            )
+        ),
+        "bayesian_average": _get_bayesian_average(summary, prior_mean),
+        "histogram": func.coalesce(
+            summary.histogram,
+            func.array_fill(cast(0, BigInteger), array([RATING_HISTOGRAM_SIZE])),
+        ),
+    }
+
+
+def _load_mod_listing(query: Query) -> Query:
+    """Apply the loading strategies required to serialize mod listings.
+
+    Many-to-one relationships are joined into the mod query itself while the tags
+    (proxied through the ``mod_tags`` association) are fetched by one additional
+    ``SELECT ... WHERE mod_id IN (...)`` query for the entire page of mods. So a page
+    of mods is always loaded in the same number of queries regardless of its size.
+    The latest release is joined through the trigger maintained ``latest_release_id``
+    so it costs a single primary key lookup per mod regardless of how many releases
+    the mod has.
+    Likewise the trigger maintained ranking tally is joined by the mod's primary key
+    rather than aggregating the mod's rankings.
+
+    :param Query query: The mod query to apply the loading strategies to
+    :return: The mod query with the loading strategies applied
+    :rtype: Query
+    """
+
+    return query.options(
+        joinedload(Mod.user, innerjoin=True),
+        joinedload(Mod.host, innerjoin=True),
+        joinedload(Mod.category),
+        joinedload(Mod.latest_release),
+        joinedload(Mod.ranking_tally),
+        selectinload(Mod.mod_tags).joinedload(ModTag.tag),
+    )
+
+
+def _build_mods_query(
+    session: Session, filters: CollectionFilter
+) -> Tuple[Query, Dict[str, ColumnElement]]:
+    """Build the query of the active mods of the catalog for the given filters.
+
+    :param Session session: The session to build the query within
+    :param CollectionFilter filters: The collection filters to apply
+    :return: The unsorted query of the mods and the columns the mods can be sorted by
+    :rtype: Tuple[Query, Dict[str, ColumnElement]]
+    """
+
+    query = session.query(Mod).filter(Mod.is_active.is_(True))
+    # NOTE: scores are inner joined so ordering by a score can be driven by the
+    # score's index, mods created since the scores were last computed are omitted
+    if any(sort.field in MOD_SCORE_SORTS for sort in filters.sorts):
+        query = query.join(ModScore, ModScore.mod_id == Mod.id)
+    columns: Dict[str, ColumnElement] = MOD_SORTABLE_COLUMNS
+    if any(sort.field == MOD_RATING_SORT for sort in filters.sorts):
+        query = query.outerjoin(ModRatingSummary, ModRatingSummary.mod_id == Mod.id)
+        columns = {
+            **MOD_SORTABLE_COLUMNS,
+            MOD_RATING_SORT: _get_bayesian_average(
+                ModRatingSummary, _get_rating_prior_mean(session)
+            ),
+        }
+
+    return query, columns
+
+
+def _build_mod_updated_at_queries(session: Session, mod_ids: List[UUID]) -> List[Query]:
+    """Build the queries selecting the ``updated_at`` of mods and their common rows.
+
+    :param Session session: The session to build the queries within
+    :param List[UUID] mod_ids: The unique primary identifiers of the mods
+    :return: The queries selecting the ``updated_at`` of the mods along with their
+        users, hosts, categories, tags and tag associations
+    :rtype: List[Query]
+    """
+
+    return [
+        filter_by_ids(session.query(Mod.updated_at), Mod.id, mod_ids),
+        filter_by_ids(
+            session.query(User.updated_at).join(Mod, Mod.user_id == User.id),
+            Mod.id,
+            mod_ids,
+        ),
+        filter_by_ids(
+            session.query(Host.updated_at).join(Mod, Mod.host_id == Host.id),
+            Mod.id,
+            mod_ids,
+        ),
+        filter_by_ids(
+            session.query(Category.updated_at).join(
+                Mod, Mod.category_id == Category.id
+            ),
+            Mod.id,
+            mod_ids,
+        ),
+        filter_by_ids(session.query(ModTag.updated_at), ModTag.mod_id, mod_ids),
+        filter_by_ids(
+            session.query(Tag.updated_at).join(ModTag, ModTag.tag_id == Tag.id),
+            ModTag.mod_id,
+            mod_ids,
+        ),
+    ]
+
+
+def _get_mod_listing_last_modified(
+    session: Session, mod_ids: List[UUID]
+) -> Tuple[Optional[datetime], int]:
+    """Get the latest ``updated_at`` and the number of the rows of mod listings.
+
+    :param Session session: The session to query within
+    :param List[UUID] mod_ids: The unique primary identifiers of the listed mods
+    :return: The latest ``updated_at`` and the number of the rows the mods' listings
+        are serialized from
+    :rtype: Tuple[Optional[datetime], int]
+    """
+
+    return get_last_modified(
+        session,
+        [
+            *_build_mod_updated_at_queries(session, mod_ids),
+            filter_by_ids(
+                session.query(ModRelease.updated_at).join(
+                    Mod, Mod.latest_release_id == ModRelease.id
+                ),
+                Mod.id,
+                mod_ids,
+            ),
+            filter_by_ids(
+                session.query(ModRankingTally.updated_at),
+                ModRankingTally.mod_id,
+                mod_ids,
+            ),
+        ],
+    )
+
+
+def get_mods_validators(
+    filters: CollectionFilter, representation: Tuple[str, ...]
+) -> Validators:
+    """Get the validators of a page of active mods without loading the page.
+
+    .. note:: The identifiers of the page's mods are part of the validators, so mods
+        being added to, removed from or reordered within the page change its ETag.
+
+    :param CollectionFilter filters: The collection filters to apply
+    :param Tuple[str, ...] representation: The representation of the page
+    :return: The validators of the requested page of mods
+    :rtype: Validators
+    """
+
+    with get_db().session() as session:
+        query, columns = _build_mods_query(session, filters)
+        mod_ids = [
+            mod_id
+            for mod_id, in paginate_query(
+                sort_query(query, filters.sorts, columns, Mod.id), filters.pagination
+            ).with_entities(Mod.id)
+        ]
+        total = get_collection_total(session, query, filters.count)
+        last_modified, count = _get_mod_listing_last_modified(session, mod_ids)
+
+    return build_validators(
+        *mod_ids, total, last_modified, count, representation=representation
+    )
+
+
+def get_mods(filters: CollectionFilter) -> CollectionSchema[ModListingSchema]:
+    """Get a page of active mods along with their related listing resources.
+
+    :param CollectionFilter filters: The collection filters to apply
+    :return: The requested page of mods
+    :rtype: CollectionSchema[ModListingSchema]
+    """
+
+    with get_db().session() as session:
+        query, columns = _build_mods_query(session, filters)
+        total = get_collection_total(session, query, filters.count)
+        mods = paginate_query(
+            _load_mod_listing(sort_query(query, filters.sorts, columns, Mod.id)),
+            filters.pagination,
+        ).all()
+
+        return CollectionSchema[ModListingSchema](
+            page=filters.pagination.page,
+            size=filters.pagination.size,
+            count=filters.count,
+            total=total,
+            results=[ModListingSchema.from_model(mod) for mod in mods],
+        )
+
+
+def _build_search_query(
+    session: Session, search: str, pagination: KeysetPagination
+) -> Tuple[Query, ColumnElement]:
+    """Build the query of a page of active mods matching a web search style query.
+
+    :param Session session: The session to build the query within
+    :param str search: The web search style query to search mods for
+    :param KeysetPagination pagination: The keyset pagination to apply
+    :raises HTTPException: If the pagination cursor is not a search cursor
+    :return: The query of the page's mods and their ranks (with one more mod than the
+        page's size to detect whether there is a next page) and the rank expression
+    :rtype: Tuple[Query, ColumnElement]
+    """
+
+    search_query = func.websearch_to_tsquery(MOD_SEARCH_CONFIG, search)
+    rank = func.ts_rank(Mod.search_vector, search_query)
+
+    query = session.query(Mod, rank).filter(
+        Mod.is_active.is_(True), Mod.search_vector.op("@@")(search_query)
+    )
+    if pagination.after is not None:
+        try:
+            after_rank, after_id = pagination.after
+            after_rank, after_id = float(after_rank), UUID(after_id)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor",
+            )
+
+        # NOTE: ``ts_rank`` is a ``real``, so the cursor's rank is compared as a
+        # ``real`` too; compared as a ``double precision`` it never equals the
+        # rounded rank and mods tied at the page boundary are skipped or repeated
+        cursor_rank = cast(after_rank, REAL)
+        query = query.filter(
+            or_(rank < cursor_rank, and_(rank == cursor_rank, Mod.id > after_id))
+        )
+
+    return (
+        query.order_by(rank.desc(), Mod.id.asc()).limit(pagination.size + 1),
+        rank,
+    )
+
+
+def search_mods_validators(
+    search: str, pagination: KeysetPagination, representation: Tuple[str, ...]
+) -> Validators:
+    """Get the validators of a page of mods matching a search without loading the page.
+
+    :param str search: The web search style query to search mods for
+    :param KeysetPagination pagination: The keyset pagination to apply
+    :param Tuple[str, ...] representation: The representation of the page
+    :raises HTTPException: If the pagination cursor is not a search cursor
+    :return: The validators of the requested page of matching mods
+    :rtype: Validators
+    """
+
+    with get_db().session() as session:
+        query, rank = _build_search_query(session, search, pagination)
+        ranks = query.with_entities(Mod.id, rank).all()
+        last_modified, count = _get_mod_listing_last_modified(
+            session, [mod_id for mod_id, _ in ranks]
+        )
+
+    return build_validators(
+        *chain.from_iterable(ranks),
+        last_modified,
+        count,
+        representation=representation,
+    )
+
+
+def search_mods(
+    search: str, pagination: KeysetPagination
+) -> KeysetCollectionSchema[ModListingSchema]:
+    """Search active mods by the words in their name and description.
+
+    Mods are matched against their ``search_vector`` through its GIN index and ordered
+    by their ``ts_rank`` (where name matches are weighted higher than description
+    matches). Pages are continued after the rank and ``id`` of the previous page's last
+    mod rather than through an offset.
+
+    :param str search: The web search style query to search mods for
+    :param KeysetPagination pagination: The keyset pagination to apply
+    :raises HTTPException: If the pagination cursor is not a search cursor
+    :return: The requested page of matching mods
+    :rtype: KeysetCollectionSchema[ModListingSchema]
+    """
+
+    with get_db().session() as session:
+        query, _ = _build_search_query(session, search, pagination)
+        results = _load_mod_listing(query).all()
+
+        next_cursor = None
+        if len(results) > pagination.size:
+            results = results[: pagination.size]
+            last_mod, last_rank = results[-1]
+            next_cursor = encode_cursor([last_rank, str(last_mod.id)])
+
+        return KeysetCollectionSchema[ModListingSchema](
+            size=pagination.size,
+            next=next_cursor,
+            results=[ModListingSchema.from_model(mod) for mod, _ in results],
+        )
+
+
+def get_mods_by_ids(mod_ids: List[UUID]) -> BatchSchema[ModSchema]:
+    """Get a batch of active mods by their ``id`` with a single query.
+
+    :param List[UUID] mod_ids: The mods' unique primary identifiers
+    :return: The discovered mods in the requested order and the missing identifiers
+    :rtype: BatchSchema[ModSchema]
+    """
+
+    with get_db().session() as session:
+        mods, missing = get_by_ids(
+            session.query(Mod).filter(Mod.is_active.is_(True)), Mod.id, mod_ids
+        )
+
+        return BatchSchema[ModSchema](
+            results=[ModSchema.from_model(mod) for mod in mods], missing=missing
+        )
+
+
+def get_mod_releases_by_ids(
+    mod_release_ids: List[UUID],
+) -> BatchSchema[ModReleaseSchema]:
+    """Get a batch of active mod releases by their ``id`` with a single query.
+
+    :param List[UUID] mod_release_ids: The mod releases' unique primary identifiers
+    :return: The discovered mod releases in the requested order and the missing
+        identifiers
+    :rtype: BatchSchema[ModReleaseSchema]
+    """
+
+    with get_db().session() as session:
+        mod_releases, missing = get_by_ids(
+            session.query(ModRelease).filter(ModRelease.is_active.is_(True)),
+            ModRelease.id,
+            mod_release_ids,
+        )
+
+        return BatchSchema[ModReleaseSchema](
+            results=[
+                ModReleaseSchema.from_model(mod_release) for mod_release in mod_releases
+            ],
+            missing=missing,
+        )
+
+
+def get_latest_mod_release(
+    mod_id: UUID, host_release_id: Optional[UUID] = None
+) -> ModReleaseSchema:
+    """Get the active release of a mod with the highest version.
+
+    .. note:: Releases are ordered by their ``version_key`` rather than their
+        ``version``, so the latest release is read from the front of the
+        ``(mod_id, version_key)`` index instead of sorting every release.
+
+    :param UUID mod_id: The mod's unique primary identifier
+    :param Optional[UUID] host_release_id: The only host release the release should
+        be for, optional, defaults to None (any host release)
+    :raises HTTPException: If the mod has no active releases
+    :return: The latest active release of the mod
+    :rtype: ModReleaseSchema
+    """
+
+    with get_db().session() as session:
+        query = session.query(ModRelease).filter(
+            ModRelease.mod_id == mod_id, ModRelease.is_active.is_(True)
+        )
+        if host_release_id is not None:
+            query = query.filter(ModRelease.host_release_id == host_release_id)
+
+        mod_release = query.order_by(ModRelease.version_key.desc()).first()
+        if mod_release is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Mod {mod_id!s} has no releases",
+            )
+
+        return ModReleaseSchema.from_model(mod_release)
+
+
+def _build_json_object(columns: Dict[str, ColumnElement]) -> ColumnElement:
+    """Build a ``json_build_object`` expression of the given named columns.
+
+    :param Dict[str, ColumnElement] columns: The columns keyed by their JSON key
+    :return: The JSON object expression
+    :rtype: ColumnElement
+    """
+
+    return func.json_build_object(
+        *chain.from_iterable(
+            (literal_column(f"'{key!s}'"), column) for key, column in columns.items()
+        )
+    )
+
+
+def _get_schema_columns(
+    schema: Type[BaseModel], selectable: FromClause
+) -> Dict[str, ColumnElement]:
+    """Get the columns of a selectable that populate the fields of a given schema.
+
+    :param Type[BaseModel] schema: The schema whose fields should be populated
+    :param FromClause selectable: The table (or subquery) to get the columns from
+    :return: The columns of the selectable keyed by the schema's field names
+    :rtype: Dict[str, ColumnElement]
+    """
+
+    return {name: selectable.c[name] for name in schema.__fields__.keys()}
+
+
+def _build_mod_detail_statement(
+    mod_id: UUID, release_limit: int, rating_prior_mean: Optional[float]
+) -> Select:
+    """Build the single statement that selects the detail payload of a mod.
+
+    The one-to-many resources of the mod (tags and recent releases with their
+    artifacts) are each aggregated by a lateral subquery, while the ratings summary is
+    joined from the trigger maintained ``mod_rating_summary``. So the statement returns
+    exactly one row containing the entire payload as JSON, along with the mean of all
+    mod ratings used as the prior of the mod's Bayesian average rating.
+
+    :param UUID mod_id: The mod's unique primary identifier
+    :param int release_limit: The maximum number of recent releases to include
+    :param Optional[float] rating_prior_mean: The cached mean of all mod ratings,
+        computed by the statement if None
+    :return: The statement selecting the mod detail payload
+    :rtype: Select
+    """
+
+    tags = (
+        select(
+            [
+                func.json_agg(
+                    aggregate_order_by(
+                        _build_json_object(
+                            _get_schema_columns(TagSchema, Tag.__table__)
+                        ),
+                        Tag.name,
+                    )
+                ).label("tags")
+            ]
+        )
+        .select_from(ModTag.__table__.join(Tag.__table__, ModTag.tag_id == Tag.id))
+        .where(ModTag.mod_id == Mod.id)
+        .lateral("tags")
+    )
+
+    recent_releases = (
+        select([ModRelease.__table__])
+        .where(and_(ModRelease.mod_id == Mod.id, ModRelease.is_active.is_(True)))
+        .order_by(ModRelease.version_key.desc())
+        .limit(release_limit)
+        .correlate(Mod.__table__)
+        .alias("recent_releases")
+    )
+    artifacts = (
+        select(
+            [
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(
+                            _build_json_object(
+                                _get_schema_columns(
+                                    ModReleaseArtifactSchema,
+                                    ModReleaseArtifact.__table__,
+                                )
+                            ),
+                            ModReleaseArtifact.name,
+                        )
+                    ),
+                    EMPTY_JSON_ARRAY,
+                )
+            ]
+        )
+        .where(
+            and_(
+                ModReleaseArtifact.mod_release_id == recent_releases.c.id,
+                ModReleaseArtifact.is_active.is_(True),
+            )
+        )
+        .as_scalar()
+    )
+    releases = (
+        select(
+            [
+                func.json_agg(
+                    aggregate_order_by(
+                        _build_json_object(
+                            {
+                                **_get_schema_columns(
+                                    ModReleaseSchema, recent_releases
+                                ),
+                                "artifacts": artifacts,
+                            }
+                        ),
+                        recent_releases.c.version_key.desc(),
+                    )
+                ).label("releases")
+            ]
+        )
+        .select_from(recent_releases)
+        .lateral("releases")
+    )
+
+    rating_prior = _build_rating_prior_mean_statement().alias("rating_prior")
+    prior_mean = rating_prior.c.mean if rating_prior_mean is None else rating_prior_mean
+    payload = _build_json_object(
+        {
+            **_get_schema_columns(ModSchema, Mod.__table__),
+            "user": _build_json_object(
+                _get_schema_columns(UserPublicSchema, User.__table__)
+            ),
+            "host": _build_json_object(_get_schema_columns(HostSchema, Host.__table__)),
+            "category": case(
+                [(Category.id.is_(None), null())],
+                else_=_build_json_object(
+                    _get_schema_columns(CategorySchema, Category.__table__)
+                ),
+            ),
+            "tags": func.coalesce(tags.c.tags, EMPTY_JSON_ARRAY),
+            "releases": func.coalesce(releases.c.releases, EMPTY_JSON_ARRAY),
+            "rating": _build_json_object(
+                _get_rating_summary_columns(ModRatingSummary, prior_mean)
+            ),
+        }
+    )
+
+    statement = (
+        select(
+            [
+                payload.label("payload"),
+                cast(prior_mean, Float).label("rating_prior_mean"),
+            ]
+        )
+        .select_from(
+            Mod.__table__.join(User.__table__, Mod.user_id == User.id)
+            .join(Host.__table__, Mod.host_id == Host.id)
+            .outerjoin(Category.__table__, Mod.category_id == Category.id)
+            .outerjoin(tags, true())
+            .outerjoin(releases, true())
+            .outerjoin(ModRatingSummary.__table__, ModRatingSummary.mod_id == Mod.id)
+        )
+        .where(and_(Mod.id == mod_id, Mod.is_active.is_(True)))
+    )
+    if rating_prior_mean is None:
+        statement = statement.select_from(rating_prior)
+
+    return statement
+
+
+def _is_mod_active(session: Session, mod_id: UUID) -> bool:
+    """Check if a given mod exists and is active.
+
+    :param Session session: The session to query within
+    :param UUID mod_id: The mod's unique primary identifier
+    :return: True if the mod exists and is active, otherwise False
+    :rtype: bool
+    """
+
+    return session.query(
+        session.query(Mod).filter(Mod.id == mod_id, Mod.is_active.is_(True)).exists()
+    ).scalar()
+
+
+def get_mod_detail_validators(
+    mod_id: UUID, representation: Tuple[str, ...]
+) -> Optional[Validators]:
+    """Get the validators of the detail of an active mod without loading the detail.
+
+    .. note:: The detail's Bayesian average rating depends on the mean of all mod
+        ratings, so the (cached) mean is part of the validators as well.
+
+    :param UUID mod_id: The mod's unique primary identifier
+    :param Tuple[str, ...] representation: The representation of the mod detail
+    :return: The validators of the mod detail, None if the mod does not exist or is
+        not active
+    :rtype: Optional[Validators]
+    """
+
+    mod_ids = [mod_id]
+    with get_db().session() as session:
+        if not _is_mod_active(session, mod_id):
+            return None
+
+        last_modified, count = get_last_modified(
+            session,
+            [
+                *_build_mod_updated_at_queries(session, mod_ids),
+                filter_by_ids(
+                    session.query(ModRelease.updated_at), ModRelease.mod_id, mod_ids
+                ),
+                filter_by_ids(
+                    session.query(ModReleaseArtifact.updated_at).join(
+                        ModRelease, ModReleaseArtifact.mod_release_id == ModRelease.id
+                    ),
+                    ModRelease.mod_id,
+                    mod_ids,
+                ),
+                filter_by_ids(
+                    session.query(ModRatingSummary.updated_at),
+                    ModRatingSummary.mod_id,
+                    mod_ids,
+                ),
+            ],
+        )
+        rating_prior_mean = _get_rating_prior_mean(session)
+
+    return build_validators(
+        mod_id, last_modified, count, rating_prior_mean, representation=representation,
+    )
+
+
+def get_mod_detail(mod_id: UUID) -> ModDetailSchema:
+    """Get an active mod along with the related resources shown on its detail page.
+
+    .. note:: Walking the relationships of the mod takes a round-trip per
+        relationship (and per release for their artifacts). Instead the database
+        shapes the entire payload with a single statement, see
+        :func:`~._build_mod_detail_statement`.
+
+    :param UUID mod_id: The mod's unique primary identifier
+    :raises HTTPException: If the mod does not exist or is not active
+    :return: The mod detail
+    :rtype: ModDetailSchema
+    """
+
+    rating_prior_mean = _get_cached_rating_prior_mean()
+    with get_db().session() as session:
+        detail = session.execute(
+            _build_mod_detail_statement(
+                mod_id, MOD_DETAIL_RELEASE_LIMIT, rating_prior_mean
+            )
+        ).first()
+
+    if detail is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"Mod {mod_id!s} not found",
+        )
+
+    # NOTE: only a mean computed by the statement is cached, re-caching the cached
+    # mean would restart its TTL on every request so it would never expire
+    if rating_prior_mean is None:
+        _cache_rating_prior_mean(detail.rating_prior_mean)
+    return ModDetailSchema.parse_obj(detail.payload)
+
+
+def get_mod_rating_versions(mod_id: UUID) -> List[ModRatingVersionSummarySchema]:
+    """Get the summaries of the ratings of each rated version of a mod.
+
+    :param UUID mod_id: The mod's unique primary identifier
+    :raises HTTPException: If the mod does not exist or is not active
+    :return: The rating summary of each rated version of the mod, newest version first
+    :rtype: List[ModRatingVersionSummarySchema]
+    """
+
+    with get_db().session() as session:
+        if not _is_mod_active(session, mod_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Mod {mod_id!s} not found",
+            )
+
+        columns = _get_rating_summary_columns(
+            ModRatingVersionSummary, _get_rating_prior_mean(session)
+        )
+        summaries = (
+            session.query(ModRatingVersionSummary.version, *columns.values())
+            .filter(
+                ModRatingVersionSummary.mod_id == mod_id,
+                ModRatingVersionSummary.count > 0,
+            )
+            .all()
+        )
+
+    return [
+        ModRatingVersionSummarySchema(
+            version=str(version), **dict(zip(columns.keys(), values))
+        )
+        for version, *values in sorted(
+            summaries, key=lambda summary: summary[0], reverse=True
+        )
+    ]
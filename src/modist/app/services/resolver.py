@@ -0,0 +1,597 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains service methods for resolving mod release dependencies.
+
+Resolution happens in two phases. First, the candidate releases for the requested mods
+are loaded along with their dependency and conflict edges, one dependency layer at a
+time, so the number of queries depends on the depth of the dependency graph rather
+than its number of edges. Then :class:`~.DependencyResolver` searches the candidates
+in memory for a consistent set of releases.
+"""
+
+from uuid import UUID
+from typing import Set, Dict, List, Type, Tuple, Iterable, Iterator, Optional
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+
+from fastapi import HTTPException, status
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement
+
+from ..utils import get_db
+from .collection import get_by_ids, filter_by_ids
+from ...models.mod import ModRelease, ModReleaseConflict, ModReleaseDependency
+from ...versioning import VersionKey, VersionRange
+from ..schemas.mod import ModReleaseSchema
+from ...models._mixins import VersionRangeMixin
+from ..schemas.resolver import ResolutionSchema, ResolutionRequestSchema
+
+Edge = Tuple[UUID, VersionRange]
+Nogood = Tuple[Tuple[UUID, UUID], ...]
+
+
+class ResolutionError(Exception):
+    """Raised when no consistent set of releases exists for the requested mods."""
+
+
+@dataclass(frozen=True)
+class Candidate(object):
+    """Describes a candidate release of a mod along with its dependency edges."""
+
+    id: UUID
+    mod_id: UUID
+    key: VersionKey
+    dependencies: Tuple[Edge, ...] = ()
+    conflicts: Tuple[Edge, ...] = ()
+
+
+class DependencyResolver(object):
+    """Resolves a consistent set of candidate releases for requested mods.
+
+    The resolver performs a backtracking search which always selects the newest viable
+    release first. Pending mods with no or a single viable release are resolved first
+    (failing early or making forced selections), otherwise the most recently required
+    mod is resolved next so dependency chains are resolved depth first.
+
+    Every constraint placed on a mod remembers the selected mod it came from. When a mod
+    runs out of viable releases, the search backjumps directly to the most recently
+    selected mod responsible for that, rather than retrying every unrelated selection
+    made in between. The responsible selections are also memoized as a nogood, so any
+    later candidate that would recreate them is pruned without being explored again.
+
+    >>> resolver = DependencyResolver(candidates)
+    >>> resolver.resolve([mod_id])
+    {mod_id: Candidate(...), dependency_mod_id: Candidate(...)}
+
+    """
+
+    def __init__(self, candidates: Dict[UUID, List[Candidate]]):
+        """Initialize the resolver.
+
+        :param Dict[UUID, List[Candidate]] candidates: The candidate releases of every
+            mod that may be required, keyed by the mod's unique identifier
+        """
+
+        self.candidates = {
+            mod_id: sorted(
+                mod_candidates, key=lambda candidate: candidate.key, reverse=True
+            )
+            for mod_id, mod_candidates in candidates.items()
+        }
+        self.selected: Dict[UUID, Candidate] = {}
+        self.constraints: Dict[UUID, List[Edge]] = defaultdict(list)
+        self.forbidden: Dict[UUID, List[Edge]] = defaultdict(list)
+        self.requirements: Dict[UUID, List[Optional[UUID]]] = defaultdict(list)
+        # NOTE: pending mods are ordered by when they were required, plain dicts are
+        # ordered too but can't be reversed before Python 3.8
+        self.pending: "OrderedDict[UUID, None]" = OrderedDict()
+        self.nogoods: Dict[UUID, List[Nogood]] = defaultdict(list)
+        self.viable: Dict[UUID, List[Candidate]] = {}
+        self.stale: Set[UUID] = set()
+        self.constrained: Set[UUID] = set()
+
+        # NOTE: the viability of a mod's candidates only changes when a mod they have
+        # an edge to (or share a nogood with) is (de)selected or has its constraints
+        # changed, so viable candidates are cached until one of those happens
+        self.referrers: Dict[UUID, Set[UUID]] = defaultdict(set)
+        for mod_candidates in self.candidates.values():
+            for candidate in mod_candidates:
+                for mod_id, _ in (*candidate.dependencies, *candidate.conflicts):
+                    self.referrers[mod_id].add(candidate.mod_id)
+
+    def _get_nogood(self, candidate: Candidate) -> Optional[Nogood]:
+        """Get a learned nogood that selecting a given candidate would complete.
+
+        :param Candidate candidate: The candidate to check
+        :return: The first nogood whose other selections are all currently selected,
+            or None if selecting the candidate completes no nogood
+        :rtype: Optional[Nogood]
+        """
+
+        for nogood in self.nogoods.get(candidate.id, []):
+            if all(
+                mod_id == candidate.mod_id
+                or (mod_id in self.selected and self.selected[mod_id].id == selected_id)
+                for mod_id, selected_id in nogood
+            ):
+                return nogood
+
+        return None
+
+    def _add_nogood(self, culprits: Set[UUID]):
+        """Learn that the current selections of the given mods lead to no solution.
+
+        :param Set[UUID] culprits: The selected mods responsible for a failure
+        """
+
+        nogood: Nogood = tuple(
+            (mod_id, self.selected[mod_id].id) for mod_id in culprits
+        )
+        for mod_id, selected_id in nogood:
+            self.nogoods[selected_id].append(nogood)
+            self.referrers[mod_id].update(culprits)
+            self.viable.pop(mod_id, None)
+            self.stale.add(mod_id)
+
+    def _invalidate(self, candidate: Candidate):
+        """Invalidate the cached viable candidates affected by a given candidate.
+
+        :param Candidate candidate: The candidate being selected or deselected
+        """
+
+        affected = {
+            candidate.mod_id,
+            *(mod_id for mod_id, _ in candidate.dependencies),
+            *(mod_id for mod_id, _ in candidate.conflicts),
+        }
+        for mod_id in list(affected):
+            affected.update(self.referrers.get(mod_id, ()))
+        for mod_id in affected:
+            self.viable.pop(mod_id, None)
+        self.stale.update(affected)
+
+    def _allows(self, mod_id: UUID, version: VersionKey, *ranges: VersionRange) -> bool:
+        """Check if a given version of a mod satisfies the current constraints.
+
+        :param UUID mod_id: The unique identifier of the mod
+        :param VersionKey version: The precedence key of the version to check
+        :param VersionRange ranges: Additional ranges the version must satisfy
+        :return: True if the version is allowed, otherwise False
+        :rtype: bool
+        """
+
+        return (
+            all(
+                version_range.contains(version)
+                for _, version_range in self.constraints[mod_id]
+            )
+            and not any(
+                version_range.contains(version)
+                for _, version_range in self.forbidden[mod_id]
+            )
+            and all(version_range.contains(version) for version_range in ranges)
+        )
+
+    def _get_blockers(self, mod_id: UUID, version: VersionKey) -> Set[UUID]:
+        """Get the selected mods whose edges disallow a given version of a mod.
+
+        :param UUID mod_id: The unique identifier of the mod
+        :param VersionKey version: The precedence key of the disallowed version
+        :return: The unique identifiers of the selected mods disallowing the version
+        :rtype: Set[UUID]
+        """
+
+        return {
+            source_id
+            for source_id, version_range in self.constraints[mod_id]
+            if not version_range.contains(version)
+        } | {
+            source_id
+            for source_id, version_range in self.forbidden[mod_id]
+            if version_range.contains(version)
+        }
+
+    def _is_viable(self, candidate: Candidate) -> bool:
+        """Check if a given candidate can be selected within the current selection.
+
+        :param Candidate candidate: The candidate to check
+        :return: True if the candidate is viable, otherwise False
+        :rtype: bool
+        """
+
+        if not self._allows(candidate.mod_id, candidate.key):
+            return False
+
+        if self._get_nogood(candidate) is not None:
+            return False
+
+        for mod_id, version_range in candidate.conflicts:
+            selected = self.selected.get(mod_id)
+            if selected is not None and version_range.contains(selected.key):
+                return False
+
+        for mod_id, version_range in candidate.dependencies:
+            selected = self.selected.get(mod_id)
+            if selected is not None:
+                if not version_range.contains(selected.key):
+                    return False
+            elif not any(
+                self._allows(mod_id, dependency.key, version_range)
+                for dependency in self.candidates.get(mod_id, [])
+            ):
+                return False
+
+        return True
+
+    def _get_culprits(self, candidate: Candidate) -> Set[UUID]:
+        """Get the selected mods responsible for a given candidate not being viable.
+
+        :param Candidate candidate: The candidate that is not viable
+        :return: The unique identifiers of the responsible selected mods
+        :rtype: Set[UUID]
+        """
+
+        culprits = self._get_blockers(candidate.mod_id, candidate.key)
+        nogood = self._get_nogood(candidate)
+        if nogood is not None:
+            culprits.update(
+                mod_id for mod_id, _ in nogood if mod_id != candidate.mod_id
+            )
+
+        for mod_id, version_range in candidate.conflicts:
+            selected = self.selected.get(mod_id)
+            if selected is not None and version_range.contains(selected.key):
+                culprits.add(mod_id)
+
+        for mod_id, version_range in candidate.dependencies:
+            selected = self.selected.get(mod_id)
+            if selected is not None:
+                if not version_range.contains(selected.key):
+                    culprits.add(mod_id)
+                continue
+
+            for dependency in self.candidates.get(mod_id, []):
+                if version_range.contains(dependency.key):
+                    culprits.update(self._get_blockers(mod_id, dependency.key))
+
+        return culprits
+
+    def _get_viable(self, mod_id: UUID) -> List[Candidate]:
+        """Get the viable candidates of a given mod, newest first.
+
+        :param UUID mod_id: The unique identifier of the mod
+        :return: The viable candidates of the mod
+        :rtype: List[Candidate]
+        """
+
+        viable = self.viable.get(mod_id)
+        if viable is None:
+            viable = [
+                candidate
+                for candidate in self.candidates.get(mod_id, [])
+                if self._is_viable(candidate)
+            ]
+            self.viable[mod_id] = viable
+
+        return viable
+
+    def _pick_pending(self) -> Optional[Tuple[UUID, List[Candidate], Set[UUID]]]:
+        """Pick the next required mod to resolve.
+
+        .. note:: Only the pending mods whose viable candidates may have changed since
+            the last pick are re-evaluated, rather than every pending mod.
+
+        :return: The picked pending mod, its viable candidates, and the selected mods
+            responsible for its other candidates not being viable, or None if every
+            required mod is resolved
+        :rtype: Optional[Tuple[UUID, List[Candidate], Set[UUID]]]
+        """
+
+        for mod_id in self.stale:
+            if mod_id not in self.pending:
+                continue
+
+            if len(self._get_viable(mod_id)) <= 1:
+                self.constrained.add(mod_id)
+            else:
+                self.constrained.discard(mod_id)
+        self.stale.clear()
+
+        picked: Optional[UUID] = None
+        for mod_id in list(self.constrained):
+            if mod_id not in self.pending:
+                self.constrained.discard(mod_id)
+            elif picked is None or len(self.viable[mod_id]) < len(self.viable[picked]):
+                picked = mod_id
+
+        if picked is None:
+            if len(self.pending) <= 0:
+                return None
+
+            picked = next(reversed(self.pending))
+
+        viable = self._get_viable(picked)
+        viable_ids = {candidate.id for candidate in viable}
+        culprits: Set[UUID] = set()
+        for candidate in self.candidates.get(picked, []):
+            if candidate.id not in viable_ids:
+                culprits.update(self._get_culprits(candidate))
+
+        return (picked, viable, culprits)
+
+    def _require(
+        self,
+        mod_id: UUID,
+        source_id: Optional[UUID] = None,
+        version_range: Optional[VersionRange] = None,
+    ):
+        """Require a given mod to be resolved.
+
+        :param UUID mod_id: The unique identifier of the required mod
+        :param Optional[UUID] source_id: The unique identifier of the selected mod
+            requiring the mod, optional, defaults to None (requested directly)
+        :param Optional[VersionRange] version_range: The range of versions the mod is
+            required within, optional, defaults to None (any version)
+        """
+
+        if version_range is not None:
+            self.constraints[mod_id].append((source_id, version_range))
+        self.requirements[mod_id].append(source_id)
+        if mod_id not in self.selected:
+            self.pending[mod_id] = None
+            self.stale.add(mod_id)
+
+    def _select(self, candidate: Candidate):
+        """Select a given candidate and apply its edges.
+
+        :param Candidate candidate: The candidate to select
+        """
+
+        self.selected[candidate.mod_id] = candidate
+        self.pending.pop(candidate.mod_id, None)
+        self._invalidate(candidate)
+        for mod_id, version_range in candidate.dependencies:
+            self._require(mod_id, candidate.mod_id, version_range)
+        for mod_id, version_range in candidate.conflicts:
+            self.forbidden[mod_id].append((candidate.mod_id, version_range))
+
+    def _deselect(self, mod_id: UUID):
+        """Deselect the selected candidate of a given mod and revert its edges.
+
+        .. note:: Candidates must be deselected in the reverse order they were
+            selected, as their edges are removed from the end of each mod's
+            constraints.
+
+        :param UUID mod_id: The unique identifier of the mod to deselect
+        """
+
+        candidate = self.selected.pop(mod_id)
+        self._invalidate(candidate)
+        if len(self.requirements[mod_id]) > 0:
+            self.pending[mod_id] = None
+            self.stale.add(mod_id)
+        for dependency_id, _ in reversed(candidate.dependencies):
+            self.constraints[dependency_id].pop()
+            self.requirements[dependency_id].pop()
+            if len(self.requirements[dependency_id]) <= 0:
+                self.pending.pop(dependency_id, None)
+        for conflict_id, _ in reversed(candidate.conflicts):
+            self.forbidden[conflict_id].pop()
+
+    def resolve(self, mod_ids: Iterable[UUID]) -> Dict[UUID, Candidate]:
+        """Resolve a consistent set of candidates for the given mods.
+
+        :param Iterable[UUID] mod_ids: The unique identifiers of the requested mods
+        :raises ResolutionError: If no consistent set of candidates exists
+        :return: The selected candidates keyed by their mod's unique identifier
+        :rtype: Dict[UUID, Candidate]
+        """
+
+        for mod_id in mod_ids:
+            self._require(mod_id)
+
+        # NOTE: the search is iterative as the dependency chains of large graphs can
+        # easily exceed the interpreter's recursion limit
+        pending = self._pick_pending()
+        if pending is None:
+            return {}
+
+        # NOTE: each level of the stack tracks the mod being resolved, its remaining
+        # viable candidates, and the selected mods responsible for its failed candidates
+        stack: List[Tuple[UUID, Iterator[Candidate], Set[UUID]]] = [
+            (pending[0], iter(pending[1]), pending[2])
+        ]
+        while len(stack) > 0:
+            mod_id, candidates, culprits = stack[-1]
+            if mod_id in self.selected:
+                self._deselect(mod_id)
+
+            candidate = next(candidates, None)
+            if candidate is None:
+                culprits.update(
+                    source_id
+                    for source_id in self.requirements[mod_id]
+                    if source_id is not None
+                )
+                culprits.discard(mod_id)
+                self._add_nogood(culprits)
+                stack.pop()
+
+                # NOTE: selections made after the most recent culprit did not cause
+                # this failure, so retrying their other candidates can't fix it
+                while len(stack) > 0 and stack[-1][0] not in culprits:
+                    self._deselect(stack.pop()[0])
+                if len(stack) > 0:
+                    stack[-1][2].update(culprits - {stack[-1][0]})
+                continue
+
+            self._select(candidate)
+            pending = self._pick_pending()
+            if pending is None:
+                return dict(self.selected)
+
+            stack.append((pending[0], iter(pending[1]), pending[2]))
+
+        raise ResolutionError("No consistent set of releases exists for the mods")
+
+
+def _build_satisfies_clause(model: Type[VersionRangeMixin]) -> ClauseElement:
+    """Build the clause matching the releases that satisfy a dependency or conflict.
+
+    .. note:: Each bound is compared with an inclusive range comparison first, which
+        ``ix_mod_release_mod_id_version_key`` can answer with a range scan, and only
+        then excludes the bound itself for exclusive bounds.
+
+    :param Type[VersionRangeMixin] model: The dependency or conflict model
+    :return: The clause matching ``mod_release`` rows within the row's version range
+    :rtype: ClauseElement
+    """
+
+    return and_(
+        ModRelease.mod_id == model.mod_id,
+        or_(
+            model.lower_version_key.is_(None),
+            and_(
+                ModRelease.version_key >= model.lower_version_key,
+                or_(
+                    model.lower_inclusive.is_(True),
+                    ModRelease.version_key != model.lower_version_key,
+                ),
+            ),
+        ),
+        or_(
+            model.upper_version_key.is_(None),
+            and_(
+                ModRelease.version_key <= model.upper_version_key,
+                or_(
+                    model.upper_inclusive.is_(True),
+                    ModRelease.version_key != model.upper_version_key,
+                ),
+            ),
+        ),
+    )
+
+
+def load_candidates(
+    session: Session, mod_ids: Iterable[UUID], host_release_id: UUID
+) -> Dict[UUID, List[Candidate]]:
+    """Load the candidate releases of the given mods and all their dependencies.
+
+    Candidates are loaded one dependency layer at a time. Each layer costs two queries
+    regardless of how many mods or edges the layer contains. The first query loads the
+    dependencies of the layer's releases joined with the releases satisfying them, which
+    form the next layer. The second loads the conflicts of the layer's releases.
+
+    .. note:: Releases of a dependency that satisfy none of the dependencies on it can
+        never be selected, so they are never loaded.
+
+    :param Session session: The session to load the candidates within
+    :param Iterable[UUID] mod_ids: The unique identifiers of the requested mods
+    :param UUID host_release_id: The host release the candidates must be built for
+    :return: The candidate releases keyed by their mod's unique identifier
+    :rtype: Dict[UUID, List[Candidate]]
+    """
+
+    mod_ids = list(mod_ids)
+    release_filters = (
+        ModRelease.is_active.is_(True),
+        ModRelease.host_release_id == host_release_id,
+    )
+    releases: Dict[UUID, Tuple[UUID, VersionKey]] = {
+        release_id: (mod_id, version_key)
+        for release_id, mod_id, version_key in filter_by_ids(
+            session.query(
+                ModRelease.id, ModRelease.mod_id, ModRelease.version_key
+            ).filter(*release_filters),
+            ModRelease.mod_id,
+            mod_ids,
+        )
+    }
+    dependencies: Dict[UUID, List[Edge]] = defaultdict(list)
+    conflicts: Dict[UUID, List[Edge]] = defaultdict(list)
+
+    layer = list(releases.keys())
+    while len(layer) > 0:
+        next_layer: List[UUID] = []
+        edges: Set[Tuple[UUID, UUID]] = set()
+        for dependency, release_id, mod_id, version_key in filter_by_ids(
+            session.query(
+                ModReleaseDependency,
+                ModRelease.id,
+                ModRelease.mod_id,
+                ModRelease.version_key,
+            ).outerjoin(
+                ModRelease,
+                and_(_build_satisfies_clause(ModReleaseDependency), *release_filters),
+            ),
+            ModReleaseDependency.mod_release_id,
+            layer,
+        ):
+            edge_key = (dependency.mod_release_id, dependency.mod_id)
+            if edge_key not in edges:
+                edges.add(edge_key)
+                dependencies[dependency.mod_release_id].append(
+                    (dependency.mod_id, dependency.version_range)
+                )
+
+            if release_id is not None and release_id not in releases:
+                releases[release_id] = (mod_id, version_key)
+                next_layer.append(release_id)
+
+        for conflict in filter_by_ids(
+            session.query(ModReleaseConflict), ModReleaseConflict.mod_release_id, layer,
+        ):
+            conflicts[conflict.mod_release_id].append(
+                (conflict.mod_id, conflict.version_range)
+            )
+
+        layer = next_layer
+
+    candidates: Dict[UUID, List[Candidate]] = {mod_id: [] for mod_id in mod_ids}
+    for release_id, (mod_id, version_key) in releases.items():
+        candidates.setdefault(mod_id, []).append(
+            Candidate(
+                id=release_id,
+                mod_id=mod_id,
+                key=version_key,
+                dependencies=tuple(dependencies.get(release_id, [])),
+                conflicts=tuple(conflicts.get(release_id, [])),
+            )
+        )
+
+    return candidates
+
+
+def resolve_mod_releases(resolution: ResolutionRequestSchema) -> ResolutionSchema:
+    """Resolve a consistent set of releases of the requested mods for a host release.
+
+    :param ResolutionRequestSchema resolution: The requested mods and host release
+    :raises HTTPException: If no consistent set of releases exists
+    :return: The releases of the requested mods and their dependencies
+    :rtype: ResolutionSchema
+    """
+
+    with get_db().session() as session:
+        candidates = load_candidates(
+            session, resolution.mod_ids, resolution.host_release_id
+        )
+        try:
+            selected = DependencyResolver(candidates).resolve(resolution.mod_ids)
+        except ResolutionError as exc:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+
+        mod_releases, _ = get_by_ids(
+            session.query(ModRelease),
+            ModRelease.id,
+            [candidate.id for candidate in selected.values()],
+        )
+
+        return ResolutionSchema(
+            host_release_id=resolution.host_release_id,
+            releases=[
+                ModReleaseSchema.from_model(mod_release) for mod_release in mod_releases
+            ],
+        )
@@ -0,0 +1,117 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains service methods related to searching resources."""
+
+from uuid import UUID
+from typing import Any, Dict, List, Type, Optional
+
+from sqlalchemy import Column, func, select
+from sqlalchemy.orm import Session
+
+from ...env import instance as env
+from ..utils import get_db
+from ...models.mod import Mod
+from ...models.host import Host
+from ...models.common import Tag
+from ..schemas.search import SuggestionType, SuggestionSchema
+
+# NOTE: the trigram similarity operator is ``%`` which must be escaped for the
+# ``pyformat`` parameter style used by psycopg2
+SIMILAR_OPERATOR = "%%"
+
+
+def _set_similarity_threshold(session: Session, threshold: float):
+    """Set the trigram similarity threshold for the session's current transaction.
+
+    :param Session session: The session to set the similarity threshold within
+    :param float threshold: The minimum similarity (between 0 and 1) for the ``%``
+        operator to consider two strings similar
+    """
+
+    session.execute(
+        select([func.set_config("pg_trgm.similarity_threshold", str(threshold), True)])
+    )
+
+
+def _get_similar(
+    session: Session,
+    model: Type[Any],
+    column: Column,
+    suggestion_type: SuggestionType,
+    search: str,
+    limit: int,
+) -> List[SuggestionSchema]:
+    """Get the active records whose given column is most similar to a search.
+
+    :param Session session: The session to query within
+    :param Type[Any] model: The model of the records to suggest
+    :param Column column: The trigram indexed text column to compare the search to
+    :param SuggestionType suggestion_type: The type of the suggested records
+    :param str search: The search to compare against
+    :param int limit: The maximum number of similar records to return
+    :return: The most similar records ordered by their similarity
+    :rtype: List[SuggestionSchema]
+    """
+
+    similarity = func.similarity(column, search)
+    return [
+        SuggestionSchema(
+            id=record_id, type=suggestion_type, text=text, similarity=record_similarity
+        )
+        for record_id, text, record_similarity in session.query(
+            model.id, column, similarity
+        )
+        .filter(model.is_active.is_(True), column.op(SIMILAR_OPERATOR)(search))
+        .order_by(similarity.desc())
+        .limit(limit)
+    ]
+
+
+def get_suggestions(
+    search: str, threshold: Optional[float] = None, limit: Optional[int] = None
+) -> List[SuggestionSchema]:
+    """Get "did you mean" suggestions for a possibly misspelled search.
+
+    Mod slugs and names, host names, and tag names are compared against the search
+    through the ``pg_trgm`` similarity operator ``%``, which is backed by their GIN
+    trigram indexes. So only similar rows are ever read rather than every name being
+    compared within the application.
+
+    :param str search: The possibly misspelled search
+    :param Optional[float] threshold: The minimum similarity of suggestions, optional,
+        defaults to ``APP_SEARCH_SIMILARITY_THRESHOLD``
+    :param Optional[int] limit: The maximum number of suggestions, optional, defaults
+        to ``APP_SEARCH_SUGGESTION_LIMIT``
+    :return: The suggestions ordered by their similarity to the search
+    :rtype: List[SuggestionSchema]
+    """
+
+    if threshold is None:
+        threshold = env.app.search.similarity_threshold
+    if limit is None:
+        limit = env.app.search.suggestion_limit
+
+    with get_db().session() as session:
+        _set_similarity_threshold(session, threshold)
+
+        suggestions: Dict[UUID, SuggestionSchema] = {}
+        for model, column, suggestion_type in (
+            (Mod, Mod.name, SuggestionType.MOD),
+            (Mod, Mod.slug, SuggestionType.MOD),
+            (Host, Host.name, SuggestionType.HOST),
+            (Tag, Tag.name, SuggestionType.TAG),
+        ):
+            for suggestion in _get_similar(
+                session, model, column, suggestion_type, search, limit
+            ):
+                # NOTE: a mod may be similar by both its name and its slug, in which
+                # case only its most similar text is suggested
+                existing = suggestions.get(suggestion.id)
+                if existing is None or existing.similarity < suggestion.similarity:
+                    suggestions[suggestion.id] = suggestion
+
+        return sorted(
+            suggestions.values(), key=lambda suggestion: -suggestion.similarity
+        )[:limit]
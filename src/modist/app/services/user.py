@@ -15,14 +15,16 @@ from sqlalchemy.orm.exc import NoResultFound
 
 from ...env import instance as env
 from ..utils import get_db
+from .collection import get_by_ids
 from ...models.user import User
-from ..schemas.user import UserSchema, UserMutationSchema
+from ..schemas.user import UserSchema, UserPublicSchema, UserMutationSchema
 from ..services.security import (
     OAuth2Scopes,
     hash_password,
     oauth2_scheme,
     verify_password,
 )
+from ..schemas.collection import BatchSchema
 
 
 def get_user_by_id(user_id: UUID) -> Optional[UserSchema]:
@@ -41,6 +43,25 @@ def get_user_by_id(user_id: UUID) -> Optional[UserSchema]:
         return UserSchema.from_model(user_model)
 
 
+def get_users_by_ids(user_ids: List[UUID]) -> BatchSchema[UserPublicSchema]:
+    """Get a batch of active users by their ``id`` with a single query.
+
+    :param List[UUID] user_ids: The users' unique primary identifiers
+    :return: The discovered users in the requested order and the missing identifiers
+    :rtype: BatchSchema[UserPublicSchema]
+    """
+
+    with get_db().session() as session:
+        users, missing = get_by_ids(
+            session.query(User).filter(User.is_active.is_(True)), User.id, user_ids
+        )
+
+        return BatchSchema[UserPublicSchema](
+            results=[UserPublicSchema.from_model(user) for user in users],
+            missing=missing,
+        )
+
+
 def get_user_by_email(user_email: str) -> Optional[UserSchema]:
     """Get a user by their ``email``.
 
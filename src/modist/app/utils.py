@@ -5,6 +5,11 @@
 """
 """
 
+import json
+import base64
+import binascii
+from typing import Any, Dict, List
+
 from cachetools import LRUCache, cached
 
 from ..db import Database
@@ -22,3 +27,69 @@ def get_db() -> Database:
     """
 
     return Database(url=env.database.url, echo=env.database.echo)
+
+
+def parse_quality_values(header: str) -> Dict[str, float]:
+    """Parse the quality values of a given content negotiation header.
+
+    Headers such as ``Accept`` and ``Accept-Encoding`` are a comma separated list of
+    entries with optional ``q`` weights, for example ``gzip;q=1.0, br;q=0.5``.
+
+    :param str header: The content negotiation header value
+    :return: A dictionary of lowercased entries to their quality values
+    :rtype: Dict[str, float]
+    """
+
+    weights: Dict[str, float] = {}
+    for entry in header.split(","):
+        value, *params = [part.strip() for part in entry.split(";")]
+        if len(value) <= 0:
+            continue
+
+        weight = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    weight = float(param[2:])
+                except ValueError:
+                    weight = 0.0
+        weights[value.lower()] = weight
+
+    return weights
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode the given keyset pagination values as an opaque cursor.
+
+    :param List[Any] values: The JSON serializable values of the last seen row
+    :return: The URL safe cursor
+    :rtype: str
+    """
+
+    return (
+        base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode())
+        .decode("ascii")
+        .rstrip("=")
+    )
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode the keyset pagination values from a given opaque cursor.
+
+    :param str cursor: The cursor to decode
+    :raises ValueError: If the given cursor is malformed
+    :return: The values of the last seen row
+    :rtype: List[Any]
+    """
+
+    try:
+        values = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        )
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError(f"Invalid cursor {cursor!r}") from exc
+
+    if not isinstance(values, list):
+        raise ValueError(f"Invalid cursor {cursor!r}")
+
+    return values
@@ -4,7 +4,9 @@
 
 """Contains the environment groups and contexts to use throughout the application."""
 
+import tempfile
 from enum import Enum
+from pathlib import Path
 
 from environ import var, group, config, bool_var
 
@@ -37,7 +39,83 @@ class AppEnv(object):
         algorithm: str = var(default="HS256")
         access_token_ttl: int = var(default=86400, converter=int)
 
+    @config(prefix="COLLECTION")
+    class CollectionEnv(object):
+        """The environment variables related to collection resources."""
+
+        count_cache_ttl: int = var(default=60, converter=int)
+        count_cache_size: int = var(default=1024, converter=int)
+        batch_maximum_size: int = var(default=100, converter=int)
+
+    @config(prefix="COMPRESSION")
+    class CompressionEnv(object):
+        """The environment variables related to response compression."""
+
+        minimum_size: int = var(default=500, converter=int)
+        gzip_level: int = var(default=6, converter=int)
+        brotli_quality: int = var(default=4, converter=int)
+        cache_size: int = var(default=256, converter=int)
+        cache_maximum_size: int = var(default=1048576, converter=int)
+
+    @config(prefix="SEARCH")
+    class SearchEnv(object):
+        """The environment variables related to searching resources."""
+
+        similarity_threshold: float = var(default=0.3, converter=float)
+        suggestion_limit: int = var(default=5, converter=int)
+
+    @config(prefix="AUTOCOMPLETE")
+    class AutocompleteEnv(object):
+        """The environment variables related to autocompletion."""
+
+        refresh_interval: int = var(default=30, converter=int)
+        rebuild_interval: int = var(default=3600, converter=int)
+        mod_limit: int = var(default=10000, converter=int)
+        result_limit: int = var(default=10, converter=int)
+
+    @config(prefix="DOWNLOADS")
+    class DownloadsEnv(object):
+        """The environment variables related to download recording and statistics."""
+
+        rollup_settle_interval: int = var(default=300, converter=int)
+        partition_premake_months: int = var(default=3, converter=int)
+        retention_months: int = var(default=24, converter=int)
+        retention_detach_only: bool = bool_var(default=False)
+        buffer_size: int = var(default=10000, converter=int)
+        flush_size: int = var(default=1000, converter=int)
+        flush_interval: float = var(default=1.0, converter=float)
+        spill_path: str = var(
+            default=Path(tempfile.gettempdir(), "modist-downloads.csv").as_posix()
+        )
+        header_allowlist: str = var(default="accept-language")
+        user_agent_cache_size: int = var(default=4096, converter=int)
+        deduplication_window: float = var(default=60.0, converter=float)
+        deduplication_size: int = var(default=100000, converter=int)
+        analytics_cache_size: int = var(default=1024, converter=int)
+
+    @config(prefix="SCORES")
+    class ScoresEnv(object):
+        """The environment variables related to mod popularity scores."""
+
+        window_days: int = var(default=30, converter=int)
+        trending_days: int = var(default=7, converter=int)
+        half_life_days: float = var(default=2.0, converter=float)
+
+    @config(prefix="RATINGS")
+    class RatingsEnv(object):
+        """The environment variables related to mod rating summaries."""
+
+        prior_count: float = var(default=10.0, converter=float)
+        prior_cache_ttl: int = var(default=300, converter=int)
+
     security: SecurityEnv = group(SecurityEnv)
+    collection: CollectionEnv = group(CollectionEnv)
+    compression: CompressionEnv = group(CompressionEnv)
+    search: SearchEnv = group(SearchEnv)
+    autocomplete: AutocompleteEnv = group(AutocompleteEnv)
+    downloads: DownloadsEnv = group(DownloadsEnv)
+    scores: ScoresEnv = group(ScoresEnv)
+    ratings: RatingsEnv = group(RatingsEnv)
     debug: bool = bool_var(default=False)
 
 
@@ -0,0 +1,178 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains a HyperLogLog sketch for estimating the number of distinct values.
+
+A sketch is a fixed array of ``2 ** HLL_PRECISION`` single byte registers, so it always
+takes ``HLL_SIZE`` bytes (8 KiB) no matter how many values were added to it. Sketches
+are mergeable (the merged sketch is the register-wise maximum), so the sketches of
+single days can be merged into the sketch of any range of days. The standard error of
+the estimate is ``1.04 / sqrt(2 ** HLL_PRECISION)``, about 1.15%.
+
+>>> sketch = HyperLogLog()
+>>> for value in ("127.0.0.1", "127.0.0.2", "127.0.0.1"):
+...     sketch.add(value)
+>>> sketch.estimate()
+2
+
+"""
+
+import math
+import hashlib
+from typing import Union, Iterable, Optional
+
+HLL_PRECISION = 13
+HLL_SIZE = 2 ** HLL_PRECISION
+HLL_HASH_BITS = 64
+HLL_ALPHA = 1 / (2 * math.log(2))
+_RANK_BITS = HLL_HASH_BITS - HLL_PRECISION
+_RANK_MASK = (1 << _RANK_BITS) - 1
+_HIGH_BITS = int.from_bytes(b"\x80" * HLL_SIZE, "big")
+
+
+def _hash(value: str) -> int:
+    """Hash a given value into an unsigned 64-bit integer.
+
+    :param str value: The value to hash
+    :return: The unsigned 64-bit hash of the value
+    :rtype: int
+    """
+
+    return int.from_bytes(
+        hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def _sigma(x: float) -> float:
+    """Compute the sigma series of the improved HyperLogLog estimator.
+
+    :param float x: The fraction of empty registers
+    :return: The value of the series
+    :rtype: float
+    """
+
+    if x == 1:
+        return math.inf
+
+    y, z = 1.0, x
+    while True:
+        x *= x
+        previous, z = z, z + x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x: float) -> float:
+    """Compute the tau series of the improved HyperLogLog estimator.
+
+    :param float x: The fraction of registers which are not saturated
+    :return: The value of the series
+    :rtype: float
+    """
+
+    if x == 0 or x == 1:
+        return 0.0
+
+    y, z = 1.0, 1 - x
+    while True:
+        x = math.sqrt(x)
+        y *= 0.5
+        previous, z = z, z - (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+class HyperLogLog(object):
+    """A mergeable sketch of the distinct values added to it."""
+
+    def __init__(self, registers: Optional[Union[bytes, bytearray]] = None):
+        """Initialize the sketch.
+
+        :param Optional[Union[bytes, bytearray]] registers: The registers of an existing
+            sketch (see :meth:`to_bytes`), optional, defaults to an empty sketch
+        :raises ValueError: If the given registers are not ``HLL_SIZE`` bytes
+        """
+
+        if registers is None:
+            registers = bytes(HLL_SIZE)
+        if len(registers) != HLL_SIZE:
+            raise ValueError(
+                f"HyperLogLog registers must be {HLL_SIZE!s} bytes, "
+                f"received {len(registers)!s}"
+            )
+
+        self.registers = bytearray(registers)
+
+    @classmethod
+    def from_values(cls, values: Iterable[str]) -> "HyperLogLog":
+        """Build a new sketch of the given values.
+
+        :param Iterable[str] values: The values to add to the sketch
+        :return: The sketch of the values
+        :rtype: HyperLogLog
+        """
+
+        sketch = cls()
+        for value in values:
+            sketch.add(value)
+
+        return sketch
+
+    def add(self, value: str):
+        """Add a value to the sketch.
+
+        :param str value: The value to add
+        """
+
+        hashed = _hash(value)
+        index = hashed >> _RANK_BITS
+        rank = _RANK_BITS - (hashed & _RANK_MASK).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        """Merge another sketch into this sketch.
+
+        :param HyperLogLog other: The sketch to merge into this sketch
+        """
+
+        # NOTE: registers never exceed 127, so the register-wise maximum is computed
+        # on all registers at once as big integers; setting the high bit of every
+        # register in ``left`` before subtracting ``right`` leaves the high bit of each
+        # register set only where the left register is the greater (or equal) one
+        left = int.from_bytes(self.registers, "big")
+        right = int.from_bytes(other.registers, "big")
+        mask = ((((left | _HIGH_BITS) - right) & _HIGH_BITS) >> 7) * 0xFF
+        self.registers = bytearray(
+            ((left & mask) | (right & ~mask)).to_bytes(HLL_SIZE, "big")
+        )
+
+    def estimate(self) -> int:
+        """Estimate the number of distinct values added to the sketch.
+
+        :return: The estimated number of distinct values
+        :rtype: int
+        """
+
+        # NOTE: this is the improved estimator described by Otmar Ertl in "New
+        # cardinality estimation algorithms for HyperLogLog sketches" (2017), which
+        # stays unbiased for small cardinalities without empirical bias correction
+        counts = [self.registers.count(rank) for rank in range(_RANK_BITS + 2)]
+        z = HLL_SIZE * _tau(1 - counts[_RANK_BITS + 1] / HLL_SIZE)
+        for count in reversed(counts[1 : _RANK_BITS + 1]):
+            z = 0.5 * (z + count)
+        z += HLL_SIZE * _sigma(counts[0] / HLL_SIZE)
+        estimate = HLL_ALPHA * HLL_SIZE * HLL_SIZE / z
+
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        """Serialize the sketch's registers.
+
+        :return: The ``HLL_SIZE`` bytes of the sketch's registers
+        :rtype: bytes
+        """
+
+        return bytes(self.registers)
@@ -10,13 +10,23 @@ from .mod import (
     ModBan,
     ModTag,
     ModPost,
+    ModScore,
     ModRating,
     ModRanking,
     ModRelease,
+    ModRankingTally,
+    ModDownloadDaily,
+    ModDownloadTotal,
+    ModRatingSummary,
+    ModDownloadSketch,
     ModReleaseArtifact,
     ModReleaseConflict,
     ModReleaseDownload,
     ModReleaseDependency,
+    ModRatingVersionSummary,
+    ModReleaseDownloadDaily,
+    ModReleaseDownloadTotal,
+    ModReleaseDownloadSketch,
 )
 from .host import Host, HostRelease, HostPublisher, HostPublisherSocial
 from .user import (
@@ -32,15 +42,19 @@ from .user import (
     UserMessage,
     ImageRanking,
     CommentRanking,
+    ImageRankingTally,
+    CommentRankingTally,
 )
 from .common import (
     Ban,
     Tag,
     Social,
     Category,
+    UserAgent,
     Notification,
     AgeRestriction,
     VirusDetection,
+    RollupWatermark,
     SiteNotification,
 )
 
@@ -80,4 +94,18 @@ __all__ = [
     "Image",
     "ImageRanking",
     "ModReleaseDownload",
+    "ModDownloadDaily",
+    "ModDownloadTotal",
+    "ModReleaseDownloadDaily",
+    "ModReleaseDownloadTotal",
+    "ModDownloadSketch",
+    "ModReleaseDownloadSketch",
+    "ModScore",
+    "ModRatingSummary",
+    "ModRatingVersionSummary",
+    "RollupWatermark",
+    "UserAgent",
+    "ModRankingTally",
+    "CommentRankingTally",
+    "ImageRankingTally",
 ]
@@ -5,11 +5,24 @@
 """Contains miscellaneous mixins for database models."""
 
 from uuid import UUID
+from typing import Union, Optional
 from datetime import datetime
 
-from sqlalchemy import Column, Boolean, DateTime, func, text
+from semver import VersionInfo
+from sqlalchemy import Text, Column, Boolean, DateTime, BigInteger, func, text
+from sqlalchemy.orm import validates
 from sqlalchemy.dialects import postgresql
 
+from ..versioning import (
+    VersionKey,
+    VersionBound,
+    VersionRange,
+    get_version_key,
+    parse_version_expression,
+)
+
+VERSION_KEY_COLLATION = "C"
+
 
 class IdMixin(object):
     """A ORM model mixin for the default auto-generated UUID id column."""
@@ -59,3 +72,138 @@ class IsActiveMixin(object):
     is_active: bool = Column(
         Boolean, nullable=False, default=True, server_default="true"
     )
+
+
+class RankingTallyMixin(object):
+    """An ORM model mixin for the maintained vote tallies of a ranked entity.
+
+    ``up`` counts the active rankings with a positive rank, ``down`` counts those with
+    a negative rank, and ``net`` is always ``up - down``. So a listing can show the
+    score of every ranked entity with a plain join rather than aggregating rankings.
+
+    .. note::
+        Tallies are maintained by triggers on the ranking association table and
+        ``ranking`` rather than the ORM. These triggers are provided by the Alembic
+        operations ``create_ranking_tally_triggers`` and
+        ``drop_ranking_tally_triggers``, and any drift is repaired by the
+        ``reconcile_ranking_tallies`` job. ``updated_at`` is refreshed by the
+        ``refresh_updated_at`` trigger whenever those triggers update the tally.
+
+    """
+
+    up: int = Column(BigInteger, nullable=False, default=0, server_default="0")
+    down: int = Column(BigInteger, nullable=False, default=0, server_default="0")
+    net: int = Column(BigInteger, nullable=False, default=0, server_default="0")
+    updated_at: datetime = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        onupdate=func.now(),
+        server_default=func.now(),
+    )
+
+
+class VersionKeyMixin(object):
+    """An ORM model mixin for the ``version_key`` of a model's ``version`` column.
+
+    ``SemverType`` stores versions as text, so ordering by ``version`` sorts lexically
+    (``1.10.0`` before ``1.9.0``). Whenever ``version`` is set, its precedence key is
+    stored in ``version_key``, which orders versions by their semver precedence. Order
+    by (and index) ``version_key`` rather than ``version`` so that latest release and
+    version range queries can be answered with an index scan.
+
+    .. note:: Version keys use the ``"C"`` collation as they must be compared
+        bytewise. Setting an invalid ``version`` raises a ``ValueError``.
+
+    """
+
+    version_key: VersionKey = Column(
+        Text(collation=VERSION_KEY_COLLATION), nullable=False
+    )
+
+    @validates("version")
+    def _validate_version(
+        self, _, version: Union[str, VersionInfo]
+    ) -> Union[str, VersionInfo]:
+        """Store the precedence key of the version being set.
+
+        :param Union[str, VersionInfo] version: The version being set
+        :raises ValueError: If the version is not a valid semver version
+        :return: The version
+        :rtype: Union[str, VersionInfo]
+        """
+
+        self.version_key = get_version_key(
+            VersionInfo.parse(version) if isinstance(version, str) else version
+        )
+        return version
+
+
+class VersionRangeMixin(object):
+    """An ORM model mixin for a ``version_expression`` and its pre-parsed bounds.
+
+    Whenever ``version_expression`` is set, the expression is parsed and the precedence
+    keys and inclusivity of its lower and upper bounds are stored alongside it. A
+    missing bound means the range is unbounded in that direction. The bounds can be
+    compared against the ``version_key`` of releases to find the releases satisfying
+    the expression with an index range scan rather than evaluating the expression
+    against every release in Python.
+
+    .. note:: Version keys use the ``"C"`` collation as they must be compared
+        bytewise. Setting an invalid ``version_expression`` raises a ``ValueError``.
+
+    """
+
+    version_expression: str = Column(Text, nullable=False)
+    lower_version_key: Optional[VersionKey] = Column(
+        Text(collation=VERSION_KEY_COLLATION)
+    )
+    lower_inclusive: bool = Column(
+        Boolean, nullable=False, default=True, server_default="true"
+    )
+    upper_version_key: Optional[VersionKey] = Column(
+        Text(collation=VERSION_KEY_COLLATION)
+    )
+    upper_inclusive: bool = Column(
+        Boolean, nullable=False, default=True, server_default="true"
+    )
+
+    @validates("version_expression")
+    def _validate_version_expression(self, _, version_expression: str) -> str:
+        """Store the bounds of the version expression being set.
+
+        :param str version_expression: The version expression being set
+        :raises ValueError: If the version expression is invalid
+        :return: The version expression
+        :rtype: str
+        """
+
+        version_range = parse_version_expression(version_expression)
+        for name, bound in (
+            ("lower", version_range.lower),
+            ("upper", version_range.upper),
+        ):
+            setattr(self, f"{name!s}_version_key", bound.key if bound else None)
+            setattr(self, f"{name!s}_inclusive", bound.inclusive if bound else True)
+
+        return version_expression
+
+    @property
+    def version_range(self) -> VersionRange:
+        """Get the range of versions described by the stored bounds.
+
+        :return: The range of versions matching the version expression
+        :rtype: VersionRange
+        """
+
+        return VersionRange(
+            lower=(
+                VersionBound(self.lower_version_key, self.lower_inclusive)
+                if self.lower_version_key is not None
+                else None
+            ),
+            upper=(
+                VersionBound(self.upper_version_key, self.upper_inclusive)
+                if self.upper_version_key is not None
+                else None
+            ),
+        )
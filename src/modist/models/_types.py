@@ -6,6 +6,7 @@
 """
 
 from typing import Type, Union, Optional
+from functools import lru_cache
 
 from sqlalchemy import Column
 from sqlalchemy.types import UnicodeText, TypeDecorator
@@ -15,6 +16,25 @@ try:
 except ImportError:
     pass
 
+VERSION_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=VERSION_CACHE_SIZE)
+def _parse_version(value: str) -> "VersionInfo":
+    """Parse the given version string with a bounded cache of parsed versions.
+
+    .. note:: Listing releases loads the same few distinct versions many times over.
+        ``VersionInfo`` is immutable, so a single parsed instance can safely be shared
+        by every row with the same version.
+
+    :param str value: The version string to parse
+    :raises ValueError: If the version string is not a valid semver version
+    :return: The parsed version
+    :rtype: VersionInfo
+    """
+
+    return VersionInfo.parse(value)
+
 
 class SemverType(TypeDecorator):
     """Custom SQLAlchemy type for Semver version details in Postgres.
@@ -71,7 +91,7 @@ class SemverType(TypeDecorator):
             return value
 
         if value is not None:
-            return VersionInfo.parse(value)
+            return _parse_version(value)
 
         return None
 
@@ -87,6 +107,6 @@ class SemverType(TypeDecorator):
             return value
 
         if value is not None and not isinstance(value, VersionInfo):
-            return VersionInfo.parse(value)
+            return _parse_version(value)
 
         return value
@@ -13,6 +13,7 @@ from furl.furl import furl
 from sqlalchemy import (
     Enum,
     Text,
+    Index,
     Column,
     String,
     Boolean,
@@ -122,6 +123,14 @@ class Tag(BaseModel):
     """The common tag model for content tags."""
 
     __tablename__ = "tag"
+    __table_args__ = (
+        Index(
+            "ix_tag_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     name: str = Column(String(length=64), nullable=False)
     description: Optional[str] = Column(Text)
@@ -170,3 +179,31 @@ class VirusDetection(BaseModel):
     checksum: str = Column(Text, nullable=False, index=True)
     is_unsafe: bool = Column(Boolean, nullable=False)
     description: Optional[str] = Column(Text)
+
+
+class RollupWatermark(Database.Entity):
+    """The common model for the high-water mark of an incremental rollup job.
+
+    Rollup jobs only process the source rows created after their watermark and then
+    advance it within the same transaction, so every source row is rolled up exactly
+    once.
+    """
+
+    __tablename__ = "rollup_watermark"
+
+    name: str = Column(Text, primary_key=True)
+    watermark: Optional[datetime] = Column(DateTime(timezone=True))
+
+
+class UserAgent(Database.Entity):
+    """The common model for an interned user agent.
+
+    .. note:: Downloads reference their user agent by this model's small integer
+        identifier rather than repeating the full user agent in every row. User agents
+        are only ever interned, never updated or deleted.
+    """
+
+    __tablename__ = "user_agent"
+
+    id: int = Column(Integer, primary_key=True)
+    value: str = Column(Text, nullable=False, unique=True)
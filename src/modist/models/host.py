@@ -8,8 +8,10 @@ from uuid import UUID
 from typing import List, Optional
 from datetime import datetime
 
+from semver import VersionInfo
 from sqlalchemy import (
     Text,
+    Index,
     Column,
     String,
     DateTime,
@@ -25,7 +27,7 @@ from ..db import Database
 from ._types import SemverType
 from .common import Social
 from ._common import BaseModel
-from ._mixins import TimestampMixin
+from ._mixins import TimestampMixin, VersionKeyMixin
 
 
 class HostPublisherSocial(Database.Entity, TimestampMixin):
@@ -78,6 +80,14 @@ class Host(BaseModel):
     """The ORM model representation of a host."""
 
     __tablename__ = "host"
+    __table_args__ = (
+        Index(
+            "ix_host_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     slug: str = Column(String(length=128), nullable=False, unique=True)
     name: str = Column(String(length=64), nullable=False)
@@ -93,14 +103,17 @@ class Host(BaseModel):
     mods = relationship("Mod", back_populates="host")
 
 
-class HostRelease(BaseModel):
+class HostRelease(BaseModel, VersionKeyMixin):
     """The ORM model representation of a host release."""
 
     __tablename__ = "host_release"
-    __table_args__ = (UniqueConstraint("host_id", "version"),)
+    __table_args__ = (
+        UniqueConstraint("host_id", "version"),
+        Index("ix_host_release_host_id_version_key", "host_id", "version_key"),
+    )
 
     released_at: Optional[datetime] = Column(DateTime(timezone=True), default=None)
-    version: str = Column(SemverType, nullable=False)
+    version: VersionInfo = Column(SemverType, nullable=False)
     description: Optional[str] = Column(Text)
     host_id: UUID = Column(
         postgresql.UUID(as_uuid=True), ForeignKey("host.id"), nullable=False
@@ -6,21 +6,28 @@
 
 from uuid import UUID
 from typing import List, Optional
-from datetime import datetime
+from decimal import Decimal
+from datetime import date, datetime
 
 from semver import VersionInfo
 from sqlalchemy import (
+    Date,
     Text,
+    Float,
+    Index,
     Column,
     String,
     Integer,
+    Numeric,
     DateTime,
+    BigInteger,
     ForeignKey,
     UniqueConstraint,
     PrimaryKeyConstraint,
+    func,
     text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy_utils import IPAddressType
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.associationproxy import association_proxy
@@ -28,14 +35,35 @@ from sqlalchemy.ext.associationproxy import association_proxy
 from ..db import Database
 from ._types import SemverType
 from ._common import BaseModel
-from ._mixins import IdMixin, TimestampMixin
+from ._mixins import (
+    IdMixin,
+    TimestampMixin,
+    VersionKeyMixin,
+    RankingTallyMixin,
+    VersionRangeMixin,
+)
 
 
 class Mod(BaseModel):
     """The ORM representation for a mod."""
 
     __tablename__ = "mod"
-    __table_args__ = (UniqueConstraint("user_id", "slug"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "slug"),
+        Index("ix_mod_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_mod_slug_trgm",
+            "slug",
+            postgresql_using="gin",
+            postgresql_ops={"slug": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_mod_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     slug: str = Column(String(length=128), nullable=False, unique=True)
     name: str = Column(String(length=64), nullable=False)
@@ -64,14 +92,39 @@ class Mod(BaseModel):
         default=None,
     )
 
+    # NOTE: the latest release is maintained by the ``refresh_latest_release_id``
+    # trigger on ``mod_release`` whenever a release is inserted, deleted, deactivated,
+    # or has its version changed, so it is never written by the ORM
+    latest_release_id: Optional[UUID] = Column(
+        postgresql.UUID(as_uuid=True),
+        ForeignKey("mod_release.id", ondelete="set null", use_alter=True),
+        nullable=True,
+    )
+
+    # NOTE: the search vector is maintained by the ``refresh_search_vector`` trigger
+    # and is only ever used within queries, so we avoid loading it with the mod
+    search_vector: str = deferred(
+        Column(
+            postgresql.TSVECTOR, nullable=False, server_default=text("''::tsvector"),
+        )
+    )
+
     user = relationship("User", back_populates="mods")
     host = relationship("Host", back_populates="mods")
     category = relationship("Category", back_populates="mods")
     age_restriction = relationship("AgeRestriction")
-    mod_releases: List["ModRelease"] = relationship("ModRelease", back_populates="mod")
+    mod_releases: List["ModRelease"] = relationship(
+        "ModRelease", back_populates="mod", foreign_keys="ModRelease.mod_id"
+    )
+    latest_release: Optional["ModRelease"] = relationship(
+        "ModRelease", foreign_keys=[latest_release_id], viewonly=True
+    )
     mod_tags: List["ModTag"] = relationship("ModTag", back_populates="mod")
     mod_bans: List["ModBan"] = relationship("ModBan", back_populates="mod")
     mod_rankings: List["ModRanking"] = relationship("ModRanking", back_populates="mod")
+    ranking_tally: Optional["ModRankingTally"] = relationship(
+        "ModRankingTally", uselist=False, viewonly=True
+    )
     mod_ratings: List["ModRating"] = relationship("ModRating", back_populates="mod")
     mod_posts: List["ModPost"] = relationship("ModPost", back_populates="mod")
     mod_images: List["ModImage"] = relationship("ModImage", back_populates="mod")
@@ -84,10 +137,13 @@ class Mod(BaseModel):
     images = association_proxy("mod_images", "image")
 
 
-class ModRelease(BaseModel):
+class ModRelease(BaseModel, VersionKeyMixin):
     """The ORM representation of a mod release."""
 
     __tablename__ = "mod_release"
+    __table_args__ = (
+        Index("ix_mod_release_mod_id_version_key", "mod_id", "version_key"),
+    )
 
     version: VersionInfo = Column(SemverType, nullable=False)
     description: Optional[str] = Column(Text)
@@ -104,7 +160,7 @@ class ModRelease(BaseModel):
         nullable=False,
     )
 
-    mod: Mod = relationship("Mod", back_populates="mod_releases")
+    mod: Mod = relationship("Mod", back_populates="mod_releases", foreign_keys=[mod_id])
     host_release = relationship("HostRelease", back_populates="mod_releases")
     artifacts: List["ModReleaseArtifact"] = relationship(
         "ModReleaseArtifact", back_populates="mod_release"
@@ -139,7 +195,7 @@ class ModReleaseArtifact(BaseModel):
     mod_release: ModRelease = relationship("ModRelease", back_populates="artifacts")
 
 
-class ModReleaseDependency(Database.Entity, TimestampMixin):
+class ModReleaseDependency(Database.Entity, TimestampMixin, VersionRangeMixin):
     """The ORM representation of a mod release dependency."""
 
     __tablename__ = "mod_release_dependency"
@@ -155,7 +211,6 @@ class ModReleaseDependency(Database.Entity, TimestampMixin):
         ForeignKey("mod.id", ondelete="cascade"),
         nullable=False,
     )
-    version_expression: str = Column(Text, nullable=False)
 
     release: "ModRelease" = relationship(
         "ModRelease", back_populates="release_dependencies"
@@ -163,7 +218,7 @@ class ModReleaseDependency(Database.Entity, TimestampMixin):
     dependency: "Mod" = relationship("Mod")
 
 
-class ModReleaseConflict(Database.Entity, TimestampMixin):
+class ModReleaseConflict(Database.Entity, TimestampMixin, VersionRangeMixin):
     """The ORM representation of a mod release conflict."""
 
     __tablename__ = "mod_release_conflict"
@@ -179,7 +234,6 @@ class ModReleaseConflict(Database.Entity, TimestampMixin):
         ForeignKey("mod.id", ondelete="cascade"),
         nullable=False,
     )
-    version_expression: str = Column(Text, nullable=False)
 
     release: "ModRelease" = relationship(
         "ModRelease", back_populates="release_conflicts"
@@ -188,12 +242,24 @@ class ModReleaseConflict(Database.Entity, TimestampMixin):
 
 
 class ModReleaseDownload(Database.Entity, IdMixin, TimestampMixin):
-    """The ORM representation of a mod release download."""
+    """The ORM representation of a mod release download.
+
+    .. note:: Downloads are range partitioned by month of ``downloaded_at`` (see
+        :mod:`~modist.partitioning`), so ``downloaded_at`` is part of the primary key as
+        Postgres requires of unique constraints on partitioned tables.
+    """
 
     __tablename__ = "mod_release_download"
+    __table_args__ = (
+        Index("ix_mod_release_download_created_at", "created_at"),
+        {"postgresql_partition_by": "RANGE (downloaded_at)"},
+    )
 
     downloaded_at: datetime = Column(
-        DateTime(timezone=True), nullable=False, server_default=text("now()")
+        DateTime(timezone=True),
+        primary_key=True,
+        nullable=False,
+        server_default=text("now()"),
     )
     ip: str = Column(postgresql.INET, nullable=False)
     headers: dict = Column(
@@ -214,6 +280,132 @@ class ModReleaseDownload(Database.Entity, IdMixin, TimestampMixin):
         ForeignKey("user.id", ondelete="set null"),
         nullable=True,
     )
+    user_agent_id: Optional[int] = Column(
+        Integer, ForeignKey("user_agent.id"), nullable=True
+    )
+
+    mod_release: Optional[ModRelease] = relationship("ModRelease")
+    mod: Mod = relationship("Mod")
+    user_agent = relationship("UserAgent")
+
+
+class ModDownloadDaily(Database.Entity):
+    """The ORM representation of the number of downloads of a mod per day.
+
+    .. note:: This and the other download rollups are maintained by the
+        ``rollup_downloads`` job from ``mod_release_download`` rather than the ORM.
+    """
+
+    __tablename__ = "mod_download_daily"
+    __table_args__ = (PrimaryKeyConstraint("mod_id", "day"),)
+
+    mod_id: UUID = Column(
+        postgresql.UUID(as_uuid=True),
+        ForeignKey("mod.id", ondelete="cascade"),
+        nullable=False,
+    )
+    day: date = Column(Date, nullable=False)
+    count: int = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+
+class ModDownloadTotal(Database.Entity):
+    """The ORM representation of the total number of downloads of a mod."""
+
+    __tablename__ = "mod_download_total"
+
+    mod_id: UUID = Column(
+        postgresql.UUID(as_uuid=True),
+        ForeignKey("mod.id", ondelete="cascade"),
+        primary_key=True,
+    )
+    count: int = Column(
+        BigInteger, nullable=False, default=0, server_default="0", index=True
+    )
+
+
+class ModReleaseDownloadDaily(Database.Entity):
+    """The ORM representation of the number of downloads of a mod release per day."""
+
+    __tablename__ = "mod_release_download_daily"
+    __table_args__ = (PrimaryKeyConstraint("mod_release_id", "day"),)
+
+    mod_release_id: UUID = Column(
+        postgresql.UUID(as_uuid=True),
+        ForeignKey("mod_release.id", ondelete="cascade"),
+        nullable=False,
+    )
+    day: date = Column(Date, nullable=False)
+    count: int = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+
+class ModReleaseDownloadTotal(Database.Entity):
+    """The ORM representation of the total number of downloads of a mod release."""
+
+    __tablename__ = "mod_release_download_total"
+
+    mod_release_id: UUID = Column(
+        postgresql.UUID(as_uuid=True),
+        ForeignKey("mod_release.id", ondelete="cascade"),
+        primary_key=True,
+    )
+    count: int = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+
+class ModDownloadSketch(Database.Entity):
+    """The ORM representation of the unique downloaders of a mod per day.
+
+    .. note:: ``sketch`` is a :class:`~modist.hyperloglog.HyperLogLog` sketch of the
+        mod's downloaders, maintained by the download recorder as downloads are flushed.
+    """
+
+    __tablename__ = "mod_download_sketch"
+    __table_args__ = (PrimaryKeyConstraint("mod_id", "day"),)
+
+    mod_id: UUID = Column(
+        postgresql.UUID(as_uuid=True),
+        ForeignKey("mod.id", ondelete="cascade"),
+        nullable=False,
+    )
+    day: date = Column(Date, nullable=False)
+    sketch: bytes = Column(postgresql.BYTEA, nullable=False)
+
+
+class ModReleaseDownloadSketch(Database.Entity):
+    """The ORM representation of the unique downloaders of a mod release per day."""
+
+    __tablename__ = "mod_release_download_sketch"
+    __table_args__ = (PrimaryKeyConstraint("mod_release_id", "day"),)
+
+    mod_release_id: UUID = Column(
+        postgresql.UUID(as_uuid=True),
+        ForeignKey("mod_release.id", ondelete="cascade"),
+        nullable=False,
+    )
+    day: date = Column(Date, nullable=False)
+    sketch: bytes = Column(postgresql.BYTEA, nullable=False)
+
+
+class ModScore(Database.Entity):
+    """The ORM representation of the popularity scores of a mod.
+
+    .. note:: Scores are computed for every mod at once by the ``compute_mod_scores``
+        job from the mod's recent downloads, rankings and ratings rather than the ORM.
+    """
+
+    __tablename__ = "mod_score"
+    __table_args__ = (
+        Index("ix_mod_score_hot", "hot"),
+        Index("ix_mod_score_trending", "trending"),
+    )
+
+    mod_id: UUID = Column(
+        postgresql.UUID(as_uuid=True),
+        ForeignKey("mod.id", ondelete="cascade"),
+        primary_key=True,
+    )
+    hot: float = Column(Float, nullable=False)
+    trending: float = Column(Float, nullable=False)
+    computed_at: datetime = Column(DateTime(timezone=True), nullable=False)
 
 
 class ModTag(Database.Entity, TimestampMixin):
@@ -265,6 +457,7 @@ class ModRanking(Database.Entity, TimestampMixin):
     __table_args__ = (
         PrimaryKeyConstraint("mod_id", "ranking_id"),
         UniqueConstraint("mod_id", "user_id"),
+        Index("ix_mod_ranking_ranking_id", "ranking_id"),
     )
 
     mod_id: UUID = Column(
@@ -288,6 +481,18 @@ class ModRanking(Database.Entity, TimestampMixin):
     user = relationship("User")
 
 
+class ModRankingTally(Database.Entity, RankingTallyMixin):
+    """The ORM representation of the maintained vote tallies of a mod's rankings."""
+
+    __tablename__ = "mod_ranking_tally"
+
+    mod_id: UUID = Column(
+        postgresql.UUID(as_uuid=True),
+        ForeignKey("mod.id", ondelete="cascade"),
+        primary_key=True,
+    )
+
+
 class ModRating(Database.Entity, TimestampMixin):
     """The ORM model for tying mods to user produced ratings."""
 
@@ -319,6 +524,57 @@ class ModRating(Database.Entity, TimestampMixin):
     user = relationship("User")
 
 
+class ModRatingSummary(Database.Entity):
+    """The ORM representation of the summary of the active ratings of a mod.
+
+    .. note:: This and the per version summary are maintained by triggers on
+        ``mod_rating`` and ``rating`` rather than the ORM. ``histogram`` counts the
+        ratings by their integer part, so ``histogram[0]`` counts ratings from 0 up to
+        (but excluding) 1. ``updated_at`` is refreshed by the ``refresh_updated_at``
+        trigger whenever those triggers update the summary.
+    """
+
+    __tablename__ = "mod_rating_summary"
+
+    mod_id: UUID = Column(
+        postgresql.UUID(as_uuid=True),
+        ForeignKey("mod.id", ondelete="cascade"),
+        primary_key=True,
+    )
+    count: int = Column(BigInteger, nullable=False, default=0, server_default="0")
+    sum: Decimal = Column(Numeric, nullable=False, default=0, server_default="0")
+    sum_squares: Decimal = Column(
+        Numeric, nullable=False, default=0, server_default="0"
+    )
+    histogram: List[int] = Column(postgresql.ARRAY(BigInteger), nullable=False)
+    updated_at: datetime = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        onupdate=func.now(),
+        server_default=func.now(),
+    )
+
+
+class ModRatingVersionSummary(Database.Entity):
+    """The ORM representation of the summary of the active ratings of a mod version."""
+
+    __tablename__ = "mod_rating_version_summary"
+    __table_args__ = (PrimaryKeyConstraint("mod_id", "version"),)
+
+    mod_id: UUID = Column(
+        postgresql.UUID(as_uuid=True),
+        ForeignKey("mod.id", ondelete="cascade"),
+        nullable=False,
+    )
+    version: VersionInfo = Column(SemverType, nullable=False)
+    count: int = Column(BigInteger, nullable=False, default=0, server_default="0")
+    sum: Decimal = Column(Numeric, nullable=False, default=0, server_default="0")
+    sum_squares: Decimal = Column(
+        Numeric, nullable=False, default=0, server_default="0"
+    )
+    histogram: List[int] = Column(postgresql.ARRAY(BigInteger), nullable=False)
+
+
 class ModPost(Database.Entity, TimestampMixin):
     """The ORM model for tying mods to author produced posts."""
 
@@ -13,6 +13,7 @@ from sqlalchemy import (
     Date,
     Enum,
     Text,
+    Index,
     Column,
     String,
     Boolean,
@@ -31,7 +32,7 @@ from sqlalchemy.ext.associationproxy import association_proxy
 
 from ..db import Database
 from ._common import BaseModel
-from ._mixins import IsActiveMixin, TimestampMixin
+from ._mixins import IsActiveMixin, TimestampMixin, RankingTallyMixin
 
 
 class RatingType(enum.Enum):
@@ -314,6 +315,7 @@ class CommentRanking(Database.Entity, TimestampMixin):
     __table_args__ = (
         PrimaryKeyConstraint("comment_id", "ranking_id"),
         UniqueConstraint("comment_id", "user_id"),
+        Index("ix_comment_ranking_ranking_id", "ranking_id"),
     )
 
     comment_id: UUID = Column(
@@ -344,6 +346,7 @@ class ImageRanking(Database.Entity, TimestampMixin):
     __table_args__ = (
         PrimaryKeyConstraint("image_id", "ranking_id"),
         UniqueConstraint("image_id", "user_id"),
+        Index("ix_image_ranking_ranking_id", "ranking_id"),
     )
 
     image_id: UUID = Column(
@@ -365,3 +368,27 @@ class ImageRanking(Database.Entity, TimestampMixin):
     image = relationship("Image", back_populates="image_rankings")
     ranking = relationship("Ranking")
     user: User = relationship("User")
+
+
+class CommentRankingTally(Database.Entity, RankingTallyMixin):
+    """The ORM representation of the maintained vote tallies of a comment's rankings."""
+
+    __tablename__ = "comment_ranking_tally"
+
+    comment_id: UUID = Column(
+        postgresql.UUID(as_uuid=True),
+        ForeignKey("comment.id", ondelete="cascade"),
+        primary_key=True,
+    )
+
+
+class ImageRankingTally(Database.Entity, RankingTallyMixin):
+    """The ORM representation of the maintained vote tallies of an image's rankings."""
+
+    __tablename__ = "image_ranking_tally"
+
+    image_id: UUID = Column(
+        postgresql.UUID(as_uuid=True),
+        ForeignKey("image.id", ondelete="cascade"),
+        primary_key=True,
+    )
@@ -0,0 +1,283 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains helpers for managing the monthly range partitions of partitioned tables.
+
+Tables partitioned by month (such as ``mod_release_download``) have one partition per
+calendar month (in UTC) named after the table and the month, for example
+``mod_release_download_y2020m01``, along with a default partition catching any row
+outside of the existing monthly partitions. These helpers build the statements shared
+by the Alembic partition operations and the partition maintenance job.
+
+.. note:: A monthly partition cannot be created while the default partition contains
+    rows belonging to that month. So partitions should always be created ahead of time
+    and the default partition should stay empty. Rows which still land in the default
+    partition must be moved out of it while it is detached before their month's
+    partition can be created.
+"""
+
+import re
+from typing import List, Optional
+from datetime import date
+
+PARTITION_NAME_PATTERN = re.compile(
+    r"^(?P<table_name>.+)_y(?P<year>\d{4})m(?P<month>\d{2})$"
+)
+DEFAULT_PARTITION_SUFFIX = "default"
+
+
+def get_month(value: date) -> date:
+    """Get the first day of the month of a given date.
+
+    :param date value: The date to get the month of
+    :return: The first day of the date's month
+    :rtype: date
+    """
+
+    return value.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Add a number of months to the month of a given date.
+
+    :param date month: The date to add months to
+    :param int months: The number of months to add, may be negative
+    :return: The first day of the resulting month
+    :rtype: date
+    """
+
+    index = month.year * 12 + (month.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def get_months(start: date, count: int) -> List[date]:
+    """Get a number of consecutive months starting at the month of a given date.
+
+    :param date start: The date of the first month
+    :param int count: The number of months to get
+    :return: The first day of each month
+    :rtype: List[date]
+    """
+
+    return [add_months(get_month(start), offset) for offset in range(count)]
+
+
+def get_partition_name(table_name: str, month: date) -> str:
+    """Get the name of the partition of a given table for a given month.
+
+    :param str table_name: The name of the partitioned table
+    :param date month: A date within the month of the partition
+    :return: The name of the monthly partition
+    :rtype: str
+    """
+
+    return f"{table_name!s}_y{month.year:04d}m{month.month:02d}"
+
+
+def get_partition_month(table_name: str, partition_name: str) -> Optional[date]:
+    """Get the month of a given monthly partition of a given table.
+
+    :param str table_name: The name of the partitioned table
+    :param str partition_name: The name of the partition
+    :return: The first day of the partition's month, None if the partition is not a
+        monthly partition of the table
+    :rtype: Optional[date]
+    """
+
+    match = PARTITION_NAME_PATTERN.match(partition_name)
+    if match is None or match.group("table_name") != table_name:
+        return None
+
+    return date(int(match.group("year")), int(match.group("month")), 1)
+
+
+def build_create_partition_sql(
+    table_name: str, month: date, schema_name: str = "public"
+) -> str:
+    """Build the statement creating the partition of a given table for a given month.
+
+    :param str table_name: The name of the partitioned table
+    :param date month: A date within the month of the partition
+    :param str schema_name: The name of the schema which the given table lives in,
+        optional, defaults to "public"
+    :return: The statement creating the partition if it does not yet exist
+    :rtype: str
+    """
+
+    lower, upper = get_month(month), add_months(month, 1)
+    return (
+        "CREATE TABLE IF NOT EXISTS "
+        f"{schema_name!s}.{get_partition_name(table_name, month)!s} "
+        f"PARTITION OF {schema_name!s}.{table_name!s} "
+        f"FOR VALUES FROM ('{lower.isoformat()!s} 00:00:00+00') "
+        f"TO ('{upper.isoformat()!s} 00:00:00+00')"
+    )
+
+
+def get_default_partition_name(table_name: str) -> str:
+    """Get the name of the default partition of a given table.
+
+    :param str table_name: The name of the partitioned table
+    :return: The name of the default partition
+    :rtype: str
+    """
+
+    return f"{table_name!s}_{DEFAULT_PARTITION_SUFFIX!s}"
+
+
+def _build_month_condition(column_name: str, month: date) -> str:
+    """Build the condition matching the values of a column within a given month.
+
+    :param str column_name: The name of the ``timestamptz`` partition key column
+    :param date month: A date within the month to match
+    :return: The condition matching the month's values
+    :rtype: str
+    """
+
+    lower, upper = get_month(month), add_months(month, 1)
+    return (
+        f"{column_name!s} >= '{lower.isoformat()!s} 00:00:00+00' "
+        f"AND {column_name!s} < '{upper.isoformat()!s} 00:00:00+00'"
+    )
+
+
+def build_create_default_partition_sql(
+    table_name: str, schema_name: str = "public"
+) -> str:
+    """Build the statement creating the default partition of a given table.
+
+    :param str table_name: The name of the partitioned table
+    :param str schema_name: The name of the schema which the given table lives in,
+        optional, defaults to "public"
+    :return: The statement creating the default partition if it does not yet exist
+    :rtype: str
+    """
+
+    return (
+        "CREATE TABLE IF NOT EXISTS "
+        f"{schema_name!s}.{get_default_partition_name(table_name)!s} "
+        f"PARTITION OF {schema_name!s}.{table_name!s} DEFAULT"
+    )
+
+
+def build_default_partition_has_rows_sql(
+    table_name: str, column_name: str, month: date, schema_name: str = "public"
+) -> str:
+    """Build the statement checking if the default partition has rows of a given month.
+
+    :param str table_name: The name of the partitioned table
+    :param str column_name: The name of the table's partition key column
+    :param date month: A date within the month to check for
+    :param str schema_name: The name of the schema which the given table lives in,
+        optional, defaults to "public"
+    :return: The statement selecting True if the default partition has rows of the
+        month, otherwise False
+    :rtype: str
+    """
+
+    return (
+        "SELECT EXISTS (SELECT 1 FROM "
+        f"{schema_name!s}.{get_default_partition_name(table_name)!s} "
+        f"WHERE {_build_month_condition(column_name, month)!s})"
+    )
+
+
+def build_detach_default_partition_sql(
+    table_name: str, schema_name: str = "public"
+) -> str:
+    """Build the statement detaching the default partition of a given table.
+
+    :param str table_name: The name of the partitioned table
+    :param str schema_name: The name of the schema which the given table lives in,
+        optional, defaults to "public"
+    :return: The statement detaching the default partition into a standalone table
+    :rtype: str
+    """
+
+    return (
+        f"ALTER TABLE {schema_name!s}.{table_name!s} DETACH PARTITION "
+        f"{schema_name!s}.{get_default_partition_name(table_name)!s}"
+    )
+
+
+def build_attach_default_partition_sql(
+    table_name: str, schema_name: str = "public"
+) -> str:
+    """Build the statement attaching the detached default partition of a given table.
+
+    :param str table_name: The name of the partitioned table
+    :param str schema_name: The name of the schema which the given table lives in,
+        optional, defaults to "public"
+    :return: The statement attaching the standalone table as the default partition
+    :rtype: str
+    """
+
+    return (
+        f"ALTER TABLE {schema_name!s}.{table_name!s} ATTACH PARTITION "
+        f"{schema_name!s}.{get_default_partition_name(table_name)!s} DEFAULT"
+    )
+
+
+def build_move_default_partition_rows_sql(
+    table_name: str, column_name: str, month: date, schema_name: str = "public"
+) -> str:
+    """Build the statement moving the rows of a month out of the default partition.
+
+    .. note:: The default partition must be detached, so the moved rows are routed
+        into the month's partition rather than back into the default partition.
+
+    :param str table_name: The name of the partitioned table
+    :param str column_name: The name of the table's partition key column
+    :param date month: A date within the month to move the rows of
+    :param str schema_name: The name of the schema which the given table lives in,
+        optional, defaults to "public"
+    :return: The statement moving the rows from the detached default partition into
+        the partitioned table
+    :rtype: str
+    """
+
+    return (
+        "WITH moved AS ("
+        f"DELETE FROM {schema_name!s}.{get_default_partition_name(table_name)!s} "
+        f"WHERE {_build_month_condition(column_name, month)!s} RETURNING *"
+        f") INSERT INTO {schema_name!s}.{table_name!s} SELECT * FROM moved"
+    )
+
+
+def build_detach_partition_sql(
+    table_name: str, month: date, schema_name: str = "public"
+) -> str:
+    """Build the statement detaching the partition of a given table for a given month.
+
+    :param str table_name: The name of the partitioned table
+    :param date month: A date within the month of the partition
+    :param str schema_name: The name of the schema which the given table lives in,
+        optional, defaults to "public"
+    :return: The statement detaching the partition into a standalone table
+    :rtype: str
+    """
+
+    return (
+        f"ALTER TABLE {schema_name!s}.{table_name!s} DETACH PARTITION "
+        f"{schema_name!s}.{get_partition_name(table_name, month)!s}"
+    )
+
+
+def build_drop_partition_sql(
+    table_name: str, month: date, schema_name: str = "public"
+) -> str:
+    """Build the statement dropping the partition of a given table for a given month.
+
+    :param str table_name: The name of the partitioned table
+    :param date month: A date within the month of the partition
+    :param str schema_name: The name of the schema which the given table lives in,
+        optional, defaults to "public"
+    :return: The statement dropping the partition (or detached partition) if it exists
+    :rtype: str
+    """
+
+    return (
+        "DROP TABLE IF EXISTS "
+        f"{schema_name!s}.{get_partition_name(table_name, month)!s}"
+    )
@@ -0,0 +1,160 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains helpers for maintaining the vote tallies of ranked entities.
+
+Every ranked entity (mods, comments and images) is tied to its rankings through an
+association table (such as ``mod_ranking``) and has a tally table (such as
+``mod_ranking_tally``) holding the ``up``, ``down`` and ``net`` totals of its active
+rankings. Tallies are kept up to date by the same two generic trigger functions for
+every entity, ``refresh_ranking_tally`` on the association table and
+``refresh_ranking_tallies`` on ``ranking``, which are told the tables and columns to
+use through their trigger arguments. These helpers build the statements shared by the
+Alembic tally operations and the tally reconciliation job.
+
+.. note:: A positive rank counts as an up vote, a negative rank as a down vote and a
+    rank of zero as neither, so ``net`` is always ``up - down``.
+"""
+
+from typing import List
+
+RECONCILE_TALLY_SQL = """
+INSERT INTO {schema_name!s}.{tally_table!s} ({entity_column!s}, up, down, net)
+SELECT
+  expected.entity_id, expected.up, expected.down, expected.up - expected.down
+FROM (
+  SELECT
+    coalesce(actual.entity_id, tally.{entity_column!s}) AS entity_id,
+    coalesce(actual.up, 0) AS up,
+    coalesce(actual.down, 0) AS down,
+    tally.up AS tally_up,
+    tally.down AS tally_down,
+    tally.net AS tally_net
+  FROM (
+    SELECT
+      association.{entity_column!s} AS entity_id,
+      count(*) FILTER (WHERE ranking.rank > 0) AS up,
+      count(*) FILTER (WHERE ranking.rank < 0) AS down
+    FROM {schema_name!s}.{association_table!s} AS association
+    JOIN {schema_name!s}.ranking ON ranking.id = association.ranking_id
+    WHERE ranking.is_active
+    GROUP BY association.{entity_column!s}
+  ) AS actual
+  FULL JOIN {schema_name!s}.{tally_table!s} AS tally
+    ON tally.{entity_column!s} = actual.entity_id
+) AS expected
+WHERE (expected.tally_up, expected.tally_down, expected.tally_net)
+  IS DISTINCT FROM (expected.up, expected.down, expected.up - expected.down)
+ON CONFLICT ({entity_column!s}) DO UPDATE
+SET up = excluded.up, down = excluded.down, net = excluded.net
+"""
+
+
+def get_tally_trigger_name(association_table: str) -> str:
+    """Get the name of the tally trigger on a given ranking association table.
+
+    :param str association_table: The name of the ranking association table
+    :return: The name of the trigger calling ``refresh_ranking_tally``
+    :rtype: str
+    """
+
+    return f"{association_table!s}_refresh_ranking_tally_trigger"
+
+
+def get_ranking_trigger_name(association_table: str) -> str:
+    """Get the name of the tally trigger on ``ranking`` for a given association table.
+
+    :param str association_table: The name of the ranking association table
+    :return: The name of the trigger calling ``refresh_ranking_tallies``
+    :rtype: str
+    """
+
+    return f"ranking_refresh_{association_table!s}_tally_trigger"
+
+
+def build_create_tally_triggers_sql(
+    association_table: str,
+    entity_column: str,
+    tally_table: str,
+    schema_name: str = "public",
+) -> List[str]:
+    """Build the statements creating the tally triggers of a ranked entity.
+
+    .. note:: The trigger on ``ranking`` fires before the ranking is deleted, as the
+        ranking's associations are only removed by the cascade after the ranking is
+        already gone.
+
+    :param str association_table: The name of the ranking association table
+    :param str entity_column: The name of the association's column referencing the
+        ranked entity, also the primary key of the tally table
+    :param str tally_table: The name of the tally table
+    :param str schema_name: The name of the schema which the given tables live in,
+        optional, defaults to "public"
+    :return: The statements creating the association and ``ranking`` triggers
+    :rtype: List[str]
+    """
+
+    return [
+        f"CREATE TRIGGER {get_tally_trigger_name(association_table)!s} "
+        f"AFTER INSERT OR DELETE OR UPDATE OF {entity_column!s}, ranking_id "
+        f"ON {schema_name!s}.{association_table!s} "
+        "FOR EACH ROW EXECUTE PROCEDURE "
+        f"refresh_ranking_tally('{entity_column!s}', '{tally_table!s}')",
+        f"CREATE TRIGGER {get_ranking_trigger_name(association_table)!s} "
+        f"BEFORE DELETE OR UPDATE OF rank, is_active ON {schema_name!s}.ranking "
+        "FOR EACH ROW EXECUTE PROCEDURE refresh_ranking_tallies("
+        f"'{association_table!s}', '{entity_column!s}', '{tally_table!s}')",
+    ]
+
+
+def build_drop_tally_triggers_sql(
+    association_table: str, schema_name: str = "public"
+) -> List[str]:
+    """Build the statements dropping the tally triggers of a ranked entity.
+
+    :param str association_table: The name of the ranking association table
+    :param str schema_name: The name of the schema which the given table lives in,
+        optional, defaults to "public"
+    :return: The statements dropping the ``ranking`` and association triggers
+    :rtype: List[str]
+    """
+
+    return [
+        "DROP TRIGGER IF EXISTS "
+        f"{get_ranking_trigger_name(association_table)!s} ON {schema_name!s}.ranking",
+        "DROP TRIGGER IF EXISTS "
+        f"{get_tally_trigger_name(association_table)!s} "
+        f"ON {schema_name!s}.{association_table!s}",
+    ]
+
+
+def build_reconcile_tally_sql(
+    association_table: str,
+    entity_column: str,
+    tally_table: str,
+    schema_name: str = "public",
+) -> str:
+    """Build the statement repairing the tallies which differ from the rankings.
+
+    The tallies are recounted from the active rankings of every entity, and only the
+    tallies which differ from their recount are written. Entities without a tally
+    are given one and tallies of entities without any active ranking are zeroed. So
+    reconciling an empty tally table backfills it.
+
+    :param str association_table: The name of the ranking association table
+    :param str entity_column: The name of the association's column referencing the
+        ranked entity, also the primary key of the tally table
+    :param str tally_table: The name of the tally table
+    :param str schema_name: The name of the schema which the given tables live in,
+        optional, defaults to "public"
+    :return: The statement upserting the repaired tallies
+    :rtype: str
+    """
+
+    return RECONCILE_TALLY_SQL.format(
+        association_table=association_table,
+        entity_column=entity_column,
+        tally_table=tally_table,
+        schema_name=schema_name,
+    )
@@ -0,0 +1,273 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains helpers for parsing and evaluating semver version expressions.
+
+Version expressions are used by mod release dependencies and conflicts to describe the
+versions of another mod that they apply to. An expression is a comma (or whitespace)
+separated list of comparators which must all be satisfied:
+
+- ``*`` matches any version
+- ``1.2.3`` or ``==1.2.3`` matches exactly ``1.2.3``
+- ``>1.2.3``, ``>=1.2.3``, ``<1.2.3``, ``<=1.2.3`` match the respective ranges
+- ``^1.2.3`` matches ``>=1.2.3,<2.0.0`` (and ``^0.2.3`` matches ``>=0.2.3,<0.3.0``)
+- ``~1.2.3`` matches ``>=1.2.3,<1.3.0``
+
+Every expression therefore describes a single (possibly unbounded) version range.
+"""
+
+import re
+from typing import Tuple, Union, Optional
+from functools import lru_cache
+from dataclasses import dataclass
+
+from semver import VersionInfo
+
+EXPRESSION_CACHE_SIZE = 4096
+OPERATOR_PATTERN = r"(?:\^|~|==|=|>=|<=|>|<)"
+OPERATOR_SPACING_PATTERN = re.compile(rf"({OPERATOR_PATTERN!s})\s+")
+COMPARATOR_PATTERN = re.compile(
+    rf"^(?P<operator>{OPERATOR_PATTERN!s})?(?P<version>.+)$"
+)
+WILDCARDS = ("*", "x", "X")
+
+VersionKey = str
+RELEASE_MARKER = "~"
+PRERELEASE_MARKER = "!"
+IDENTIFIER_SEPARATOR = ","
+
+
+def _encode_number(number: int) -> str:
+    """Encode a number so encoded numbers sort lexically in numeric order.
+
+    :param int number: The non-negative number to encode
+    :return: The number prefixed with its zero-padded number of digits
+    :rtype: str
+    """
+
+    digits = str(number)
+    return f"{len(digits):02d}{digits!s}"
+
+
+def get_version_key(version: VersionInfo) -> VersionKey:
+    """Get a key which orders versions by their semver precedence.
+
+    Keys are ASCII strings which sort by precedence when compared bytewise, both in
+    Python and in Postgres under the ``"C"`` collation. So they can be stored alongside
+    versions and compared, sorted, and indexed without parsing any version.
+
+    .. note:: Numbers are prefixed with their number of digits, so ``1.10.0`` sorts
+        after ``1.9.0``. Releases sort after all of their prereleases. Prerelease
+        identifiers compare numerically when they are numeric and lexically otherwise,
+        with numeric identifiers sorting first. Build metadata does not affect
+        precedence.
+
+    :param VersionInfo version: The version to build a key for
+    :return: The precedence key of the version
+    :rtype: VersionKey
+    """
+
+    key = ".".join(
+        _encode_number(number)
+        for number in (version.major, version.minor, version.patch)
+    )
+    if version.prerelease is None:
+        return key + RELEASE_MARKER
+
+    return (
+        key
+        + PRERELEASE_MARKER
+        + IDENTIFIER_SEPARATOR.join(
+            f"0{_encode_number(int(identifier))!s}"
+            if identifier.isdigit()
+            else f"1{identifier!s}"
+            for identifier in version.prerelease.split(".")
+        )
+    )
+
+
+def _compare(first: VersionKey, second: VersionKey) -> int:
+    """Compare two version keys.
+
+    :param VersionKey first: The first version key to compare
+    :param VersionKey second: The second version key to compare
+    :return: -1 if the first version precedes the second, 1 if it follows the second,
+        otherwise 0
+    :rtype: int
+    """
+
+    return (first > second) - (first < second)
+
+
+@dataclass(frozen=True)
+class VersionBound(object):
+    """Describes a single bound of a version range by its precedence key."""
+
+    key: VersionKey
+    inclusive: bool = True
+
+
+@dataclass(frozen=True)
+class VersionRange(object):
+    """Describes a range of versions between an optional lower and upper bound."""
+
+    lower: Optional[VersionBound] = None
+    upper: Optional[VersionBound] = None
+
+    @property
+    def is_empty(self) -> bool:
+        """Check if the range cannot contain any version.
+
+        :return: True if no version satisfies the range, otherwise False
+        :rtype: bool
+        """
+
+        if self.lower is None or self.upper is None:
+            return False
+
+        comparison = _compare(self.lower.key, self.upper.key)
+        if comparison == 0:
+            return not (self.lower.inclusive and self.upper.inclusive)
+
+        return comparison > 0
+
+    def contains(self, version: Union[VersionInfo, VersionKey]) -> bool:
+        """Check if a given version is within the range.
+
+        :param Union[VersionInfo, VersionKey] version: The version (or the precedence
+            key of the version) to check
+        :return: True if the version is within the range, otherwise False
+        :rtype: bool
+        """
+
+        key = version if isinstance(version, str) else get_version_key(version)
+        if self.lower is not None:
+            comparison = _compare(key, self.lower.key)
+            if comparison < 0 or (comparison == 0 and not self.lower.inclusive):
+                return False
+
+        if self.upper is not None:
+            comparison = _compare(key, self.upper.key)
+            if comparison > 0 or (comparison == 0 and not self.upper.inclusive):
+                return False
+
+        return True
+
+    def intersect(self, other: "VersionRange") -> "VersionRange":
+        """Build the range of versions contained by both this and another range.
+
+        :param VersionRange other: The other range to intersect with
+        :return: The intersection of both ranges
+        :rtype: VersionRange
+        """
+
+        return VersionRange(
+            lower=_pick_bound(self.lower, other.lower, prefer_greater=True),
+            upper=_pick_bound(self.upper, other.upper, prefer_greater=False),
+        )
+
+
+ANY_VERSION = VersionRange()
+
+
+def _pick_bound(
+    first: Optional[VersionBound], second: Optional[VersionBound], prefer_greater: bool
+) -> Optional[VersionBound]:
+    """Pick the more restrictive of two bounds.
+
+    :param Optional[VersionBound] first: The first bound
+    :param Optional[VersionBound] second: The second bound
+    :param bool prefer_greater: True to pick the greater bound (for lower bounds),
+        False to pick the lesser bound (for upper bounds)
+    :return: The more restrictive bound
+    :rtype: Optional[VersionBound]
+    """
+
+    if first is None or second is None:
+        return first or second
+
+    comparison = _compare(first.key, second.key)
+    if comparison == 0:
+        return first if not first.inclusive else second
+    if (comparison > 0) == prefer_greater:
+        return first
+
+    return second
+
+
+def _parse_comparator(comparator: str) -> VersionRange:
+    """Parse a single comparator of a version expression.
+
+    :param str comparator: The comparator to parse
+    :raises ValueError: If the comparator is invalid
+    :return: The range of versions matching the comparator
+    :rtype: VersionRange
+    """
+
+    if comparator in WILDCARDS:
+        return ANY_VERSION
+
+    match = COMPARATOR_PATTERN.match(comparator)
+    if match is None:
+        raise ValueError(f"Invalid version comparator {comparator!r}")
+
+    operator = match.group("operator") or "=="
+    version = VersionInfo.parse(match.group("version"))
+    key = get_version_key(version)
+
+    if operator in ("==", "="):
+        bound = VersionBound(key)
+        return VersionRange(lower=bound, upper=bound)
+    elif operator == ">=":
+        return VersionRange(lower=VersionBound(key))
+    elif operator == ">":
+        return VersionRange(lower=VersionBound(key, inclusive=False))
+    elif operator == "<=":
+        return VersionRange(upper=VersionBound(key))
+    elif operator == "<":
+        return VersionRange(upper=VersionBound(key, inclusive=False))
+    elif operator == "~":
+        upper = version.bump_minor()
+    elif version.major > 0:
+        upper = version.bump_major()
+    elif version.minor > 0:
+        upper = version.bump_minor()
+    else:
+        upper = version.bump_patch()
+
+    return VersionRange(
+        lower=VersionBound(key),
+        upper=VersionBound(get_version_key(upper), inclusive=False),
+    )
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def parse_version_expression(expression: str) -> VersionRange:
+    """Parse a given version expression into the range of versions it matches.
+
+    .. note:: Parsed expressions are cached as the same few expressions are shared by
+        many dependency and conflict rows. :class:`~.VersionRange` is immutable, so
+        cached ranges are safe to share.
+
+    :param str expression: The version expression to parse
+    :raises ValueError: If the version expression is invalid
+    :return: The range of versions matching the expression
+    :rtype: VersionRange
+    """
+
+    comparators: Tuple[str, ...] = tuple(
+        comparator
+        for comparator in re.split(
+            r"[\s,]+", OPERATOR_SPACING_PATTERN.sub(r"\1", expression.strip())
+        )
+        if len(comparator) > 0
+    )
+    if len(comparators) <= 0:
+        raise ValueError(f"Invalid empty version expression {expression!r}")
+
+    version_range = ANY_VERSION
+    for comparator in comparators:
+        version_range = version_range.intersect(_parse_comparator(comparator))
+
+    return version_range
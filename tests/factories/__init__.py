@@ -4,6 +4,35 @@
 
 """Contains all SQLAlchemy model testing factories."""
 
-from .user import UserFactory
+from .mod import (
+    ModFactory,
+    ModTagFactory,
+    ModRatingFactory,
+    ModRankingFactory,
+    ModReleaseFactory,
+    ModReleaseConflictFactory,
+    ModReleaseDownloadFactory,
+    ModReleaseDependencyFactory,
+)
+from .host import HostFactory, HostReleaseFactory, HostPublisherFactory
+from .user import UserFactory, RatingFactory, RankingFactory
+from .common import TagFactory, CategoryFactory
 
-__all__ = ["UserFactory"]
+__all__ = [
+    "CategoryFactory",
+    "HostFactory",
+    "HostPublisherFactory",
+    "HostReleaseFactory",
+    "ModFactory",
+    "ModRankingFactory",
+    "ModRatingFactory",
+    "ModReleaseConflictFactory",
+    "ModReleaseDependencyFactory",
+    "ModReleaseDownloadFactory",
+    "ModReleaseFactory",
+    "ModTagFactory",
+    "RankingFactory",
+    "RatingFactory",
+    "TagFactory",
+    "UserFactory",
+]
@@ -0,0 +1,36 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains all related common leaf model factories."""
+
+from factory import Faker
+from factory.alchemy import SQLAlchemyModelFactory
+
+from modist.models.common import Tag, Category
+
+from ._common import SQLALCHEMY_SESSION
+
+
+class TagFactory(SQLAlchemyModelFactory):
+    """Build a testing tag model instance."""
+
+    class Meta:
+        model = Tag
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    name = Faker("word")
+    description = Faker("sentence")
+
+
+class CategoryFactory(SQLAlchemyModelFactory):
+    """Build a testing category model instance."""
+
+    class Meta:
+        model = Category
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    name = Faker("pystr", max_chars=64)
+    description = Faker("sentence")
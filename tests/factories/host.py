@@ -0,0 +1,52 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains all related host model factories."""
+
+from factory import Faker, Sequence, SubFactory
+from factory.alchemy import SQLAlchemyModelFactory
+
+from modist.models.host import Host, HostRelease, HostPublisher
+
+from ._common import SQLALCHEMY_SESSION
+
+
+class HostPublisherFactory(SQLAlchemyModelFactory):
+    """Build a testing host publisher model instance."""
+
+    class Meta:
+        model = HostPublisher
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    slug = Faker("uuid4")
+    name = Faker("company")
+    description = Faker("paragraph")
+
+
+class HostFactory(SQLAlchemyModelFactory):
+    """Build a testing host model instance."""
+
+    class Meta:
+        model = Host
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    slug = Faker("uuid4")
+    name = Faker("catch_phrase")
+    description = Faker("paragraph")
+    publisher = SubFactory(HostPublisherFactory)
+
+
+class HostReleaseFactory(SQLAlchemyModelFactory):
+    """Build a testing host release model instance."""
+
+    class Meta:
+        model = HostRelease
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    version = Sequence(lambda index: f"1.0.{index!s}")
+    description = Faker("paragraph")
+    host = SubFactory(HostFactory)
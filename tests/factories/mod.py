@@ -0,0 +1,134 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+"""Contains all related mod model factories."""
+
+from factory import Faker, Sequence, SubFactory, SelfAttribute
+from factory.alchemy import SQLAlchemyModelFactory
+
+from modist.models.mod import (
+    Mod,
+    ModTag,
+    ModRating,
+    ModRanking,
+    ModRelease,
+    ModReleaseConflict,
+    ModReleaseDownload,
+    ModReleaseDependency,
+)
+
+from .host import HostFactory, HostReleaseFactory
+from .user import UserFactory, RatingFactory, RankingFactory
+from .common import TagFactory, CategoryFactory
+from ._common import SQLALCHEMY_SESSION
+
+
+class ModFactory(SQLAlchemyModelFactory):
+    """Build a testing mod model instance."""
+
+    class Meta:
+        model = Mod
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    slug = Faker("uuid4")
+    name = Faker("pystr", max_chars=64)
+    description = Faker("paragraph")
+    user = SubFactory(UserFactory)
+    host = SubFactory(HostFactory)
+    category = SubFactory(CategoryFactory)
+
+
+class ModTagFactory(SQLAlchemyModelFactory):
+    """Build a testing mod tag association model instance."""
+
+    class Meta:
+        model = ModTag
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    mod = SubFactory(ModFactory)
+    tag = SubFactory(TagFactory)
+
+
+class ModReleaseFactory(SQLAlchemyModelFactory):
+    """Build a testing mod release model instance."""
+
+    class Meta:
+        model = ModRelease
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    version = Sequence(lambda index: f"1.0.{index!s}")
+    description = Faker("paragraph")
+    size = Faker("pyint")
+    checksum = Faker("sha256")
+    mod = SubFactory(ModFactory)
+    host_release = SubFactory(HostReleaseFactory)
+
+
+class ModReleaseDependencyFactory(SQLAlchemyModelFactory):
+    """Build a testing mod release dependency model instance."""
+
+    class Meta:
+        model = ModReleaseDependency
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    version_expression = "*"
+    release = SubFactory(ModReleaseFactory)
+    dependency = SubFactory(ModFactory)
+
+
+class ModReleaseConflictFactory(SQLAlchemyModelFactory):
+    """Build a testing mod release conflict model instance."""
+
+    class Meta:
+        model = ModReleaseConflict
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    version_expression = "*"
+    release = SubFactory(ModReleaseFactory)
+    conflict = SubFactory(ModFactory)
+
+
+class ModReleaseDownloadFactory(SQLAlchemyModelFactory):
+    """Build a testing mod release download model instance."""
+
+    class Meta:
+        model = ModReleaseDownload
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    ip = Faker("ipv4")
+    mod_release = SubFactory(ModReleaseFactory)
+    mod = SelfAttribute("mod_release.mod")
+
+
+class ModRatingFactory(SQLAlchemyModelFactory):
+    """Build a testing mod rating association model instance."""
+
+    class Meta:
+        model = ModRating
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    version = Sequence(lambda index: f"1.0.{index!s}")
+    mod = SubFactory(ModFactory)
+    rating = SubFactory(RatingFactory)
+    user = SelfAttribute("rating.user")
+
+
+class ModRankingFactory(SQLAlchemyModelFactory):
+    """Build a testing mod ranking association model instance."""
+
+    class Meta:
+        model = ModRanking
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    mod = SubFactory(ModFactory)
+    ranking = SubFactory(RankingFactory)
+    user = SelfAttribute("ranking.user")
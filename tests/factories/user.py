@@ -4,10 +4,10 @@
 
 """Contains all related user model factories."""
 
-from factory import Faker
+from factory import Faker, SubFactory
 from factory.alchemy import SQLAlchemyModelFactory
 
-from modist.models.user import User
+from modist.models.user import User, Rating, Ranking
 from modist.app.services.security import hash_password
 
 from ._common import SQLALCHEMY_SESSION
@@ -31,3 +31,28 @@ class UserFactory(SQLAlchemyModelFactory):
     family_name = Faker("last_name")
     display_name = Faker("user_name")
     bio = Faker("paragraph")
+
+
+class RatingFactory(SQLAlchemyModelFactory):
+    """Build a testing rating model instance."""
+
+    class Meta:
+        model = Rating
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    rating = Faker("pydecimal", left_digits=1, right_digits=2, positive=True)
+    content = Faker("paragraph")
+    user = SubFactory(UserFactory)
+
+
+class RankingFactory(SQLAlchemyModelFactory):
+    """Build a testing ranking model instance."""
+
+    class Meta:
+        model = Ranking
+        sqlalchemy_session = SQLALCHEMY_SESSION
+        sqlalchemy_session_persistence = "flush"
+
+    rank = 1
+    user = SubFactory(UserFactory)
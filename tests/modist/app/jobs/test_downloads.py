@@ -0,0 +1,46 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from datetime import date, datetime, timezone, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from modist.models.mod import (
+    ModDownloadDaily,
+    ModDownloadTotal,
+    ModReleaseDownloadTotal,
+)
+from modist.app.jobs.downloads import rollup_downloads
+
+
+@pytest.mark.db
+def test_rollup_downloads_only_counts_downloads_once(
+    db_session: Session, mod_release_factory, mod_release_download_factory
+):
+    created_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    mod_release = mod_release_factory.create()
+    for day in (1, 1, 2):
+        mod_release_download_factory.create(
+            mod_release=mod_release,
+            downloaded_at=datetime(2020, 1, day, 12, tzinfo=timezone.utc),
+            created_at=created_at,
+        )
+
+    assert rollup_downloads(db_session, 60) == 3
+    # NOTE: downloads created after the settle interval are left for the next run
+    mod_release_download_factory.create(
+        mod_release=mod_release,
+        downloaded_at=datetime(2020, 1, 2, 12, tzinfo=timezone.utc),
+    )
+    assert rollup_downloads(db_session, 60) == 0
+
+    assert db_session.query(ModDownloadTotal).get(mod_release.mod_id).count == 3
+    assert db_session.query(ModReleaseDownloadTotal).get(mod_release.id).count == 3
+    assert [
+        (row.day, row.count)
+        for row in db_session.query(ModDownloadDaily)
+        .filter(ModDownloadDaily.mod_id == mod_release.mod_id)
+        .order_by(ModDownloadDaily.day)
+    ] == [(date(2020, 1, 1), 2), (date(2020, 1, 2), 1)]
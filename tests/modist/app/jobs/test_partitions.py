@@ -0,0 +1,64 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+from modist.partitioning import (
+    get_month,
+    add_months,
+    get_partition_name,
+    build_create_partition_sql,
+    get_default_partition_name,
+)
+from modist.app.jobs.downloads import rollup_downloads
+from modist.app.jobs.partitions import (
+    DOWNLOAD_TABLE_NAME,
+    _get_partition_months,
+    maintain_download_partitions,
+)
+
+
+@pytest.mark.db
+def test_maintain_download_partitions(db_session: Session):
+    current = get_month(datetime.now(timezone.utc).date())
+    expired = date(2000, 1, 1)
+    db_session.execute(build_create_partition_sql(DOWNLOAD_TABLE_NAME, expired))
+
+    # NOTE: partitions are never removed before the download rollup has run
+    assert maintain_download_partitions(db_session, 2, 12, False) == []
+    assert expired in _get_partition_months(db_session, DOWNLOAD_TABLE_NAME)
+
+    rollup_downloads(db_session, 0)
+    assert maintain_download_partitions(db_session, 2, 12, False) == [expired]
+    months = _get_partition_months(db_session, DOWNLOAD_TABLE_NAME)
+    assert expired not in months
+    assert add_months(current, 2) in months
+
+
+@pytest.mark.db
+def test_maintain_download_partitions_moves_default_partition_rows(
+    db_session: Session, mod_release_download_factory
+):
+    month = add_months(get_month(datetime.now(timezone.utc).date()), 24)
+    download = mod_release_download_factory.create(
+        downloaded_at=datetime(month.year, month.month, 15, tzinfo=timezone.utc)
+    )
+    assert month not in _get_partition_months(db_session, DOWNLOAD_TABLE_NAME)
+
+    maintain_download_partitions(db_session, 24, 12, False)
+    assert month in _get_partition_months(db_session, DOWNLOAD_TABLE_NAME)
+    for table_name, count in (
+        (get_partition_name(DOWNLOAD_TABLE_NAME, month), 1),
+        (get_default_partition_name(DOWNLOAD_TABLE_NAME), 0),
+    ):
+        assert (
+            db_session.execute(
+                f"SELECT count(*) FROM {table_name!s} WHERE id = :id",
+                {"id": download.id},
+            ).scalar()
+            == count
+        )
@@ -0,0 +1,67 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+import pytest
+from sqlalchemy import text
+
+from modist.models.mod import ModRankingTally
+from modist.app.jobs.rankings import reconcile_ranking_tallies
+
+
+def _get_tally(db_session, mod):
+    tally = db_session.query(ModRankingTally).get(mod.id)
+    if tally is not None:
+        db_session.refresh(tally)
+    return tally
+
+
+@pytest.mark.db
+def test_ranking_tally_follows_ranking_changes(
+    db_session, mod_factory, ranking_factory, mod_ranking_factory
+):
+    mod = mod_factory.create()
+    up = mod_ranking_factory.create(mod=mod, ranking=ranking_factory.create(rank=1))
+    down = mod_ranking_factory.create(mod=mod, ranking=ranking_factory.create(rank=-1))
+    tally = _get_tally(db_session, mod)
+    assert (tally.up, tally.down, tally.net) == (1, 1, 0)
+
+    down.ranking.rank = 1
+    db_session.flush()
+    tally = _get_tally(db_session, mod)
+    assert (tally.up, tally.down, tally.net) == (2, 0, 2)
+
+    up.ranking.is_active = False
+    db_session.flush()
+    tally = _get_tally(db_session, mod)
+    assert (tally.up, tally.down, tally.net) == (1, 0, 1)
+
+    db_session.delete(down.ranking)
+    db_session.flush()
+    tally = _get_tally(db_session, mod)
+    assert (tally.up, tally.down, tally.net) == (0, 0, 0)
+
+
+@pytest.mark.db
+def test_reconcile_ranking_tallies_repairs_drift(
+    db_session, mod_factory, mod_ranking_factory
+):
+    mod = mod_factory.create()
+    mod_ranking_factory.create(mod=mod)
+    assert reconcile_ranking_tallies(db_session) == 0
+
+    db_session.execute(
+        text("UPDATE mod_ranking_tally SET up = 5, net = 5 WHERE mod_id = :mod_id"),
+        {"mod_id": mod.id},
+    )
+    assert reconcile_ranking_tallies(db_session) == 1
+    tally = _get_tally(db_session, mod)
+    assert (tally.up, tally.down, tally.net) == (1, 0, 1)
+
+    db_session.execute(
+        text("DELETE FROM mod_ranking_tally WHERE mod_id = :mod_id"),
+        {"mod_id": mod.id},
+    )
+    assert reconcile_ranking_tallies(db_session) == 1
+    tally = _get_tally(db_session, mod)
+    assert (tally.up, tally.down, tally.net) == (1, 0, 1)
@@ -0,0 +1,83 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from uuid import uuid4
+from types import SimpleNamespace
+from datetime import date, datetime, timezone
+
+import numpy
+import pytest
+from sqlalchemy.orm import Session
+
+from modist.models.mod import ModScore, ModDownloadDaily
+from modist.app.jobs.scores import (
+    _load_activity,
+    compute_hot_scores,
+    compute_mod_scores,
+    compute_trending_scores,
+)
+
+
+def _activity(indices, ages, values):
+    return (
+        numpy.array(indices, dtype=numpy.intp),
+        numpy.array(ages, dtype=numpy.float64),
+        numpy.array(values, dtype=numpy.float64),
+    )
+
+
+def test_compute_hot_scores_decays_by_half_life():
+    scores = compute_hot_scores(
+        3, [_activity([0, 1], [0.0, 2.0], [3.0, 6.0]), _activity([], [], [])], 2.0
+    )
+    # NOTE: activity halves every half life, so both mods have a decayed activity of 3
+    assert scores[0] == pytest.approx(numpy.log1p(3.0))
+    assert scores[1] == pytest.approx(numpy.log1p(3.0))
+    assert scores[2] == 0.0
+
+
+def test_compute_trending_scores_compares_recent_and_baseline_rates():
+    downloads = _activity([0, 0, 1, 1], [0.0, 10.0, 1.0, 20.0], [14.0, 2.0, 7.0, 46.0])
+    scores = compute_trending_scores(3, downloads, 30, 7)
+    assert scores[0] > 0
+    assert scores[1] < 0
+    assert scores[2] == 0.0
+
+
+def test_load_activity_skips_mods_missing_from_index():
+    known_mod_id, created_mod_id = uuid4(), uuid4()
+    query = SimpleNamespace(
+        all=lambda: [(known_mod_id, 1.0, 2.0), (created_mod_id, 0.0, 5.0)]
+    )
+
+    indices, ages, values = _load_activity(query, {known_mod_id: 3})
+    assert indices.tolist() == [3]
+    assert ages.tolist() == [1.0]
+    assert values.tolist() == [2.0]
+
+
+@pytest.mark.parametrize("window_days, trending_days", [(30, 0), (30, 30)])
+def test_compute_mod_scores_rejects_invalid_trending_days(window_days, trending_days):
+    with pytest.raises(ValueError):
+        compute_mod_scores(None, window_days, trending_days, 2.0)
+
+
+@pytest.mark.db
+def test_compute_mod_scores(db_session: Session, mod_factory):
+    popular, unpopular = mod_factory.create(), mod_factory.create()
+    db_session.add(
+        ModDownloadDaily(
+            mod_id=popular.id, day=datetime.now(timezone.utc).date(), count=10
+        )
+    )
+    db_session.add(
+        ModDownloadDaily(mod_id=unpopular.id, day=date(2000, 1, 1), count=10)
+    )
+    db_session.flush()
+
+    assert compute_mod_scores(db_session, 30, 7, 2.0) >= 2
+    assert (
+        db_session.query(ModScore).get(popular.id).hot
+        > db_session.query(ModScore).get(unpopular.id).hot
+    )
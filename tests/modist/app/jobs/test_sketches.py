@@ -0,0 +1,54 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+from modist.models.mod import ModDownloadSketch, ModReleaseDownloadSketch
+from modist.hyperloglog import HyperLogLog
+from modist.app.jobs.sketches import backfill_download_sketches
+
+
+@pytest.mark.db
+def test_backfill_download_sketches_is_idempotent(
+    db_session: Session, mod_release_factory, mod_release_download_factory
+):
+    mod_release = mod_release_factory.create()
+    for day, ip in ((1, "127.0.0.1"), (1, "127.0.0.1"), (1, "127.0.0.2"), (2, "::1")):
+        mod_release_download_factory.create(
+            mod_release=mod_release,
+            ip=ip,
+            downloaded_at=datetime(2020, 1, day, 12, tzinfo=timezone.utc),
+        )
+
+    start, end = date(2020, 1, 1), date(2020, 1, 3)
+    assert backfill_download_sketches(db_session, start, end) == 4
+    sketches = {
+        sketch.day: sketch.sketch
+        for sketch in db_session.query(ModDownloadSketch).filter(
+            ModDownloadSketch.mod_id == mod_release.mod_id
+        )
+    }
+    estimates = {
+        day: HyperLogLog(sketch).estimate() for day, sketch in sketches.items()
+    }
+    assert estimates == {date(2020, 1, 1): 2, date(2020, 1, 2): 1}
+
+    # NOTE: downloaders which are already sketched leave the sketches unchanged
+    assert backfill_download_sketches(db_session, start, end) == 4
+    db_session.expire_all()
+    assert {
+        sketch.day: sketch.sketch
+        for sketch in db_session.query(ModDownloadSketch).filter(
+            ModDownloadSketch.mod_id == mod_release.mod_id
+        )
+    } == sketches
+    assert (
+        db_session.query(ModReleaseDownloadSketch)
+        .filter(ModReleaseDownloadSketch.mod_release_id == mod_release.id)
+        .count()
+        == 2
+    )
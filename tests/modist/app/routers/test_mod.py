@@ -0,0 +1,43 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from uuid import UUID, uuid4
+from typing import List
+
+import pytest
+from sqlalchemy.orm import Session
+
+from modist.app.routers import mod as mod_router
+from modist.app.schemas.mod import ModDetailSchema
+
+from .conftest import request_client
+
+
+@pytest.mark.db
+def test_get_mod_not_modified_skips_loading(
+    db_session: Session, mod_factory, monkeypatch
+):
+    loaded: List[UUID] = []
+    get_mod_detail = mod_router.get_mod_detail
+
+    def _get_mod_detail(mod_id: UUID) -> ModDetailSchema:
+        loaded.append(mod_id)
+        return get_mod_detail(mod_id)
+
+    monkeypatch.setattr(mod_router, "get_mod_detail", _get_mod_detail)
+    mod = mod_factory.create()
+
+    with request_client() as client:
+        resp = client.get(f"/mods/{mod.id!s}")
+        assert resp.status_code == 200
+        assert loaded == [mod.id]
+
+        resp = client.get(
+            f"/mods/{mod.id!s}", headers={"If-None-Match": resp.headers["ETag"]}
+        )
+        assert resp.status_code == 304
+        assert loaded == [mod.id]
+
+        resp = client.get(f"/mods/{uuid4()!s}", headers={"If-None-Match": "*"})
+        assert resp.status_code == 404
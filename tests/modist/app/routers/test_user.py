@@ -2,12 +2,14 @@
 # Copyright (c) 2020 Modist Team <admin@modist.io>
 # ISC License <https://choosealicense.com/licenses/isc>
 
+from uuid import uuid4
+
 import pytest
 import rapidjson as json
 from sqlalchemy.orm import Session
 
 from modist.models.user import User
-from modist.app.schemas.user import UserSchema
+from modist.app.schemas.user import UserSchema, UserPublicSchema
 
 from .conftest import request_client
 
@@ -56,3 +58,24 @@ def test_get_me(db_session: Session, user_instance: User):
             )
 
         assert UserSchema.from_model(user_instance) == schema
+
+
+@pytest.mark.db
+def test_get_users_batch(db_session: Session, user_factory):
+    users = user_factory.create_batch(3)
+    missing_id = uuid4()
+    requested_ids = [users[2].id, missing_id, users[0].id, users[1].id]
+
+    with request_client() as client:
+        resp = client.get(
+            "/users/batch", params={"ids": ",".join(map(str, requested_ids))}
+        )
+        assert resp.status_code == 200
+
+        content = json.loads(resp.text)
+        assert [UserPublicSchema(**result).id for result in content["results"]] == [
+            users[2].id,
+            users[0].id,
+            users[1].id,
+        ]
+        assert content["missing"] == [str(missing_id)]
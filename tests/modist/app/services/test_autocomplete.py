@@ -0,0 +1,79 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from uuid import uuid4
+from datetime import datetime, timezone
+
+from modist.models.common import Tag
+from modist.app.schemas.search import SuggestionType
+from modist.app.services.autocomplete import PrefixIndex, _IndexSource
+
+
+def test_prefix_index_matches_any_word_case_insensitively():
+    weather, lighting = uuid4(), uuid4()
+    index = PrefixIndex()
+    index.upsert(weather, "Realistic Weather")
+    index.upsert(lighting, "Realistic Lighting")
+
+    assert index.search("weath", 10) == [(weather, "Realistic Weather")]
+    assert index.search("REALISTIC l", 10) == [(lighting, "Realistic Lighting")]
+    assert sorted(index.search("real", 10)) == sorted(
+        [(weather, "Realistic Weather"), (lighting, "Realistic Lighting")]
+    )
+    assert index.search("snow", 10) == []
+
+
+def test_prefix_index_returns_each_record_once_within_limit():
+    index = PrefixIndex()
+    for _ in range(5):
+        index.upsert(uuid4(), "Sword Sword")
+
+    assert len(index.search("sword", 3)) == 3
+    assert len(index.search("sword", 10)) == 5
+
+
+def test_prefix_index_upsert_replaces_previous_text():
+    record_id = uuid4()
+    index = PrefixIndex()
+    index.upsert(record_id, "Old Name")
+    index.upsert(record_id, "New Name")
+
+    assert len(index) == 1
+    assert index.search("old", 10) == []
+    assert index.search("name", 10) == [(record_id, "New Name")]
+
+
+def test_prefix_index_remove_and_load():
+    first, second = uuid4(), uuid4()
+    index = PrefixIndex()
+    index.load([(first, "First Tag"), (second, "Second Tag")])
+    assert len(index) == 2
+
+    index.remove(first)
+    index.remove(uuid4())
+    assert first not in index
+    assert index.search("tag", 10) == [(second, "Second Tag")]
+
+
+def test_index_source_rebuild_serves_current_index_until_swapped():
+    old, new = uuid4(), uuid4()
+    updated_at = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    source = _IndexSource(Tag, SuggestionType.TAG)
+    source.index.load([(old, "Old Tag")])
+    served_during_rebuild = []
+
+    class RebuildQuery(object):
+        def all(self):
+            served_during_rebuild.extend(source.index.search("tag", 10))
+            return [
+                (new, "New Tag", True, updated_at),
+                (old, "Old Tag", False, updated_at),
+            ]
+
+    source.build_query = lambda *args, **kwargs: RebuildQuery()
+    source.rebuild(None)
+
+    assert served_during_rebuild == [(old, "Old Tag")]
+    assert source.index.search("tag", 10) == [(new, "New Tag")]
+    assert source.watermark == updated_at
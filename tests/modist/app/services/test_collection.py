@@ -0,0 +1,123 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from typing import List
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.dialects import postgresql
+
+from modist.models.mod import ModReleaseDownload
+from modist.app.filters import Sort, CountStrategy, SortDirection
+from modist.models.common import Tag
+from modist.app.services.collection import (
+    Explain,
+    sort_query,
+    exact_count_cache,
+    get_collection_total,
+)
+
+TAG_NAMES = [f"count-strategy-{index!s}" for index in range(4)]
+
+
+def create_tags(tag_factory, names: List[str]) -> List[Tag]:
+    """Create a tag for each of the given names.
+
+    :param tag_factory: The tag factory to create the tags with
+    :param List[str] names: The names of the tags to create
+    :return: The created tags
+    :rtype: List[Tag]
+    """
+
+    return [tag_factory.create(name=name) for name in names]
+
+
+def test_explain_compiles_to_json_explain():
+    statement = Query(ModReleaseDownload).statement
+    compiled = str(Explain(statement).compile(dialect=postgresql.dialect()))
+    assert compiled.startswith("EXPLAIN (FORMAT JSON) SELECT")
+
+
+def test_collection_total_skipped_for_none_strategy():
+    query = Query(ModReleaseDownload)
+    assert get_collection_total(None, query, CountStrategy.NONE) is None
+
+
+@pytest.mark.db
+def test_collection_total_skipped_for_none_strategy_without_querying(
+    db_session: Session, tag_factory
+):
+    create_tags(tag_factory, TAG_NAMES)
+    query = db_session.query(Tag).filter(Tag.name.in_(TAG_NAMES))
+    assert get_collection_total(db_session, query, CountStrategy.NONE) is None
+
+
+@pytest.mark.db
+def test_collection_total_counts_exact_rows(db_session: Session, tag_factory):
+    exact_count_cache.clear()
+    create_tags(tag_factory, TAG_NAMES)
+    query = db_session.query(Tag).filter(Tag.name.in_(TAG_NAMES)).order_by(Tag.name)
+
+    assert get_collection_total(db_session, query.limit(1), CountStrategy.EXACT) == 4
+
+    # NOTE: exact counts are cached, so rows created within the cache period are not
+    # reflected until the cached count expires
+    tag_factory.create(name=TAG_NAMES[0])
+    assert get_collection_total(db_session, query, CountStrategy.EXACT) == 4
+
+    exact_count_cache.clear()
+    assert get_collection_total(db_session, query, CountStrategy.EXACT) == 5
+
+
+@pytest.mark.db
+def test_collection_total_estimated_from_table_statistics(
+    db_session: Session, tag_factory
+):
+    create_tags(tag_factory, TAG_NAMES)
+    db_session.execute(text("ANALYZE tag"))
+    analyzed = db_session.query(Tag).count()
+
+    # NOTE: the table statistics are only refreshed by the next ``ANALYZE`` while the
+    # planner scales them by the table's current size, so only the planner's estimate
+    # reflects the rows created since
+    db_session.execute(
+        text(
+            "INSERT INTO tag (name) "
+            "SELECT 'count-strategy-' || index FROM generate_series(1, 1000) index"
+        )
+    )
+    query = db_session.query(Tag).order_by(Tag.name).limit(1)
+    assert (
+        get_collection_total(
+            db_session, query, CountStrategy.ESTIMATE, table=Tag.__table__
+        )
+        == analyzed
+    )
+    assert get_collection_total(db_session, query, CountStrategy.ESTIMATE) > analyzed
+
+
+@pytest.mark.db
+def test_collection_total_estimated_from_query_plan(db_session: Session, tag_factory):
+    create_tags(tag_factory, TAG_NAMES)
+    db_session.execute(text("ANALYZE tag"))
+
+    query = db_session.query(Tag).filter(Tag.name == TAG_NAMES[0])
+    plan = db_session.execute(Explain(query.statement)).scalar()
+    estimate = get_collection_total(db_session, query, CountStrategy.ESTIMATE)
+    assert estimate == plan[0]["Plan"]["Plan Rows"]
+    assert estimate < db_session.query(Tag).count()
+
+
+def test_sort_query_ignores_unknown_fields_and_appends_tiebreaker():
+    query = sort_query(
+        Query(ModReleaseDownload),
+        [Sort(field="downloaded_at", direction=SortDirection.DESCENDING), Sort("ip")],
+        {"downloaded_at": ModReleaseDownload.downloaded_at},
+        ModReleaseDownload.id,
+    )
+    compiled = str(query.statement.compile(dialect=postgresql.dialect()))
+    assert compiled.endswith(
+        "ORDER BY mod_release_download.downloaded_at DESC, mod_release_download.id ASC"
+    )
@@ -0,0 +1,50 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from datetime import date
+
+import pytest
+
+from modist.app.filters import DateRange, Granularity
+from modist.app.services.download import (
+    _downsample,
+    _get_buckets,
+    _get_captured_headers,
+)
+
+
+def test_get_captured_headers_keeps_allowlisted_headers():
+    headers = {
+        "accept": "*/*",
+        "accept-language": "en-US",
+        "cookie": "session=secret",
+        "user-agent": "Modist/1.0",
+    }
+    assert _get_captured_headers(headers) == {"accept-language": "en-US"}
+
+
+@pytest.mark.parametrize(
+    "granularity, buckets",
+    [
+        (Granularity.DAY, [date(2020, 1, 30), date(2020, 1, 31), date(2020, 2, 1)]),
+        (Granularity.WEEK, [date(2020, 1, 27)]),
+        (Granularity.MONTH, [date(2020, 1, 1), date(2020, 2, 1)]),
+    ],
+)
+def test_get_buckets_covers_range(granularity, buckets):
+    date_range = DateRange(start=date(2020, 1, 30), end=date(2020, 2, 1))
+    assert _get_buckets(date_range, granularity) == buckets
+
+
+def test_downsample_merges_consecutive_buckets():
+    buckets = _get_buckets(
+        DateRange(start=date(2020, 1, 1), end=date(2020, 1, 5)), Granularity.DAY
+    )
+    counts = {date(2020, 1, 1): 1, date(2020, 1, 2): 2, date(2020, 1, 5): 5}
+    points = _downsample(buckets, counts, 2)
+    assert [(point.day, point.count) for point in points] == [
+        (date(2020, 1, 1), 3),
+        (date(2020, 1, 3), 0),
+        (date(2020, 1, 5), 5),
+    ]
@@ -0,0 +1,253 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from uuid import uuid4
+from typing import List, Generator
+from decimal import Decimal
+from contextlib import contextmanager
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from modist.app.utils import decode_cursor
+from modist.models.mod import ModRatingSummary
+from modist.app.filters import (
+    Pagination,
+    CountStrategy,
+    CollectionFilter,
+    KeysetPagination,
+)
+from modist.app.services import mod as mod_service
+from modist.app.services.mod import (
+    get_mods,
+    search_mods,
+    get_mod_detail,
+    get_mods_validators,
+    get_latest_mod_release,
+    search_mods_validators,
+    get_mod_rating_versions,
+    get_mod_detail_validators,
+)
+
+
+@contextmanager
+def count_statements(session: Session) -> Generator[List[str], None, None]:
+    """Collect the statements executed through a given session's engine.
+
+    :param Session session: The session whose engine should be observed
+    :return: A generator that yields the list of collected statements
+    :rtype: Generator[List[str], None, None]
+    """
+
+    statements: List[str] = []
+
+    def _collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(session.bind, "before_cursor_execute", _collect)
+    try:
+        yield statements
+    finally:
+        event.remove(session.bind, "before_cursor_execute", _collect)
+
+
+@pytest.mark.db
+def test_get_mods_statement_count_independent_of_page_size(
+    db_session: Session, mod_factory, mod_tag_factory
+):
+    for mod in mod_factory.create_batch(8):
+        mod_tag_factory.create_batch(2, mod=mod)
+
+    # NOTE: expunging the created instances ensures the service can't reuse the
+    # already loaded relationships of the factory built instances
+    db_session.expunge_all()
+
+    statement_counts = []
+    for size in (1, 8):
+        filters = CollectionFilter(
+            pagination=Pagination(size=size, page=0), sorts=[], count=CountStrategy.NONE
+        )
+        with count_statements(db_session) as statements:
+            collection = get_mods(filters)
+
+        assert len(collection.results) == size
+        assert all(len(mod.tags) == 2 for mod in collection.results)
+        statement_counts.append(len(statements))
+
+    assert statement_counts[0] == statement_counts[1]
+
+
+@pytest.mark.db
+def test_search_mods_ranks_name_matches_first_and_paginates(
+    db_session: Session, mod_factory
+):
+    described = mod_factory(name="Lighting Overhaul", description="Better skyrim rain")
+    named = mod_factory(name="Skyrim Rain", description="Realistic weather")
+    mod_factory(name="Unrelated", description="Nothing to see here")
+
+    first_page = search_mods("skyrim rain", KeysetPagination(size=1))
+    assert [mod.id for mod in first_page.results] == [named.id]
+    assert first_page.next is not None
+
+    second_page = search_mods(
+        "skyrim rain", KeysetPagination(size=1, after=decode_cursor(first_page.next))
+    )
+    assert [mod.id for mod in second_page.results] == [described.id]
+    assert second_page.next is None
+
+
+@pytest.mark.db
+def test_search_mods_paginates_through_tied_ranks(db_session: Session, mod_factory):
+    tied = {
+        mod_factory(name="Skyrim Rain", description="Realistic weather").id
+        for _ in range(3)
+    }
+
+    seen = []
+    after = None
+    while True:
+        page = search_mods("skyrim rain", KeysetPagination(size=1, after=after))
+        seen.extend(mod.id for mod in page.results)
+        if page.next is None:
+            break
+        after = decode_cursor(page.next)
+
+    assert len(seen) == len(tied)
+    assert set(seen) == tied
+
+
+@pytest.mark.db
+def test_get_latest_mod_release_orders_by_version_precedence(
+    db_session: Session, mod_factory, mod_release_factory
+):
+    mod = mod_factory.create()
+    for version in ("1.9.0", "1.10.0-rc.1", "1.10.0", "1.2.0"):
+        mod_release_factory.create(mod=mod, version=version)
+    mod_release_factory.create(mod=mod, version="2.0.0", is_active=False)
+
+    assert get_latest_mod_release(mod.id).version == "1.10.0"
+
+    with pytest.raises(HTTPException):
+        get_latest_mod_release(mod_factory.create().id)
+
+
+@pytest.mark.db
+def test_get_mod_detail_is_a_single_statement(
+    db_session: Session, mod_factory, mod_tag_factory, mod_release_factory
+):
+    mod = mod_factory.create()
+    mod_tag_factory.create_batch(2, mod=mod)
+    for index in range(8):
+        mod_release_factory.create(mod=mod, version=f"1.{index!s}.0")
+    db_session.expunge_all()
+
+    with count_statements(db_session) as statements:
+        detail = get_mod_detail(mod.id)
+
+    assert len(statements) == 1
+    assert detail.id == mod.id
+    assert len(detail.tags) == 2
+    assert [release.version for release in detail.releases] == [
+        f"1.{index!s}.0" for index in range(7, 2, -1)
+    ]
+    assert detail.rating.count == 0
+    assert detail.rating.average is None
+
+    with pytest.raises(HTTPException):
+        get_mod_detail(mod_factory.create(is_active=False).id)
+
+
+@pytest.mark.db
+def test_get_mod_detail_only_caches_computed_rating_prior_mean(
+    db_session: Session, mod_factory, monkeypatch
+):
+    cached: List[float] = []
+    monkeypatch.setattr(mod_service, "_cache_rating_prior_mean", cached.append)
+    mod_service.rating_prior_cache.clear()
+    mod = mod_factory.create()
+
+    get_mod_detail(mod.id)
+    assert len(cached) == 1
+
+    # NOTE: re-caching an already cached mean would keep extending its TTL
+    monkeypatch.setattr(mod_service, "_get_cached_rating_prior_mean", lambda: 3.0)
+    get_mod_detail(mod.id)
+    assert len(cached) == 1
+
+
+@pytest.mark.db
+def test_mod_rating_summaries_follow_rating_changes(
+    db_session: Session, mod_factory, mod_rating_factory
+):
+    mod = mod_factory.create()
+    ratings = [
+        mod_rating_factory.create(mod=mod, version=version, rating__rating=rating)
+        for version, rating in (
+            ("1.0.0", Decimal("4.50")),
+            ("1.0.0", Decimal("2.00")),
+            ("2.0.0", Decimal("3.25")),
+        )
+    ]
+
+    versions = get_mod_rating_versions(mod.id)
+    assert [version.version for version in versions] == ["2.0.0", "1.0.0"]
+    assert versions[1].count == 2
+    assert versions[1].average == pytest.approx(3.25)
+    assert versions[1].deviation == pytest.approx(1.25)
+    assert versions[1].histogram == [0, 0, 1, 0, 1, 0, 0, 0, 0, 0]
+
+    ratings[0].rating.is_active = False
+    db_session.flush()
+    db_session.delete(ratings[1].rating)
+    db_session.flush()
+    db_session.expire_all()
+
+    summary = db_session.query(ModRatingSummary).get(mod.id)
+    assert summary.count == 1
+    assert summary.sum == Decimal("3.25")
+    assert [version.version for version in get_mod_rating_versions(mod.id)] == ["2.0.0"]
+
+    assert get_mod_rating_versions(mod_factory.create().id) == []
+    with pytest.raises(HTTPException):
+        get_mod_rating_versions(uuid4())
+    with pytest.raises(HTTPException):
+        get_mod_rating_versions(mod_factory.create(is_active=False).id)
+
+
+@pytest.mark.db
+def test_mod_listing_validators_follow_ranking_tallies(
+    db_session: Session, mod_factory, mod_ranking_factory
+):
+    mod = mod_factory(name="Skyrim Rain", description="Realistic weather")
+    filters = CollectionFilter(
+        pagination=Pagination(size=8, page=0), sorts=[], count=CountStrategy.EXACT
+    )
+    pagination = KeysetPagination(size=1)
+    listing = get_mods_validators(filters, ())
+    search = search_mods_validators("skyrim rain", pagination, ())
+
+    # NOTE: tallies are maintained by triggers rather than through the mod, so the
+    # mod's own ``updated_at`` is unchanged by rankings
+    mod_ranking_factory.create(mod=mod)
+    assert get_mods_validators(filters, ()) != listing
+    assert search_mods_validators("skyrim rain", pagination, ()) != search
+
+
+@pytest.mark.db
+def test_get_mod_detail_validators_follow_rating_summaries(
+    db_session: Session, mod_factory, mod_rating_factory, monkeypatch
+):
+    monkeypatch.setattr(mod_service, "_get_rating_prior_mean", lambda session: 3.0)
+    mod = mod_factory.create()
+    validators = get_mod_detail_validators(mod.id, ())
+    assert validators == get_mod_detail_validators(mod.id, ())
+    assert validators != get_mod_detail_validators(mod.id, ("json", ""))
+
+    mod_rating_factory.create(mod=mod)
+    assert get_mod_detail_validators(mod.id, ()) != validators
+
+    assert get_mod_detail_validators(uuid4(), ()) is None
+    assert get_mod_detail_validators(mod_factory.create(is_active=False).id, ()) is None
@@ -0,0 +1,178 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from uuid import UUID, uuid4
+from typing import Dict, List, Tuple
+
+import pytest
+from semver import VersionInfo
+from sqlalchemy.orm import Session
+
+from modist.versioning import get_version_key, parse_version_expression
+from modist.app.services.resolver import (
+    Candidate,
+    ResolutionError,
+    DependencyResolver,
+    load_candidates,
+)
+
+
+def version_key(version: str) -> str:
+    return get_version_key(VersionInfo.parse(version))
+
+
+def build_candidate(
+    mod_id: UUID,
+    version: str,
+    dependencies: List[Tuple[UUID, str]] = [],
+    conflicts: List[Tuple[UUID, str]] = [],
+) -> Candidate:
+    return Candidate(
+        id=uuid4(),
+        mod_id=mod_id,
+        key=version_key(version),
+        dependencies=tuple(
+            (dependency_id, parse_version_expression(expression))
+            for dependency_id, expression in dependencies
+        ),
+        conflicts=tuple(
+            (conflict_id, parse_version_expression(expression))
+            for conflict_id, expression in conflicts
+        ),
+    )
+
+
+def resolve_versions(
+    candidates: Dict[UUID, List[Candidate]], mod_ids: List[UUID]
+) -> Dict[UUID, str]:
+    return {
+        mod_id: candidate.key
+        for mod_id, candidate in DependencyResolver(candidates).resolve(mod_ids).items()
+    }
+
+
+def test_resolver_prefers_newest_satisfying_releases():
+    app, library = uuid4(), uuid4()
+    candidates = {
+        app: [
+            build_candidate(app, "1.0.0", [(library, "^1.0.0")]),
+            build_candidate(app, "2.0.0", [(library, "^2.0.0")]),
+        ],
+        library: [
+            build_candidate(library, "1.5.0"),
+            build_candidate(library, "2.1.0"),
+            build_candidate(library, "3.0.0"),
+        ],
+    }
+
+    assert resolve_versions(candidates, [app]) == {
+        app: version_key("2.0.0"),
+        library: version_key("2.1.0"),
+    }
+
+
+def test_resolver_resolves_most_recently_required_mod_first():
+    # NOTE: both mods have several viable releases, so the resolver falls back to the
+    # most recently required mod (which must work on Python 3.7 dicts as well)
+    first, second = uuid4(), uuid4()
+    candidates = {
+        first: [build_candidate(first, "1.0.0"), build_candidate(first, "2.0.0")],
+        second: [
+            build_candidate(second, "1.0.0"),
+            build_candidate(second, "2.0.0", conflicts=[(first, "^2.0.0")]),
+        ],
+    }
+
+    assert resolve_versions(candidates, [first, second]) == {
+        first: version_key("1.0.0"),
+        second: version_key("2.0.0"),
+    }
+
+
+def test_resolver_backtracks_on_conflicts():
+    first, second, library = uuid4(), uuid4(), uuid4()
+    candidates = {
+        first: [
+            build_candidate(first, "1.0.0", [(library, "^1.0.0")]),
+            build_candidate(first, "2.0.0", [(library, "^2.0.0")]),
+        ],
+        second: [build_candidate(second, "1.0.0", conflicts=[(library, ">=2.0.0")])],
+        library: [build_candidate(library, "1.0.0"), build_candidate(library, "2.0.0")],
+    }
+
+    assert resolve_versions(candidates, [first, second]) == {
+        first: version_key("1.0.0"),
+        second: version_key("1.0.0"),
+        library: version_key("1.0.0"),
+    }
+
+
+def test_resolver_raises_when_no_consistent_set_exists():
+    first, second, library = uuid4(), uuid4(), uuid4()
+    candidates = {
+        first: [build_candidate(first, "1.0.0", [(library, "^1.0.0")])],
+        second: [build_candidate(second, "1.0.0", [(library, "^2.0.0")])],
+        library: [build_candidate(library, "1.0.0"), build_candidate(library, "2.0.0")],
+    }
+
+    with pytest.raises(ResolutionError):
+        DependencyResolver(candidates).resolve([first, second])
+
+
+def test_resolver_raises_for_mods_without_candidates():
+    mod_id = uuid4()
+    with pytest.raises(ResolutionError):
+        DependencyResolver({mod_id: []}).resolve([mod_id])
+
+
+def test_resolver_handles_deep_dependency_chains():
+    mod_ids = [uuid4() for _ in range(2000)]
+    candidates = {
+        mod_id: [
+            build_candidate(
+                mod_id,
+                "1.0.0",
+                [(mod_ids[index + 1], "^1.0.0")] if index + 1 < len(mod_ids) else [],
+            )
+        ]
+        for index, mod_id in enumerate(mod_ids)
+    }
+
+    assert len(DependencyResolver(candidates).resolve(mod_ids[:1])) == len(mod_ids)
+
+
+@pytest.mark.db
+def test_load_candidates_only_loads_satisfying_releases(
+    db_session: Session,
+    host_release_factory,
+    mod_release_factory,
+    mod_release_dependency_factory,
+    mod_release_conflict_factory,
+):
+    host_release = host_release_factory()
+    app = mod_release_factory(version="1.0.0", host_release=host_release)
+    library_releases = {
+        version: mod_release_factory(version=version, host_release=host_release)
+        for version in ("1.0.0", "1.5.0", "2.0.0", "3.0.0")
+    }
+    library = library_releases["1.0.0"].mod
+    for library_release in library_releases.values():
+        library_release.mod = library
+    mod_release_dependency_factory(
+        release=app, dependency=library, version_expression=">1.0.0, <3.0.0"
+    )
+    mod_release_conflict_factory(
+        release=app, conflict=library, version_expression="<=1.5.0"
+    )
+    db_session.flush()
+
+    candidates = load_candidates(db_session, [app.mod_id], host_release.id)
+    assert {candidate.id for candidate in candidates[library.id]} == {
+        library_releases["1.5.0"].id,
+        library_releases["2.0.0"].id,
+    }
+    assert [
+        candidate.id
+        for candidate in DependencyResolver(candidates).resolve([app.mod_id]).values()
+    ] == [app.id, library_releases["2.0.0"].id]
@@ -0,0 +1,34 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+import pytest
+from sqlalchemy.orm import Session
+
+from modist.app.schemas.search import SuggestionType
+from modist.app.services.search import get_suggestions
+
+
+@pytest.mark.db
+def test_get_suggestions_tolerates_misspellings(
+    db_session: Session, mod_factory, tag_factory
+):
+    mod = mod_factory(name="Frostfall Survival")
+    tag = tag_factory(name="frostbite")
+    mod_factory(name="Unrelated")
+
+    suggestions = get_suggestions("frostfal", threshold=0.3)
+    assert suggestions[0].id == mod.id
+    assert suggestions[0].type == SuggestionType.MOD
+    assert [suggestion.id for suggestion in suggestions].count(mod.id) == 1
+    assert tag.id in [suggestion.id for suggestion in suggestions]
+    assert all(
+        first.similarity >= second.similarity
+        for first, second in zip(suggestions, suggestions[1:])
+    )
+
+
+@pytest.mark.db
+def test_get_suggestions_respects_threshold(db_session: Session, mod_factory):
+    mod_factory(name="Frostfall Survival")
+    assert get_suggestions("frostfal", threshold=1.0) == []
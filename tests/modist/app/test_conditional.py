@@ -0,0 +1,177 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from uuid import uuid4
+from typing import Union, Optional
+from datetime import datetime, timezone, timedelta
+
+import pytest
+from fastapi import Depends, FastAPI, Request, APIRouter
+from pydantic import BaseModel
+from starlette.responses import Response
+from starlette.testclient import TestClient
+
+from modist.app.content import MSGPACK_MEDIA_TYPE, MessagePackRoute
+from modist.app.conditional import (
+    ConditionalHeaders,
+    build_validators,
+    get_representation,
+    conditional_headers,
+    respond_conditionally,
+    build_not_modified_response,
+)
+
+UPDATED_AT = datetime(2020, 4, 20, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+class PageSchema(BaseModel):
+    page: int
+    names: list
+
+
+def build_client(loaded: Optional[list] = None) -> TestClient:
+    router = APIRouter(route_class=MessagePackRoute)
+
+    def get_page(page: int) -> PageSchema:
+        if loaded is not None:
+            loaded.append(page)
+        return PageSchema(page=1, names=["modist"])
+
+    @router.get("/names", response_model=PageSchema)
+    def get_names(
+        request: Request,
+        response: Response,
+        page: int = 1,
+        conditions: ConditionalHeaders = Depends(conditional_headers),
+    ) -> Union[PageSchema, Response]:
+        return respond_conditionally(
+            build_validators(UPDATED_AT, 1, representation=get_representation(request)),
+            response,
+            conditions,
+            get_page,
+            page,
+        )
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_etag_changes_with_updated_at():
+    resource_id = uuid4()
+    validators = build_validators(resource_id, UPDATED_AT)
+
+    assert validators.etag.startswith('"') and validators.etag.endswith('"')
+    assert validators == build_validators(resource_id, UPDATED_AT)
+    assert (
+        validators.etag
+        != build_validators(resource_id, UPDATED_AT + timedelta(microseconds=1)).etag
+    )
+
+
+def test_etag_changes_with_count():
+    assert build_validators(UPDATED_AT, 10).etag != build_validators(UPDATED_AT, 9).etag
+
+
+def test_etag_changes_with_representation():
+    validators = build_validators(UPDATED_AT, 10, representation=("json", "page=1"))
+    assert validators.etag != build_validators(UPDATED_AT, 10).etag
+    assert (
+        validators.etag
+        != build_validators(UPDATED_AT, 10, representation=("json", "page=2")).etag
+    )
+
+
+def test_validators_without_last_modified():
+    validators = build_validators(None, 0)
+    assert validators.last_modified is None
+    assert "Last-Modified" not in validators.headers
+
+
+def test_validator_headers():
+    headers = build_validators(uuid4(), UPDATED_AT, last_modified=UPDATED_AT).headers
+    assert headers["Last-Modified"] == "Mon, 20 Apr 2020 12:30:15 GMT"
+
+
+def test_not_modified_for_matching_etags():
+    validators = build_validators(uuid4(), UPDATED_AT, last_modified=UPDATED_AT)
+    conditions = conditional_headers(
+        if_none_match=f'"other", W/{validators.etag!s}', if_modified_since=None
+    )
+    assert conditions.is_not_modified(validators)
+
+
+def test_not_modified_for_wildcard_etags():
+    validators = build_validators(uuid4(), UPDATED_AT, last_modified=UPDATED_AT)
+    assert ConditionalHeaders(if_none_match=["*"]).is_not_modified(validators)
+
+
+def test_modified_for_mismatched_etags():
+    validators = build_validators(uuid4(), UPDATED_AT, last_modified=UPDATED_AT)
+    conditions = conditional_headers(
+        if_none_match='"other"', if_modified_since="Mon, 20 Apr 2020 12:30:15 GMT"
+    )
+    assert not conditions.is_not_modified(validators)
+
+
+def test_not_modified_since():
+    validators = build_validators(uuid4(), UPDATED_AT, last_modified=UPDATED_AT)
+    conditions = conditional_headers(
+        if_none_match=None, if_modified_since="Mon, 20 Apr 2020 12:30:15 GMT"
+    )
+    assert conditions.is_not_modified(validators)
+
+
+def test_modified_since():
+    validators = build_validators(uuid4(), UPDATED_AT, last_modified=UPDATED_AT)
+    conditions = conditional_headers(
+        if_none_match=None, if_modified_since="Mon, 20 Apr 2020 12:30:14 GMT"
+    )
+    assert not conditions.is_not_modified(validators)
+
+
+def test_invalid_modified_since_ignored():
+    conditions = conditional_headers(if_none_match=None, if_modified_since="invalid")
+    assert conditions.if_modified_since is None
+
+
+def test_modified_for_missing_resources():
+    assert not ConditionalHeaders(if_none_match=["*"]).is_not_modified(None)
+
+
+def test_not_modified_response():
+    validators = build_validators(uuid4(), UPDATED_AT, last_modified=UPDATED_AT)
+    response = build_not_modified_response(validators)
+    assert response.status_code == 304
+    assert response.headers["ETag"] == validators.etag
+    assert len(response.body) == 0
+
+
+def test_respond_conditionally():
+    loaded = []
+    client = build_client(loaded)
+    resp = client.get("/names")
+    assert resp.status_code == 200
+    assert resp.headers["Vary"] == "Accept"
+    assert loaded == [1]
+
+    resp = client.get("/names", headers={"If-None-Match": resp.headers["ETag"]})
+    assert resp.status_code == 304
+    assert resp.headers["Vary"] == "Accept"
+    assert len(resp.content) == 0
+    # NOTE: the content is never loaded for unmodified representations
+    assert loaded == [1]
+
+
+@pytest.mark.parametrize(
+    "path,headers", [("/names?page=2", {}), ("/names", {"Accept": MSGPACK_MEDIA_TYPE})],
+)
+def test_respond_conditionally_varies_etag_by_representation(path, headers):
+    client = build_client()
+    etag = client.get("/names").headers["ETag"]
+
+    # NOTE: the content is the same, but the representation is not
+    resp = client.get(path, headers={"If-None-Match": etag, **headers})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
@@ -0,0 +1,110 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from uuid import UUID, uuid4
+from typing import List
+from datetime import datetime, timezone
+
+import pytest
+import rapidjson as json
+from fastapi import FastAPI, APIRouter
+from pydantic import BaseModel
+from starlette.responses import Response
+from starlette.testclient import TestClient
+
+from modist.app.content import (
+    MSGPACK_MEDIA_TYPE,
+    MessagePackRoute,
+    decode_msgpack,
+    encode_msgpack,
+    negotiate_media_type,
+)
+
+CREATED_AT = datetime(2020, 4, 20, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+class ArtifactSchema(BaseModel):
+    id: UUID
+    created_at: datetime
+    name: str
+    sizes: List[int]
+
+
+def build_client() -> TestClient:
+    router = APIRouter(route_class=MessagePackRoute)
+
+    @router.get("/artifact", response_model=ArtifactSchema)
+    def get_artifact(response: Response) -> ArtifactSchema:
+        response.headers["X-Modist"] = "true"
+        return ArtifactSchema(
+            id=uuid4(), created_at=CREATED_AT, name="artifact", sizes=[1, 2]
+        )
+
+    @router.post("/artifact", response_model=ArtifactSchema, status_code=201)
+    async def post_artifact(artifact: ArtifactSchema) -> ArtifactSchema:
+        return artifact
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "accept,expected",
+    [
+        ("", "application/json"),
+        ("*/*", "application/json"),
+        ("application/msgpack", "application/msgpack"),
+        ("application/x-msgpack", "application/msgpack"),
+        ("application/json;q=0.5, application/msgpack", "application/msgpack"),
+        ("application/*", "application/json"),
+        ("text/html", None),
+    ],
+)
+def test_negotiate_media_type(accept, expected):
+    assert (
+        negotiate_media_type(accept, ["application/json", "application/msgpack"])
+        == expected
+    )
+
+
+def test_msgpack_encodes_uuids_and_datetimes_natively():
+    content = {"id": uuid4(), "created_at": CREATED_AT}
+    encoded = encode_msgpack(content)
+
+    assert len(encoded) < len(json.dumps({k: str(v) for k, v in content.items()}))
+    assert decode_msgpack(encoded) == content
+
+
+def test_json_responses_by_default():
+    client = build_client()
+    resp = client.get("/artifact")
+    assert resp.headers["Content-Type"] == "application/json"
+    assert resp.headers["Vary"] == "Accept"
+    assert json.loads(resp.text)["name"] == "artifact"
+
+
+def test_msgpack_responses_when_accepted():
+    client = build_client()
+    resp = client.get("/artifact", headers={"Accept": MSGPACK_MEDIA_TYPE})
+    assert resp.headers["Content-Type"] == MSGPACK_MEDIA_TYPE
+    assert resp.headers["X-Modist"] == "true"
+    assert resp.headers["Vary"] == "Accept"
+
+    content = decode_msgpack(resp.content)
+    assert isinstance(content["id"], UUID)
+    assert content["created_at"] == CREATED_AT
+    assert content["sizes"] == [1, 2]
+
+
+def test_msgpack_request_bodies():
+    client = build_client()
+    artifact = {"id": uuid4(), "created_at": CREATED_AT, "name": "a", "sizes": [3]}
+    resp = client.post(
+        "/artifact",
+        data=encode_msgpack(artifact),
+        headers={"Content-Type": MSGPACK_MEDIA_TYPE, "Accept": MSGPACK_MEDIA_TYPE},
+    )
+    assert resp.status_code == 201
+    assert decode_msgpack(resp.content) == artifact
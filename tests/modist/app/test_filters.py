@@ -0,0 +1,77 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from uuid import uuid4
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from modist.env import instance as env
+from modist.app.utils import encode_cursor
+from modist.app.filters import (
+    DATE_RANGE_DEFAULT_DAYS,
+    DATE_RANGE_MAXIMUM_DAYS,
+    ids_filters,
+    date_range_filters,
+    keyset_pagination_filters,
+)
+
+
+def test_ids_filters_accepts_repeated_and_comma_separated_ids():
+    first, second, third = uuid4(), uuid4(), uuid4()
+    assert ids_filters(ids=[f"{first!s},{second!s}", str(third)]) == [
+        first,
+        second,
+        third,
+    ]
+
+
+def test_ids_filters_removes_duplicates_preserving_order():
+    first, second = uuid4(), uuid4()
+    assert ids_filters(ids=[str(second), str(first), str(second)]) == [second, first]
+
+
+def test_ids_filters_rejects_invalid_ids():
+    with pytest.raises(HTTPException) as exc:
+        ids_filters(ids=["invalid"])
+    assert exc.value.status_code == 400
+
+
+def test_ids_filters_rejects_too_many_ids():
+    ids = [str(uuid4()) for _ in range(env.app.collection.batch_maximum_size + 1)]
+    with pytest.raises(HTTPException) as exc:
+        ids_filters(ids=ids)
+    assert exc.value.status_code == 400
+
+
+def test_keyset_pagination_filters_decodes_cursor():
+    pagination = keyset_pagination_filters(size=5, after=encode_cursor([0.5, "id"]))
+    assert pagination.size == 5
+    assert pagination.after == [0.5, "id"]
+
+
+def test_keyset_pagination_filters_rejects_malformed_cursor():
+    with pytest.raises(HTTPException) as exc:
+        keyset_pagination_filters(size=5, after="!!!")
+    assert exc.value.status_code == 400
+
+
+def test_date_range_filters_defaults_to_days_before_end():
+    date_range = date_range_filters(start=None, end=date(2020, 3, 31))
+    assert date_range.end == date(2020, 3, 31)
+    assert (date_range.end - date_range.start).days == DATE_RANGE_DEFAULT_DAYS - 1
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        (date(2020, 2, 1), date(2020, 1, 1)),
+        (date(2020, 1, 1), date(2020, 1, 1) + timedelta(days=DATE_RANGE_MAXIMUM_DAYS)),
+    ],
+)
+def test_date_range_filters_rejects_invalid_ranges(start, end):
+    with pytest.raises(HTTPException) as exc:
+        date_range_filters(start=start, end=end)
+    assert exc.value.status_code == 400
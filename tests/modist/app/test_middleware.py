@@ -0,0 +1,179 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+import gzip
+
+import brotli
+import pytest
+from starlette.responses import Response, PlainTextResponse, StreamingResponse
+from starlette.testclient import TestClient
+from starlette.applications import Starlette
+
+from modist.app.middleware import CompressionMiddleware, negotiate_encoding
+
+LARGE_CONTENT = "modist " * 1000
+
+
+def build_client(**kwargs) -> TestClient:
+    app = Starlette()
+
+    @app.route("/large")
+    def large(request):
+        return PlainTextResponse(LARGE_CONTENT)
+
+    @app.route("/small")
+    def small(request):
+        return PlainTextResponse("modist")
+
+    @app.route("/tagged")
+    def tagged(request):
+        return PlainTextResponse(LARGE_CONTENT, headers={"ETag": '"modist"'})
+
+    @app.route("/unmodified")
+    def unmodified(request):
+        return Response(status_code=304, headers={"ETag": '"modist"'})
+
+    @app.route("/image")
+    def image(request):
+        return Response(LARGE_CONTENT.encode("utf-8"), media_type="image/png")
+
+    @app.route("/stream")
+    def stream(request):
+        def _stream():
+            for _ in range(10):
+                yield LARGE_CONTENT.encode("utf-8")
+
+        return StreamingResponse(_stream(), media_type="text/plain")
+
+    @app.route("/encoded")
+    def encoded(request):
+        return Response(
+            gzip.compress(LARGE_CONTENT.encode("utf-8")),
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    app.add_middleware(CompressionMiddleware, **kwargs)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "br"),
+        ("*, br;q=0", "gzip"),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding, ["br", "gzip"]) == expected
+
+
+def test_compresses_large_responses_with_brotli():
+    client = build_client()
+    resp = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+    assert resp.headers["Content-Encoding"] == "br"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert int(resp.headers["Content-Length"]) < len(LARGE_CONTENT)
+
+
+def test_compresses_large_responses_with_gzip():
+    client = build_client()
+    resp = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.text == LARGE_CONTENT
+
+
+def test_skips_responses_below_minimum_size():
+    client = build_client()
+    resp = client.get("/small", headers={"Accept-Encoding": "gzip, br"})
+    assert "Content-Encoding" not in resp.headers
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert resp.text == "modist"
+
+
+def test_skips_incompressible_responses():
+    client = build_client()
+    resp = client.get("/image", headers={"Accept-Encoding": "gzip, br"})
+    assert "Content-Encoding" not in resp.headers
+    assert "Vary" not in resp.headers
+    assert resp.text == LARGE_CONTENT
+
+
+def test_varies_uncompressed_responses_by_accept_encoding():
+    client = build_client()
+    resp = client.get("/tagged", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in resp.headers
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert resp.headers["ETag"] == '"modist"'
+
+
+def test_weakens_etags_of_compressed_responses():
+    client = build_client()
+    resp = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.headers["ETag"] == 'W/"modist"'
+
+    resp = client.get("/unmodified", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == 'W/"modist"'
+
+
+def test_skips_already_encoded_responses():
+    client = build_client()
+    resp = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.text == LARGE_CONTENT
+
+
+def test_compresses_streaming_responses():
+    client = build_client()
+    resp = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.text == LARGE_CONTENT * 10
+
+
+def test_reuses_cached_compressed_bodies():
+    middleware = CompressionMiddleware(None, cache_size=4)
+    body = LARGE_CONTENT.encode("utf-8")
+
+    compressed = middleware.compress(body, "br", '"modist"')
+    assert brotli.decompress(compressed) == body
+    assert middleware.compress(body, "br", '"modist"') is compressed
+    assert len(middleware.cache) == 1
+
+
+def test_reuses_cached_compressed_bodies_of_tagged_responses(monkeypatch):
+    compressed = []
+    compress = CompressionMiddleware._compress
+
+    def _compress(self, body, encoding):
+        compressed.append(encoding)
+        return compress(self, body, encoding)
+
+    monkeypatch.setattr(CompressionMiddleware, "_compress", _compress)
+    client = build_client()
+    for path in ("/tagged", "/tagged", "/large", "/large"):
+        resp = client.get(path, headers={"Accept-Encoding": "br"})
+        assert resp.text == LARGE_CONTENT
+
+    # NOTE: the untagged response is compressed every time
+    assert compressed == ["br", "br", "br"]
+
+
+@pytest.mark.parametrize("etag", [None, 'W/"modist"'])
+def test_skips_caching_bodies_without_strong_etags(etag):
+    middleware = CompressionMiddleware(None)
+    middleware.compress(LARGE_CONTENT.encode("utf-8"), "gzip", etag)
+    assert len(middleware.cache) == 0
+
+
+def test_skips_caching_bodies_above_cache_maximum_size():
+    middleware = CompressionMiddleware(None, cache_maximum_size=10)
+    middleware.compress(LARGE_CONTENT.encode("utf-8"), "gzip", '"modist"')
+    assert len(middleware.cache) == 0
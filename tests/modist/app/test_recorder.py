@@ -0,0 +1,223 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+import io
+import csv
+import json
+from uuid import uuid4
+from typing import List
+from pathlib import Path
+
+import pytest
+import psycopg2
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from modist.app.utils import get_db
+from modist.models.mod import Mod, ModReleaseDownload
+from modist.models.user import User
+from modist.app.recorder import (
+    DownloadEvent,
+    DownloadRecorder,
+    DeduplicationInfo,
+    DeduplicationWindow,
+    write_download_events,
+)
+from modist.models.common import UserAgent
+
+
+@pytest.fixture
+def recorder(tmp_path: Path) -> DownloadRecorder:
+    return DownloadRecorder(get_db(), 2, 10, 0.01, tmp_path / "spill.csv")
+
+
+@pytest.fixture
+def unavailable_recorder(recorder: DownloadRecorder, monkeypatch) -> DownloadRecorder:
+    def copy(events, include_spill):
+        raise OperationalError(
+            "COPY", {}, psycopg2.OperationalError("could not connect to server")
+        )
+
+    monkeypatch.setattr(recorder, "_copy", copy)
+    return recorder
+
+
+def _read_spilled_mod_ids(recorder: DownloadRecorder) -> List[str]:
+    with recorder.spill_path.open("r", newline="") as spill:
+        return [row[4] for row in csv.reader(spill)]
+
+
+def test_write_download_events_escapes_headers():
+    event = DownloadEvent(uuid4(), uuid4(), "127.0.0.1", {"user-agent": 'a, "b"'})
+    stream = io.StringIO()
+    write_download_events(stream, [event], {})
+
+    stream.seek(0)
+    (row,) = list(csv.reader(stream))
+    assert row[1] == "127.0.0.1"
+    assert json.loads(row[2]) == event.headers
+    # NOTE: unquoted empty values are copied in as NULL
+    assert row[3:] == [str(event.mod_release_id), str(event.mod_id), "", "", ""]
+
+
+def test_write_download_events_replaces_interned_user_agents():
+    events = [
+        DownloadEvent(uuid4(), uuid4(), "127.0.0.1", user_agent=user_agent)
+        for user_agent in ("Interned/1.0", "Uninterned/1.0")
+    ]
+    stream = io.StringIO()
+    write_download_events(stream, events, {"Interned/1.0": 7})
+
+    stream.seek(0)
+    assert [row[-2:] for row in csv.reader(stream)] == [
+        ["7", ""],
+        ["", "Uninterned/1.0"],
+    ]
+
+
+def test_record_drops_events_when_buffer_is_full(recorder: DownloadRecorder):
+    events = [DownloadEvent(uuid4(), uuid4(), "127.0.0.1") for _ in range(3)]
+    assert [recorder.record(event) for event in events] == [True, True, False]
+    assert recorder.dropped == 1
+
+
+def test_deduplication_window_expires_keys():
+    now = [0.0]
+    window = DeduplicationWindow(10, 60, timer=lambda: now[0])
+    assert not window.seen(("127.0.0.1", 1))
+    assert window.seen(("127.0.0.1", 1))
+    assert not window.seen(("127.0.0.2", 1))
+
+    # NOTE: repeats don't extend the window of the first download
+    now[0] = 59
+    assert window.seen(("127.0.0.1", 1))
+    now[0] = 61
+    assert not window.seen(("127.0.0.1", 1))
+    assert window.info() == DeduplicationInfo(hits=2, misses=3, maxsize=10, currsize=1)
+
+
+def test_deduplication_window_is_bounded():
+    window = DeduplicationWindow(2, 60)
+    for key in range(3):
+        window.seen(key)
+
+    assert window.info().currsize == 2
+    assert not window.seen(0)
+
+
+def test_record_collapses_repeated_downloads(recorder: DownloadRecorder):
+    mod_id, mod_release_id = uuid4(), uuid4()
+    assert recorder.record(DownloadEvent(mod_id, mod_release_id, "127.0.0.1"))
+    assert not recorder.record(DownloadEvent(mod_id, mod_release_id, "127.0.0.1"))
+    assert recorder.record(DownloadEvent(mod_id, mod_release_id, "127.0.0.2"))
+    assert recorder.dropped == 0
+    assert recorder.deduplication.info().hits == 1
+
+
+def test_flush_spills_events_while_database_is_unavailable(
+    unavailable_recorder: DownloadRecorder,
+):
+    recorder = unavailable_recorder
+    events = [DownloadEvent(uuid4(), uuid4(), "127.0.0.1") for _ in range(2)]
+    assert not recorder.flush(events[:1])
+    assert not recorder.flush(events[1:])
+
+    assert recorder.spilled == 2
+    assert recorder.flushed == 0
+    assert _read_spilled_mod_ids(recorder) == [str(event.mod_id) for event in events]
+
+
+def test_stop_flushes_buffered_events(unavailable_recorder: DownloadRecorder):
+    recorder = unavailable_recorder
+    events = [DownloadEvent(uuid4(), uuid4(), "127.0.0.1") for _ in range(2)]
+    recorder.start()
+    for event in events:
+        recorder.record(event)
+    recorder.stop()
+
+    assert recorder.spilled == 2
+    assert _read_spilled_mod_ids(recorder) == [str(event.mod_id) for event in events]
+    assert not recorder.record(DownloadEvent(uuid4(), uuid4(), "127.0.0.1"))
+
+
+def test_run_survives_unexpected_flush_failures(
+    recorder: DownloadRecorder, monkeypatch
+):
+    def flush(events):
+        raise OSError("spill file is unwritable")
+
+    monkeypatch.setattr(recorder, "flush", flush)
+    recorder.start()
+    recorder.record(DownloadEvent(uuid4(), uuid4(), "127.0.0.1"))
+    recorder.record(DownloadEvent(uuid4(), uuid4(), "127.0.0.1"))
+    thread = recorder._thread
+    recorder.stop()
+
+    assert recorder.dropped == 2
+    assert thread is not None and not thread.is_alive()
+
+
+def test_reject_spill_keeps_earlier_rejections(recorder: DownloadRecorder):
+    recorder._write_spill([DownloadEvent(uuid4(), uuid4(), "127.0.0.1")])
+
+    with recorder._lock_spill():
+        recorder._reject_spill()
+    recorder._write_spill([DownloadEvent(uuid4(), uuid4(), "127.0.0.1")])
+    with recorder._lock_spill():
+        recorder._reject_spill()
+
+    rejected = sorted(recorder.spill_path.parent.glob("spill.csv.*.rejected"))
+    assert len(rejected) == 2
+    assert not recorder.spill_path.exists()
+
+
+@pytest.mark.db
+def test_flush_copies_events_into_downloads(
+    db_session: Session, mod_release_factory, tmp_path: Path
+):
+    # NOTE: the recorder commits through its own connection, so the release it
+    # records downloads of must be committed rather than only flushed
+    mod_release = mod_release_factory.create()
+    db_session.commit()
+    user_agent = f"Recorder/{uuid4().hex!s}"
+    try:
+        recorder = DownloadRecorder(get_db(), 10, 10, 0.01, tmp_path / "spill.csv")
+        assert recorder.flush(
+            [
+                DownloadEvent(
+                    mod_release.mod_id,
+                    mod_release.id,
+                    ip,
+                    {"user-agent": user_agent},
+                    user_agent=user_agent,
+                )
+                for ip in ("127.0.0.1", "127.0.0.2")
+            ]
+            + [DownloadEvent(mod_release.mod_id, uuid4(), "127.0.0.3")]
+        )
+
+        user_agent_id = (
+            db_session.query(UserAgent.id)
+            .filter(UserAgent.value == user_agent)
+            .scalar()
+        )
+        assert user_agent_id is not None
+        assert recorder.user_agents == {user_agent: user_agent_id}
+        assert recorder.flushed == 3
+        # NOTE: downloads of releases which don't exist are filtered out of the batch
+        assert sorted(
+            (str(download.ip), download.mod_id, download.user_agent_id)
+            for download in db_session.query(ModReleaseDownload).filter(
+                ModReleaseDownload.mod_release_id == mod_release.id
+            )
+        ) == [
+            ("127.0.0.1", mod_release.mod_id, user_agent_id),
+            ("127.0.0.2", mod_release.mod_id, user_agent_id),
+        ]
+    finally:
+        # NOTE: the mod's releases, downloads and sketches are removed by the cascade
+        mod = mod_release.mod
+        db_session.execute(Mod.__table__.delete().where(Mod.id == mod.id))
+        db_session.execute(User.__table__.delete().where(User.id == mod.user_id))
+        db_session.commit()
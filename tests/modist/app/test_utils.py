@@ -0,0 +1,28 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+import pytest
+
+from modist.app.utils import decode_cursor, encode_cursor, parse_quality_values
+
+
+def test_parse_quality_values():
+    assert parse_quality_values("gzip;q=0.5, br, *;q=0") == {
+        "gzip": 0.5,
+        "br": 1.0,
+        "*": 0.0,
+    }
+
+
+def test_cursor_round_trips_values():
+    values = [0.0607927, "b9c5d3a4-4e3b-4cb1-8b7a-36a7d1b4f3a2"]
+    cursor = encode_cursor(values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == values
+
+
+@pytest.mark.parametrize("cursor", ["!!!", encode_cursor({"a": 1}), "e30"])
+def test_decode_cursor_rejects_malformed_cursors(cursor: str):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -0,0 +1,69 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+import pytest
+from semver import VersionInfo
+
+from modist.models.mod import ModRelease, ModReleaseConflict, ModReleaseDependency
+from modist.versioning import get_version_key
+from modist.models.host import HostRelease
+
+
+@pytest.mark.parametrize("model", [ModRelease, HostRelease])
+def test_release_stores_version_key_on_write(model):
+    release = model(version="1.10.0")
+    assert release.version_key == get_version_key(VersionInfo.parse("1.10.0"))
+
+    release.version = VersionInfo.parse("2.0.0-rc.1")
+    assert release.version_key == get_version_key(VersionInfo.parse("2.0.0-rc.1"))
+
+
+@pytest.mark.parametrize("model", [ModRelease, HostRelease])
+def test_release_rejects_invalid_versions(model):
+    with pytest.raises(ValueError):
+        model(version="1.0")
+
+
+@pytest.mark.parametrize("model", [ModReleaseDependency, ModReleaseConflict])
+def test_version_range_bounds_are_stored_on_write(model):
+    edge = model(version_expression="^1.2.0")
+    assert edge.lower_version_key == get_version_key(VersionInfo.parse("1.2.0"))
+    assert edge.lower_inclusive
+    assert edge.upper_version_key == get_version_key(VersionInfo.parse("2.0.0"))
+    assert not edge.upper_inclusive
+    assert edge.version_range.contains(VersionInfo.parse("1.9.0"))
+    assert not edge.version_range.contains(VersionInfo.parse("2.0.0"))
+
+    edge.version_expression = "*"
+    assert edge.lower_version_key is None
+    assert edge.upper_version_key is None
+
+
+@pytest.mark.parametrize("model", [ModReleaseDependency, ModReleaseConflict])
+def test_version_range_rejects_invalid_expressions(model):
+    with pytest.raises(ValueError):
+        model(version_expression=">=abc")
+
+
+@pytest.mark.db
+def test_mod_latest_release_follows_release_changes(
+    db_session, mod_factory, mod_release_factory
+):
+    mod = mod_factory.create()
+    assert mod.latest_release_id is None
+
+    older = mod_release_factory.create(mod=mod, version="1.9.0")
+    newer = mod_release_factory.create(mod=mod, version="1.10.0")
+    db_session.refresh(mod)
+    assert mod.latest_release_id == newer.id
+
+    newer.is_active = False
+    db_session.flush()
+    db_session.refresh(mod)
+    assert mod.latest_release_id == older.id
+
+    db_session.delete(older)
+    db_session.flush()
+    db_session.refresh(mod)
+    assert mod.latest_release_id is None
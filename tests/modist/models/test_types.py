@@ -0,0 +1,15 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from semver import VersionInfo
+
+from modist.models._types import SemverType
+
+
+def test_semver_type_shares_parsed_versions():
+    semver_type = SemverType()
+    version = semver_type.process_result_value("1.10.0-rc.1")
+    assert version == VersionInfo.parse("1.10.0-rc.1")
+    assert semver_type.process_result_value("1.10.0-rc.1") is version
+    assert semver_type.process_result_value(None) is None
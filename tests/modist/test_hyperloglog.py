@@ -0,0 +1,41 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+import pytest
+
+from modist.hyperloglog import HLL_SIZE, HyperLogLog
+
+
+@pytest.mark.parametrize("count", [0, 1, 10, 1000, 50000])
+def test_estimate_is_within_error(count):
+    sketch = HyperLogLog.from_values(f"ip:10.0.{index!s}" for index in range(count))
+    assert abs(sketch.estimate() - count) <= max(count * 0.03, 1)
+
+
+def test_estimate_ignores_duplicates():
+    sketch = HyperLogLog.from_values(f"ip:{index % 100!s}" for index in range(10000))
+    assert sketch.estimate() == pytest.approx(100, abs=3)
+
+
+def test_merge_estimates_union():
+    first = HyperLogLog.from_values(str(index) for index in range(0, 20000))
+    second = HyperLogLog.from_values(str(index) for index in range(10000, 30000))
+    first.merge(second)
+    assert first.estimate() == pytest.approx(30000, rel=0.03)
+    assert (
+        first.registers
+        == HyperLogLog.from_values(str(i) for i in range(30000)).registers
+    )
+
+
+def test_to_bytes_round_trips():
+    sketch = HyperLogLog.from_values(str(index) for index in range(100))
+    serialized = sketch.to_bytes()
+    assert len(serialized) == HLL_SIZE
+    assert HyperLogLog(serialized).registers == sketch.registers
+
+
+def test_rejects_invalid_registers():
+    with pytest.raises(ValueError):
+        HyperLogLog(bytes(HLL_SIZE - 1))
@@ -0,0 +1,78 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from datetime import date
+
+import pytest
+
+from modist.partitioning import (
+    add_months,
+    get_months,
+    get_partition_name,
+    get_partition_month,
+    build_create_partition_sql,
+    build_move_default_partition_rows_sql,
+)
+
+
+@pytest.mark.parametrize(
+    "month,months,expected",
+    [
+        (date(2020, 1, 15), 1, date(2020, 2, 1)),
+        (date(2020, 12, 1), 1, date(2021, 1, 1)),
+        (date(2020, 1, 1), -1, date(2019, 12, 1)),
+        (date(2020, 3, 31), -26, date(2018, 1, 1)),
+        (date(2020, 6, 1), 0, date(2020, 6, 1)),
+    ],
+)
+def test_add_months(month, months, expected):
+    assert add_months(month, months) == expected
+
+
+def test_get_months():
+    assert get_months(date(2020, 11, 30), 3) == [
+        date(2020, 11, 1),
+        date(2020, 12, 1),
+        date(2021, 1, 1),
+    ]
+    assert get_months(date(2020, 11, 30), 0) == []
+
+
+def test_get_partition_month_inverts_get_partition_name():
+    month = date(2020, 2, 1)
+    partition_name = get_partition_name("mod_release_download", month)
+    assert partition_name == "mod_release_download_y2020m02"
+    assert get_partition_month("mod_release_download", partition_name) == month
+
+
+@pytest.mark.parametrize(
+    "partition_name",
+    [
+        "mod_release_download_default",
+        "mod_release_download_daily",
+        "mod_download_y2020m02",
+        "mod_release_download_y2020m2",
+    ],
+)
+def test_get_partition_month_ignores_other_tables(partition_name):
+    assert get_partition_month("mod_release_download", partition_name) is None
+
+
+def test_build_create_partition_sql_bounds_month():
+    sql = build_create_partition_sql("mod_release_download", date(2020, 12, 10))
+    assert "public.mod_release_download_y2020m12 " in sql
+    assert "PARTITION OF public.mod_release_download " in sql
+    assert "FROM ('2020-12-01 00:00:00+00') TO ('2021-01-01 00:00:00+00')" in sql
+
+
+def test_build_move_default_partition_rows_sql_bounds_month():
+    sql = build_move_default_partition_rows_sql(
+        "mod_release_download", "downloaded_at", date(2020, 12, 10)
+    )
+    assert "DELETE FROM public.mod_release_download_default " in sql
+    assert (
+        "downloaded_at >= '2020-12-01 00:00:00+00' "
+        "AND downloaded_at < '2021-01-01 00:00:00+00'"
+    ) in sql
+    assert sql.endswith("INSERT INTO public.mod_release_download SELECT * FROM moved")
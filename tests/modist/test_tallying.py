@@ -0,0 +1,48 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+from modist.tallying import (
+    get_tally_trigger_name,
+    get_ranking_trigger_name,
+    build_reconcile_tally_sql,
+    build_drop_tally_triggers_sql,
+    build_create_tally_triggers_sql,
+)
+
+
+def test_build_create_tally_triggers_sql_passes_tables_as_arguments():
+    association_sql, ranking_sql = build_create_tally_triggers_sql(
+        "mod_ranking", "mod_id", "mod_ranking_tally"
+    )
+    assert get_tally_trigger_name("mod_ranking") in association_sql
+    assert "OF mod_id, ranking_id ON public.mod_ranking " in association_sql
+    assert "refresh_ranking_tally('mod_id', 'mod_ranking_tally')" in association_sql
+    assert get_ranking_trigger_name("mod_ranking") in ranking_sql
+    assert (
+        "BEFORE DELETE OR UPDATE OF rank, is_active ON public.ranking " in ranking_sql
+    )
+    assert (
+        "refresh_ranking_tallies('mod_ranking', 'mod_id', 'mod_ranking_tally')"
+        in ranking_sql
+    )
+
+
+def test_build_drop_tally_triggers_sql_drops_both_triggers():
+    ranking_sql, association_sql = build_drop_tally_triggers_sql("image_ranking")
+    assert ranking_sql.endswith(
+        f"{get_ranking_trigger_name('image_ranking')} ON public.ranking"
+    )
+    assert association_sql.endswith(
+        f"{get_tally_trigger_name('image_ranking')} ON public.image_ranking"
+    )
+
+
+def test_build_reconcile_tally_sql_only_writes_drifted_tallies():
+    sql = build_reconcile_tally_sql(
+        "comment_ranking", "comment_id", "comment_ranking_tally"
+    )
+    assert "INSERT INTO public.comment_ranking_tally (comment_id, up, down, net)" in sql
+    assert "FROM public.comment_ranking AS association" in sql
+    assert "IS DISTINCT FROM" in sql
+    assert "ON CONFLICT (comment_id) DO UPDATE" in sql
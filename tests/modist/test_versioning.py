@@ -0,0 +1,66 @@
+# -*- encoding: utf-8 -*-
+# Copyright (c) 2020 Modist Team <admin@modist.io>
+# ISC License <https://choosealicense.com/licenses/isc>
+
+import pytest
+from semver import VersionInfo
+
+from modist.versioning import get_version_key, parse_version_expression
+
+
+@pytest.mark.parametrize(
+    "expression,matching,mismatching",
+    [
+        ("*", ["0.0.1", "99.0.0"], []),
+        ("1.2.3", ["1.2.3"], ["1.2.4", "1.2.2"]),
+        (">= 1.2.0, <2.0.0", ["1.2.0", "1.9.9"], ["1.1.9", "2.0.0"]),
+        (">1.2.0 <=1.3.0", ["1.2.1", "1.3.0"], ["1.2.0", "1.3.1"]),
+        ("^1.2.3", ["1.2.3", "1.9.0"], ["1.2.2", "2.0.0"]),
+        ("^0.2.3", ["0.2.3", "0.2.9"], ["0.3.0"]),
+        ("~1.2.3", ["1.2.3", "1.2.9"], ["1.3.0"]),
+    ],
+)
+def test_parse_version_expression(expression, matching, mismatching):
+    version_range = parse_version_expression(expression)
+    for version in matching:
+        assert version_range.contains(VersionInfo.parse(version))
+    for version in mismatching:
+        assert not version_range.contains(VersionInfo.parse(version))
+
+
+def test_parse_version_expression_detects_empty_ranges():
+    assert parse_version_expression(">=2.0.0, <1.0.0").is_empty
+    assert parse_version_expression(">1.0.0, <=1.0.0").is_empty
+    assert not parse_version_expression(">=1.0.0, <=1.0.0").is_empty
+
+
+@pytest.mark.parametrize("expression", ["", " , ", ">=abc", "1.0"])
+def test_parse_version_expression_rejects_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        parse_version_expression(expression)
+
+
+def test_get_version_key_orders_by_precedence():
+    versions = [
+        "1.0.0-alpha",
+        "1.0.0-alpha.1",
+        "1.0.0-alpha.beta",
+        "1.0.0-alpha-beta",
+        "1.0.0-beta",
+        "1.0.0-beta.2",
+        "1.0.0-beta.11",
+        "1.0.0-rc.1",
+        "1.0.0",
+        "1.0.1",
+        "1.10.0",
+        "2.0.0",
+    ]
+    assert (
+        sorted(
+            versions, key=lambda version: get_version_key(VersionInfo.parse(version))
+        )
+        == versions
+    )
+    assert get_version_key(VersionInfo.parse("1.0.0+build.1")) == get_version_key(
+        VersionInfo.parse("1.0.0")
+    )